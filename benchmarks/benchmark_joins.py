@@ -8,6 +8,12 @@ Comprehensive benchmarks for JOIN operations comparing:
 - Different dataset sizes
 - Different join types (inner, left, etc.)
 - Cost-based optimization effectiveness
+- Columnar (NumPy) hash join vs row-based hash join at 1M x 1M rows
+- Parallel hash join scaling across worker processes
+
+Parallel scaling depends on physical cores: run on an 8-16 core machine
+to see the worker sweep; the matching phase divides across workers while
+key extraction and output row assembly stay in the parent process.
 """
 
 import time
@@ -21,7 +27,10 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
-from core.join_engine import JoinExecutor, HashJoinExecutor, MergeJoinExecutor, NestedLoopJoinExecutor, JoinType
+from core.join_engine import (
+    JoinExecutor, HashJoinExecutor, MergeJoinExecutor, NestedLoopJoinExecutor,
+    ColumnarHashJoinExecutor, ParallelHashJoinExecutor, JoinType, NUMPY_AVAILABLE
+)
 from core.statistics_collector import StatisticsCollector
 
 
@@ -224,6 +233,97 @@ def benchmark_multi_table_joins():
     print(f"    Results: {len(final):,} rows")
 
 
+def benchmark_columnar_join(row_count: int = 1_000_000):
+    """Benchmark columnar hash join against the row-based executor"""
+    print("\n" + "=" * 60)
+    print(f"Columnar vs Row Hash Join ({row_count:,} x {row_count:,})")
+    print("=" * 60)
+
+    if not NUMPY_AVAILABLE:
+        print("  Skipped: numpy not installed")
+        return
+
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    left_columns = {
+        "id": np.arange(row_count, dtype=np.int64),
+        "age": rng.integers(20, 80, row_count),
+    }
+    right_columns = {
+        "order_id": np.arange(row_count, dtype=np.int64),
+        "user_id": rng.integers(0, row_count, row_count),
+        "amount": rng.integers(10, 1000, row_count),
+    }
+
+    for join_type in (JoinType.INNER, JoinType.FULL):
+        print(f"\n  {join_type.value} join:")
+
+        executor = ColumnarHashJoinExecutor(join_type)
+        start = time.time()
+        result, stats = executor.execute(left_columns, right_columns, "id", "user_id")
+        for name in result.column_names:
+            result.column(name)  # Gather every output column
+        columnar_time = (time.time() - start) * 1000
+        print(f"    Columnar: {columnar_time:,.0f} ms "
+              f"(build {stats.build_time_ms:,.0f} ms, probe {stats.probe_time_ms:,.0f} ms), "
+              f"{len(result):,} rows")
+
+        # Row executor gets pre-built dicts so only the join is timed
+        left_rows = [dict(zip(left_columns, values))
+                     for values in zip(*(c.tolist() for c in left_columns.values()))]
+        right_rows = [dict(zip(right_columns, values))
+                      for values in zip(*(c.tolist() for c in right_columns.values()))]
+
+        start = time.time()
+        row_results, _ = HashJoinExecutor(join_type).execute(left_rows, right_rows, "id", "user_id")
+        row_time = (time.time() - start) * 1000
+        print(f"    Row:      {row_time:,.0f} ms, {len(row_results):,} rows")
+        print(f"    Speedup:  {row_time / max(columnar_time, 0.001):.1f}x")
+
+        del left_rows, right_rows, row_results
+
+
+def benchmark_parallel_join(row_count: int = 1_000_000, worker_counts: tuple = (1, 2, 4, 8, 16)):
+    """Benchmark parallel hash join scaling across worker processes"""
+    print("\n" + "=" * 60)
+    print(f"Parallel Hash Join Scaling ({row_count:,} x {row_count:,})")
+    print("=" * 60)
+
+    if not NUMPY_AVAILABLE:
+        print("  Skipped: numpy not installed")
+        return
+
+    cores = os.cpu_count() or 1
+    print(f"  CPU cores: {cores}")
+
+    users = [{"id": i, "age": 20 + (i % 60)} for i in range(row_count)]
+    orders = [{"order_id": i, "user_id": random.randrange(row_count), "amount": i % 1000}
+              for i in range(row_count)]
+
+    start = time.time()
+    serial_results, _ = HashJoinExecutor(JoinType.INNER).execute(users, orders, "id", "user_id")
+    serial_time = (time.time() - start) * 1000
+    print(f"\n  Serial hash join: {serial_time:,.0f} ms, {len(serial_results):,} rows")
+    del serial_results
+
+    baseline = None
+    for workers in worker_counts:
+        if workers > cores:
+            print(f"  {workers:>2} workers: skipped (only {cores} cores)")
+            continue
+        executor = ParallelHashJoinExecutor(JoinType.INNER, max_workers=workers)
+        start = time.time()
+        results, stats = executor.execute(users, orders, "id", "user_id")
+        elapsed = (time.time() - start) * 1000
+        baseline = baseline or elapsed
+        print(f"  {workers:>2} workers: {elapsed:,.0f} ms "
+              f"(partition {stats.build_time_ms:,.0f} ms, match {stats.probe_time_ms:,.0f} ms), "
+              f"{len(results):,} rows, {baseline / elapsed:.2f}x vs 1 worker, "
+              f"{serial_time / elapsed:.2f}x vs serial")
+        del results
+
+
 def main():
     """Run all benchmarks"""
     print("=" * 60)
@@ -235,6 +335,8 @@ def main():
     benchmark_smart_selection()
     benchmark_cost_estimation()
     benchmark_multi_table_joins()
+    benchmark_columnar_join()
+    benchmark_parallel_join()
     
     print("\n" + "=" * 60)
     print("Benchmark Complete!")
@@ -244,6 +346,8 @@ def main():
     print("  * Smart algorithm selection chooses optimal strategy")
     print("  * Cost estimation accurately predicts join sizes")
     print("  * Multi-table joins execute efficiently")
+    print("  * Columnar join avoids per-row dicts on large equi-joins")
+    print("  * Parallel join spreads key matching across worker processes")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+SAIQL Approximate Query Processing
+==================================
+
+Answers COUNT / SUM / AVG queries from a sample instead of a full scan,
+with confidence intervals, when the execution context asks for it
+(ExecutionMode.APPROXIMATE).
+
+Eligible queries are single-table aggregates of the form
+
+    SELECT [group columns,] COUNT(*) | COUNT(col) | SUM(col) | AVG(col) ...
+    FROM table [WHERE ...] [GROUP BY group columns]
+
+They are rewritten to return sufficient statistics (counts, sums and sums of
+squares) over one of three samples:
+
+- BERNOULLI: each row independently with probability p (a seeded hash of
+  the rowid, so a query is repeatable); still reads every page
+- BLOCK: runs of block_size consecutive rowids, each with probability p;
+  only the chosen rowid ranges are read
+- STRATIFIED: a maintained sample table holding up to rows_per_stratum
+  rows of every value of a strata column (reservoir sampling), so rare
+  groups are not lost; SampleManager keeps it current as rows are
+  inserted through the engine
+
+Estimates are Horvitz-Thompson totals (stratified: per-stratum expansion)
+and ratio estimates for AVG; intervals use the normal approximation.
+MIN, MAX, COUNT(DISTINCT), joins and anything else run exactly. Rewrites
+use SQLite SQL (rowid ranges, json_each).
+
+Author: Apollo & Claude
+Version: 1.0.0
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .hash_aggregate import AggregateSpec
+except ImportError:
+    # Fallback for standalone testing
+    from hash_aggregate import AggregateSpec
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_REGISTRY_TABLE = "saiql_samples"
+SAMPLE_STRATA_TABLE = "saiql_sample_strata"
+
+_APPROXIMATE_FUNCTIONS = ('COUNT', 'SUM', 'AVG')
+
+_SELECT_RE = re.compile(
+    r'^\s*SELECT\s+(?P<select>.+?)\s+FROM\s+(?P<table>"[^"]+"|\w+)'
+    r'(?:\s+WHERE\s+(?P<where>.+?))?'
+    r'(?:\s+GROUP\s+BY\s+(?P<group>.+?))?\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+
+_COLUMN_RE = re.compile(r'^(?:(?:"[^"]+"|\w+)\.)?(?:"[^"]+"|\w+)$')
+
+# WHERE clauses that could reach beyond one sampled table
+_UNSAFE_WHERE_RE = re.compile(r'\b(SELECT|JOIN|LIMIT|HAVING|ORDER|UNION)\b', re.IGNORECASE)
+
+# 31-bit multiplicative hash of the rowid for repeatable Bernoulli samples
+_HASH_MODULUS = 2 ** 31
+_HASH_MULTIPLIER = 1103515245
+
+
+class SamplingMethod(Enum):
+    """How an approximate query samples its table"""
+    AUTO = "auto"              # STRATIFIED if the table has a sample, else BLOCK
+    BERNOULLI = "bernoulli"
+    BLOCK = "block"
+    STRATIFIED = "stratified"
+
+
+@dataclass
+class ApproximationSettings:
+    """Approximate execution settings (ExecutionContext.approximation)"""
+    method: SamplingMethod = SamplingMethod.AUTO
+    sample_fraction: float = 0.01
+    confidence: float = 0.95
+    block_size: int = 1024
+    min_table_rows: int = 100_000  # Smaller tables are scanned exactly
+    seed: Optional[int] = None
+
+    def cache_key(self) -> Dict[str, Any]:
+        return {
+            'method': self.method.value, 'sample_fraction': self.sample_fraction,
+            'confidence': self.confidence, 'block_size': self.block_size,
+            'min_table_rows': self.min_table_rows, 'seed': self.seed,
+        }
+
+
+@dataclass
+class ApproximatePlan:
+    """An eligible aggregate query, parsed"""
+    table: str                     # Unquoted table name
+    items: List[Tuple[str, Any]]   # ('group', column) or ('aggregate', AggregateSpec) in SELECT order
+    group_by: List[str]            # Column expressions as written
+    where: Optional[str]
+
+    @property
+    def aggregates(self) -> List[AggregateSpec]:
+        return [spec for kind, spec in self.items if kind == 'aggregate']
+
+    @property
+    def value_columns(self) -> List[str]:
+        """Distinct aggregated columns, in first-use order"""
+        return list(dict.fromkeys(spec.column for spec in self.aggregates if spec.column != '*'))
+
+
+@dataclass
+class _GroupSums:
+    """Sufficient statistics of one output group over the sampled units"""
+    n: float = 0.0                                          # Rows
+    nn: float = 0.0                                         # Sum of squared per-unit row counts
+    columns: Dict[str, List[float]] = field(default_factory=dict)  # col -> [c, cc, s, ss, sc]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _unquote(name: str) -> str:
+    return name[1:-1].replace('""', '"') if name.startswith('"') and name.endswith('"') else name
+
+
+def _split_items(select: str) -> List[str]:
+    """Split a SELECT list on top-level commas"""
+    items, depth, current = [], 0, []
+    for ch in select:
+        if ch == ',' and depth == 0:
+            items.append(''.join(current).strip())
+            current = []
+            continue
+        depth += ch == '('
+        depth -= ch == ')'
+        current.append(ch)
+    items.append(''.join(current).strip())
+    return items
+
+
+def plan_approximation(sql: str) -> Tuple[Optional[ApproximatePlan], str]:
+    """
+    Parse an aggregate query for approximate execution.
+
+    Returns:
+        (plan, '') if eligible, else (None, reason)
+    """
+    match = _SELECT_RE.match(sql)
+    if not match:
+        return None, "not a single-table aggregate query"
+    if match.group('select').strip().upper().startswith('DISTINCT'):
+        return None, "SELECT DISTINCT"
+    where = match.group('where')
+    if where and _UNSAFE_WHERE_RE.search(where):
+        return None, "WHERE clause is not a simple filter"
+
+    group_by = [g.strip() for g in _split_items(match.group('group'))] if match.group('group') else []
+    if not all(_COLUMN_RE.match(g) for g in group_by):
+        return None, "GROUP BY expressions are not plain columns"
+
+    items: List[Tuple[str, Any]] = []
+    for text in _split_items(match.group('select')):
+        if text in group_by:
+            items.append(('group', text))
+            continue
+        try:
+            spec = AggregateSpec.parse(text)
+        except ValueError:
+            return None, f"unsupported SELECT item: {text}"
+        if spec.function not in _APPROXIMATE_FUNCTIONS:
+            return None, f"{spec.function} cannot be estimated from a sample"
+        if spec.column != '*' and not _COLUMN_RE.match(spec.column):
+            return None, f"aggregate over an expression: {text}"
+        # Without AS the backend names the column after the expression as written
+        if not re.search(r'\s+AS\s+\w+\s*$', text, re.IGNORECASE):
+            spec = AggregateSpec(spec.function, spec.column, text)
+        items.append(('aggregate', spec))
+    if not any(kind == 'aggregate' for kind, _ in items):
+        return None, "no aggregates"
+    return ApproximatePlan(_unquote(match.group('table')), items, group_by, where), ""
+
+
+class SampleManager:
+    """
+    Stratified sample tables kept in the database next to their base tables
+
+    For a sampled table t with strata column s, "saiql_sample_t" holds up to
+    rows_per_stratum rows of each value of s, and saiql_sample_strata holds
+    each stratum's population and sample size. record_inserts() adds the
+    statements that keep both current (reservoir sampling per stratum) to
+    a batch of inserts, so they run in the same transaction.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.lock = threading.RLock()
+        self._rng = random.Random(seed)
+        self._seed = seed
+
+    @staticmethod
+    def sample_table_name(table: str) -> str:
+        return f"saiql_sample_{table}"
+
+    def _ensure_registry(self, db: Any) -> None:
+        for sql in (f"CREATE TABLE IF NOT EXISTS {SAMPLE_REGISTRY_TABLE} (table_name TEXT PRIMARY KEY, "
+                    f"strata_column TEXT NOT NULL, rows_per_stratum INTEGER NOT NULL, sample_table TEXT NOT NULL)",
+                    f"CREATE TABLE IF NOT EXISTS {SAMPLE_STRATA_TABLE} (table_name TEXT NOT NULL, stratum, "
+                    f"population INTEGER NOT NULL, sample_size INTEGER NOT NULL)"):
+            _checked(db.execute_query(sql))
+
+    def create_sample(self, db: Any, table: str, strata_column: str, rows_per_stratum: int = 1000) -> Dict[str, Any]:
+        """(Re)build the stratified sample of a table from its current rows"""
+        sample, column = _quote(self.sample_table_name(table)), _quote(strata_column)
+        with self.lock:
+            self._ensure_registry(db)
+            columns = [row['name'] for row in _checked(db.execute_query(f"PRAGMA table_info({_quote(table)})")).data]
+            if strata_column not in columns:
+                raise ValueError(f"Column {strata_column} not found in {table}")
+            column_list = ', '.join(_quote(c) for c in columns)
+            # Initial sample: the first rows_per_stratum rows of each stratum in (seeded) hash order
+            seed = self._seed if self._seed is not None else self._rng.randrange(_HASH_MODULUS)
+            order = f"(((rowid % {_HASH_MODULUS}) * {_HASH_MULTIPLIER} + {int(seed)}) % {_HASH_MODULUS})"
+            _checked(db.execute_transaction([
+                {'sql': f"DROP TABLE IF EXISTS {sample}"},
+                {'sql': f"CREATE TABLE {sample} AS SELECT * FROM {_quote(table)} WHERE 0"},
+                {'sql': f"INSERT INTO {sample} ({column_list}) SELECT {column_list} FROM "
+                        f"(SELECT *, ROW_NUMBER() OVER (PARTITION BY {column} ORDER BY {order}) AS saiql_rn "
+                        f"FROM {_quote(table)}) WHERE saiql_rn <= ?", 'params': (rows_per_stratum,)},
+                {'sql': f"CREATE INDEX {_quote(self.sample_table_name(table) + '_stratum')} ON {sample} ({column})"},
+                {'sql': f"DELETE FROM {SAMPLE_STRATA_TABLE} WHERE table_name = ?", 'params': (table,)},
+                {'sql': f"INSERT INTO {SAMPLE_STRATA_TABLE} SELECT ?, {column}, COUNT(*), MIN(COUNT(*), ?) "
+                        f"FROM {_quote(table)} GROUP BY {column}", 'params': (table, rows_per_stratum)},
+                {'sql': f"INSERT OR REPLACE INTO {SAMPLE_REGISTRY_TABLE} VALUES (?, ?, ?, ?)",
+                 'params': (table, strata_column, rows_per_stratum, self.sample_table_name(table))},
+            ]))
+        info = self.get_sample(db, table)
+        logger.info(f"Built stratified sample of {table} by {strata_column}: "
+                    f"{info['sample_rows']} of {info['population']} rows in {info['strata']} strata")
+        return info
+
+    def get_sample(self, db: Any, table: str) -> Optional[Dict[str, Any]]:
+        """Registry entry and totals of a table's sample, or None"""
+        result = db.execute_query(f"SELECT * FROM {SAMPLE_REGISTRY_TABLE} WHERE table_name = ?", (table,))
+        if not result.success or not result.data:
+            return None
+        info = dict(result.data[0])
+        totals = _checked(db.execute_query(
+            f"SELECT COUNT(*) AS strata, TOTAL(population) AS population, TOTAL(sample_size) AS sample_rows "
+            f"FROM {SAMPLE_STRATA_TABLE} WHERE table_name = ?", (table,))).data[0]
+        info.update(strata=totals['strata'], population=int(totals['population']),
+                    sample_rows=int(totals['sample_rows']))
+        return info
+
+    def strata(self, db: Any, table: str) -> List[Tuple[Any, int, int]]:
+        """(stratum, population, sample_size) of every stratum"""
+        rows = _checked(db.execute_query(
+            f"SELECT stratum, population, sample_size FROM {SAMPLE_STRATA_TABLE} WHERE table_name = ?",
+            (table,))).data
+        return [(row['stratum'], row['population'], row['sample_size']) for row in rows]
+
+    def drop_sample(self, db: Any, table: str) -> bool:
+        with self.lock:
+            if self.get_sample(db, table) is None:
+                return False
+            _checked(db.execute_transaction([
+                {'sql': f"DROP TABLE IF EXISTS {_quote(self.sample_table_name(table))}"},
+                {'sql': f"DELETE FROM {SAMPLE_STRATA_TABLE} WHERE table_name = ?", 'params': (table,)},
+                {'sql': f"DELETE FROM {SAMPLE_REGISTRY_TABLE} WHERE table_name = ?", 'params': (table,)},
+            ]))
+            return True
+
+    def record_inserts(self, db: Any, table: str, rows: Sequence[Dict[str, Any]],
+                       inserts: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Interleave sample maintenance into a batch of single-row inserts.
+
+        inserts[i] is the operation inserting rows[i]; a row kept in the
+        sample is copied from the base table right after its insert
+        (rowid = last_insert_rowid()), so it carries generated keys and
+        defaults. Call with self.lock held until the returned operations
+        have run, so concurrent batches see each other's stratum counts.
+        """
+        info = self.get_sample(db, table)
+        if info is None:
+            return list(inserts)
+        strata_column, capacity = info['strata_column'], info['rows_per_stratum']
+        sample = _quote(info['sample_table'])
+        state = {stratum: [population, size] for stratum, population, size in self.strata(db, table)}
+        known, touched = set(state), {}
+
+        operations = []
+        for row, insert in zip(rows, inserts):
+            operations.append(insert)
+            stratum = row.get(strata_column)
+            counts = touched[stratum] = state.setdefault(stratum, [0, 0])
+            counts[0] += 1
+            if counts[1] < capacity:
+                counts[1] += 1
+            else:
+                # Algorithm R: keep the new row with probability capacity / population
+                victim = self._rng.randrange(counts[0])
+                if victim >= capacity:
+                    continue
+                operations.append({
+                    'sql': f"DELETE FROM {sample} WHERE rowid = (SELECT rowid FROM {sample} "
+                           f"WHERE {_quote(strata_column)} IS ? LIMIT 1 OFFSET ?)",
+                    'params': (stratum, victim)})
+            operations.append({'sql': f"INSERT INTO {sample} SELECT * FROM {_quote(table)} "
+                                      f"WHERE rowid = last_insert_rowid()"})
+
+        for stratum, (population, size) in touched.items():
+            if stratum in known:
+                operations.append({
+                    'sql': f"UPDATE {SAMPLE_STRATA_TABLE} SET population = ?, sample_size = ? "
+                           f"WHERE table_name = ? AND stratum IS ?",
+                    'params': (population, size, table, stratum)})
+            else:
+                operations.append({'sql': f"INSERT INTO {SAMPLE_STRATA_TABLE} VALUES (?, ?, ?, ?)",
+                                   'params': (table, stratum, population, size)})
+        return operations
+
+
+class ApproximateQueryExecutor:
+    """
+    Runs eligible aggregate queries over a sample and attaches error bounds
+
+    execute() returns None when the query should simply run exactly; the
+    reason is then in last_skip_reason.
+    """
+
+    def __init__(self, sample_manager: Optional[SampleManager] = None):
+        self.sample_manager = sample_manager or SampleManager()
+        self.last_skip_reason = ""
+
+    def execute(self, db: Any, sql: str,
+                settings: ApproximationSettings) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Estimate an aggregate query from a sample.
+
+        Returns:
+            (rows, metadata) or None if the query is not eligible
+        """
+        start = time.time()
+        plan, reason = plan_approximation(sql)
+        if plan is None:
+            return self._skip(reason)
+
+        method = settings.method
+        sample_info = None
+        if method in (SamplingMethod.AUTO, SamplingMethod.STRATIFIED):
+            sample_info = self.sample_manager.get_sample(db, plan.table)
+            if sample_info is None and method == SamplingMethod.STRATIFIED:
+                return self._skip(f"no stratified sample for {plan.table}")
+            method = SamplingMethod.STRATIFIED if sample_info else SamplingMethod.BLOCK
+
+        if method == SamplingMethod.STRATIFIED:
+            population = sample_info['population']
+        else:
+            result = db.execute_query(f"SELECT MAX(rowid) AS max_rowid FROM {_quote(plan.table)}")
+            if not result.success:
+                return self._skip(f"table size unknown: {result.error_message}")
+            population = result.data[0]['max_rowid'] or 0
+        if population < settings.min_table_rows:
+            return self._skip(f"{plan.table} has about {population} rows (< {settings.min_table_rows})")
+
+        seed = settings.seed if settings.seed is not None else random.randrange(_HASH_MODULUS)
+        if method == SamplingMethod.STRATIFIED:
+            sampled_sql, params = self._stratified_sql(plan, sample_info['sample_table'], sample_info['strata_column'])
+        elif method == SamplingMethod.BLOCK:
+            sampled_sql, params = self._block_sql(plan, population, settings, seed)
+        else:
+            sampled_sql, params = self._bernoulli_sql(plan, settings, seed)
+
+        result = db.execute_query(sampled_sql, params)
+        if not result.success:
+            return self._skip(f"sampled query failed: {result.error_message}")
+
+        if method == SamplingMethod.STRATIFIED:
+            rows, intervals, sample_rows = self._stratified_estimates(
+                plan, result.data, self.sample_manager.strata(db, plan.table), settings.confidence)
+            fraction = sample_info['sample_rows'] / population if population else 1.0
+        else:
+            fraction = settings.sample_fraction
+            rows, intervals, sample_rows = self._sampled_estimates(plan, result.data, fraction, settings.confidence)
+
+        metadata = {
+            'applied': True,
+            'method': method.value,
+            'sample_fraction': fraction,
+            'sample_rows': sample_rows,
+            'population_rows': population,
+            'confidence': settings.confidence,
+            'confidence_intervals': intervals,
+            'seed': seed if method != SamplingMethod.STRATIFIED else None,
+            'sql': sampled_sql,
+            'time_ms': (time.time() - start) * 1000,
+        }
+        logger.info(f"Approximate {method.value} query on {plan.table}: {sample_rows} sampled rows, "
+                    f"{len(rows)} result rows in {metadata['time_ms']:.2f}ms")
+        return rows, metadata
+
+    def _skip(self, reason: str) -> None:
+        self.last_skip_reason = reason
+        logger.debug(f"Approximate execution skipped: {reason}")
+        return None
+
+    # ------------------------------------------------------------------
+    # Rewrites
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _statistics_list(plan: ApproximatePlan, with_squares: bool) -> str:
+        """SELECT list of group columns, row count and per-column count / sum (/ sums of squares)"""
+        parts = [f"{column} AS saiql_g{i}" for i, column in enumerate(plan.group_by)]
+        parts.append("COUNT(*) AS saiql_n")
+        for i, column in enumerate(plan.value_columns):
+            parts += [f"COUNT({column}) AS saiql_c{i}", f"TOTAL({column}) AS saiql_s{i}"]
+            if with_squares:
+                parts.append(f"TOTAL(({column}) * ({column})) AS saiql_q{i}")
+        return ', '.join(parts)
+
+    @staticmethod
+    def _group_clause(plan: ApproximatePlan, extra: Optional[str] = None) -> str:
+        columns = plan.group_by + ([extra] if extra else [])
+        return f" GROUP BY {', '.join(columns)}" if columns else ""
+
+    def _bernoulli_sql(self, plan: ApproximatePlan, settings: ApproximationSettings,
+                       seed: int) -> Tuple[str, tuple]:
+        table = _quote(plan.table)
+        threshold = int(settings.sample_fraction * _HASH_MODULUS)
+        condition = (f"((({table}.rowid % {_HASH_MODULUS}) * {_HASH_MULTIPLIER} + ?) % {_HASH_MODULUS}) < ?")
+        if plan.where:
+            condition = f"({plan.where}) AND {condition}"
+        sql = (f"SELECT {self._statistics_list(plan, with_squares=True)} FROM {table} "
+               f"WHERE {condition}{self._group_clause(plan)}")
+        return sql, (seed, threshold)
+
+    def _block_sql(self, plan: ApproximatePlan, max_rowid: int, settings: ApproximationSettings,
+                   seed: int) -> Tuple[str, tuple]:
+        table, size = _quote(plan.table), settings.block_size
+        rng = random.Random(seed)
+        blocks = [b for b in range(max_rowid // size + 1) if rng.random() < settings.sample_fraction]
+        where = f" WHERE {plan.where}" if plan.where else ""
+        sql = (f"SELECT {self._statistics_list(plan, with_squares=False)}, saiql_block.value AS saiql_block "
+               f"FROM json_each(?) AS saiql_block CROSS JOIN {table} "
+               f"ON {table}.rowid >= saiql_block.value * {size} AND {table}.rowid < (saiql_block.value + 1) * {size}"
+               f"{where}{self._group_clause(plan, 'saiql_block.value')}")
+        return sql, (json.dumps(blocks),)
+
+    def _stratified_sql(self, plan: ApproximatePlan, sample_table: str, strata_column: str) -> Tuple[str, tuple]:
+        # Aliasing the sample as the base table keeps qualified column references valid
+        table = _quote(plan.table)
+        where = f" WHERE {plan.where}" if plan.where else ""
+        sql = (f"SELECT {self._statistics_list(plan, with_squares=True)}, {table}.{_quote(strata_column)} "
+               f"AS saiql_stratum FROM {_quote(sample_table)} AS {table}{where}"
+               f"{self._group_clause(plan, f'{table}.{_quote(strata_column)}')}")
+        return sql, ()
+
+    # ------------------------------------------------------------------
+    # Estimation
+    # ------------------------------------------------------------------
+
+    def _sampled_estimates(self, plan: ApproximatePlan, data: List[Dict[str, Any]], fraction: float,
+                           confidence: float) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+        """
+        Horvitz-Thompson estimates over units sampled with probability
+        `fraction` (rows for Bernoulli, rowid blocks for block sampling)
+        """
+        groups: Dict[tuple, _GroupSums] = {}
+        value_columns = plan.value_columns
+        per_row_units = 'saiql_block' not in (data[0] if data else {})
+        for record in data:
+            key = tuple(record[f"saiql_g{i}"] for i in range(len(plan.group_by)))
+            sums = groups.setdefault(key, _GroupSums(columns={c: [0.0] * 5 for c in value_columns}))
+            n = record['saiql_n']
+            sums.n += n
+            sums.nn += n if per_row_units else n * n
+            for i, column in enumerate(value_columns):
+                c, s = record[f"saiql_c{i}"], record[f"saiql_s{i}"]
+                stats = sums.columns[column]
+                stats[0] += c
+                stats[2] += s
+                if per_row_units:
+                    # Row units: c_i is 0/1, so sums of c^2 and s*c collapse to c and s
+                    stats[1] += c
+                    stats[3] += record[f"saiql_q{i}"]
+                    stats[4] += s
+                else:
+                    stats[1] += c * c
+                    stats[3] += s * s
+                    stats[4] += s * c
+
+        if not plan.group_by and not groups:
+            # A global aggregate over an empty sample still yields one row
+            groups[()] = _GroupSums(columns={c: [0.0] * 5 for c in value_columns})
+
+        factor = (1 - fraction) / (fraction * fraction) if fraction > 0 else 0.0
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        def total(value: float, square_sum: float) -> Tuple[float, float]:
+            return value / fraction, factor * square_sum
+
+        def ratio(c: float, cc: float, s: float, ss: float, sc: float) -> Tuple[Optional[float], float]:
+            if not c:
+                return None, 0.0
+            r = s / c
+            return r, factor * max(ss - 2 * r * sc + r * r * cc, 0.0) / (c / fraction) ** 2
+
+        rows, intervals = [], []
+        for key, sums in self._ordered_groups(groups):
+            estimates = {}
+            for spec in plan.aggregates:
+                if spec.column == '*':
+                    estimates[spec.alias] = ('COUNT',) + total(sums.n, sums.nn)
+                    continue
+                c, cc, s, ss, sc = sums.columns[spec.column]
+                if spec.function == 'COUNT':
+                    estimates[spec.alias] = ('COUNT',) + total(c, cc)
+                elif spec.function == 'SUM':
+                    estimates[spec.alias] = ('SUM',) + (total(s, ss) if c else (None, 0.0))
+                else:
+                    estimates[spec.alias] = ('AVG',) + ratio(c, cc, s, ss, sc)
+            row, interval = self._output_row(plan, key, estimates, z)
+            rows.append(row)
+            intervals.append(interval)
+        return rows, intervals, int(sum(sums.n for sums in groups.values()))
+
+    def _stratified_estimates(self, plan: ApproximatePlan, data: List[Dict[str, Any]],
+                              strata: List[Tuple[Any, int, int]],
+                              confidence: float) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+        """Per-stratum expansion estimates over a stratified sample (domain estimation for filters / groups)"""
+        populations = {stratum: (population, size) for stratum, population, size in strata}
+        value_columns = plan.value_columns
+        groups: Dict[tuple, Dict[Any, Dict[str, float]]] = {}
+        for record in data:
+            key = tuple(record[f"saiql_g{i}"] for i in range(len(plan.group_by)))
+            groups.setdefault(key, {})[record['saiql_stratum']] = record
+        if not plan.group_by and not groups:
+            groups[()] = {}
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        def expand(per_stratum: Dict[Any, Dict[str, float]], y_sum, y_square_sum) -> Tuple[float, float]:
+            """Estimated domain total of y and its variance"""
+            estimate = variance = 0.0
+            for stratum, record in per_stratum.items():
+                population, size = populations.get(stratum, (0, 0))
+                if not size:
+                    continue
+                sy, syy = y_sum(record), y_square_sum(record)
+                estimate += population / size * sy
+                if size > 1:
+                    spread = max(syy - sy * sy / size, 0.0) / (size - 1)
+                    variance += population * population * (1 - size / population) * spread / size
+            return estimate, variance
+
+        rows, intervals = [], []
+        for key, per_stratum in self._ordered_groups(groups):
+            estimates = {}
+            for spec in plan.aggregates:
+                if spec.column == '*':
+                    estimates[spec.alias] = ('COUNT',) + expand(per_stratum, lambda r: r['saiql_n'],
+                                                                lambda r: r['saiql_n'])
+                    continue
+                i = value_columns.index(spec.column)
+                c_key, s_key, q_key = f"saiql_c{i}", f"saiql_s{i}", f"saiql_q{i}"
+                counted = sum(record[c_key] for record in per_stratum.values())
+                if spec.function == 'COUNT':
+                    estimates[spec.alias] = ('COUNT',) + expand(per_stratum, lambda r: r[c_key], lambda r: r[c_key])
+                elif not counted:
+                    estimates[spec.alias] = (spec.function, None, 0.0)
+                elif spec.function == 'SUM':
+                    estimates[spec.alias] = ('SUM',) + expand(per_stratum, lambda r: r[s_key], lambda r: r[q_key])
+                else:
+                    total_sum, _ = expand(per_stratum, lambda r: r[s_key], lambda r: r[q_key])
+                    total_count, _ = expand(per_stratum, lambda r: r[c_key], lambda r: r[c_key])
+                    r = total_sum / total_count
+                    # Linearized ratio: z_i = y_i - r * c_i
+                    _, variance = expand(per_stratum, lambda rec: rec[s_key] - r * rec[c_key],
+                                         lambda rec: rec[q_key] - 2 * r * rec[s_key] + r * r * rec[c_key])
+                    estimates[spec.alias] = ('AVG', r, variance / (total_count * total_count))
+            row, interval = self._output_row(plan, key, estimates, z)
+            rows.append(row)
+            intervals.append(interval)
+        sample_rows = sum(record['saiql_n'] for per_stratum in groups.values() for record in per_stratum.values())
+        return rows, intervals, int(sample_rows)
+
+    @staticmethod
+    def _ordered_groups(groups: Dict[tuple, Any]) -> List[Tuple[tuple, Any]]:
+        """Groups in SQLite's GROUP BY order: NULL, numbers, text, blobs"""
+        def rank(value: Any) -> Tuple[int, Any]:
+            if value is None:
+                return 0, 0
+            if isinstance(value, (int, float)):
+                return 1, value
+            return (2, value) if isinstance(value, str) else (3, bytes(value))
+        return sorted(groups.items(), key=lambda item: tuple(rank(v) for v in item[0]))
+
+    @staticmethod
+    def _output_row(plan: ApproximatePlan, key: tuple,
+                    estimates: Dict[str, Tuple[str, Optional[float], float]],
+                    z: float) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Result row in SELECT order plus its confidence intervals"""
+        row, interval = {}, {}
+        for kind, item in plan.items:
+            if kind == 'group':
+                row[_unquote(item.split('.')[-1])] = key[plan.group_by.index(item)]
+                continue
+            function, estimate, variance = estimates[item.alias]
+            if estimate is None:
+                row[item.alias] = None
+                interval[item.alias] = None
+                continue
+            error = math.sqrt(variance)
+            low, high = estimate - z * error, estimate + z * error
+            if function == 'COUNT':
+                estimate, low = int(round(estimate)), max(low, 0.0)
+            row[item.alias] = estimate
+            interval[item.alias] = {'low': low, 'high': high, 'std_error': error}
+        return row, interval
+
+
+def _checked(result: Any) -> Any:
+    """Raise on a failed DatabaseResult"""
+    if not result.success:
+        raise RuntimeError(result.error_message)
+    return result
+
+
+__all__ = ['SamplingMethod', 'ApproximationSettings', 'ApproximatePlan', 'SampleManager',
+           'ApproximateQueryExecutor', 'plan_approximation']
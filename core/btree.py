@@ -40,9 +40,16 @@ Change Notes (2026-01-20 Round 5):
 - Fixed insert to check for existing keys in internal nodes (not just leaves)
 - Fixed row_id deletion for keys in internal nodes (was ignoring row_id)
 - Updated return type annotations: _delete_from_node/internal return Union[str, bool]
+
+Change Notes (2026-10-18):
+- Copy-on-write writes: insert/delete path-copy the nodes they touch and
+  publish the new root with a single assignment. Readers take a snapshot of
+  the root and never block; writers are serialized by _write_lock.
+- Value lists are copied before mutation so snapshots stay immutable.
 """
 
 import logging
+import threading
 from typing import Any, List, Optional, Tuple, Iterator, Union
 from dataclasses import dataclass, field
 
@@ -65,6 +72,7 @@ class BTreeNode:
     values: List[Any] = field(default_factory=list)
     children: List['BTreeNode'] = field(default_factory=list)
     is_leaf: bool = True
+    epoch: int = 0  # Write epoch that owns this node (copy-on-write)
     
     def is_full(self) -> bool:
         """Check if node is full"""
@@ -118,6 +126,12 @@ class BTree:
         self.order = order
         self.root = BTreeNode(order=order)
         self.size = 0
+
+        # Copy-on-write state: nodes created/cloned in the current write
+        # carry its epoch and may be mutated in place; anything older is
+        # shared with published snapshots and must be cloned first.
+        self._epoch = 0
+        self._write_lock = threading.Lock()
         
         logger.info(f"Created B-Tree with order {order}")
     
@@ -132,6 +146,41 @@ class BTree:
             List of values associated with the key, or None if not found
         """
         return self._search_node(self.root, key)
+
+    def _clone(self, node: BTreeNode) -> BTreeNode:
+        """Return a node private to the current write epoch"""
+        if node.epoch == self._epoch:
+            return node
+        return BTreeNode(
+            order=node.order,
+            keys=list(node.keys),
+            values=list(node.values),
+            children=list(node.children),
+            is_leaf=node.is_leaf,
+            epoch=self._epoch
+        )
+
+    def _writable_child(self, parent: BTreeNode, idx: int) -> BTreeNode:
+        """Clone parent.children[idx] into the current epoch (parent must be private)"""
+        child = parent.children[idx]
+        if child.epoch != self._epoch:
+            child = self._clone(child)
+            parent.children[idx] = child
+        return child
+
+    def _begin_write(self) -> BTreeNode:
+        """Start a write epoch and return a private copy of the root"""
+        self._epoch += 1
+        return self._clone(self.root)
+
+    @staticmethod
+    def _append_value(node: BTreeNode, idx: int, value: Any) -> None:
+        """Append to a key's value list without mutating shared snapshots"""
+        existing = node.values[idx]
+        if isinstance(existing, list):
+            node.values[idx] = existing + [value]
+        else:
+            node.values[idx] = [existing, value]
     
     def _search_node(self, node: BTreeNode, key: Any) -> Optional[List[Any]]:
         """Recursively search for key in node and its children"""
@@ -159,18 +208,44 @@ class BTree:
             key: Key to insert
             value: Value associated with the key
         """
-        # If root is full, split it
-        if self.root.is_full():
-            old_root = self.root
-            self.root = BTreeNode(order=self.order, is_leaf=False)
-            self.root.children.append(old_root)
-            self._split_child(self.root, 0)
-        
-        # Insert into the tree
-        is_new_key = self._insert_non_full(self.root, key, value)
-        if is_new_key:
-            self.size += 1
+        with self._write_lock:
+            root = self._begin_write()
+
+            # If root is full, split it
+            if root.is_full():
+                old_root = root
+                root = BTreeNode(order=self.order, is_leaf=False, epoch=self._epoch)
+                root.children.append(old_root)
+                self._split_child(root, 0)
+
+            # Insert into the private copy, then publish it atomically
+            is_new_key = self._insert_non_full(root, key, value)
+            self.root = root
+            if is_new_key:
+                self.size += 1
     
+    def insert_many(self, items: List[Tuple[Any, Any]]) -> None:
+        """
+        Insert many key-value pairs as one write.
+
+        All pairs share a single copy-on-write epoch, so each node is cloned
+        at most once per batch instead of once per key. Readers see either
+        none or all of the batch.
+        """
+        with self._write_lock:
+            root = self._begin_write()
+            added = 0
+            for key, value in items:
+                if root.is_full():
+                    old_root = root
+                    root = BTreeNode(order=self.order, is_leaf=False, epoch=self._epoch)
+                    root.children.append(old_root)
+                    self._split_child(root, 0)
+                if self._insert_non_full(root, key, value):
+                    added += 1
+            self.root = root
+            self.size += added
+
     def _insert_non_full(self, node: BTreeNode, key: Any, value: Any) -> bool:
         """Insert into a node that is not full. Returns True if new key, False if appended to existing."""
         idx = node.find_key_index(key)
@@ -178,11 +253,7 @@ class BTree:
         # Check if key already exists at this position (works for both leaf and internal nodes)
         if idx < len(node.keys) and node.keys[idx] == key:
             # Key exists - append value to list
-            existing = node.values[idx]
-            if isinstance(existing, list):
-                existing.append(value)
-            else:
-                node.values[idx] = [existing, value]
+            self._append_value(node, idx, value)
             return False  # Not a new key
 
         if node.is_leaf:
@@ -198,17 +269,13 @@ class BTree:
                 # After split, check if key matches the promoted key
                 if idx < len(node.keys) and node.keys[idx] == key:
                     # Key was promoted during split - append value
-                    existing = node.values[idx]
-                    if isinstance(existing, list):
-                        existing.append(value)
-                    else:
-                        node.values[idx] = [existing, value]
+                    self._append_value(node, idx, value)
                     return False
                 # Otherwise, key might go to the right child
                 if key > node.keys[idx]:
                     idx += 1
 
-            return self._insert_non_full(node.children[idx], key, value)
+            return self._insert_non_full(self._writable_child(node, idx), key, value)
     
     def _split_child(self, parent: BTreeNode, child_idx: int) -> None:
         """
@@ -218,11 +285,11 @@ class BTree:
         When a node is full, we split it into two nodes and move the
         median key up to the parent.
         """
-        full_child = parent.children[child_idx]
+        full_child = self._writable_child(parent, child_idx)
         mid_idx = len(full_child.keys) // 2
         
         # Create new node for right half
-        new_child = BTreeNode(order=self.order, is_leaf=full_child.is_leaf)
+        new_child = BTreeNode(order=self.order, is_leaf=full_child.is_leaf, epoch=self._epoch)
         
         # Move right half of keys/values to new node
         new_child.keys = full_child.keys[mid_idx + 1:]
@@ -256,7 +323,7 @@ class BTree:
             List of (key, value) tuples in the range
         """
         results = []
-        self._range_search_node(self.root, min_key, max_key, results)
+        self._range_search_node(self.root, min_key, max_key, results)  # root snapshot
         return results
     
     def _range_search_node(
@@ -301,15 +368,20 @@ class BTree:
         Returns:
             True if key/value was found and deleted, False otherwise
         """
-        result = self._delete_from_node(self.root, key, row_id)
+        with self._write_lock:
+            root = self._begin_write()
+            result = self._delete_from_node(root, key, row_id)
+            if result is False:
+                return False  # Nothing changed - keep the published root
 
-        # If root is empty after deletion, make its only child the new root
-        if len(self.root.keys) == 0 and not self.root.is_leaf:
-            self.root = self.root.children[0]
+            # If root is empty after deletion, make its only child the new root
+            if len(root.keys) == 0 and not root.is_leaf:
+                root = root.children[0]
+            self.root = root
 
-        # Only decrement size if a KEY was removed (not just a value)
-        if result == 'key':
-            self.size -= 1
+            # Only decrement size if a KEY was removed (not just a value)
+            if result == 'key':
+                self.size -= 1
 
         return result is not False  # Return True if anything was deleted
     
@@ -323,7 +395,9 @@ class BTree:
             if row_id is not None:
                 values = node.values[idx]
                 if isinstance(values, list) and row_id in values:
+                    values = list(values)  # Copy: the old list belongs to published snapshots
                     values.remove(row_id)
+                    node.values[idx] = values
                     if len(values) == 0:
                         # No more values - remove the key entirely
                         if node.is_leaf:
@@ -354,7 +428,7 @@ class BTree:
         idx = self._ensure_child_can_lose_key(node, idx)
 
         # Recurse to appropriate child
-        return self._delete_from_node(node.children[idx], key, row_id)
+        return self._delete_from_node(self._writable_child(node, idx), key, row_id)
     
     def _delete_from_internal(self, node: BTreeNode, idx: int) -> Union[str, bool]:
         """Delete key from internal node by replacing with predecessor or successor"""
@@ -368,7 +442,7 @@ class BTree:
                 node.keys[idx] = pred_key
                 node.values[idx] = pred_value
                 child_idx = self._ensure_child_can_lose_key(node, idx)
-                return self._delete_from_node(node.children[child_idx], pred_key)
+                return self._delete_from_node(self._writable_child(node, child_idx), pred_key)
 
         # Case 2: Right child has more than min keys - use successor
         if idx + 1 < len(node.children):
@@ -379,7 +453,7 @@ class BTree:
                     node.keys[idx] = succ_key
                     node.values[idx] = succ_value
                     child_idx = self._ensure_child_can_lose_key(node, idx + 1)
-                    return self._delete_from_node(node.children[child_idx], succ_key)
+                    return self._delete_from_node(self._writable_child(node, child_idx), succ_key)
 
         # Case 3: Both children at minimum - merge and recurse
         # The key at node.keys[idx] moves down into merged child
@@ -387,7 +461,7 @@ class BTree:
         if idx + 1 < len(node.children):
             self._merge_children(node, idx)
             # Key moved down into node.children[idx], recurse to delete it
-            return self._delete_from_node(node.children[idx], key_to_delete)
+            return self._delete_from_node(self._writable_child(node, idx), key_to_delete)
 
         # Fallback: use predecessor with underflow handling
         pred_key, pred_value = self._find_predecessor(left_child)
@@ -395,7 +469,7 @@ class BTree:
             node.keys[idx] = pred_key
             node.values[idx] = pred_value
             child_idx = self._ensure_child_can_lose_key(node, idx)
-            return self._delete_from_node(node.children[child_idx], pred_key)
+            return self._delete_from_node(self._writable_child(node, child_idx), pred_key)
 
         logger.warning(f"B-Tree deletion: could not find replacement key at index {idx}")
         return False
@@ -465,8 +539,8 @@ class BTree:
 
     def _borrow_from_left_sibling(self, parent: BTreeNode, child_idx: int) -> None:
         """Borrow a key from left sibling through parent"""
-        child = parent.children[child_idx]
-        left_sibling = parent.children[child_idx - 1]
+        child = self._writable_child(parent, child_idx)
+        left_sibling = self._writable_child(parent, child_idx - 1)
 
         # Move parent key down to child (at front)
         child.keys.insert(0, parent.keys[child_idx - 1])
@@ -482,8 +556,8 @@ class BTree:
 
     def _borrow_from_right_sibling(self, parent: BTreeNode, child_idx: int) -> None:
         """Borrow a key from right sibling through parent"""
-        child = parent.children[child_idx]
-        right_sibling = parent.children[child_idx + 1]
+        child = self._writable_child(parent, child_idx)
+        right_sibling = self._writable_child(parent, child_idx + 1)
 
         # Move parent key down to child (at end)
         child.keys.append(parent.keys[child_idx])
@@ -502,8 +576,8 @@ class BTree:
         Merge child at left_idx with child at left_idx+1.
         Parent key between them moves down to merged node.
         """
-        left_child = parent.children[left_idx]
-        right_child = parent.children[left_idx + 1]
+        left_child = self._writable_child(parent, left_idx)
+        right_child = parent.children[left_idx + 1]  # Only read; dropped from the new version
 
         # Move parent key down to left child
         left_child.keys.append(parent.keys[left_idx])
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+SAIQL Cardinality Feedback
+==========================
+
+Learning optimizer feedback loop (in the spirit of DB2 LEO): after a plan
+runs, actual row counts are compared with the optimizer's estimates per
+plan node, and the resulting correction factors are applied by
+CostEstimator the next time the same predicates are planned.
+
+Feedback is keyed by node signature with literals elided:
+
+- scans:  "users: age > ?, status = ?"
+- joins:  "orders.user_id = users.id"
+
+A join's correction only covers the error of its own predicate: the
+estimate is first rescaled by how wrong its inputs were, so a bad scan
+estimate is not learned twice.
+
+Author: Apollo & Claude
+Version: 1.0.0
+"""
+
+import hashlib
+import json
+import logging
+import math
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def scan_signature(table_name: str, conditions: List[Dict[str, Any]]) -> str:
+    """Signature of a table scan and its filter shape (values elided)"""
+    predicates = sorted(f"{c.get('column')} {c.get('operator')} ?" for c in conditions if c.get('column'))
+    return f"{table_name}: {', '.join(predicates)}" if predicates else table_name
+
+
+def join_signature(conditions: List[Dict[str, Any]]) -> str:
+    """Signature of a join predicate set, independent of input orientation"""
+    predicates = sorted(
+        f" {c.get('operator', '=')} ".join(sorted((str(c.get('column')), str(c.get('value')))))
+        for c in conditions
+    )
+    return " AND ".join(predicates) if predicates else "CROSS"
+
+
+def _is_join(node: Any) -> bool:
+    return getattr(node.operation, "value", node.operation) == "JOIN"
+
+
+def node_signature(node: Any) -> Optional[str]:
+    """Signature of an ExecutionNode, or None if it is not a scan or join"""
+    if _is_join(node) and len(node.children) == 2:
+        return join_signature(node.conditions)
+    if not node.children and node.table_name:
+        return scan_signature(node.table_name, node.conditions)
+    return None
+
+
+def plan_fingerprint(plan: Any) -> str:
+    """
+    Stable fingerprint of the query behind a plan.
+
+    Built from the set of scan and join signatures, so it does not change
+    when feedback leads to a different join order.
+    """
+    signatures = []
+
+    def walk(node: Any) -> None:
+        signature = node_signature(node)
+        if signature:
+            signatures.append(signature)
+        for child in node.children:
+            walk(child)
+
+    walk(plan)
+    if not signatures and getattr(plan, "table_name", None):
+        signatures.append(scan_signature(plan.table_name, plan.conditions))
+    digest = hashlib.md5("|".join(sorted(signatures)).encode()).hexdigest()
+    return digest[:16]
+
+
+@dataclass
+class FeedbackEntry:
+    """Learned estimate-to-actual ratio for one node signature"""
+    signature: str
+    kind: str  # "scan" or "join"
+    log_ratio: float = 0.0  # Smoothed log(actual / estimated)
+    observations: int = 0
+    last_estimated: int = 0
+    last_actual: int = 0
+    max_q_error: float = 1.0
+    queries: List[str] = field(default_factory=list)
+    last_updated: str = ""
+
+    @property
+    def q_error(self) -> float:
+        """Symmetric misestimation factor (>= 1.0)"""
+        return math.exp(abs(self.log_ratio))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["q_error"] = self.q_error
+        data["direction"] = "under" if self.log_ratio > 0 else "over" if self.log_ratio < 0 else "exact"
+        return data
+
+
+@dataclass
+class QueryFeedback:
+    """Per-fingerprint execution history"""
+    fingerprint: str
+    executions: int = 0
+    last_estimated_rows: int = 0
+    last_actual_rows: int = 0
+    max_q_error: float = 1.0
+
+
+class CardinalityFeedback:
+    """
+    Stores estimate/actual ratios and hands out correction factors.
+
+    Corrections are exp(EWMA(log(actual / estimate))), clamped to
+    [1 / max_correction, max_correction]; entries with fewer than
+    min_observations samples are not applied yet.
+    """
+
+    MAX_QUERIES_PER_ENTRY = 20
+
+    def __init__(self, storage_path: Optional[str] = None, smoothing: float = 0.5,
+                 min_observations: int = 1, max_correction: float = 1000.0):
+        """
+        Args:
+            storage_path: Directory for cardinality_feedback.json (memory only if None)
+            smoothing: Weight of the newest observation in the moving average
+            min_observations: Observations required before a correction is applied
+            max_correction: Largest factor applied in either direction
+        """
+        self.storage_path = Path(storage_path) if storage_path else None
+        self.smoothing = smoothing
+        self.min_observations = min_observations
+        self.max_correction = max_correction
+
+        self.entries: Dict[str, FeedbackEntry] = {}
+        self.queries: Dict[str, QueryFeedback] = {}
+        self._lock = threading.RLock()
+
+        if self.storage_path:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Corrections
+    # ------------------------------------------------------------------
+
+    def correction(self, signature: str) -> float:
+        """Multiplicative correction for estimates of this signature"""
+        with self._lock:
+            entry = self.entries.get(signature)
+            if entry is None or entry.observations < self.min_observations:
+                return 1.0
+            limit = math.log(self.max_correction)
+            return math.exp(max(-limit, min(limit, entry.log_ratio)))
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, signature: str, kind: str, estimated_rows: float, actual_rows: int,
+               query_fingerprint: Optional[str] = None) -> FeedbackEntry:
+        """
+        Record one observation.
+
+        estimated_rows must be the optimizer's estimate before any feedback
+        correction was applied.
+        """
+        # +1 smoothing keeps empty results and zero estimates finite
+        log_ratio = math.log((actual_rows + 1.0) / (max(0.0, estimated_rows) + 1.0))
+        with self._lock:
+            entry = self.entries.get(signature)
+            if entry is None:
+                entry = self.entries[signature] = FeedbackEntry(signature=signature, kind=kind,
+                                                                log_ratio=log_ratio)
+            else:
+                entry.log_ratio = (1 - self.smoothing) * entry.log_ratio + self.smoothing * log_ratio
+            entry.observations += 1
+            entry.last_estimated = int(round(estimated_rows))
+            entry.last_actual = actual_rows
+            entry.max_q_error = max(entry.max_q_error, math.exp(abs(log_ratio)))
+            entry.last_updated = datetime.now().isoformat()
+            if query_fingerprint and query_fingerprint not in entry.queries:
+                entry.queries = (entry.queries + [query_fingerprint])[-self.MAX_QUERIES_PER_ENTRY:]
+            return entry
+
+    def record_plan(self, plan: Any, query_fingerprint: Optional[str] = None) -> int:
+        """
+        Record every scan/join node of an executed plan that has actual_rows.
+
+        Returns:
+            Number of nodes recorded
+        """
+        fingerprint = query_fingerprint or plan_fingerprint(plan)
+        recorded = 0
+
+        def raw_estimate(node: Any) -> float:
+            return node.estimated_rows / (getattr(node, "cardinality_correction", 1.0) or 1.0)
+
+        def walk(node: Any) -> None:
+            nonlocal recorded
+            for child in node.children:
+                walk(child)
+            if node.actual_rows is None:
+                return
+            signature = node_signature(node)
+            if signature is None:
+                return
+            estimate = raw_estimate(node)
+            kind = "scan"
+            if _is_join(node):
+                kind = "join"
+                # Rescale by the input errors so only the join predicate's error is learned
+                for child in node.children:
+                    if child.actual_rows is not None:
+                        estimate *= (child.actual_rows + 1.0) / (child.estimated_rows + 1.0)
+            self.record(signature, kind, estimate, node.actual_rows, fingerprint)
+            recorded += 1
+
+        walk(plan)
+
+        executed = plan.actual_rows is not None
+        if executed:
+            with self._lock:
+                query = self.queries.setdefault(fingerprint, QueryFeedback(fingerprint=fingerprint))
+                query.executions += 1
+                query.last_estimated_rows = plan.estimated_rows
+                query.last_actual_rows = plan.actual_rows
+                q_error = (plan.actual_rows + 1.0) / (plan.estimated_rows + 1.0)
+                query.max_q_error = max(query.max_q_error, q_error, 1.0 / q_error)
+
+        if (recorded or executed) and self.storage_path:
+            self.save()
+        return recorded
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def most_misestimated(self, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Signatures ordered by current q-error, worst first"""
+        with self._lock:
+            entries = [e for e in self.entries.values() if kind is None or e.kind == kind]
+            entries.sort(key=lambda e: abs(e.log_ratio), reverse=True)
+            return [e.to_dict() for e in entries[:limit]]
+
+    def get_report(self) -> Dict[str, Any]:
+        """Summary of learned corrections"""
+        with self._lock:
+            return {
+                "signatures": len(self.entries),
+                "queries": len(self.queries),
+                "observations": sum(e.observations for e in self.entries.values()),
+                "most_misestimated": self.most_misestimated(),
+                "queries_by_q_error": sorted(
+                    (asdict(q) for q in self.queries.values()),
+                    key=lambda q: q["max_q_error"], reverse=True
+                )[:10]
+            }
+
+    def reset(self, signature: Optional[str] = None) -> None:
+        """Forget one signature (e.g. after ANALYZE) or everything"""
+        with self._lock:
+            if signature is None:
+                self.entries.clear()
+                self.queries.clear()
+            else:
+                self.entries.pop(signature, None)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Persist feedback to storage_path"""
+        if not self.storage_path:
+            return
+        try:
+            with self._lock:
+                data = {
+                    "entries": {sig: asdict(entry) for sig, entry in self.entries.items()},
+                    "queries": {fp: asdict(query) for fp, query in self.queries.items()}
+                }
+            with open(self.storage_path / "cardinality_feedback.json", 'w') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            logger.warning(f"Failed to save cardinality feedback: {e}")
+
+    def _load(self) -> None:
+        """Load persisted feedback"""
+        feedback_file = self.storage_path / "cardinality_feedback.json"
+        if not feedback_file.exists():
+            return
+        try:
+            with open(feedback_file, 'r') as f:
+                data = json.load(f)
+            self.entries = {sig: FeedbackEntry(**entry) for sig, entry in data.get("entries", {}).items()}
+            self.queries = {fp: QueryFeedback(**query) for fp, query in data.get("queries", {}).items()}
+            logger.info(f"Loaded cardinality feedback for {len(self.entries)} signatures")
+        except Exception as e:
+            logger.warning(f"Failed to load cardinality feedback: {e}")
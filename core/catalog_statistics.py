@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+SAIQL Catalog Statistics Importer
+=================================
+
+Maps the statistics a backend already maintains into TableStatistics /
+ColumnStatistics, so the optimizer gets cardinalities without scanning
+any data in Python:
+
+- SQLite: sqlite_stat1 (row counts, rows-per-key for each index prefix)
+  and sqlite_stat4 samples (MCVs, histogram) when compiled in
+- PostgreSQL: pg_class.reltuples/relpages and pg_stats (null_frac,
+  n_distinct, most_common_vals/freqs, histogram_bounds)
+- MySQL: information_schema.TABLES / STATISTICS cardinalities and
+  MySQL 8 COLUMN_STATISTICS histograms
+
+Sources may be a plugin adapter, a core DatabaseManager / DatabaseAdapter
+or a raw sqlite3 connection. A background refresh can keep a
+StatisticsCollector and/or QueryOptimizer up to date.
+
+Author: Apollo & Claude
+Version: 1.0.0
+"""
+
+import base64
+import json
+import logging
+import sqlite3
+import struct
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .statistics_collector import TableStatistics, ColumnStatistics
+    from .execution_planner import QueryStatistics
+except ImportError:
+    # Fallback for standalone testing
+    from statistics_collector import TableStatistics, ColumnStatistics
+    from execution_planner import QueryStatistics
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ("sqlite", "postgresql", "mysql")
+
+# Number of most common values kept per column (matches StatisticsCollector)
+MCV_LIMIT = 10
+
+
+def detect_backend(source: Any) -> str:
+    """Infer the backend type of a connection, adapter or DatabaseManager"""
+    if isinstance(source, sqlite3.Connection):
+        return "sqlite"
+    default_backend = getattr(source, "default_backend", None)
+    config = getattr(source, "config", None)
+    if default_backend and isinstance(config, dict):
+        backend_type = config.get("backends", {}).get(default_backend, {}).get("type")
+        if backend_type:
+            return backend_type
+    name = type(source).__name__.lower()
+    for backend, marker in (("sqlite", "sqlite"), ("postgresql", "postgres"), ("mysql", "mysql")):
+        if marker in name:
+            return backend
+    raise ValueError(f"Cannot determine backend type for {type(source).__name__}; pass backend=")
+
+
+# PostgreSQL types (format_type names) whose pg_stats text values are numbers
+_PG_INTEGER_TYPES = {"smallint", "integer", "bigint"}
+_PG_FLOAT_TYPES = {"real", "double precision", "numeric"}
+
+
+def _coerce_value(value: Any, data_type: Optional[str] = None) -> Any:
+    """
+    Convert a catalog text value (pg_stats arrays) to the column's type
+
+    Only integer and floating-point columns are converted; text such as
+    zip codes or IDs ('00123') stays a string.
+    """
+    if not isinstance(value, str) or not data_type:
+        return value
+    base_type = data_type.split("(", 1)[0].strip().lower()
+    convert = int if base_type in _PG_INTEGER_TYPES else float if base_type in _PG_FLOAT_TYPES else None
+    if convert is None:
+        return value
+    try:
+        return convert(value)
+    except ValueError:
+        return value  # NaN/Infinity spellings float() rejects
+
+
+def _sqlite_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Decode a SQLite varint, returning (value, new_offset)"""
+    value = 0
+    for i in range(8):
+        byte = data[offset + i]
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, offset + i + 1
+    return (value << 8) | data[offset + 8], offset + 9
+
+
+def decode_sqlite_record(blob: bytes) -> List[Any]:
+    """Decode a SQLite record (as stored in sqlite_stat4.sample) into values"""
+    header_size, offset = _sqlite_varint(blob, 0)
+    serial_types = []
+    while offset < header_size:
+        serial_type, offset = _sqlite_varint(blob, offset)
+        serial_types.append(serial_type)
+
+    int_sizes = {1: 1, 2: 2, 3: 3, 4: 4, 5: 6, 6: 8}
+    values: List[Any] = []
+    position = header_size
+    for serial_type in serial_types:
+        if serial_type == 0:
+            values.append(None)
+        elif serial_type in int_sizes:
+            size = int_sizes[serial_type]
+            values.append(int.from_bytes(blob[position:position + size], "big", signed=True))
+            position += size
+        elif serial_type == 7:
+            values.append(struct.unpack(">d", blob[position:position + 8])[0])
+            position += 8
+        elif serial_type in (8, 9):
+            values.append(serial_type - 8)
+        elif serial_type >= 12:
+            size = (serial_type - 12) // 2
+            raw = bytes(blob[position:position + size])
+            values.append(raw if serial_type % 2 == 0 else raw.decode("utf-8", "replace"))
+            position += size
+        else:
+            raise ValueError(f"Reserved SQLite serial type {serial_type}")
+    return values
+
+
+def _decode_mysql_histogram_value(value: Any) -> Any:
+    """MySQL stores string bucket values as 'base64:typeNNN:<payload>'"""
+    if isinstance(value, str) and value.startswith("base64:type"):
+        payload = value.split(":", 2)[2]
+        return base64.b64decode(payload).decode("utf-8", "replace")
+    return value
+
+
+class CatalogStatisticsImporter:
+    """
+    Imports optimizer statistics from a backend's own catalog tables.
+
+    Results are plain TableStatistics, so they can be fed to
+    StatisticsCollector, IndexAdvisor or (via QueryStatistics) the
+    QueryOptimizer interchangeably with sampled statistics.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        backend: Optional[str] = None,
+        schema: Optional[str] = None,
+        collector: Optional[Any] = None,
+        optimizer: Optional[Any] = None
+    ):
+        """
+        Args:
+            source: sqlite3 connection, plugin adapter, DatabaseAdapter or DatabaseManager
+            backend: Backend type (detected from source if omitted)
+            schema: PostgreSQL schema (default 'public'); MySQL uses DATABASE()
+            collector: StatisticsCollector updated on every import
+            optimizer: QueryOptimizer reloaded on every import
+        """
+        self.source = source
+        self.backend = backend or detect_backend(source)
+        if self.backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Catalog statistics not supported for backend: {self.backend}")
+        self.schema = schema or "public"
+        self.collector = collector
+        self.optimizer = optimizer
+
+        self.last_import: Dict[str, TableStatistics] = {}
+        self.last_refresh: Optional[str] = None
+        self._running = False
+        self._stop_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Query plumbing
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Run a catalog query against any supported source type"""
+        if isinstance(self.source, sqlite3.Connection):
+            cursor = self.source.execute(sql, params or ())
+            columns = [description[0] for description in cursor.description or ()]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        result = self.source.execute_query(sql, params) if params else self.source.execute_query(sql)
+        if isinstance(result, dict):
+            success, data, error = result.get("success"), result.get("data"), result.get("error")
+        else:
+            success, data, error = result.success, result.data, getattr(result, "error_message", None)
+        if not success:
+            raise RuntimeError(f"Catalog query failed: {error}")
+        return [dict(row) for row in (data or [])]
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+
+    def import_statistics(self, tables: Optional[Iterable[str]] = None,
+                          analyze: bool = False) -> Dict[str, TableStatistics]:
+        """
+        Read catalog statistics for all (or the given) tables
+
+        Args:
+            tables: Restrict the import to these table names
+            analyze: Run the backend's ANALYZE first to refresh its catalog
+
+        Returns:
+            Mapping of table name -> TableStatistics
+        """
+        wanted = {t.lower() for t in tables} if tables is not None else None
+        if analyze:
+            self._analyze(wanted)
+
+        importer = {
+            "sqlite": self._import_sqlite,
+            "postgresql": self._import_postgresql,
+            "mysql": self._import_mysql,
+        }[self.backend]
+        statistics = importer(wanted)
+
+        timestamp = datetime.now().isoformat()
+        for stats in statistics.values():
+            stats.last_updated = timestamp
+
+        with self._lock:
+            self.last_import = statistics
+            self.last_refresh = timestamp
+        self._publish(statistics)
+
+        logger.info(f"Imported {self.backend} catalog statistics for {len(statistics)} tables")
+        return statistics
+
+    def _analyze(self, wanted: Optional[set]) -> None:
+        """Ask the backend to refresh its own statistics"""
+        if self.backend == "mysql":
+            for table in sorted(wanted or self._mysql_table_names()):
+                self._query(f"ANALYZE TABLE `{table}`")
+        else:
+            self._query("ANALYZE")
+
+    def _publish(self, statistics: Dict[str, TableStatistics]) -> None:
+        """Push imported statistics to the attached collector / optimizer"""
+        if self.collector is not None:
+            for stats in statistics.values():
+                self.collector.update_statistics(stats, persist=False)
+            self.collector.save()
+        if self.optimizer is not None:
+            planner_stats = dict(getattr(self.optimizer.cost_estimator, "statistics", None) or {})
+            for name, stats in statistics.items():
+                planner_stats[name] = QueryStatistics.from_table_statistics(stats)
+            self.optimizer.load_statistics(planner_stats)
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _import_sqlite(self, wanted: Optional[set]) -> Dict[str, TableStatistics]:
+        catalog = {row["name"] for row in self._query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        table_names = [
+            row["name"] for row in self._query(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY name")
+            if wanted is None or row["name"].lower() in wanted
+        ]
+
+        stat1: Dict[str, List[Tuple[Optional[str], List[int]]]] = {}
+        if "sqlite_stat1" in catalog:
+            for row in self._query("SELECT tbl, idx, stat FROM sqlite_stat1"):
+                # Trailing tokens like 'unordered' or 'sz=N' are not counts
+                counts = []
+                for token in str(row["stat"]).split():
+                    if not token.isdigit():
+                        break
+                    counts.append(int(token))
+                stat1.setdefault(row["tbl"], []).append((row["idx"], counts))
+
+        stat4: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        if "sqlite_stat4" in catalog:
+            for row in self._query("SELECT tbl, idx, neq, nlt, ndlt, sample FROM sqlite_stat4"):
+                stat4.setdefault((row["tbl"], row["idx"]), []).append(row)
+
+        statistics = {}
+        for table in table_names:
+            stats = TableStatistics(table_name=table)
+            entries = stat1.get(table, [])
+            row_count = max((counts[0] for _, counts in entries if counts), default=None)
+            if row_count is None:
+                # Never analyzed (or no usable stat1 counts): COUNT(*) runs inside SQLite, not in Python
+                row_count = self._query(f'SELECT COUNT(*) AS n FROM "{table}"')[0]["n"]
+            stats.row_count = row_count
+
+            for column in self._query(f"PRAGMA table_info(\"{table}\")"):
+                col_stats = ColumnStatistics(column_name=column["name"])
+                if column["pk"] and str(column["type"]).upper() == "INTEGER":
+                    col_stats.distinct_count = stats.row_count  # rowid alias
+                stats.columns[column["name"]] = col_stats
+
+            for index_name, counts in entries:
+                if index_name is None or len(counts) < 2:
+                    continue
+                stats.indexes.append(index_name)
+                index_columns = [row["name"] for row in self._query(f"PRAGMA index_info(\"{index_name}\")")]
+                if not index_columns or index_columns[0] not in stats.columns:
+                    continue
+                col_stats = stats.columns[index_columns[0]]
+                # counts[1] = average rows per distinct value of the leading column
+                col_stats.distinct_count = max(col_stats.distinct_count,
+                                               int(round(counts[0] / max(1, counts[1]))))
+                samples = stat4.get((table, index_name))
+                if samples:
+                    self._apply_sqlite_stat4(col_stats, samples)
+
+            statistics[table] = stats
+        return statistics
+
+    @staticmethod
+    def _apply_sqlite_stat4(col_stats: ColumnStatistics, samples: List[Dict[str, Any]]) -> None:
+        """Derive MCVs and a histogram for an index's leading column from stat4 samples"""
+        points: Dict[Any, Tuple[int, int, int]] = {}
+        for sample in samples:
+            value = decode_sqlite_record(sample["sample"])[0]
+            neq = int(str(sample["neq"]).split()[0])
+            nlt = int(str(sample["nlt"]).split()[0])
+            ndlt = int(str(sample["ndlt"]).split()[0])
+            if value is not None:
+                points[value] = (nlt, neq, ndlt)
+        if not points:
+            return
+
+        try:
+            ordered = sorted(points.items(), key=lambda item: item[1][0])
+        except TypeError:
+            return
+        by_frequency = sorted(points.items(), key=lambda item: item[1][1], reverse=True)
+        col_stats.most_common_values = [value for value, _ in by_frequency[:MCV_LIMIT]]
+
+        col_stats.histogram_bounds = [value for value, _ in ordered]
+        col_stats.histogram = {
+            i: ordered[i + 1][1][0] - ordered[i][1][0] + (ordered[i + 1][1][1] if i == len(ordered) - 2 else 0)
+            for i in range(len(ordered) - 1)
+        }
+        # ndlt of the largest sample = distinct keys below it
+        col_stats.distinct_count = max(col_stats.distinct_count, ordered[-1][1][2] + 1)
+
+    # ------------------------------------------------------------------
+    # PostgreSQL
+    # ------------------------------------------------------------------
+
+    def _import_postgresql(self, wanted: Optional[set]) -> Dict[str, TableStatistics]:
+        table_rows = self._query("""
+            SELECT c.relname AS table_name,
+                   c.reltuples AS reltuples,
+                   c.relpages AS relpages,
+                   COALESCE(s.n_live_tup, 0) AS n_live_tup,
+                   pg_relation_size(c.oid) AS size_bytes
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE n.nspname = %s AND c.relkind IN ('r', 'p')
+        """, (self.schema,))
+
+        statistics: Dict[str, TableStatistics] = {}
+        for row in table_rows:
+            if wanted is not None and row["table_name"].lower() not in wanted:
+                continue
+            # reltuples is -1 until the first VACUUM/ANALYZE (PostgreSQL 14+)
+            reltuples = float(row["reltuples"] or 0)
+            row_count = int(reltuples) if reltuples >= 0 else int(row["n_live_tup"] or 0)
+            size_bytes = int(row["size_bytes"] or 0)
+            statistics[row["table_name"]] = TableStatistics(
+                table_name=row["table_name"],
+                row_count=row_count,
+                total_size_bytes=size_bytes,
+                avg_row_size_bytes=size_bytes / row_count if row_count else 0.0
+            )
+
+        column_rows = self._query("""
+            SELECT s.tablename AS table_name,
+                   s.attname AS column_name,
+                   format_type(a.atttypid, a.atttypmod) AS data_type,
+                   s.null_frac,
+                   s.avg_width,
+                   s.n_distinct,
+                   s.most_common_vals::text::text[] AS most_common_vals,
+                   s.most_common_freqs,
+                   s.histogram_bounds::text::text[] AS histogram_bounds
+            FROM pg_stats s
+            JOIN pg_namespace n ON n.nspname = s.schemaname
+            JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = s.tablename
+            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = s.attname
+            WHERE s.schemaname = %s
+        """, (self.schema,))
+
+        for row in column_rows:
+            stats = statistics.get(row["table_name"])
+            if stats is None:
+                continue
+            rows = stats.row_count
+            null_frac = float(row["null_frac"] or 0.0)
+            n_distinct = float(row["n_distinct"] or 0.0)
+            data_type = row.get("data_type")
+            mcvs = [_coerce_value(v, data_type) for v in (row["most_common_vals"] or [])]
+            mcv_freqs = [float(f) for f in (row["most_common_freqs"] or [])]
+            bounds = [_coerce_value(v, data_type) for v in (row["histogram_bounds"] or [])]
+
+            col_stats = ColumnStatistics(column_name=row["column_name"])
+            col_stats.null_count = int(round(null_frac * rows))
+            # Negative n_distinct is a fraction of the row count
+            col_stats.distinct_count = int(round(-n_distinct * rows)) if n_distinct < 0 else int(n_distinct)
+            col_stats.avg_length = float(row["avg_width"] or 0.0)
+            col_stats.most_common_values = mcvs[:MCV_LIMIT]
+            if len(bounds) > 1:
+                # Bounds are equi-depth over the rows not covered by NULLs or MCVs
+                remaining = max(0.0, 1.0 - null_frac - sum(mcv_freqs)) * rows
+                per_bucket = int(round(remaining / (len(bounds) - 1)))
+                col_stats.histogram_bounds = bounds
+                col_stats.histogram = {i: per_bucket for i in range(len(bounds) - 1)}
+            try:
+                candidates = mcvs + bounds
+                if candidates:
+                    col_stats.min_value = min(candidates)
+                    col_stats.max_value = max(candidates)
+            except TypeError:
+                pass
+            stats.columns[row["column_name"]] = col_stats
+
+        for row in self._query("SELECT tablename AS table_name, indexname AS index_name "
+                               "FROM pg_indexes WHERE schemaname = %s", (self.schema,)):
+            if row["table_name"] in statistics:
+                statistics[row["table_name"]].indexes.append(row["index_name"])
+
+        return statistics
+
+    # ------------------------------------------------------------------
+    # MySQL
+    # ------------------------------------------------------------------
+
+    def _mysql_table_names(self) -> List[str]:
+        return [row["table_name"] for row in self._query(
+            "SELECT TABLE_NAME AS table_name FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'")]
+
+    def _import_mysql(self, wanted: Optional[set]) -> Dict[str, TableStatistics]:
+        table_rows = self._query("""
+            SELECT TABLE_NAME AS table_name,
+                   TABLE_ROWS AS table_rows,
+                   AVG_ROW_LENGTH AS avg_row_length,
+                   DATA_LENGTH AS data_length
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'
+        """)
+
+        statistics: Dict[str, TableStatistics] = {}
+        for row in table_rows:
+            if wanted is not None and row["table_name"].lower() not in wanted:
+                continue
+            statistics[row["table_name"]] = TableStatistics(
+                table_name=row["table_name"],
+                row_count=int(row["table_rows"] or 0),
+                total_size_bytes=int(row["data_length"] or 0),
+                avg_row_size_bytes=float(row["avg_row_length"] or 0)
+            )
+
+        for row in self._query("""
+            SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """):
+            if row["table_name"] in statistics:
+                statistics[row["table_name"]].columns[row["column_name"]] = \
+                    ColumnStatistics(column_name=row["column_name"])
+
+        for row in self._query("""
+            SELECT TABLE_NAME AS table_name,
+                   INDEX_NAME AS index_name,
+                   COLUMN_NAME AS column_name,
+                   SEQ_IN_INDEX AS seq_in_index,
+                   CARDINALITY AS cardinality
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """):
+            stats = statistics.get(row["table_name"])
+            if stats is None:
+                continue
+            if row["index_name"] not in stats.indexes:
+                stats.indexes.append(row["index_name"])
+            # CARDINALITY of the first index column is that column's NDV estimate
+            col_stats = stats.columns.get(row["column_name"])
+            if int(row["seq_in_index"]) == 1 and col_stats is not None and row["cardinality"] is not None:
+                col_stats.distinct_count = max(col_stats.distinct_count, int(row["cardinality"]))
+
+        try:
+            histogram_rows = self._query("""
+                SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name, HISTOGRAM AS histogram
+                FROM information_schema.COLUMN_STATISTICS
+                WHERE SCHEMA_NAME = DATABASE()
+            """)
+        except RuntimeError as e:
+            # COLUMN_STATISTICS only exists from MySQL 8.0
+            logger.debug(f"MySQL histograms unavailable: {e}")
+            histogram_rows = []
+
+        for row in histogram_rows:
+            stats = statistics.get(row["table_name"])
+            if stats is None:
+                continue
+            col_stats = stats.columns.setdefault(row["column_name"], ColumnStatistics(column_name=row["column_name"]))
+            histogram = row["histogram"]
+            if isinstance(histogram, (str, bytes)):
+                histogram = json.loads(histogram)
+            self._apply_mysql_histogram(col_stats, histogram, stats.row_count)
+
+        return statistics
+
+    @staticmethod
+    def _apply_mysql_histogram(col_stats: ColumnStatistics, histogram: Dict[str, Any], row_count: int) -> None:
+        """Map a MySQL 8 singleton or equi-height histogram onto column statistics"""
+        buckets = histogram.get("buckets") or []
+        col_stats.null_count = int(round(float(histogram.get("null-values", 0.0)) * row_count))
+        if not buckets:
+            return
+
+        previous = 0.0
+        if histogram.get("histogram-type") == "singleton":
+            # [value, cumulative_frequency] per distinct value
+            frequencies = []
+            for value, cumulative in buckets:
+                frequencies.append((_decode_mysql_histogram_value(value), cumulative - previous))
+                previous = cumulative
+            col_stats.distinct_count = max(col_stats.distinct_count, len(frequencies))
+            col_stats.most_common_values = [
+                value for value, _ in sorted(frequencies, key=lambda item: item[1], reverse=True)[:MCV_LIMIT]
+            ]
+            col_stats.min_value = frequencies[0][0]
+            col_stats.max_value = frequencies[-1][0]
+            return
+
+        # equi-height: [lower, upper, cumulative_frequency, distinct_values]
+        bounds = [_decode_mysql_histogram_value(buckets[0][0])]
+        counts = {}
+        distinct = 0
+        for i, (_, upper, cumulative, bucket_distinct) in enumerate(buckets):
+            bounds.append(_decode_mysql_histogram_value(upper))
+            counts[i] = int(round((cumulative - previous) * row_count))
+            distinct += int(bucket_distinct)
+            previous = cumulative
+        col_stats.histogram_bounds = bounds
+        col_stats.histogram = counts
+        col_stats.distinct_count = max(col_stats.distinct_count, distinct)
+        col_stats.min_value = bounds[0]
+        col_stats.max_value = bounds[-1]
+
+    # ------------------------------------------------------------------
+    # Scheduled refresh
+    # ------------------------------------------------------------------
+
+    def start_refresh(self, interval: float = 300.0, tables: Optional[Iterable[str]] = None,
+                      analyze: bool = False) -> None:
+        """Re-import catalog statistics every `interval` seconds in the background"""
+        if self._running:
+            return
+        self._running = True
+        self._stop_event.clear()
+        table_list = list(tables) if tables is not None else None
+
+        def refresh_loop():
+            while self._running:
+                try:
+                    self.import_statistics(table_list, analyze=analyze)
+                except Exception as e:
+                    logger.error(f"Catalog statistics refresh error: {e}")
+                if self._stop_event.wait(interval):
+                    break
+
+        self._refresh_thread = threading.Thread(target=refresh_loop, daemon=True)
+        self._refresh_thread.start()
+
+    def stop_refresh(self) -> None:
+        """Stop the background refresh"""
+        self._running = False
+        self._stop_event.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=2.0)
+            self._refresh_thread = None
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+SAIQL Database Connection Pool
+==============================
+
+Driver-agnostic connection pool shared by the MySQL and PostgreSQL adapters.
+
+Features:
+- Validation by idle age: a connection is validated (pinged) at checkout
+  only if it has sat idle longer than validation_idle_time, so hot
+  connections are handed out without a network round trip
+- Max lifetime: connections are retired once older than max_lifetime
+  (jittered so a pool opened at once does not expire at once)
+- Background reaper: closes idle connections beyond min_size after
+  idle_timeout, retires expired ones and pre-warms back up to min_size
+- Metrics: checkout-wait histogram, saturation gauges (in use / max,
+  waiting threads) and lifecycle counters
+
+Idle connections are kept as a stack, so the most recently used one is
+handed out first and the rest age out under light load.
+
+Author: Apollo & Claude
+Version: 1.0.0
+"""
+
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolConfig:
+    """Pool sizing and connection lifecycle settings (seconds)"""
+    min_size: int = 2
+    max_size: int = 20
+    checkout_timeout: float = 30.0
+    validation_idle_time: float = 30.0  # validate only connections idle longer than this
+    max_lifetime: float = 1800.0        # retire connections older than this (0 = never)
+    idle_timeout: float = 600.0         # close idle connections above min_size after this (0 = never)
+    reaper_interval: float = 30.0       # reaper/pre-warmer period (0 = no background thread)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+
+    BUCKETS_MS: Tuple[float, ...] = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, bounds: Tuple[float, ...] = BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000.0
+        with self._lock:
+            self.counts[bisect_left(self.bounds, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (max observed for +Inf)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for i, n in enumerate(self.counts):
+                seen += n
+                if seen >= rank and n:
+                    return self.bounds[i] if i < len(self.bounds) else self.max_ms
+            return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {f"le_{bound:g}": n for bound, n in zip(self.bounds, self.counts)}
+            buckets["le_inf"] = self.counts[-1]
+            count, total, maximum = self.count, self.total_ms, self.max_ms
+        return {
+            'count': count,
+            'sum_ms': total,
+            'avg_ms': total / count if count else 0.0,
+            'max_ms': maximum,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': buckets,
+        }
+
+
+class _PooledConnection:
+    """A pooled connection and its lifecycle timestamps"""
+
+    __slots__ = ('connection', 'created_at', 'last_used', 'expires_at')
+
+    def __init__(self, connection: Any, now: float, max_lifetime: float):
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+        # Up to 10% early so connections opened together do not all retire together
+        self.expires_at = now + max_lifetime * (1.0 - 0.1 * random.random()) if max_lifetime > 0 else None
+
+    def expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool over a connect() callable
+
+    Driver specifics come in as hooks:
+        validate(conn) -> bool: liveness check for connections idle too long
+        reset(conn): restore a returned connection (e.g. roll back an open transaction)
+        is_usable(conn) -> bool: cheap client-side check on return (e.g. not closed)
+        close(conn): close a connection (default: conn.close())
+    """
+
+    def __init__(self, connect: Callable[[], Any], config: Optional[PoolConfig] = None, *,
+                 validate: Optional[Callable[[Any], bool]] = None,
+                 reset: Optional[Callable[[Any], None]] = None,
+                 is_usable: Optional[Callable[[Any], bool]] = None,
+                 close: Optional[Callable[[Any], None]] = None,
+                 name: str = "pool",
+                 clock: Callable[[], float] = time.monotonic):
+        self.config = config or PoolConfig()
+        self.name = name
+        self._connect = connect
+        self._validate = validate
+        self._reset = reset
+        self._is_usable = is_usable
+        self._close = close or (lambda conn: conn.close())
+        self._clock = clock
+
+        self._idle: List[_PooledConnection] = []  # stack: most recently returned last
+        self._in_use: Dict[int, _PooledConnection] = {}  # includes those being validated or reset
+        self._opening = 0   # slots reserved for connections being opened
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.wait_histogram = LatencyHistogram()
+        self.stats = {
+            'created': 0,
+            'closed': 0,
+            'create_failures': 0,
+            'checkouts': 0,
+            'checkout_timeouts': 0,
+            'validations': 0,
+            'validation_failures': 0,
+            'retired_lifetime': 0,
+            'reaped_idle': 0,
+            'discarded': 0,
+        }
+
+        self.prewarm()
+
+        self._stop = threading.Event()
+        self._reaper = None
+        if self.config.reaper_interval > 0:
+            self._reaper = threading.Thread(target=self._reaper_loop, name=f"{name}-reaper", daemon=True)
+            self._reaper.start()
+
+    # ----- checkout / return -----
+
+    def get_connection(self, timeout: Optional[float] = None):
+        """Check out a connection, waiting up to timeout seconds for one to free up"""
+        timeout = self.config.checkout_timeout if timeout is None else timeout
+        start = self._clock()
+        deadline = start + timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError(f"Connection pool '{self.name}' is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        # Counted as in use while validated, so its slot is not handed out again
+                        self._in_use[id(entry.connection)] = entry
+                        break
+                    if self._size() < self.config.max_size:
+                        self._opening += 1
+                        break
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        self.stats['checkout_timeouts'] += 1
+                        raise RuntimeError(
+                            f"No connections available and max pool size reached "
+                            f"({self.config.max_size} in use, waited {timeout:.1f}s)")
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            opened = entry is None
+            if opened:
+                entry = self._open_reserved()
+            elif not self._check_idle(entry):
+                continue
+
+            with self._cond:
+                if opened:
+                    self._opening -= 1
+                    self._in_use[id(entry.connection)] = entry
+                self.stats['checkouts'] += 1
+            self.wait_histogram.observe(self._clock() - start)
+            return entry.connection
+
+    def return_connection(self, conn, discard: bool = False):
+        """Return a checked-out connection; discard=True closes it instead"""
+        # The connection stays in _in_use, and so counts toward max_size,
+        # until it is back on the idle stack or closed
+        with self._cond:
+            entry = self._in_use.get(id(conn))
+        if entry is None:
+            logger.warning(f"Connection returned to pool '{self.name}' that it did not hand out; closing it")
+            self._close_quietly(conn)
+            return
+
+        now = self._clock()
+        if discard or self._closed or not self._usable(conn):
+            self._discard(entry, 'discarded')
+            return
+        if entry.expired(now):
+            self._discard(entry, 'retired_lifetime')
+            return
+        if self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception as e:
+                logger.warning(f"Resetting pooled connection failed, discarding it: {e}")
+                self._discard(entry, 'discarded')
+                return
+
+        entry.last_used = now
+        with self._cond:
+            if not self._closed:
+                del self._in_use[id(conn)]
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+        self._discard(entry, 'discarded')
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager form of get_connection/return_connection"""
+        conn = self.get_connection(timeout)
+        try:
+            yield conn
+        finally:
+            self.return_connection(conn)
+
+    # ----- maintenance -----
+
+    def reap(self) -> int:
+        """
+        Close expired connections and idle ones above min_size past idle_timeout,
+        then pre-warm back to min_size
+
+        Returns:
+            Number of connections closed
+        """
+        now = self._clock()
+        victims = []
+        with self._cond:
+            size = self._size()
+            keep = []
+            # Oldest-returned first, so the stack keeps the warmest connections
+            for entry in self._idle:
+                if entry.expired(now):
+                    victims.append((entry, 'retired_lifetime'))
+                    size -= 1
+                elif (self.config.idle_timeout > 0 and size > self.config.min_size and
+                      now - entry.last_used >= self.config.idle_timeout):
+                    victims.append((entry, 'reaped_idle'))
+                    size -= 1
+                else:
+                    keep.append(entry)
+            self._idle = keep
+
+        for entry, reason in victims:
+            self._discard(entry, reason)
+        if victims:
+            logger.debug(f"Pool '{self.name}' reaped {len(victims)} connections")
+        self.prewarm()
+        return len(victims)
+
+    def prewarm(self) -> int:
+        """Open connections until the pool holds min_size; returns how many were opened"""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size() >= self.config.min_size:
+                    return opened
+                self._opening += 1
+            try:
+                entry = self._open_reserved()
+            except Exception:
+                return opened  # already logged; the next reap retries
+            with self._cond:
+                self._opening -= 1
+                if self._closed:
+                    self._close_quietly(entry.connection)
+                    self.stats['closed'] += 1
+                    return opened
+                self._idle.insert(0, entry)
+                self._cond.notify()
+            opened += 1
+
+    def _reaper_loop(self):
+        while not self._stop.wait(self.config.reaper_interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.warning(f"Pool '{self.name}' reaper failed: {e}")
+
+    def close_all(self):
+        """Close idle connections and stop the reaper; checked-out ones close on return"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        self._stop.set()
+        for entry in idle:
+            self._discard(entry, 'discarded')
+        if self._reaper is not None and self._reaper is not threading.current_thread():
+            self._reaper.join(timeout=5)
+
+    # ----- metrics -----
+
+    def metrics(self) -> Dict[str, Any]:
+        """Saturation gauges, lifecycle counters and the checkout-wait histogram"""
+        with self._cond:
+            in_use = len(self._in_use)
+            gauges = {
+                'size': self._size(),
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'opening': self._opening,
+                'waiting': self._waiting,
+                'max_size': self.config.max_size,
+                'saturation': in_use / self.config.max_size if self.config.max_size else 0.0,
+            }
+            gauges.update(self.stats)
+        gauges['checkout_wait'] = self.wait_histogram.snapshot()
+        return gauges
+
+    # ----- internals -----
+
+    def _size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _open_reserved(self) -> _PooledConnection:
+        """Open a connection into a slot already reserved via _opening (released on failure)"""
+        try:
+            conn = self._connect()
+        except Exception as e:
+            with self._cond:
+                self._opening -= 1
+                self.stats['create_failures'] += 1
+                self._cond.notify()
+            logger.error(f"Failed to open connection for pool '{self.name}': {e}")
+            raise
+        with self._cond:
+            self.stats['created'] += 1
+        # The slot stays reserved until the caller places the connection
+        return _PooledConnection(conn, self._clock(), self.config.max_lifetime)
+
+    def _check_idle(self, entry: _PooledConnection) -> bool:
+        """Retire or validate a connection taken off the idle stack; False if it was discarded"""
+        now = self._clock()
+        if entry.expired(now):
+            self._discard(entry, 'retired_lifetime')
+            return False
+        if self._validate is None or now - entry.last_used <= self.config.validation_idle_time:
+            return True
+        with self._cond:
+            self.stats['validations'] += 1
+        try:
+            ok = self._validate(entry.connection)
+        except Exception as e:
+            logger.debug(f"Pool '{self.name}' validation failed: {e}")
+            ok = False
+        if not ok:
+            with self._cond:
+                self.stats['validation_failures'] += 1
+            self._discard(entry, 'discarded')
+        return ok
+
+    def _usable(self, conn) -> bool:
+        if self._is_usable is None:
+            return True
+        try:
+            return bool(self._is_usable(conn))
+        except Exception:
+            return False
+
+    def _discard(self, entry: _PooledConnection, reason: str):
+        """Close a connection and free its slot once it is closed"""
+        self._close_quietly(entry.connection)
+        with self._cond:
+            if self._in_use.get(id(entry.connection)) is entry:
+                del self._in_use[id(entry.connection)]
+            self.stats[reason] += 1
+            self.stats['closed'] += 1
+            self._cond.notify()
+
+    def _close_quietly(self, conn):
+        try:
+            self._close(conn)
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+
+__all__ = ['PoolConfig', 'LatencyHistogram', 'ConnectionPool']
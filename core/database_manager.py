@@ -17,8 +17,13 @@ Status: Production-Ready for SAIQL-Bravo
 Usage:
     manager = DatabaseManager()
     result = manager.execute("SELECT * FROM users", backend="postgresql")
+
+    # From asyncio code (native asyncpg/aiomysql when installed, else worker threads)
+    result = await manager.execute_query_async("SELECT * FROM users", backend="postgresql")
 """
 
+import asyncio
+import itertools
 import json
 import logging
 import os
@@ -27,8 +32,10 @@ from typing import Dict, List, Any, Optional, Union, Type
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 # Configure logging
@@ -307,7 +314,11 @@ class PostgreSQLAdapterWrapper(DatabaseAdapter):
                 idle_in_transaction_timeout=config.get('idle_in_transaction_timeout', 60),
                 max_retries=config.get('max_retries', 3),
                 retry_delay=config.get('retry_delay', 1.0),
-                application_name=config.get('application_name', 'SAIQL-Bravo')
+                application_name=config.get('application_name', 'SAIQL-Bravo'),
+                pool_validation_idle_time=config.get('pool_validation_idle_time', 30.0),
+                pool_max_lifetime=config.get('pool_max_lifetime', 1800.0),
+                pool_idle_timeout=config.get('pool_idle_timeout', 600.0),
+                pool_reaper_interval=config.get('pool_reaper_interval', 30.0)
             )
             
             self.adapter = PostgreSQLAdapter(pg_config)
@@ -390,7 +401,12 @@ class MySQLAdapterWrapper(DatabaseAdapter):
                 retry_delay=config.get('retry_delay', 1.0),
                 charset=config.get('charset', 'utf8mb4'),
                 sql_mode=config.get('sql_mode', 'STRICT_TRANS_TABLES,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'),
-                autocommit=config.get('autocommit', False)
+                autocommit=config.get('autocommit', False),
+                local_infile=config.get('local_infile', False),
+                pool_validation_idle_time=config.get('pool_validation_idle_time', 30.0),
+                pool_max_lifetime=config.get('pool_max_lifetime', 1800.0),
+                pool_idle_timeout=config.get('pool_idle_timeout', 600.0),
+                pool_reaper_interval=config.get('pool_reaper_interval', 30.0)
             )
             
             self.adapter = MySQLAdapter(mysql_config)
@@ -779,6 +795,223 @@ class BigQueryAdapterWrapper(DatabaseAdapter):
         """Get BigQuery adapter statistics"""
         return self.adapter.get_statistics()
 
+# ===== Async adapters =====
+
+_PARAM_RE = re.compile(r'%(%|s)')
+_ROW_RETURNING_RE = re.compile(r'^\s*(SELECT|WITH|VALUES|SHOW|EXPLAIN|TABLE)\b|\bRETURNING\b', re.IGNORECASE)
+
+
+def _numbered_placeholders(sql: str) -> str:
+    """Rewrite DB-API %s placeholders (psycopg2 style, %% escapes) as asyncpg $1, $2, ..."""
+    counter = itertools.count(1)
+    return _PARAM_RE.sub(lambda m: '%' if m.group(1) == '%' else f"${next(counter)}", sql)
+
+
+def _status_rowcount(status: str) -> int:
+    """Row count from a PostgreSQL command tag such as 'INSERT 0 3' or 'UPDATE 2'"""
+    tail = status.rsplit(' ', 1)[-1] if status else ''
+    return int(tail) if tail.isdigit() else 0
+
+
+class AsyncDatabaseAdapter:
+    """Base class for async database adapters"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.backend_type = config.get('type', 'unknown')
+        self.stats = {
+            'queries_executed': 0,
+            'failed_queries': 0,
+            'total_execution_time': 0.0
+        }
+
+    async def execute_query(self, sql: str, params: Optional[tuple] = None) -> DatabaseResult:
+        """Execute a query - to be implemented by subclasses"""
+        raise NotImplementedError("Subclasses must implement execute_query")
+
+    async def close(self):
+        """Close connections - to be implemented by subclasses"""
+        pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get adapter statistics"""
+        return dict(self.stats, mode='native')
+
+    def _result(self, sql: str, start_time: float, data: Optional[List[Dict[str, Any]]] = None,
+                rows_affected: int = 0, error: Optional[Exception] = None) -> DatabaseResult:
+        execution_time = time.time() - start_time
+        self.stats['queries_executed'] += 1
+        self.stats['total_execution_time'] += execution_time
+        if error is not None:
+            self.stats['failed_queries'] += 1
+            logger.error(f"{self.backend_type} async query failed: {error}")
+        return DatabaseResult(
+            success=error is None,
+            data=data or [],
+            rows_affected=rows_affected,
+            execution_time=execution_time,
+            backend=self.backend_type,
+            sql_executed=sql,
+            error_message=str(error) if error is not None else None
+        )
+
+
+class AsyncPostgreSQLAdapter(AsyncDatabaseAdapter):
+    """PostgreSQL over asyncpg (raises ImportError if asyncpg is not installed)"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        import asyncpg
+        self._driver = asyncpg
+        self._pool = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+
+    async def _get_pool(self):
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    config = self.config
+                    self._pool = await self._driver.create_pool(
+                        host=config.get('host', 'localhost'),
+                        port=config.get('port', 5432),
+                        database=config.get('database', 'saiql'),
+                        user=config.get('user', 'postgres'),
+                        password=config.get('password', ''),
+                        min_size=config.get('min_connections', 2),
+                        max_size=config.get('max_connections', 20),
+                        timeout=config.get('connect_timeout', 10),
+                        command_timeout=config.get('statement_timeout', 300),
+                        max_inactive_connection_lifetime=config.get('pool_idle_timeout', 600.0),
+                        server_settings={
+                            'application_name': config.get('application_name', 'SAIQL-Bravo'),
+                            'idle_in_transaction_session_timeout':
+                                str(config.get('idle_in_transaction_timeout', 60) * 1000)
+                        }
+                    )
+        return self._pool
+
+    async def execute_query(self, sql: str, params: Optional[tuple] = None) -> DatabaseResult:
+        """Execute PostgreSQL query"""
+        start_time = time.time()
+        try:
+            pool = await self._get_pool()
+            # psycopg2 only interprets placeholders when parameters are passed; so do we
+            query = _numbered_placeholders(sql) if params else sql
+            async with pool.acquire() as conn:
+                if _ROW_RETURNING_RE.search(query):
+                    data = [dict(record) for record in await conn.fetch(query, *(params or ()))]
+                    return self._result(sql, start_time, data, len(data))
+                status = await conn.execute(query, *(params or ()))
+                return self._result(sql, start_time, rows_affected=_status_rowcount(status))
+        except Exception as e:
+            return self._result(sql, start_time, error=e)
+
+    async def close(self):
+        """Close the asyncpg pool"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+class AsyncMySQLAdapter(AsyncDatabaseAdapter):
+    """MySQL/MariaDB over aiomysql (raises ImportError if aiomysql is not installed)"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        import aiomysql
+        self._driver = aiomysql
+        self._pool = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+
+    async def _get_pool(self):
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    config = self.config
+                    self._pool = await self._driver.create_pool(
+                        host=config.get('host', 'localhost'),
+                        port=config.get('port', 3306),
+                        db=config.get('database', 'saiql'),
+                        user=config.get('user', 'root'),
+                        password=config.get('password', ''),
+                        minsize=config.get('min_connections', 2),
+                        maxsize=config.get('max_connections', 20),
+                        connect_timeout=config.get('connect_timeout', 10),
+                        charset=config.get('charset', 'utf8mb4'),
+                        sql_mode=config.get('sql_mode', 'STRICT_TRANS_TABLES,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'),
+                        init_command="SET time_zone = '+00:00'",
+                        autocommit=config.get('autocommit', False),
+                        pool_recycle=config.get('pool_max_lifetime', 1800.0),
+                        cursorclass=self._driver.DictCursor
+                    )
+        return self._pool
+
+    async def execute_query(self, sql: str, params: Optional[tuple] = None) -> DatabaseResult:
+        """Execute MySQL query"""
+        start_time = time.time()
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                try:
+                    async with conn.cursor() as cursor:
+                        await cursor.execute(sql, params)
+                        if cursor.description:
+                            data = [dict(row) for row in await cursor.fetchall()]
+                            rows_affected = len(data)
+                        else:
+                            data, rows_affected = [], cursor.rowcount
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    raise
+            return self._result(sql, start_time, data, rows_affected)
+        except Exception as e:
+            return self._result(sql, start_time, error=e)
+
+    async def close(self):
+        """Close the aiomysql pool"""
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+
+class ThreadedAsyncAdapter(AsyncDatabaseAdapter):
+    """
+    Async front for a blocking DatabaseAdapter
+
+    Calls run on the adapter's own bounded worker threads, so a slow
+    backend cannot exhaust the event loop's default executor. Used for
+    SQLite, and for PostgreSQL/MySQL when no native async driver is installed.
+    """
+
+    def __init__(self, adapter: DatabaseAdapter, max_workers: int = 4):
+        super().__init__(adapter.config)
+        self.adapter = adapter
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix=f"saiql-{self.backend_type}")
+
+    async def execute_query(self, sql: str, params: Optional[tuple] = None) -> DatabaseResult:
+        """Execute query on a worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.adapter.execute_query, sql, params)
+
+    async def close(self):
+        """Stop the worker threads (the wrapped adapter is closed by DatabaseManager)"""
+        self.shutdown()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {'mode': 'threaded', 'max_workers': self.max_workers}
+
+
 class DatabaseManager:
     """
     Multi-backend database manager for SAIQL
@@ -799,6 +1032,7 @@ class DatabaseManager:
             self.config = self._load_config(config_path)
         self.firewall = firewall
         self.adapters = {}
+        self.async_adapters: Dict[str, AsyncDatabaseAdapter] = {}
         self.default_backend = self.config.get('default_backend', 'sqlite')
         self._lock = threading.RLock()
         
@@ -927,6 +1161,57 @@ class DatabaseManager:
         """Alias for execute_query() - provided for convenience."""
         return self.execute_query(sql, params, backend)
 
+    def get_async_adapter(self, backend: Optional[str] = None) -> AsyncDatabaseAdapter:
+        """
+        Get the async adapter for a backend
+
+        PostgreSQL and MySQL use asyncpg / aiomysql when installed (set
+        'async_driver': false in the backend config to opt out); everything
+        else runs the blocking adapter on 'async_workers' worker threads.
+        """
+        backend_name = backend or self.default_backend
+
+        with self._lock:
+            adapter = self.async_adapters.get(backend_name)
+            if adapter is None:
+                adapter = self.async_adapters[backend_name] = self._create_async_adapter(backend_name)
+        return adapter
+
+    def _create_async_adapter(self, backend_name: str) -> AsyncDatabaseAdapter:
+        backend_config = self.config.get('backends', {}).get(backend_name)
+        if not backend_config:
+            raise ValueError(f"No configuration found for backend: {backend_name}")
+
+        backend_type = backend_config.get('type')
+        native = {'postgresql': AsyncPostgreSQLAdapter, 'mysql': AsyncMySQLAdapter}.get(backend_type)
+        if native and backend_config.get('async_driver', True):
+            try:
+                adapter = native(backend_config)
+                logger.info(f"Initialized async backend: {backend_name} ({backend_type}, native driver)")
+                return adapter
+            except ImportError as e:
+                logger.info(f"No native async driver for {backend_name} ({e}); using worker threads")
+
+        self._initialize_backend(backend_name)
+        workers = backend_config.get('async_workers', 4)
+        logger.info(f"Initialized async backend: {backend_name} ({backend_type}, {workers} worker threads)")
+        return ThreadedAsyncAdapter(self.adapters[backend_name], max_workers=workers)
+
+    async def execute_query_async(self, sql: str, params: Optional[tuple] = None,
+                                  backend: Optional[str] = None) -> DatabaseResult:
+        """
+        Execute SQL query on specified backend without blocking the event loop
+
+        Args:
+            sql: SQL query string
+            params: Query parameters (optional)
+            backend: Backend name (uses default if not specified)
+
+        Returns:
+            DatabaseResult with execution details
+        """
+        return await self.get_async_adapter(backend).execute_query(sql, params)
+
     def execute_transaction(self, operations: List[Dict[str, Any]], 
                            backend: Optional[str] = None) -> DatabaseResult:
         """
@@ -948,6 +1233,26 @@ class DatabaseManager:
         adapter = self.adapters[backend_name]
         return adapter.execute_transaction(operations)
     
+    def import_catalog_statistics(self, backend: Optional[str] = None,
+                                  tables: Optional[List[str]] = None,
+                                  analyze: bool = False) -> Dict[str, Any]:
+        """
+        Import optimizer statistics from the backend's own catalog
+        (sqlite_stat1/4, pg_stats, information_schema) without scanning data
+
+        Returns:
+            Mapping of table name -> TableStatistics
+        """
+        from core.catalog_statistics import CatalogStatisticsImporter
+
+        backend_name = backend or self.default_backend
+        if backend_name not in self.adapters:
+            self._initialize_backend(backend_name)
+
+        backend_type = self.config['backends'][backend_name]['type']
+        importer = CatalogStatisticsImporter(self.adapters[backend_name], backend=backend_type)
+        return importer.import_statistics(tables, analyze=analyze)
+
     def get_available_backends(self) -> List[str]:
         """Get list of configured backends"""
         return list(self.config.get('backends', {}).keys())
@@ -994,6 +1299,10 @@ class DatabaseManager:
         for backend_name, adapter in self.adapters.items():
             stats['backend_stats'][backend_name] = adapter.get_statistics()
         
+        stats['async_backend_stats'] = {
+            backend_name: adapter.get_statistics() for backend_name, adapter in self.async_adapters.items()
+        }
+        
         return stats
     
     def close_all(self):
@@ -1009,6 +1318,21 @@ class DatabaseManager:
                     logger.error(f"Error closing backend {backend_name}: {e}")
             
             self.adapters.clear()
+            
+            # Native async pools need close_all_async(); worker threads can stop here
+            for adapter in self.async_adapters.values():
+                if isinstance(adapter, ThreadedAsyncAdapter):
+                    adapter.shutdown()
+            self.async_adapters.clear()
+    
+    async def close_all_async(self):
+        """Close async driver pools, then all other connections"""
+        for backend_name, adapter in list(self.async_adapters.items()):
+            try:
+                await adapter.close()
+            except Exception as e:
+                logger.error(f"Error closing async backend {backend_name}: {e}")
+        self.close_all()
 
 # Example usage and testing
 if __name__ == "__main__":
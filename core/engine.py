@@ -14,6 +14,10 @@ The engine handles:
 - Error recovery and detailed reporting
 - Configuration management
 - Connection pooling and resource management
+- EXPLAIN / EXPLAIN ANALYZE plans for any query (see explain); EXPLAIN
+  ANALYZE is what trains the planner's persisted cardinality feedback
+- Approximate aggregates over samples with confidence intervals
+  (ExecutionMode.APPROXIMATE, see core.approximate_query)
 
 Author: Apollo & Claude
 Version: 1.0.0
@@ -34,6 +38,7 @@ from contextlib import contextmanager
 from pathlib import Path
 import json
 import hashlib
+import re
 from collections import defaultdict, OrderedDict
 
 # Optional SymbolicEngine import
@@ -46,6 +51,9 @@ except ImportError:
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# "EXPLAIN <query>" / "EXPLAIN ANALYZE <query>"
+_EXPLAIN_RE = re.compile(r'^\s*EXPLAIN(\s+ANALYZE)?\s+', re.IGNORECASE)
+
 class ExecutionMode(Enum):
     """Execution modes for different use cases"""
     SYNC = "synchronous"           # Standard synchronous execution
@@ -53,6 +61,7 @@ class ExecutionMode(Enum):
     BATCH = "batch"                # Batch processing of multiple queries
     STREAMING = "streaming"        # Streaming results for large datasets
     CACHED = "cached"              # Cached execution with result reuse
+    APPROXIMATE = "approximate"    # Sampled aggregates with confidence intervals
 
 class SessionState(Enum):
     """Session states"""
@@ -73,6 +82,7 @@ class ExecutionContext:
     max_memory_mb: int = 1024
     debug: bool = False
     metadata: Dict[str, Any] = field(default_factory=dict)
+    approximation: Optional['ApproximationSettings'] = None  # APPROXIMATE mode settings (defaults if None)
 
 @dataclass
 class QueryResult:
@@ -330,6 +340,32 @@ class SAIQLEngine:
         self.session_manager = SessionManager()
         self.query_cache = QueryCache(max_size=self.config.get('cache_size', 1000))
         self.performance_tracker = PerformanceTracker()
+
+        # Workload-driven index advisor
+        from .index_advisor import IndexAdvisor
+        advisor_config = self.config.get('index_advisor', {})
+        self.index_advisor = None
+        if advisor_config.get('enabled', True):
+            self.index_advisor = IndexAdvisor(
+                window_size=advisor_config.get('window_size', 1000),
+                max_write_amplification=advisor_config.get('max_write_amplification', 4.0),
+                auto_apply=advisor_config.get('auto_apply', False)
+            )
+        self._advisor_queries_since_apply = 0
+
+        # Actual-vs-estimated row counts learned from EXPLAIN ANALYZE (the only
+        # producer: plain execution has no per-node actuals), kept next to the database
+        from .cardinality_feedback import CardinalityFeedback
+        feedback_config = self.config.get('cardinality_feedback', {})
+        self.cardinality_feedback = None
+        if feedback_config.get('enabled', True):
+            storage_path = feedback_config.get('storage_path') or Path(self.config['database']['path']).parent
+            self.cardinality_feedback = CardinalityFeedback(storage_path=str(storage_path))
+
+        # Sample tables and sampled execution for ExecutionMode.APPROXIMATE
+        from .approximate_query import ApproximateQueryExecutor, SampleManager
+        self.sample_manager = SampleManager()
+        self.approximate_executor = ApproximateQueryExecutor(self.sample_manager)
         
         # Engine statistics
         self.stats = {
@@ -380,6 +416,17 @@ class SAIQLEngine:
                 'cache_size': 1000,
                 'session_cleanup_interval': 3600,
                 'performance_tracking': True,
+                'index_advisor': {
+                    'enabled': True,
+                    'window_size': 1000,
+                    'auto_apply': False,
+                    'auto_apply_interval': 500,
+                    'max_write_amplification': 4.0
+                },
+                'cardinality_feedback': {
+                    'enabled': True,
+                    'storage_path': None  # defaults to the database's directory
+                },
             }
             
             # If specific config path provided, merge it (legacy support)
@@ -541,8 +588,12 @@ class SAIQLEngine:
                                               state=SessionState.ACTIVE,
                                               query_count=self.session_manager.get_session(session_id)['query_count'] + 1)
             
-            # Check cache if enabled
+            # EXPLAIN [ANALYZE] <query> returns plans instead of result rows
+            explain_match = _EXPLAIN_RE.match(query)
+
+            # Check cache if enabled (never for EXPLAIN, whose timings must be fresh)
             use_cache = enable_caching if enable_caching is not None else self.config['compilation']['enable_caching']
+            use_cache = use_cache and not explain_match
             cache_key = None
 
             if use_cache:
@@ -566,7 +617,11 @@ class SAIQLEngine:
                     return result
 
             # Execute SAIQL pipeline
-            pipeline_result = self._execute_pipeline(query, context)
+            if explain_match:
+                pipeline_result = self._explain_pipeline(query[explain_match.end():], context,
+                                                         analyze=bool(explain_match.group(1)))
+            else:
+                pipeline_result = self._execute_pipeline(query, context)
 
             # Update result with pipeline data
             result.success = pipeline_result.get('success', False)
@@ -581,6 +636,10 @@ class SAIQLEngine:
             result.complexity_score = pipeline_result.get('complexity_score', 0)
             result.target_dialect = pipeline_result.get('target_dialect', '')
             result.warnings = pipeline_result.get('warnings', [])
+            if 'explain' in pipeline_result:
+                result.metadata['explain'] = pipeline_result['explain']
+            if 'approximate' in pipeline_result:
+                result.metadata['approximate'] = pipeline_result['approximate']
 
             # Propagate pipeline errors if any
             if not result.success:
@@ -647,8 +706,97 @@ class SAIQLEngine:
                 )
         
         result.metadata['edition'] = self.edition
+        self._guard_output(result, log_extra)
+        return result
+
+    async def execute_async(self, query: str, db_manager, backend: Optional[str] = None,
+                            context: Optional[ExecutionContext] = None) -> QueryResult:
+        """
+        Execute a SAIQL query on a DatabaseManager backend without blocking the event loop.
+
+        The query passes the same firewall guards, safety policy and compiler as
+        execute(); only the compiled SQL is awaited, through the manager's async
+        adapter. EXPLAIN and APPROXIMATE mode stay with execute().
+
+        Args:
+            query: SAIQL query string
+            db_manager: DatabaseManager whose async adapter runs the compiled SQL
+            backend: Backend name (defaults to the manager's default backend)
+            context: Execution context (optional)
+
+        Returns:
+            QueryResult with execution details and data
+        """
+        start_time = time.time()
+        context = context or ExecutionContext(session_id="")
+        result = QueryResult(
+            success=False,
+            data=[],
+            execution_time=0.0,
+            query=query,
+            sql_generated="",
+            rows_affected=0,
+            session_id=context.session_id
+        )
+        log_extra = {
+            "session_id": context.session_id,
+            "query_hash": hashlib.md5(query.encode()).hexdigest()
+        }
+
+        firewall_decision = self.firewall.pre_prompt_guard(query, context={"session_id": context.session_id})
+        if firewall_decision.action == "BLOCK":
+            result.error_message = f"Firewall blocked query: {', '.join(firewall_decision.reasons)}"
+            result.error_phase = "security_guard"
+            result.metadata['firewall_decision'] = "BLOCK"
+            logger.warning(result.error_message, extra=log_extra)
+        elif _EXPLAIN_RE.match(query):
+            result.error_message = "EXPLAIN is only available through execute()"
+            result.error_phase = "explain"
+        else:
+            with self._lock:
+                self.stats['queries_executed'] += 1
+            timings: Dict[str, Any] = {}
+            try:
+                compilation_result = self._compile_query(query, context, timings)
+            except Exception as e:
+                result.error_message = str(e)
+                result.error_phase = "compilation"
+            else:
+                result.sql_generated = compilation_result.sql_code
+                result.target_dialect = compilation_result.target_dialect.value
+                result.warnings = compilation_result.warnings
+                result.lexing_time = timings.get('lexing_time', 0.0)
+                result.parsing_time = timings.get('parsing_time', 0.0)
+                result.compilation_time = timings.get('compilation_time', 0.0)
+
+                try:
+                    db_result = await db_manager.execute_query_async(compilation_result.sql_code,
+                                                                     backend=backend)
+                except Exception as db_error:
+                    db_result = None
+                    result.error_message = f"Database execution failed: {db_error}"
+                    result.error_phase = "database_execution"
+                if db_result is not None:
+                    result.database_time = db_result.execution_time
+                    result.success = db_result.success
+                    if db_result.success:
+                        result.data = db_result.data
+                        result.rows_affected = db_result.rows_affected
+                    else:
+                        result.error_message = f"Database execution failed: {db_result.error_message}"
+                        result.error_phase = "database_execution"
+
+        result.execution_time = time.time() - start_time
+        with self._lock:
+            self.stats['total_execution_time'] += result.execution_time
+            self.stats['successful_queries' if result.success else 'failed_queries'] += 1
+
+        result.metadata['edition'] = self.edition
+        self._guard_output(result, log_extra)
+        return result
 
-        # Semantic Firewall: Post-Output Guard
+    def _guard_output(self, result: QueryResult, log_extra: Dict[str, Any]) -> None:
+        """Semantic Firewall: Post-Output Guard, applied to result.data in place"""
         if result.data:
             data_str = json.dumps(result.data)
             out_decision = self.firewall.post_output_guard(data_str)
@@ -669,8 +817,6 @@ class SAIQLEngine:
                 result.data = []
                 result.metadata['firewall_decision'] = "BLOCK"
                 result.metadata['block_reasons'] = out_decision.reasons
-
-        return result
     
     def _execute_pipeline(self, query: str, context: ExecutionContext) -> Dict[str, Any]:
         """Execute the full SAIQL pipeline"""
@@ -680,33 +826,8 @@ class SAIQLEngine:
         pipeline_result = {}
         
         try:
-            # Phase 1: Lexical Analysis
-            with measure_time("lexing", log_result=context.debug) as timing:
-                # Validate and sanitize query
-                is_valid, error_msg = validate_saiql_query(query)
-                if not is_valid:
-                    raise ValueError(f"Invalid query: {error_msg}")
-                
-                sanitized_query = sanitize_query(query)
-                tokens = self.lexer.tokenize(sanitized_query)
-            
-            pipeline_result['lexing_time'] = timing['execution_time']
-            
-            # Phase 2: Parsing
-            with measure_time("parsing", log_result=context.debug) as timing:
-                ast = self.parser.parse(tokens)
-            
-            pipeline_result['parsing_time'] = timing['execution_time']
-            
-            # Phase 2.5: Safety Check
-            with measure_time("safety_check", log_result=context.debug) as timing:
-                self.safety_policy.validate_query(ast)
-            
-            # Phase 3: Compilation
-            with measure_time("compilation", log_result=context.debug) as timing:
-                compilation_result = self.compiler.compile(ast, debug=context.debug)
-            
-            pipeline_result['compilation_time'] = timing['execution_time']
+            # Phases 1-3: Lexing, parsing, safety check, compilation
+            compilation_result = self._compile_query(query, context, pipeline_result)
             pipeline_result['sql_generated'] = compilation_result.sql_code
             pipeline_result['success'] = True  # Compilation succeeded - core SAIQL validated
             pipeline_result['optimizations_applied'] = compilation_result.optimization_report.get('optimizations_applied', [])
@@ -719,27 +840,34 @@ class SAIQLEngine:
                 try:
                     # Get database manager
                     # Get database manager
-                    from .database_manager import DatabaseManager
-                    
-                    # Construct config for DatabaseManager to ensure it uses the engine's db path
-                    db_config = {
-                        "default_backend": "sqlite",
-                        "backends": {
-                            "sqlite": {
-                                "type": "sqlite",
-                                "path": self.config['database']['path'],
-                                "timeout": self.config['database'].get('timeout', 30)
-                            }
-                        }
-                    }
-                    db_manager = DatabaseManager(config=db_config, firewall=self.firewall)
+                    db_manager = self._create_db_manager()
 
                     try:
-                        # Execute compiled SQL against configured backend
-                        db_result = db_manager.execute_query(compilation_result.sql_code)
+                        approximate = None
+                        if context.execution_mode == ExecutionMode.APPROXIMATE:
+                            from .approximate_query import ApproximationSettings
+                            approximate = self.approximate_executor.execute(
+                                db_manager, compilation_result.sql_code,
+                                context.approximation or ApproximationSettings())
+                            if approximate is None:
+                                pipeline_result['approximate'] = {
+                                    'applied': False, 'reason': self.approximate_executor.last_skip_reason}
+
+                        if approximate is not None:
+                            pipeline_result["data"], pipeline_result['approximate'] = approximate
+                            pipeline_result["rows_affected"] = len(pipeline_result["data"])
+                            db_result = None
+                        else:
+                            # Execute compiled SQL against configured backend
+                            db_result = db_manager.execute_query(compilation_result.sql_code)
 
-                        pipeline_result["data"] = db_result.data
-                        pipeline_result["rows_affected"] = db_result.rows_affected
+                            pipeline_result["data"] = db_result.data
+                            pipeline_result["rows_affected"] = db_result.rows_affected
+
+                        if self.index_advisor and db_result and db_result.success:
+                            self.index_advisor.record_query(compilation_result.sql_code,
+                                                            db_result.execution_time)
+                            self._maybe_auto_apply_indexes(db_manager)
                     finally:
                         # Always close to prevent connection leaks
                         db_manager.close_all()
@@ -775,6 +903,295 @@ class SAIQLEngine:
         
         return pipeline_result
     
+    def _compile_query(self, query: str, context: ExecutionContext,
+                       timings: Dict[str, Any]):
+        """Lex, parse, safety-check and compile a query, recording phase times in timings"""
+        # Phase 1: Lexical Analysis
+        with measure_time("lexing", log_result=context.debug) as timing:
+            # Validate and sanitize query
+            is_valid, error_msg = validate_saiql_query(query)
+            if not is_valid:
+                raise ValueError(f"Invalid query: {error_msg}")
+            
+            sanitized_query = sanitize_query(query)
+            tokens = self.lexer.tokenize(sanitized_query)
+        
+        timings['lexing_time'] = timing['execution_time']
+        
+        # Phase 2: Parsing
+        with measure_time("parsing", log_result=context.debug) as timing:
+            ast = self.parser.parse(tokens)
+        
+        timings['parsing_time'] = timing['execution_time']
+        
+        # Phase 2.5: Safety Check
+        with measure_time("safety_check", log_result=context.debug) as timing:
+            self.safety_policy.validate_query(ast)
+        
+        # Phase 3: Compilation
+        with measure_time("compilation", log_result=context.debug) as timing:
+            compilation_result = self.compiler.compile(ast, debug=context.debug)
+        
+        timings['compilation_time'] = timing['execution_time']
+        return compilation_result
+
+    def explain(self, query: str, analyze: bool = False,
+                context: Optional[ExecutionContext] = None):
+        """
+        Show the logical, physical and backend plans of a SAIQL query.
+
+        Args:
+            query: SAIQL query string (without the EXPLAIN keyword)
+            analyze: Also execute the query once and annotate each physical
+                plan node with actual rows and time (EXPLAIN ANALYZE);
+                refused for data-modifying statements
+            context: Execution context (optional)
+
+        Returns:
+            ExplainResult
+
+        Raises:
+            LexError, ParseError, CompilerError for invalid queries and
+            errors.RuntimeError if ANALYZE execution fails or would modify data
+        """
+        from .explain import (ExplainResult, PlanAnalyzer, backend_explain_sql, is_data_modifying,
+                              load_catalog_statistics, logical_plan_from_ast, planner_query_from_ast,
+                              postgresql_analyzed_plan)
+        from .execution_planner import QueryOptimizer
+        from .catalog_statistics import detect_backend
+        from .errors import RuntimeError as SAIQLRuntimeError
+
+        context = context or ExecutionContext(session_id="")
+        timings: Dict[str, Any] = {}
+        compilation_result = self._compile_query(query, context, timings)
+        phase_times = {phase[:-len('_time')]: seconds for phase, seconds in timings.items()}
+        sql = compilation_result.sql_code
+        ast = compilation_result.optimized_ast
+        if analyze and is_data_modifying(sql):
+            raise SAIQLRuntimeError("EXPLAIN ANALYZE executes the statement and will not run a "
+                                    "data-modifying one; use EXPLAIN", {'sql': sql})
+
+        db_manager = self._create_db_manager()
+        try:
+            backend = detect_backend(db_manager)
+            explained = ExplainResult(
+                query=query,
+                sql=sql,
+                backend=backend,
+                analyze=analyze,
+                logical_plan=logical_plan_from_ast(ast),
+                warnings=list(compilation_result.warnings)
+            )
+
+            # Physical plan from the cost-based optimizer, costed with catalog statistics
+            start = time.perf_counter()
+            plan = None
+            planner_query = planner_query_from_ast(ast)
+            if planner_query:
+                tables = [planner_query['table']] + [join['table'] for join in planner_query.get('joins', [])]
+                optimizer = QueryOptimizer(feedback=self.cardinality_feedback)
+                optimizer.load_statistics(load_catalog_statistics(db_manager, tables))
+                plan, explained.optimization_report = optimizer.optimize_query(planner_query)
+            phase_times['planning'] = time.perf_counter() - start
+
+            # Backend's own plan; on PostgreSQL with ANALYZE this is the one execution
+            analyzed = None
+            explain_sql = backend_explain_sql(sql, backend, analyze=analyze)
+            if explain_sql:
+                backend_result = db_manager.execute_query(explain_sql)
+                if backend_result.success:
+                    explained.backend_plan = backend_result.data
+                    if analyze and backend == 'postgresql':
+                        analyzed = postgresql_analyzed_plan(backend_result.data)
+                else:
+                    explained.warnings.append(f"Backend plan unavailable: {backend_result.error_message}")
+
+            if analyze:
+                if analyzed is not None:
+                    phase_times['execution'] = analyzed.get('Execution Time', 0.0) / 1000
+                    explained.actual_rows = int(analyzed['Plan']['Actual Rows'])
+                    analyzer = PlanAnalyzer(db_manager, backend_plan=analyzed['Plan'])
+                else:
+                    start = time.perf_counter()
+                    db_result = db_manager.execute_query(sql)
+                    phase_times['execution'] = time.perf_counter() - start
+                    if not db_result.success:
+                        raise SAIQLRuntimeError(f"Database execution failed: {db_result.error_message}",
+                                                {'sql': sql})
+                    explained.data = db_result.data
+                    explained.actual_rows = len(db_result.data) if db_result.data else db_result.rows_affected
+                    analyzer = PlanAnalyzer(db_manager)
+                if plan is not None:
+                    analyzer.annotate(plan, explained.actual_rows, phase_times['execution'] * 1000)
+                    if self.cardinality_feedback:
+                        self.cardinality_feedback.record_plan(plan)
+
+            if plan is not None:
+                explained.physical_plan = plan.to_dict()
+        finally:
+            db_manager.close_all()
+
+        explained.phase_times = phase_times
+        return explained
+
+    def _explain_pipeline(self, query: str, context: ExecutionContext, analyze: bool) -> Dict[str, Any]:
+        """Run explain() and shape its output like _execute_pipeline's result"""
+        from .lexer import LexError
+        from .parser import ParseError
+
+        pipeline_result = {}
+        try:
+            explained = self.explain(query, analyze=analyze, context=context)
+        except LexError as e:
+            return {'success': False, 'error_message': str(e), 'error_phase': 'lexical_analysis'}
+        except ParseError as e:
+            return {'success': False, 'error_message': str(e), 'error_phase': 'parsing'}
+        except Exception as e:
+            return {'success': False, 'error_message': str(e), 'error_phase': 'explain'}
+
+        times = explained.phase_times
+        pipeline_result['success'] = True
+        pipeline_result['data'] = [{'QUERY PLAN': line} for line in explained.to_text()]
+        pipeline_result['rows_affected'] = len(pipeline_result['data'])
+        pipeline_result['sql_generated'] = explained.sql
+        pipeline_result['lexing_time'] = times.get('lexing', 0.0)
+        pipeline_result['parsing_time'] = times.get('parsing', 0.0)
+        pipeline_result['compilation_time'] = times.get('compilation', 0.0)
+        pipeline_result['database_time'] = times.get('execution', 0.0)
+        pipeline_result['target_dialect'] = self.config['compilation']['target_dialect']
+        pipeline_result['warnings'] = explained.warnings
+        pipeline_result['explain'] = explained.to_dict()
+        return pipeline_result
+
+    def _create_db_manager(self):
+        """Create a DatabaseManager bound to the engine's database path"""
+        from .database_manager import DatabaseManager
+
+        # Construct config for DatabaseManager to ensure it uses the engine's db path
+        db_config = {
+            "default_backend": "sqlite",
+            "backends": {
+                "sqlite": {
+                    "type": "sqlite",
+                    "path": self.config['database']['path'],
+                    "timeout": self.config['database'].get('timeout', 30)
+                }
+            }
+        }
+        return DatabaseManager(config=db_config, firewall=self.firewall)
+
+    def _maybe_auto_apply_indexes(self, db_manager) -> None:
+        """Periodically apply index recommendations when auto-apply is enabled"""
+        if not self.index_advisor.auto_apply:
+            return
+        interval = self.config.get('index_advisor', {}).get('auto_apply_interval', 500)
+        with self._lock:
+            self._advisor_queries_since_apply += 1
+            if self._advisor_queries_since_apply < interval:
+                return
+            self._advisor_queries_since_apply = 0
+        try:
+            self.index_advisor.refresh_statistics(db_manager)
+            for rec in self.index_advisor.auto_apply_recommendations(db_manager):
+                logger.info(f"Index advisor: {rec.candidate.index_name} -> {rec.status}")
+        except Exception as e:
+            logger.warning(f"Index advisor auto-apply failed: {e}")
+
+    def apply_index_recommendations(self, top_n: int = 3, measure: bool = True) -> List[Dict[str, Any]]:
+        """
+        Apply the advisor's top recommendations as CREATE INDEX statements.
+
+        Returns the per-index report (expected and observed speedup).
+        """
+        if not self.index_advisor:
+            return []
+        db_manager = self._create_db_manager()
+        try:
+            self.index_advisor.refresh_statistics(db_manager)
+            applied = [self.index_advisor.apply(rec, db_manager, measure=measure)
+                       for rec in self.index_advisor.recommend(top_n=top_n)]
+        finally:
+            db_manager.close_all()
+        self.clear_cache()  # Cached results predate the new indexes' plans
+        return [rec.to_dict() for rec in applied]
+
+    def get_index_advisor_report(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get the index advisor's workload and recommendation report.
+
+        Recommendations are scored with the catalog statistics loaded by the
+        last apply or auto-apply; refresh re-imports them from the backend first.
+        """
+        if not self.index_advisor:
+            return {}
+        if refresh:
+            db_manager = self._create_db_manager()
+            try:
+                self.index_advisor.refresh_statistics(db_manager)
+            finally:
+                db_manager.close_all()
+        return self.index_advisor.get_report()
+
+    def create_sample(self, table: str, strata_column: str, rows_per_stratum: int = 1000) -> Dict[str, Any]:
+        """
+        Build (or rebuild) the stratified sample approximate queries use for a table.
+
+        Returns:
+            Sample summary (strata, population, sample_rows)
+        """
+        db_manager = self._create_db_manager()
+        try:
+            info = self.sample_manager.create_sample(db_manager, table, strata_column, rows_per_stratum)
+        finally:
+            db_manager.close_all()
+        self.clear_cache()
+        return info
+
+    def drop_sample(self, table: str) -> bool:
+        """Drop a table's stratified sample"""
+        db_manager = self._create_db_manager()
+        try:
+            return self.sample_manager.drop_sample(db_manager, table)
+        finally:
+            db_manager.close_all()
+
+    def insert_rows(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert rows, folding them into the table's stratified sample (if any)
+        in the same transaction.
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            ValueError: Invalid table or column names
+            RuntimeError: The insert failed (nothing was written)
+        """
+        if not re.match(r'^\w+$', table):
+            raise ValueError(f"Invalid table name: {table}")
+        if not rows:
+            return 0
+        operations = []
+        for row in rows:
+            if not all(re.match(r'^\w+$', column) for column in row):
+                raise ValueError(f"Invalid column names: {list(row)}")
+            columns = ', '.join(f'"{column}"' for column in row)
+            placeholders = ', '.join('?' for _ in row)
+            operations.append({'sql': f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})',
+                               'params': tuple(row.values())})
+
+        db_manager = self._create_db_manager()
+        try:
+            with self.sample_manager.lock:
+                operations = self.sample_manager.record_inserts(db_manager, table, rows, operations)
+                db_result = db_manager.execute_transaction(operations)
+        finally:
+            db_manager.close_all()
+        if not db_result.success:
+            raise RuntimeError(f"Insert into {table} failed: {db_result.error_message}")
+        self.clear_cache()  # Cached results predate the new rows
+        return len(rows)
+
     def _generate_cache_key(self, query: str, context: ExecutionContext) -> str:
         """Generate cache key for query.
 
@@ -788,6 +1205,10 @@ class SAIQLEngine:
             # Include user_id to prevent cross-user cache leakage
             'user_id': context.user_id,
         }
+        if context.execution_mode == ExecutionMode.APPROXIMATE:
+            # Sampled answers must never be served for exact queries (or other settings)
+            from .approximate_query import ApproximationSettings
+            cache_data['approximation'] = (context.approximation or ApproximationSettings()).cache_key()
         cache_string = json.dumps(cache_data, sort_keys=True)
         return hashlib.sha256(cache_string.encode()).hexdigest()[:16]
     
@@ -8,16 +8,54 @@ and execution strategies. This is what separates hobby projects
 from production databases.
 
 Author: Apollo & Claude  
-Version: 2.0.0
+Version: 2.1.0
+
+Change Notes (2026-10-18):
+- optimize_join_order enumerates join trees with dynamic programming over
+  connected relation subsets (DPsize) for up to MAX_DP_RELATIONS tables and
+  falls back to greedy operator ordering above that
+- Join cardinalities come from TableStatistics.estimate_join_size, join
+  costs from CostEstimator.estimate_join_cost
+- build_join_sql renders the chosen tree as a FROM clause and
+  execute_join_plan runs it in-process with JoinExecutor; EXPLAIN shows it.
+  The SAIQL compiler still emits joins in written order (it only compiles
+  two-table joins, where order has nothing to choose), so these are for
+  callers that build planner queries themselves
+- QueryStatistics.from_table_statistics converts collector or backend
+  catalog statistics (see catalog_statistics) for the planner
+- Cardinality feedback: execute_join_plan / record_actuals store actual
+  rows per node in a CardinalityFeedback, and CostEstimator applies the
+  learned correction factors to later scan and join estimates
+- ExecutionNode.actual_time_ms and render_join_tree support EXPLAIN
+  ANALYZE (see explain), which measures every plan node on the backend
+- Queries with "order_by" get a SORT node; choose_sort_strategy turns a
+  SORT under a "limit" into TOP_K (bounded heap, see top_k), costed
+  O(n log k) and applied by execute_join_plan
+- "aggregates" (e.g. "SUM(orders.total) AS revenue") are kept on the
+  AGGREGATE node; execute_join_plan evaluates GROUP BY with HashAggregator
+  (see hash_aggregate) before any SORT / TOP_K
 """
 
 import json
+import operator as _operator
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 import math
 
+try:
+    from .statistics_collector import TableStatistics, ColumnStatistics
+    from .cardinality_feedback import CardinalityFeedback, scan_signature, join_signature
+    from .top_k import top_k, make_sort_key, parse_order_by
+    from .hash_aggregate import HashAggregator
+except ImportError:
+    # Fallback for standalone testing
+    from statistics_collector import TableStatistics, ColumnStatistics
+    from cardinality_feedback import CardinalityFeedback, scan_signature, join_signature
+    from top_k import top_k, make_sort_key, parse_order_by
+    from hash_aggregate import HashAggregator
+
 class OperationType(Enum):
     """Types of database operations"""
     SELECT = "SELECT"
@@ -28,6 +66,7 @@ class OperationType(Enum):
     AGGREGATE = "AGGREGATE"
     FILTER = "FILTER"
     SORT = "SORT"
+    TOP_K = "TOP_K"  # SORT with a LIMIT, evaluated with a bounded heap
 
 class JoinType(Enum):
     """Types of joins"""
@@ -46,6 +85,29 @@ class QueryStatistics:
     column_stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     index_info: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     
+    @classmethod
+    def from_table_statistics(cls, stats: TableStatistics) -> 'QueryStatistics':
+        """Convert StatisticsCollector / catalog TableStatistics for the planner"""
+        column_stats = {}
+        for name, col in stats.columns.items():
+            column_stats[name] = {
+                "null_count": col.null_count,
+                "min_value": col.min_value,
+                "max_value": col.max_value,
+                "most_common_values": col.most_common_values,
+                "histogram_bounds": col.histogram_bounds
+            }
+            if col.distinct_count > 0:  # 0 means unknown (e.g. unindexed catalog column)
+                column_stats[name]["distinct_count"] = col.distinct_count
+        index_info = {name: {"columns": [], "type": "btree"} for name in stats.indexes}
+        return cls(
+            table_name=stats.table_name,
+            row_count=stats.row_count,
+            table_size_mb=stats.total_size_bytes / (1024 * 1024),
+            column_stats=column_stats,
+            index_info=index_info
+        )
+
     def get_selectivity(self, column: str, operator: str, value: Any) -> float:
         """Estimate selectivity of a condition"""
         if column not in self.column_stats:
@@ -77,6 +139,12 @@ class ExecutionNode:
     estimated_rows: int = 0
     index_used: Optional[str] = None
     join_type: Optional[JoinType] = None
+    relations: List[str] = field(default_factory=list)  # Tables covered by a join subtree
+    actual_rows: Optional[int] = None  # Filled in after execution
+    cardinality_correction: float = 1.0  # Feedback factor already applied to estimated_rows
+    actual_time_ms: Optional[float] = None  # Filled in by EXPLAIN ANALYZE
+    limit: Optional[int] = None  # Row limit of SORT / TOP_K nodes
+    aggregates: List[str] = field(default_factory=list)  # Aggregate expressions of AGGREGATE nodes
     
     def add_child(self, child: 'ExecutionNode'):
         """Add a child node"""
@@ -93,9 +161,29 @@ class ExecutionNode:
             "estimated_rows": self.estimated_rows,
             "index_used": self.index_used,
             "join_type": self.join_type.value if self.join_type else None,
+            "relations": self.relations,
+            "actual_rows": self.actual_rows,
+            "cardinality_correction": self.cardinality_correction,
+            "actual_time_ms": self.actual_time_ms,
+            "limit": self.limit,
+            "aggregates": self.aggregates,
             "children": [child.to_dict() for child in self.children]
         }
 
+@dataclass
+class JoinEdge:
+    """Equi-join predicate left_table.left_column = right_table.right_column"""
+    left_table: str
+    left_column: str
+    right_table: str
+    right_column: str
+
+    def oriented(self, left_relations: List[str]) -> 'JoinEdge':
+        """Return this edge with left_table inside left_relations"""
+        if self.left_table in left_relations:
+            return self
+        return JoinEdge(self.right_table, self.right_column, self.left_table, self.left_column)
+
 class CostEstimator:
     """Cost-based query optimization"""
     
@@ -106,13 +194,28 @@ class CostEstimator:
     COST_PER_ROW_SORT = 0.05
     COST_PER_ROW_AGGREGATE = 0.03
     
-    def __init__(self, statistics: Dict[str, QueryStatistics]):
+    def __init__(self, statistics: Dict[str, QueryStatistics],
+                 feedback: Optional[CardinalityFeedback] = None):
         self.statistics = statistics
+        self.feedback = feedback
+    
+    def scan_correction(self, table_name: str, conditions: List[Dict[str, Any]]) -> float:
+        """Learned actual/estimated factor for a filtered table scan"""
+        if not self.feedback:
+            return 1.0
+        return self.feedback.correction(scan_signature(table_name, conditions))
+    
+    def join_correction(self, conditions: List[Dict[str, Any]]) -> float:
+        """Learned actual/estimated factor for a join predicate set"""
+        if not self.feedback:
+            return 1.0
+        return self.feedback.correction(join_signature(conditions))
     
     def estimate_scan_cost(self, table_name: str, conditions: List[Dict[str, Any]]) -> Tuple[float, int]:
         """Estimate cost of scanning a table"""
+        correction = self.scan_correction(table_name, conditions)
         if table_name not in self.statistics:
-            return 1000.0, 1000  # High cost for unknown tables
+            return 1000.0, int(round(1000 * correction))  # High cost for unknown tables
         
         stats = self.statistics[table_name]
         base_rows = stats.row_count
@@ -128,6 +231,10 @@ class CostEstimator:
                 selectivity = stats.get_selectivity(column, operator, value)
                 estimated_rows = int(estimated_rows * selectivity)
         
+        # Apply cardinality feedback from earlier executions
+        if correction != 1.0:
+            estimated_rows = min(base_rows, int(round(estimated_rows * correction)))
+        
         # Cost depends on whether we can use an index
         best_index = self.find_best_index(table_name, conditions)
         if best_index:
@@ -189,6 +296,14 @@ class CostEstimator:
         # O(n log n) sorting cost
         return rows * math.log2(rows) * self.COST_PER_ROW_SORT
     
+    def estimate_top_k_cost(self, rows: int, limit: int) -> Tuple[float, int]:
+        """Estimate cost of ORDER BY ... LIMIT with a bounded heap of size limit"""
+        result_rows = min(rows, limit)
+        if rows <= 1 or limit <= 0:
+            return 0.0, max(0, result_rows)
+        # O(n log k): every row is compared with the heap root, at most log k swaps
+        return rows * math.log2(max(2, limit)) * self.COST_PER_ROW_SORT, result_rows
+    
     def estimate_aggregate_cost(self, rows: int, group_by_columns: int) -> Tuple[float, int]:
         """Estimate cost of aggregation"""
         cost = rows * self.COST_PER_ROW_AGGREGATE
@@ -202,19 +317,30 @@ class CostEstimator:
 
 class QueryOptimizer:
     """Production-grade query optimizer"""
+
+    # Exhaustive join enumeration up to this many relations, greedy above
+    MAX_DP_RELATIONS = 10
+
+    # Filter operators supported by in-process join execution
+    _FILTER_OPERATORS = {
+        "=": _operator.eq, "!=": _operator.ne, "<>": _operator.ne,
+        ">": _operator.gt, "<": _operator.lt, ">=": _operator.ge, "<=": _operator.le
+    }
     
-    def __init__(self):
+    def __init__(self, feedback: Optional[CardinalityFeedback] = None):
         self.cost_estimator = None
+        self.feedback = feedback
         self.optimization_rules = [
             self.push_down_selections,
             self.optimize_join_order,
             self.choose_join_algorithm,
-            self.optimize_aggregations
+            self.optimize_aggregations,
+            self.choose_sort_strategy
         ]
     
     def load_statistics(self, statistics: Dict[str, QueryStatistics]):
         """Load table statistics for optimization"""
-        self.cost_estimator = CostEstimator(statistics)
+        self.cost_estimator = CostEstimator(statistics, feedback=self.feedback)
     
     def optimize_query(self, query_ast: Dict[str, Any]) -> Tuple[ExecutionNode, Dict[str, Any]]:
         """Optimize a query and return execution plan"""
@@ -233,13 +359,15 @@ class QueryOptimizer:
         physical_plan = self.generate_physical_plan(optimized_plan)
         
         # Create optimization report
+        join_tree = self._join_tree(physical_plan)
         optimization_report = {
             "query_complexity": self.assess_query_complexity(query_ast),
             "optimization_rules_applied": len(self.optimization_rules),
             "estimated_total_cost": physical_plan.estimated_cost,
             "estimated_result_rows": physical_plan.estimated_rows,
             "indexes_recommended": self.recommend_indexes(query_ast),
-            "execution_strategy": self.determine_execution_strategy(physical_plan)
+            "execution_strategy": self.determine_execution_strategy(physical_plan),
+            "join_order": join_tree.relations if join_tree else []
         }
         
         return physical_plan, optimization_report
@@ -262,12 +390,22 @@ class QueryOptimizer:
                     join_node = self.build_join_node(join_info)
                     root.add_child(join_node)
             
-            if 'group_by' in query_ast:
+            if 'group_by' in query_ast or query_ast.get('aggregates'):
                 agg_node = ExecutionNode(
                     operation=OperationType.AGGREGATE,
-                    columns=query_ast.get('group_by', [])
+                    columns=query_ast.get('group_by', []),
+                    aggregates=list(query_ast.get('aggregates', []))
                 )
                 root.add_child(agg_node)
+            
+            if query_ast.get('order_by'):
+                sort_node = ExecutionNode(
+                    operation=OperationType.SORT,
+                    columns=[f"{column} {'DESC' if descending else 'ASC'}"
+                             for column, descending in parse_order_by(query_ast['order_by'])],
+                    limit=query_ast.get('limit')
+                )
+                root.add_child(sort_node)
         
         elif operation_type in [OperationType.INSERT, OperationType.UPDATE, OperationType.DELETE]:
             # Build modification plan
@@ -303,22 +441,385 @@ class QueryOptimizer:
         return plan
     
     def optimize_join_order(self, plan: ExecutionNode) -> ExecutionNode:
-        """Optimize the order of joins using cost estimation"""
-        if plan.operation != OperationType.JOIN or len(plan.children) < 2:
-            return plan
-        
-        # For simplicity, sort joins by estimated selectivity
-        # Real implementation would use dynamic programming
+        """
+        Optimize the order of joins using cost estimation
+
+        Builds the join graph from the base table and its INNER joins, then
+        picks the cheapest join tree by dynamic programming over connected
+        subsets (greedy above MAX_DP_RELATIONS). The JOIN children of the
+        SELECT are replaced by a single JOIN tree whose leaves are table
+        scans; outer joins keep their written order.
+        """
         join_children = [child for child in plan.children if child.operation == OperationType.JOIN]
-        if len(join_children) > 1:
-            join_children.sort(key=lambda x: len(x.conditions), reverse=True)
-            plan.children = [child for child in plan.children if child.operation != OperationType.JOIN] + join_children
-        
+        if (plan.operation != OperationType.SELECT or not plan.table_name
+                or len(join_children) < 2 or not self.cost_estimator):
+            return plan
+
+        # Outer joins are not freely reorderable
+        if any(child.join_type not in (None, JoinType.INNER) for child in join_children):
+            return plan
+
+        graph = self._extract_join_graph(plan, join_children)
+        if graph is None:
+            return plan
+        leaves, edges = graph
+
+        if len(leaves) <= self.MAX_DP_RELATIONS:
+            join_tree = self._dp_join_order(leaves, edges)
+        else:
+            join_tree = self._greedy_join_order(leaves, edges)
+
+        plan.children = [child for child in plan.children if child.operation != OperationType.JOIN]
+        plan.children.append(join_tree)
         return plan
+
+    def _extract_join_graph(
+        self, plan: ExecutionNode, join_children: List[ExecutionNode]
+    ) -> Optional[Tuple[Dict[str, ExecutionNode], List[JoinEdge]]]:
+        """
+        Split conditions into per-table filters and equi-join edges.
+
+        A join condition whose value names another relation's column
+        ("users.id") is an edge; anything else filters its own table.
+        Returns None for self-joins, which need aliases to be reordered.
+        """
+        tables = [plan.table_name] + [child.table_name for child in join_children]
+        if None in tables or len(set(tables)) != len(tables):
+            return None
+
+        filters: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
+        edges: List[JoinEdge] = []
+
+        for condition in plan.conditions:
+            table, _, column = condition.get('column', '').rpartition('.')
+            target = table if table in filters else (plan.table_name if not table else None)
+            if target:
+                filters[target].append({**condition, 'column': column})
+
+        for child in join_children:
+            for condition in child.conditions:
+                table, _, column = condition.get('column', '').rpartition('.')
+                table = table or child.table_name
+                value = condition.get('value')
+                value_table, _, value_column = value.rpartition('.') if isinstance(value, str) else ('', '', '')
+                if condition.get('operator', '=') == '=' and value_table in filters and table in filters:
+                    edges.append(JoinEdge(table, column, value_table, value_column))
+                elif table in filters:
+                    filters[table].append({**condition, 'column': column})
+
+        leaves = {}
+        for table in tables:
+            cost, rows = self.cost_estimator.estimate_scan_cost(table, filters[table])
+            leaves[table] = ExecutionNode(
+                operation=OperationType.SELECT,
+                table_name=table,
+                conditions=filters[table],
+                estimated_cost=cost,
+                estimated_rows=rows,
+                index_used=self.cost_estimator.find_best_index(table, filters[table]),
+                relations=[table],
+                cardinality_correction=self.cost_estimator.scan_correction(table, filters[table])
+            )
+        return leaves, edges
+
+    def _dp_join_order(self, leaves: Dict[str, ExecutionNode], edges: List[JoinEdge]) -> ExecutionNode:
+        """
+        DPsize join enumeration over relation bitmasks.
+
+        Subsets are visited in order of size; each is split into every pair
+        of already-planned disjoint subsets connected by an edge, keeping the
+        cheapest. Cross products are only considered if the join graph is
+        disconnected.
+        """
+        names = list(leaves)
+        bit = {name: 1 << i for i, name in enumerate(names)}
+        edge_masks = [(bit[edge.left_table] | bit[edge.right_table], edge) for edge in edges]
+        allow_cross = not self._is_connected(names, edges)
+
+        best: Dict[int, ExecutionNode] = {bit[name]: leaves[name] for name in names}
+        full = (1 << len(names)) - 1
+
+        for mask in sorted(range(1, full + 1), key=lambda m: bin(m).count('1')):
+            if mask & (mask - 1) == 0:
+                continue  # Single relation
+            sub = (mask - 1) & mask
+            while sub:
+                other = mask ^ sub
+                if sub < other and sub in best and other in best:
+                    crossing = [edge for edge_mask, edge in edge_masks
+                                if edge_mask & sub and edge_mask & other]
+                    if crossing or allow_cross:
+                        candidate = self._make_join_node(best[sub], best[other], crossing)
+                        if mask not in best or candidate.estimated_cost < best[mask].estimated_cost:
+                            best[mask] = candidate
+                sub = (sub - 1) & mask
+
+        return best[full]
+
+    def _greedy_join_order(self, leaves: Dict[str, ExecutionNode], edges: List[JoinEdge]) -> ExecutionNode:
+        """
+        Greedy operator ordering for large joins.
+
+        Repeatedly joins the pair of connected subtrees with the smallest
+        estimated result until one tree remains.
+        """
+        components = list(leaves.values())
+        while len(components) > 1:
+            best_pair = None
+            for i in range(len(components)):
+                for j in range(i + 1, len(components)):
+                    crossing = self._crossing_edges(components[i], components[j], edges)
+                    candidate = self._make_join_node(components[i], components[j], crossing)
+                    key = (not crossing, candidate.estimated_rows, candidate.estimated_cost)
+                    if best_pair is None or key < best_pair[0]:
+                        best_pair = (key, i, j, candidate)
+            _, i, j, candidate = best_pair
+            components = [c for k, c in enumerate(components) if k not in (i, j)] + [candidate]
+        return components[0]
+
+    @staticmethod
+    def _crossing_edges(left: ExecutionNode, right: ExecutionNode, edges: List[JoinEdge]) -> List[JoinEdge]:
+        """Edges with one side in each subtree"""
+        return [edge for edge in edges
+                if (edge.left_table in left.relations and edge.right_table in right.relations)
+                or (edge.left_table in right.relations and edge.right_table in left.relations)]
+
+    @staticmethod
+    def _is_connected(names: List[str], edges: List[JoinEdge]) -> bool:
+        """Check whether the join graph links every relation"""
+        reached = {names[0]}
+        changed = True
+        while changed:
+            changed = False
+            for edge in edges:
+                if (edge.left_table in reached) != (edge.right_table in reached):
+                    reached.update((edge.left_table, edge.right_table))
+                    changed = True
+        return len(reached) == len(names)
+
+    def _column_distinct(self, table: str, column: str, rows: int) -> int:
+        """Distinct values of table.column within an input of `rows` rows"""
+        stats = self.cost_estimator.statistics.get(table)
+        distinct = None
+        if stats:
+            distinct = stats.column_stats.get(column, {}).get('distinct_count')
+            if distinct is None:
+                distinct = stats.row_count  # Unknown join columns are assumed key-like
+        return max(1, min(distinct or rows, rows))
+
+    def _make_join_node(self, left: ExecutionNode, right: ExecutionNode, crossing: List[JoinEdge]) -> ExecutionNode:
+        """Build a JOIN node over two subtrees with estimated rows and cumulative cost"""
+        # Probe with the larger input, build the hash table from the smaller one
+        if left.estimated_rows < right.estimated_rows:
+            left, right = right, left
+        crossing = [edge.oriented(left.relations) for edge in crossing]
+
+        if not crossing:
+            rows = left.estimated_rows * right.estimated_rows
+        else:
+            rows = None
+            for edge in crossing:
+                left_distinct = self._column_distinct(edge.left_table, edge.left_column, left.estimated_rows)
+                right_distinct = self._column_distinct(edge.right_table, edge.right_column, right.estimated_rows)
+                if rows is None:
+                    left_stats = TableStatistics(
+                        table_name=edge.left_table, row_count=left.estimated_rows,
+                        columns={edge.left_column: ColumnStatistics(edge.left_column, distinct_count=left_distinct)})
+                    right_stats = TableStatistics(
+                        table_name=edge.right_table, row_count=right.estimated_rows,
+                        columns={edge.right_column: ColumnStatistics(edge.right_column, distinct_count=right_distinct)})
+                    rows = left_stats.estimate_join_size(right_stats, edge.left_column, edge.right_column)
+                else:
+                    # Additional equality predicates between the same inputs
+                    rows //= max(left_distinct, right_distinct)
+            if left.estimated_rows and right.estimated_rows:
+                rows = max(1, rows)
+
+        join_type = JoinType.INNER if crossing else JoinType.CROSS
+        join_cost, _ = self.cost_estimator.estimate_join_cost(left.estimated_rows, right.estimated_rows, join_type)
+
+        conditions = [{
+            "column": f"{edge.left_table}.{edge.left_column}",
+            "operator": "=",
+            "value": f"{edge.right_table}.{edge.right_column}"
+        } for edge in crossing]
+        correction = self.cost_estimator.join_correction(conditions) if crossing else 1.0
+        if correction != 1.0:
+            rows = max(1, int(round(rows * correction)))
+
+        return ExecutionNode(
+            operation=OperationType.JOIN,
+            join_type=join_type,
+            conditions=conditions,
+            children=[left, right],
+            estimated_cost=left.estimated_cost + right.estimated_cost + join_cost,
+            estimated_rows=rows,
+            relations=left.relations + right.relations,
+            cardinality_correction=correction
+        )
+
+    @staticmethod
+    def _join_tree(plan: ExecutionNode) -> Optional[ExecutionNode]:
+        """The ordered join tree under a SELECT, if optimize_join_order built one"""
+        for child in plan.children:
+            if child.operation == OperationType.JOIN and plan.table_name in child.relations:
+                return child
+        return None
+
+    def build_join_sql(self, plan: ExecutionNode) -> str:
+        """
+        Render the ordered join tree as a FROM clause body.
+
+        Bushy subtrees are parenthesized, e.g.
+        "users" JOIN ("orders" JOIN "items" ON ...) ON ...
+        """
+        join_tree = self._join_tree(plan)
+        if join_tree is None:
+            return f'"{plan.table_name}"'
+        return self.render_join_tree(join_tree)
+
+    @staticmethod
+    def render_join_tree(node: ExecutionNode, nested: bool = False) -> str:
+        """Render a join (sub)tree of table scans as a FROM clause body"""
+        def quote(reference: str) -> str:
+            return '.'.join(f'"{part}"' for part in reference.split('.'))
+
+        if node.operation != OperationType.JOIN:
+            return quote(node.table_name)
+        left, right = (QueryOptimizer.render_join_tree(child, True) for child in node.children)
+        if node.join_type == JoinType.CROSS or not node.conditions:
+            sql = f"{left} CROSS JOIN {right}"
+        else:
+            on = " AND ".join(f"{quote(c['column'])} = {quote(c['value'])}" for c in node.conditions)
+            sql = f"{left} JOIN {right} ON {on}"
+        return f"({sql})" if nested else sql
+
+    def execute_join_plan(
+        self,
+        plan: ExecutionNode,
+        tables: Dict[str, List[Dict[str, Any]]],
+        executor: Optional[Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute the ordered join tree in-process with JoinExecutor.
+
+        Args:
+            plan: Plan returned by optimize_query
+            tables: Rows for each table in the join
+            executor: JoinExecutor to use (a default one is created if omitted)
+
+        Returns:
+            Joined rows keyed by qualified "table.column" names, grouped by
+            the plan's AGGREGATE node and ordered and limited by its SORT /
+            TOP_K node if it has them
+
+        Actual row counts are stored on every node (actual_rows) and, when
+        the optimizer has a CardinalityFeedback, recorded as feedback.
+        """
+        try:
+            from .join_engine import JoinExecutor, NestedLoopJoinExecutor, JoinType as EngineJoinType
+        except ImportError:
+            from join_engine import JoinExecutor, NestedLoopJoinExecutor, JoinType as EngineJoinType
+
+        join_tree = self._join_tree(plan)
+        if join_tree is None:
+            raise ValueError("Plan has no ordered join tree; run optimize_query on a multi-join query")
+        executor = executor or JoinExecutor()
+
+        def matches(row: Dict[str, Any], conditions: List[Dict[str, Any]]) -> bool:
+            # NULL never satisfies a comparison
+            for condition in conditions:
+                value = row.get(condition['column'])
+                if value is None or not self._FILTER_OPERATORS[condition['operator']](value, condition.get('value')):
+                    return False
+            return True
+
+        def unprefix(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            # Qualified names are unique, so the left_/right_ prefix can be dropped
+            return [{key.split('_', 1)[1]: value for key, value in row.items()} for row in rows]
+
+        def run(node: ExecutionNode) -> List[Dict[str, Any]]:
+            rows = execute_node(node)
+            node.actual_rows = len(rows)
+            return rows
+
+        def execute_node(node: ExecutionNode) -> List[Dict[str, Any]]:
+            if node.operation != OperationType.JOIN:
+                return [{f"{node.table_name}.{k}": v for k, v in row.items()}
+                        for row in tables[node.table_name] if matches(row, node.conditions)]
+
+            left_rows, right_rows = run(node.children[0]), run(node.children[1])
+            if not node.conditions:
+                joined, _ = NestedLoopJoinExecutor().execute(left_rows, right_rows, lambda l, r: True)
+                return unprefix(joined)
+
+            first, extra = node.conditions[0], node.conditions[1:]
+
+            def extra_conditions(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+                merged = {**a, **b}
+                return all(merged.get(c['column']) == merged.get(c['value']) for c in extra)
+
+            joined, _ = executor.execute(left_rows, right_rows, first['column'], first['value'],
+                                         EngineJoinType.INNER, extra_conditions if extra else None)
+            return unprefix(joined)
+
+        for node_filters in self._leaf_conditions(join_tree):
+            for condition in node_filters:
+                if condition.get('operator') not in self._FILTER_OPERATORS:
+                    raise ValueError(f"Unsupported filter operator for in-process join: {condition.get('operator')}")
+        result = run(join_tree)
+        plan.actual_rows = len(result)
+        if self.feedback:
+            self.feedback.record_plan(plan)
+
+        for child in plan.children:
+            if child.operation == OperationType.AGGREGATE and (child.columns or child.aggregates):
+                result, _ = HashAggregator(child.columns, child.aggregates).execute(result)
+                child.actual_rows = len(result)
+            elif child.operation in (OperationType.SORT, OperationType.TOP_K):
+                if child.limit is None:
+                    result = sorted(result, key=make_sort_key(child.columns))
+                else:
+                    result = top_k(result, child.columns, child.limit)
+                child.actual_rows = len(result)
+        return result
+
+    def record_actuals(self, plan: ExecutionNode, actual_rows: int) -> int:
+        """
+        Record the actual result size of a plan executed elsewhere
+        (e.g. as SQL on a backend) as cardinality feedback.
+
+        For join plans the ordered join tree receives the count; nodes
+        that already carry actual_rows are recorded as well.
+
+        Returns:
+            Number of plan nodes recorded
+        """
+        plan.actual_rows = actual_rows
+        join_tree = self._join_tree(plan)
+        if join_tree is not None:
+            join_tree.actual_rows = actual_rows
+        if not self.feedback:
+            return 0
+        return self.feedback.record_plan(plan)
+
+    @staticmethod
+    def _leaf_conditions(node: ExecutionNode) -> List[List[Dict[str, Any]]]:
+        """Filter lists of every table scan under a join tree"""
+        if node.operation != OperationType.JOIN:
+            return [node.conditions]
+        return [conds for child in node.children for conds in QueryOptimizer._leaf_conditions(child)]
     
     def choose_join_algorithm(self, plan: ExecutionNode) -> ExecutionNode:
         """Choose the best join algorithm based on data size"""
+        # Ordered join trees carry row estimates on every JOIN node
+        join_tree = self._join_tree(plan)
+        if join_tree is not None:
+            self.choose_join_algorithm(join_tree)
+
         if plan.operation == OperationType.JOIN:
+            for child in plan.children:
+                self.choose_join_algorithm(child)
             # Simplified logic - real optimizer would consider hash join, sort-merge join, etc.
             if plan.estimated_rows < 1000:
                 plan.index_used = "nested_loop_join"
@@ -342,6 +843,13 @@ class QueryOptimizer:
         
         return plan
     
+    def choose_sort_strategy(self, plan: ExecutionNode) -> ExecutionNode:
+        """Evaluate ORDER BY ... LIMIT as a bounded-heap TOP_K instead of a full sort"""
+        for child in plan.children:
+            if child.operation == OperationType.SORT and child.limit is not None:
+                child.operation = OperationType.TOP_K
+        return plan
+    
     def generate_physical_plan(self, logical_plan: ExecutionNode) -> ExecutionNode:
         """Generate physical execution plan with cost estimates"""
         if not self.cost_estimator:
@@ -349,13 +857,23 @@ class QueryOptimizer:
             logical_plan.estimated_rows = 1000
             return logical_plan
         
-        if logical_plan.operation == OperationType.SELECT:
+        join_tree = self._join_tree(logical_plan)
+
+        if logical_plan.operation == OperationType.SELECT and join_tree is not None:
+            # Base table is scanned as a leaf of the ordered join tree
+            logical_plan.estimated_cost = 0.0
+            logical_plan.index_used = None
+
+        elif logical_plan.operation == OperationType.SELECT:
             cost, rows = self.cost_estimator.estimate_scan_cost(
                 logical_plan.table_name, 
                 logical_plan.conditions
             )
             logical_plan.estimated_cost = cost
             logical_plan.estimated_rows = rows
+            logical_plan.cardinality_correction = self.cost_estimator.scan_correction(
+                logical_plan.table_name, logical_plan.conditions
+            )
             
             # Find best index
             best_index = self.cost_estimator.find_best_index(
@@ -373,7 +891,9 @@ class QueryOptimizer:
                 left_rows, right_rows, logical_plan.join_type
             )
             logical_plan.estimated_cost = cost
-            logical_plan.estimated_rows = rows
+            if not logical_plan.relations:
+                # Ordered join nodes keep their statistics-based cardinality
+                logical_plan.estimated_rows = rows
         
         # Recursively process children
         total_child_cost = 0.0
@@ -382,6 +902,25 @@ class QueryOptimizer:
             total_child_cost += child_plan.estimated_cost
         
         logical_plan.estimated_cost += total_child_cost
+        if join_tree is not None:
+            logical_plan.estimated_rows = join_tree.estimated_rows
+
+        # Aggregates, then sorts, consume the rows their parent produces
+        input_rows = logical_plan.estimated_rows
+        for operation in (OperationType.AGGREGATE, OperationType.SORT, OperationType.TOP_K):
+            for child in logical_plan.children:
+                if child.operation != operation or child.children:
+                    continue
+                if operation == OperationType.AGGREGATE:
+                    cost, rows = self.cost_estimator.estimate_aggregate_cost(input_rows, len(child.columns))
+                elif operation == OperationType.TOP_K:
+                    cost, rows = self.cost_estimator.estimate_top_k_cost(input_rows, child.limit)
+                else:
+                    cost = self.cost_estimator.estimate_sort_cost(input_rows)
+                    rows = input_rows if child.limit is None else min(input_rows, child.limit)
+                child.estimated_cost += cost
+                child.estimated_rows = input_rows = rows
+                logical_plan.estimated_cost += cost
         
         return logical_plan
     
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+SAIQL EXPLAIN / EXPLAIN ANALYZE
+===============================
+
+Shows how a SAIQL query will run, at three levels:
+
+- Logical plan: the compiled SAIQL AST as Output/Project/Filter/Join/
+  Aggregate/Scan operators
+- Physical plan: the cost-based QueryOptimizer's ExecutionNode tree,
+  costed with the backend's catalog statistics (see catalog_statistics)
+- Backend plan: the database's own plan (SQLite EXPLAIN QUERY PLAN,
+  PostgreSQL EXPLAIN (FORMAT JSON), MySQL EXPLAIN FORMAT=JSON)
+
+EXPLAIN ANALYZE also runs the query, exactly once. The physical plan is
+annotated with actual rows and time per node (times are inclusive of the
+subtree, as in PostgreSQL). On PostgreSQL the one run is EXPLAIN
+(ANALYZE, BUFFERS), and every node's actuals come from its output. Other
+backends execute the query itself for the root and measure every other
+scan/join subtree with a COUNT(*) of that subtree. Measured nodes are fed
+to the optimizer's CardinalityFeedback.
+
+ANALYZE refuses data-modifying statements (INSERT/UPDATE/DELETE/DDL),
+since running them to measure them would apply the change.
+
+Author: Apollo & Claude
+Version: 1.0.0
+"""
+
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .execution_planner import QueryOptimizer, QueryStatistics, ExecutionNode, OperationType
+except ImportError:
+    # Fallback for standalone testing
+    from execution_planner import QueryOptimizer, QueryStatistics, ExecutionNode, OperationType
+
+logger = logging.getLogger(__name__)
+
+# Comparison operators the planner and the COUNT(*) probes understand
+_SQL_OPERATORS = {'==': '=', '!=': '<>'}
+_PLANNER_OPERATORS = {'=', '<>', '!=', '<', '>', '<=', '>=', 'LIKE'}
+
+# Leading keywords of statements that only read
+_READ_ONLY_KEYWORDS = {'SELECT', 'WITH', 'VALUES', 'TABLE', 'SHOW', 'EXPLAIN'}
+_WRITE_KEYWORD = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|UPSERT|REPLACE)\b", re.IGNORECASE)
+
+# Parser join types that the planner's JoinType can represent
+_JOIN_TYPES = {'INNER': 'INNER', 'LEFT': 'LEFT', 'RIGHT': 'RIGHT', 'FULL OUTER': 'FULL', 'CROSS': 'CROSS'}
+
+
+@dataclass
+class ExplainResult:
+    """Plans (and, with ANALYZE, measurements) for one SAIQL query"""
+    query: str
+    sql: str
+    backend: str
+    analyze: bool
+    logical_plan: Dict[str, Any]
+    physical_plan: Optional[Dict[str, Any]] = None
+    backend_plan: List[Dict[str, Any]] = field(default_factory=list)
+    optimization_report: Dict[str, Any] = field(default_factory=dict)
+    phase_times: Dict[str, float] = field(default_factory=dict)
+    actual_rows: Optional[int] = None
+    data: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization (result rows excluded)"""
+        return {
+            'query': self.query,
+            'sql': self.sql,
+            'backend': self.backend,
+            'analyze': self.analyze,
+            'logical_plan': self.logical_plan,
+            'physical_plan': self.physical_plan,
+            'backend_plan': self.backend_plan,
+            'optimization_report': self.optimization_report,
+            'phase_times': self.phase_times,
+            'actual_rows': self.actual_rows,
+            'warnings': self.warnings
+        }
+
+    def to_text(self) -> List[str]:
+        """Render the plans as indented lines, one per operator"""
+        lines = ["Logical Plan:"]
+        lines.extend(_logical_lines(self.logical_plan, 1))
+
+        lines.append("Physical Plan:")
+        if self.physical_plan:
+            lines.extend(_physical_lines(self.physical_plan, 1))
+        else:
+            lines.append("  (not planned)")
+
+        lines.append(f"Backend Plan ({self.backend}):")
+        lines.extend(_backend_lines(self.backend_plan))
+
+        lines.append("SQL: " + " ".join(self.sql.split()))
+        timings = ", ".join(f"{phase}={seconds * 1000:.3f} ms" for phase, seconds in self.phase_times.items())
+        lines.append(f"Timing: {timings}")
+        if self.analyze and self.actual_rows is not None:
+            lines.append(f"Rows: {self.actual_rows}")
+        return lines
+
+
+def _logical_lines(node: Dict[str, Any], depth: int) -> List[str]:
+    details = ", ".join(f"{key}={value}" for key, value in node.items()
+                        if key not in ('node', 'children') and value not in (None, [], ''))
+    lines = ["  " * depth + (f"{node['node']} ({details})" if details else node['node'])]
+    for child in node.get('children', []):
+        lines.extend(_logical_lines(child, depth + 1))
+    return lines
+
+
+def _physical_lines(node: Dict[str, Any], depth: int) -> List[str]:
+    label = node['operation']
+    if node.get('join_type'):
+        label = f"{node['join_type']} {label}"
+    if node.get('relations') and node['operation'] == 'JOIN':
+        label += f" [{', '.join(node['relations'])}]"
+    elif node.get('table_name'):
+        label += f" on {node['table_name']}"
+    if node.get('aggregates'):
+        label += f" {', '.join(node['aggregates'])}"
+    if node['operation'] in ('SORT', 'TOP_K', 'AGGREGATE') and node.get('columns'):
+        label += f" by {', '.join(node['columns'])}"
+    if node.get('limit') is not None:
+        label += f" limit {node['limit']}"
+    if node.get('index_used'):
+        label += f" using {node['index_used']}"
+    if node.get('conditions'):
+        label += " filter " + " AND ".join(
+            f"{c.get('column')} {c.get('operator', '=')} {c.get('value')}" for c in node['conditions']
+        )
+    label += f"  (cost={node['estimated_cost']:.2f} rows={node['estimated_rows']})"
+    if node.get('actual_rows') is not None:
+        timing = f" time={node['actual_time_ms']:.3f} ms" if node.get('actual_time_ms') is not None else ""
+        label += f" (actual rows={node['actual_rows']}{timing})"
+    lines = ["  " * depth + ("-> " if depth > 1 else "") + label]
+    for child in node.get('children', []):
+        lines.extend(_physical_lines(child, depth + 1))
+    return lines
+
+
+def _backend_lines(rows: List[Dict[str, Any]]) -> List[str]:
+    if not rows:
+        return ["  (unavailable)"]
+    if 'detail' in rows[0] and 'id' in rows[0]:
+        # SQLite EXPLAIN QUERY PLAN: rows form a tree through parent ids
+        depth = {0: 0}
+        lines = []
+        for row in rows:
+            level = depth.get(row.get('parent', 0), 0) + 1
+            depth[row['id']] = level
+            lines.append("  " * level + str(row['detail']))
+        return lines
+    return ["  " + " ".join(str(value) for value in row.values()) for row in rows]
+
+
+# ----------------------------------------------------------------------
+# AST -> logical plan / planner query
+# ----------------------------------------------------------------------
+
+def _tables(ast: Any) -> List[str]:
+    target = getattr(ast, 'target', None)
+    if target is None:
+        return []
+    if hasattr(target, 'contents'):
+        return [content.table_name for content in target.contents if hasattr(content, 'table_name')]
+    if hasattr(target, 'table_name'):
+        return [target.table_name]
+    return []
+
+
+def _columns(ast: Any) -> List[str]:
+    target = getattr(ast, 'target', None)
+    columns = getattr(target, 'columns', None)
+    if columns is not None and hasattr(columns, 'columns'):
+        return list(columns.columns)
+    if hasattr(target, 'columns') and isinstance(target.columns, list):
+        return list(target.columns)
+    return ['*']
+
+
+def _operand(node: Any) -> Tuple[str, Any]:
+    """Classify a condition operand as ('column', name), ('value', literal) or ('expr', None)"""
+    if hasattr(node, 'column_name'):
+        name = node.column_name
+        return 'column', f"{node.table_alias}.{name}" if getattr(node, 'table_alias', None) else name
+    if hasattr(node, 'value'):
+        return 'value', node.value
+    if hasattr(node, 'name'):
+        return 'column', node.name
+    return 'expr', None
+
+
+def _conditions(nodes: List[Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Flatten AND-ed binary comparisons into planner conditions.
+
+    Returns the conditions and a description of anything that could not
+    be represented (OR, nested expressions), which the planner then ignores.
+    """
+    conditions, skipped = [], []
+    pending = list(nodes)
+    while pending:
+        node = pending.pop(0)
+        operator = _SQL_OPERATORS.get(getattr(node, 'operator', None), getattr(node, 'operator', None))
+        if operator in ('AND', '&&'):
+            pending[:0] = [node.left, node.right]
+            continue
+        if operator and operator.upper() in _PLANNER_OPERATORS:
+            (left_kind, left), (right_kind, right) = _operand(node.left), _operand(node.right)
+            if left_kind == 'column' and right_kind in ('value', 'column'):
+                conditions.append({'column': left, 'operator': operator.upper(), 'value': right})
+                continue
+            if right_kind == 'column' and left_kind == 'value':
+                flipped = {'<': '>', '>': '<', '<=': '>=', '>=': '<='}.get(operator, operator)
+                conditions.append({'column': right, 'operator': flipped.upper(), 'value': left})
+                continue
+        skipped.append(type(node).__name__)
+    return conditions, skipped
+
+
+def logical_plan_from_ast(ast: Any) -> Dict[str, Any]:
+    """Describe a compiled SAIQL QueryNode as a tree of logical operators"""
+    query_type = getattr(ast, 'query_type', 'unknown')
+    operation = getattr(ast, 'operation', None)
+    tables = _tables(ast)
+
+    if query_type == 'TRANSACTION':
+        statement = getattr(operation, 'metadata', {}).get('operation', '$1')
+        return {'node': 'Transaction', 'statement': statement}
+
+    scans = [{'node': 'Scan', 'table': table} for table in tables] or [{'node': 'Scan', 'table': None}]
+    if query_type == 'JOIN' and len(scans) >= 2:
+        condition = getattr(operation, 'join_condition', None)
+        join_conditions, _ = _conditions([condition] if condition is not None else [])
+        plan = {'node': 'Join', 'join_type': getattr(operation, 'join_type', 'INNER'),
+                'conditions': join_conditions, 'children': scans[:2]}
+    else:
+        plan = scans[0]
+
+    conditions, _ = _conditions(getattr(ast, 'conditions', []) or [])
+    if conditions:
+        plan = {'node': 'Filter', 'conditions': conditions, 'children': [plan]}
+
+    if query_type == 'AGGREGATE':
+        plan = {'node': 'Aggregate', 'function': getattr(operation, 'function_name', None), 'children': [plan]}
+    else:
+        plan = {'node': 'Project', 'columns': _columns(ast), 'children': [plan]}
+
+    output = getattr(getattr(ast, 'output', None), 'value', None)
+    return {'node': 'Output', 'format': output, 'children': [plan]}
+
+
+def planner_query_from_ast(ast: Any) -> Optional[Dict[str, Any]]:
+    """
+    Translate a compiled SAIQL QueryNode into QueryOptimizer's query form.
+
+    Returns None for statements the optimizer does not plan (transactions).
+    """
+    query_type = getattr(ast, 'query_type', 'unknown')
+    tables = _tables(ast)
+    if query_type not in ('SELECT', 'JOIN', 'AGGREGATE') or not tables:
+        return None
+
+    conditions, _ = _conditions(getattr(ast, 'conditions', []) or [])
+    query = {'operation': 'SELECT', 'table': tables[0], 'columns': _columns(ast)}
+
+    if query_type == 'JOIN' and len(tables) >= 2:
+        operation = getattr(ast, 'operation', None)
+        condition = getattr(operation, 'join_condition', None)
+        join_conditions, _ = _conditions([condition] if condition is not None else [])
+        if condition is None and conditions:
+            # The compiler uses the first WHERE condition as the ON clause
+            join_conditions, conditions = conditions[:1], conditions[1:]
+        join_type = _JOIN_TYPES.get(getattr(operation, 'join_type', 'INNER'), 'INNER')
+        query['joins'] = [{'type': join_type, 'table': tables[1], 'conditions': join_conditions}]
+
+    query['conditions'] = conditions
+    if query_type == 'AGGREGATE':
+        query['group_by'] = []
+    return query
+
+
+# ----------------------------------------------------------------------
+# Backend plans and per-node measurement
+# ----------------------------------------------------------------------
+
+def is_data_modifying(sql: str) -> bool:
+    """Whether running sql could change data or schema (conservative)"""
+    statement = sql.strip().lstrip('(')
+    keyword = statement.split(None, 1)[0].upper() if statement else ''
+    if keyword not in _READ_ONLY_KEYWORDS:
+        return True
+    # Data-modifying CTEs (WITH moved AS (DELETE ... RETURNING *) SELECT ...)
+    return keyword == 'WITH' and _WRITE_KEYWORD.search(sql) is not None
+
+
+def backend_explain_sql(sql: str, backend: str, analyze: bool = False) -> Optional[str]:
+    """
+    The backend's EXPLAIN statement for sql, or None if not supported
+
+    Only PostgreSQL's form executes the statement (analyze=True); its
+    output then replaces running the query. MySQL's EXPLAIN ANALYZE would
+    be a second execution next to the measured one, so it gets the
+    estimated plan like SQLite.
+    """
+    statement = sql.strip().rstrip(';')
+    if backend == 'sqlite':
+        return f"EXPLAIN QUERY PLAN {statement}"
+    if backend == 'postgresql':
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        return f"EXPLAIN ({options}) {statement}"
+    if backend == 'mysql':
+        return f"EXPLAIN FORMAT=JSON {statement}"
+    return None
+
+
+def postgresql_analyzed_plan(rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The top-level object of EXPLAIN (ANALYZE, FORMAT JSON) output, or None"""
+    if not rows:
+        return None
+    value = next(iter(rows[0].values()), None)
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict) and 'Actual Rows' in value.get('Plan', {}):
+        return value
+    return None
+
+
+def _backend_nodes(node: Dict[str, Any]) -> List[Tuple[Dict[str, Any], frozenset]]:
+    """Every node of a PostgreSQL JSON plan with the relations it reads"""
+    nodes = []
+    relations = {node['Relation Name']} if node.get('Relation Name') else set()
+    for child in node.get('Plans', []):
+        child_nodes = _backend_nodes(child)
+        relations |= child_nodes[0][1]
+        nodes.extend(child_nodes)
+    return [(node, frozenset(relations))] + nodes
+
+
+def _literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _quote(reference: str) -> str:
+    return '.'.join(f'"{part}"' for part in str(reference).split('.'))
+
+
+def _where(filters: List[Tuple[Optional[str], Dict[str, Any]]]) -> str:
+    parts = []
+    for table, condition in filters:
+        column = condition['column']
+        if table and '.' not in column:
+            column = f"{table}.{column}"
+        operator = '<>' if condition['operator'] == '!=' else condition['operator']
+        parts.append(f"{_quote(column)} {operator} {_literal(condition.get('value'))}")
+    return f" WHERE {' AND '.join(parts)}" if parts else ""
+
+
+def _scan_filters(node: ExecutionNode) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+    if node.operation != OperationType.JOIN:
+        return [(node.table_name, condition) for condition in node.conditions]
+    return [item for child in node.children for item in _scan_filters(child)]
+
+
+def count_sql(node: ExecutionNode) -> Optional[str]:
+    """COUNT(*) probe returning the rows a scan or ordered join subtree produces"""
+    if node.operation == OperationType.JOIN:
+        if not node.relations or len(node.children) != 2:
+            return None  # Unordered join placeholder; its inputs are not in the tree
+        return f"SELECT COUNT(*) AS n FROM {QueryOptimizer.render_join_tree(node)}{_where(_scan_filters(node))}"
+    if node.table_name and not node.children:
+        return f"SELECT COUNT(*) AS n FROM {_quote(node.table_name)}{_where(_scan_filters(node))}"
+    return None
+
+
+class PlanAnalyzer:
+    """
+    Annotates a physical plan with actual rows and time measured on a backend
+
+    With backend_plan (the "Plan" of PostgreSQL's EXPLAIN ANALYZE JSON),
+    scans and joins take the actuals of the backend node reading the same
+    relations and nothing is run; otherwise each is measured by a COUNT(*)
+    probe.
+    """
+
+    def __init__(self, db_manager: Any, backend_plan: Optional[Dict[str, Any]] = None):
+        self.db_manager = db_manager
+        self.backend_nodes = _backend_nodes(backend_plan) if backend_plan else None
+
+    def _measure(self, node: ExecutionNode) -> Tuple[Optional[int], Optional[float]]:
+        if self.backend_nodes is None:
+            sql = count_sql(node)
+            return self._count(sql) if sql else (None, None)
+        if node.operation == OperationType.JOIN:
+            if not node.relations or len(node.children) != 2:
+                return None, None
+            wanted = frozenset(node.relations)
+            matches = [backend for backend, relations in self.backend_nodes
+                       if relations == wanted and ('Join' in backend['Node Type'] or
+                                                   backend['Node Type'] == 'Nested Loop')]
+        elif node.table_name and not node.children:
+            matches = [backend for backend, _ in self.backend_nodes
+                       if backend.get('Relation Name') == node.table_name and 'Scan' in backend['Node Type']]
+        else:
+            return None, None
+        if len(matches) != 1:
+            return None, None  # Not in the backend plan, or ambiguous (self-join)
+        # Actuals are per loop (e.g. the inner side of a nested loop)
+        loops = matches[0].get('Actual Loops') or 1
+        return int(matches[0]['Actual Rows']) * loops, float(matches[0]['Actual Total Time']) * loops
+
+    def _count(self, sql: str) -> Tuple[Optional[int], float]:
+        start = time.perf_counter()
+        result = self.db_manager.execute_query(sql)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not result.success or not result.data:
+            logger.debug(f"EXPLAIN ANALYZE probe failed: {result.error_message}")
+            return None, elapsed_ms
+        return int(list(result.data[0].values())[0]), elapsed_ms
+
+    def annotate(self, plan: ExecutionNode, result_rows: int, execution_ms: float) -> None:
+        """
+        Fill actual_rows / actual_time_ms on every measurable node.
+
+        Args:
+            plan: Physical plan from QueryOptimizer.optimize_query
+            result_rows: Rows returned by executing the query
+            execution_ms: Wall time of that execution
+        """
+        join_tree = QueryOptimizer._join_tree(plan)
+
+        def walk(node: ExecutionNode) -> None:
+            for child in node.children:
+                walk(child)
+            if node is plan:
+                return
+            if node.operation in (OperationType.AGGREGATE, OperationType.SORT, OperationType.TOP_K):
+                node.actual_rows, node.actual_time_ms = result_rows, execution_ms
+                return
+            node.actual_rows, node.actual_time_ms = self._measure(node)
+
+        walk(plan)
+
+        has_aggregate = any(child.operation in (OperationType.AGGREGATE, OperationType.SORT, OperationType.TOP_K)
+                            for child in plan.children)
+        if join_tree is not None:
+            plan.actual_rows, plan.actual_time_ms = join_tree.actual_rows, join_tree.actual_time_ms
+            if not has_aggregate:
+                plan.actual_rows, plan.actual_time_ms = result_rows, execution_ms
+        elif plan.children:
+            # The root estimate is its own table scan; joins/aggregates hang below it
+            plan.actual_rows, plan.actual_time_ms = self._measure(
+                ExecutionNode(operation=OperationType.SELECT, table_name=plan.table_name,
+                              conditions=plan.conditions))
+        else:
+            plan.actual_rows, plan.actual_time_ms = result_rows, execution_ms
+
+
+def load_catalog_statistics(db_manager: Any, tables: List[str]) -> Dict[str, QueryStatistics]:
+    """Planner statistics for tables from the backend catalog (empty on failure)"""
+    try:
+        imported = db_manager.import_catalog_statistics(tables=tables)
+    except Exception as e:
+        logger.debug(f"Catalog statistics unavailable for EXPLAIN: {e}")
+        return {}
+    return {name: QueryStatistics.from_table_statistics(stats) for name, stats in imported.items()}
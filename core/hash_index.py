@@ -17,17 +17,38 @@ Status: Production-Ready
 """
 
 import logging
+import threading
 from typing import Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+class _BucketTable:
+    """
+    Bucket array plus its size, swapped as one object on resize so readers
+    never hash with one size and probe another table.
+    """
+    __slots__ = ('size', 'buckets')
+
+    def __init__(self, size: int):
+        self.size = size
+        # Each bucket is an immutable tuple of (key, values_tuple) entries
+        self.buckets: List[Tuple[Tuple[Any, Tuple[Any, ...]], ...]] = [()] * size
+
+
 class HashIndex:
     """
     Hash Index Implementation
     
     A hash index provides O(1) average case lookups for equality comparisons.
     It uses a hash table with chaining for collision resolution.
+
+    Concurrency:
+    - Readers are lock-free: buckets are immutable tuples replaced on write,
+      so a reader always sees a complete before- or after-image of a bucket.
+    - Writers take one of `stripes` locks chosen by bucket, so writers on
+      different stripes proceed in parallel.
+    - Resize takes every stripe lock and swaps in a new table atomically.
     
     Time Complexity:
     - Insert: O(1) average
@@ -37,29 +58,45 @@ class HashIndex:
     Space Complexity: O(n) where n is the number of entries
     """
     
-    def __init__(self, initial_size: int = 1024):
+    def __init__(self, initial_size: int = 1024, stripes: int = 16):
         """
         Initialize hash index
         
         Args:
             initial_size: Initial number of buckets (power of 2 recommended)
+            stripes: Number of writer lock stripes
         """
-        self.size = initial_size
-        self.count = 0
         self.load_factor_threshold = 0.75
-        
-        # Buckets: each bucket is a list of (key, [values]) tuples
-        self.buckets: List[List[Tuple[Any, List[Any]]]] = [[] for _ in range(self.size)]
+        self._table = _BucketTable(initial_size)
+        self._stripes = [threading.Lock() for _ in range(max(1, stripes))]
+        self._stripe_counts = [0] * len(self._stripes)
         
         logger.info(f"Created hash index with {self.size} buckets")
+
+    @property
+    def size(self) -> int:
+        """Current number of buckets"""
+        return self._table.size
+
+    @property
+    def buckets(self) -> List[Tuple[Tuple[Any, Tuple[Any, ...]], ...]]:
+        """Current bucket array (read-only snapshot)"""
+        return self._table.buckets
+
+    @property
+    def count(self) -> int:
+        """Number of distinct keys"""
+        return sum(self._stripe_counts)
     
-    def _hash(self, key: Any) -> int:
+    @staticmethod
+    def _hash(key: Any, size: int) -> int:
         """
         Hash function
         
-        Uses Python's built-in hash() and maps to bucket index
+        Uses Python's built-in hash() and maps to a bucket index of a table
+        with size buckets (callers pass the size of the table they hold)
         """
-        return hash(key) % self.size
+        return hash(key) % size
     
     def _should_resize(self) -> bool:
         """Check if we should resize the hash table"""
@@ -70,20 +107,50 @@ class HashIndex:
         """
         Resize hash table when load factor is too high
         
-        Doubles the size and rehashes all entries
+        Doubles the size and rehashes all entries under every stripe lock
         """
-        old_buckets = self.buckets
-        self.size *= 2
-        self.buckets = [[] for _ in range(self.size)]
-        self.count = 0
-        
-        # Rehash all entries (value is a list of row_ids)
-        for bucket in old_buckets:
-            for key, values in bucket:
-                for value in values:
-                    self.insert(key, value)
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            if not self._should_resize():
+                return  # Another writer resized while we waited
+
+            old_table = self._table
+            new_table = _BucketTable(old_table.size * 2)
+            new_counts = [0] * len(self._stripes)
+            rehashed = [[] for _ in range(new_table.size)]
+
+            for bucket in old_table.buckets:
+                for entry in bucket:
+                    bucket_idx = self._hash(entry[0], new_table.size)
+                    rehashed[bucket_idx].append(entry)
+                    new_counts[bucket_idx % len(self._stripes)] += 1
+
+            new_table.buckets = [tuple(bucket) for bucket in rehashed]
+            self._table = new_table
+            self._stripe_counts = new_counts
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()
 
         logger.info(f"Resized hash index to {self.size} buckets")
+
+    def _lock_bucket(self, key: Any) -> Tuple[_BucketTable, int, int]:
+        """
+        Acquire the stripe lock for key's bucket.
+
+        Returns (table, bucket_idx, stripe_idx); the caller must release
+        self._stripes[stripe_idx]. Retries if a resize swapped the table
+        while we were waiting for the lock.
+        """
+        while True:
+            table = self._table
+            bucket_idx = self._hash(key, table.size)
+            stripe_idx = bucket_idx % len(self._stripes)
+            self._stripes[stripe_idx].acquire()
+            if self._table is table:
+                return table, bucket_idx, stripe_idx
+            self._stripes[stripe_idx].release()
     
     def insert(self, key: Any, value: Any) -> None:
         """
@@ -97,24 +164,26 @@ class HashIndex:
         if self._should_resize():
             self._resize()
 
-        bucket_idx = self._hash(key)
-        bucket = self.buckets[bucket_idx]
+        table, bucket_idx, stripe_idx = self._lock_bucket(key)
+        try:
+            bucket = table.buckets[bucket_idx]
 
-        # Check if key already exists - append to value list
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                # v is a list of values for this key
-                if value not in v:
-                    v.append(value)
-                return
+            # Check if key already exists - append to value list
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    if value not in v:
+                        table.buckets[bucket_idx] = bucket[:i] + ((k, v + (value,)),) + bucket[i + 1:]
+                    return
 
-        # Key doesn't exist, add new entry with value as list
-        bucket.append((key, [value]))
-        self.count += 1
+            # Key doesn't exist, add new entry
+            table.buckets[bucket_idx] = bucket + ((key, (value,)),)
+            self._stripe_counts[stripe_idx] += 1
+        finally:
+            self._stripes[stripe_idx].release()
     
     def search(self, key: Any) -> Optional[List[Any]]:
         """
-        Search for a key
+        Search for a key (lock-free)
 
         Args:
             key: Key to search for
@@ -122,14 +191,13 @@ class HashIndex:
         Returns:
             List of values (row_ids) associated with the key, or None if not found
         """
-        bucket_idx = self._hash(key)
-        bucket = self.buckets[bucket_idx]
+        table = self._table
+        bucket = table.buckets[self._hash(key, table.size)]
 
         # Linear search within bucket
         for k, v in bucket:
             if k == key:
-                # v is already a list of values
-                return v if v else None
+                return list(v) if v else None
 
         return None
     
@@ -144,29 +212,29 @@ class HashIndex:
         Returns:
             True if key/value was found and deleted, False otherwise
         """
-        bucket_idx = self._hash(key)
-        bucket = self.buckets[bucket_idx]
+        table, bucket_idx, stripe_idx = self._lock_bucket(key)
+        try:
+            bucket = table.buckets[bucket_idx]
 
-        # Find the key
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                if row_id is not None:
-                    # Remove specific row_id from value list
-                    if row_id in v:
-                        v.remove(row_id)
-                        if len(v) == 0:
-                            # No more values - remove the key entirely
-                            bucket.pop(i)
-                            self.count -= 1
-                        return True
-                    return False  # row_id not found
-                else:
-                    # Delete entire key
-                    bucket.pop(i)
-                    self.count -= 1
+            # Find the key
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    if row_id is not None:
+                        # Remove specific row_id from value list
+                        if row_id not in v:
+                            return False  # row_id not found
+                        remaining = tuple(x for x in v if x != row_id)
+                        if remaining:
+                            table.buckets[bucket_idx] = bucket[:i] + ((k, remaining),) + bucket[i + 1:]
+                            return True
+                    # Delete entire key (or its last row_id)
+                    table.buckets[bucket_idx] = bucket[:i] + bucket[i + 1:]
+                    self._stripe_counts[stripe_idx] -= 1
                     return True
 
-        return False
+            return False
+        finally:
+            self._stripes[stripe_idx].release()
     
     def __len__(self) -> int:
         """Return number of entries in the index"""
@@ -184,18 +252,21 @@ class HashIndex:
             Dictionary with statistics about the index
         """
         # Calculate bucket utilization
-        non_empty_buckets = sum(1 for bucket in self.buckets if bucket)
-        max_bucket_size = max(len(bucket) for bucket in self.buckets) if self.buckets else 0
-        avg_bucket_size = self.count / non_empty_buckets if non_empty_buckets > 0 else 0
+        table = self._table
+        count = self.count
+        non_empty_buckets = sum(1 for bucket in table.buckets if bucket)
+        max_bucket_size = max(len(bucket) for bucket in table.buckets) if table.buckets else 0
+        avg_bucket_size = count / non_empty_buckets if non_empty_buckets > 0 else 0
         
         return {
-            "total_entries": self.count,
-            "total_buckets": self.size,
+            "total_entries": count,
+            "total_buckets": table.size,
             "non_empty_buckets": non_empty_buckets,
-            "load_factor": self.count / self.size,
+            "load_factor": count / table.size,
             "max_bucket_size": max_bucket_size,
             "avg_bucket_size": avg_bucket_size,
-            "utilization": non_empty_buckets / self.size
+            "utilization": non_empty_buckets / table.size,
+            "lock_stripes": len(self._stripes)
         }
 
 
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+SAIQL Index Advisor
+===================
+
+Workload-driven index recommendations that are actually applied.
+
+The advisor watches the SQL that SAIQLEngine sends to the backend over a
+sliding workload window, records which columns appear in predicates and
+ORDER BY clauses, and scores candidate single-column indexes by the cost
+reduction CostEstimator predicts for the recorded queries. Accepted
+recommendations are materialized as real CREATE INDEX statements on the
+backend, and the advisor reports expected vs observed speedup.
+
+Auto-apply mode only creates indexes that stay within the configured
+write-amplification limit (1 heap write + 1 write per secondary index).
+
+Author: Apollo & Claude
+Version: 1.0.0
+
+Usage:
+    advisor = IndexAdvisor(statistics=collector.table_stats)
+    advisor.record_query('SELECT * FROM "users" WHERE ("age" > 18)', 0.12)
+    advisor.refresh_statistics(db_manager)  # or load catalog statistics
+    for rec in advisor.recommend():
+        advisor.apply(rec, db_manager)
+"""
+
+import re
+import time
+import logging
+import threading
+from collections import deque, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple, Deque
+
+from .execution_planner import CostEstimator, QueryStatistics
+from .catalog_statistics import detect_backend
+
+logger = logging.getLogger(__name__)
+
+# Rows assumed for tables without collected statistics. Keeps unknown tables
+# comparable to each other instead of collapsing every estimate to a constant.
+DEFAULT_ROW_COUNT = 1000
+
+_IDENT = r'["`\[]?([A-Za-z_][A-Za-z0-9_]*)["`\]]?'
+_QUALIFIED_IDENT = rf'(?:{_IDENT}\s*\.\s*)?{_IDENT}'
+_TABLE_RE = re.compile(
+    rf'\b(?:FROM|JOIN|UPDATE|INTO)\s+{_QUALIFIED_IDENT}', re.IGNORECASE
+)
+_PREDICATE_RE = re.compile(
+    rf'{_QUALIFIED_IDENT}\s*(<>|!=|<=|>=|=|<|>|\bNOT\s+LIKE\b|\bLIKE\b|\bIN\b|\bBETWEEN\b)\s*'
+    r"""('(?:[^']|'')*'|-?\d+(?:\.\d+)?|[A-Za-z_"`\[][^\s)]*|\()""",
+    re.IGNORECASE
+)
+_WHERE_RE = re.compile(
+    r'\b(?:WHERE|ON)\b(.*?)(?=\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s*JOIN\b|$)',
+    re.IGNORECASE | re.DOTALL
+)
+_ORDER_BY_RE = re.compile(r'\bORDER\s+BY\b(.*?)(?=\bLIMIT\b|\bOFFSET\b|$)', re.IGNORECASE | re.DOTALL)
+_WRITE_RE = re.compile(r'^\s*(INSERT|UPDATE|DELETE|REPLACE)\b', re.IGNORECASE)
+_SELECT_RE = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+_SQL_KEYWORDS = {'AND', 'OR', 'NOT', 'NULL', 'IS', 'TRUE', 'FALSE', 'SELECT'}
+
+
+@dataclass
+class WorkloadQuery:
+    """A single query observed in the workload window"""
+    sql: str
+    tables: List[str]
+    predicates: List[Dict[str, Any]]
+    order_by: List[Tuple[str, str]]
+    execution_time: float
+    is_write: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class IndexCandidate:
+    """A hypothetical single-column index"""
+    table_name: str
+    column_name: str
+
+    @property
+    def index_name(self) -> str:
+        return f"idx_saiql_{self.table_name}_{self.column_name}"
+
+    def create_sql(self, backend: str = "sqlite") -> str:
+        """CREATE INDEX statement for a backend type (sqlite, postgresql or mysql)"""
+        if backend == "mysql":
+            # MySQL has no CREATE INDEX IF NOT EXISTS; applied indexes are never re-proposed
+            return f'CREATE INDEX `{self.index_name}` ON `{self.table_name}` (`{self.column_name}`)'
+        if backend not in ("sqlite", "postgresql"):
+            raise ValueError(f"Index advisor cannot create indexes on {backend} backends")
+        return (f'CREATE INDEX IF NOT EXISTS "{self.index_name}" '
+                f'ON "{self.table_name}" ("{self.column_name}")')
+
+
+@dataclass
+class IndexRecommendation:
+    """Scored index candidate with expected and observed effect"""
+    candidate: IndexCandidate
+    estimated_cost_before: float
+    estimated_cost_after: float
+    benefit: float
+    queries_affected: int
+    write_amplification: float
+    status: str = "proposed"  # proposed, applied, rejected, failed
+    observed_time_before: Optional[float] = None
+    observed_time_after: Optional[float] = None
+    error_message: Optional[str] = None
+
+    @property
+    def expected_speedup(self) -> float:
+        return self.estimated_cost_before / max(self.estimated_cost_after, 1e-9)
+
+    @property
+    def observed_speedup(self) -> Optional[float]:
+        if self.observed_time_before is None or self.observed_time_after is None:
+            return None
+        return self.observed_time_before / max(self.observed_time_after, 1e-9)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "table": self.candidate.table_name,
+            "column": self.candidate.column_name,
+            "index_name": self.candidate.index_name,
+            "create_sql": self.candidate.create_sql(),
+            "estimated_cost_before": self.estimated_cost_before,
+            "estimated_cost_after": self.estimated_cost_after,
+            "benefit": self.benefit,
+            "queries_affected": self.queries_affected,
+            "write_amplification": self.write_amplification,
+            "expected_speedup": self.expected_speedup,
+            "observed_speedup": self.observed_speedup,
+            "status": self.status,
+            "error_message": self.error_message,
+        }
+
+
+class IndexAdvisor:
+    """
+    Records predicate/ORDER BY usage over a workload window and turns it
+    into backend indexes.
+
+    Statistics may be either planner QueryStatistics or the TableStatistics
+    produced by StatisticsCollector; the latter are converted on load.
+    """
+
+    def __init__(self,
+                 statistics: Optional[Dict[str, Any]] = None,
+                 window_size: int = 1000,
+                 min_benefit: float = 1.0,
+                 max_write_amplification: float = 4.0,
+                 auto_apply: bool = False,
+                 replay_limit: int = 5):
+        self.window_size = window_size
+        self.min_benefit = min_benefit
+        self.max_write_amplification = max_write_amplification
+        self.auto_apply = auto_apply
+        self.replay_limit = replay_limit
+
+        self.workload: Deque[WorkloadQuery] = deque(maxlen=window_size)
+        self.applied: Dict[str, IndexRecommendation] = {}
+        self.statistics: Dict[str, QueryStatistics] = {}
+        self._lock = threading.RLock()
+
+        if statistics:
+            self.load_statistics(statistics)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def load_statistics(self, statistics: Dict[str, Any]) -> None:
+        """Load planner statistics (QueryStatistics or TableStatistics)"""
+        with self._lock:
+            for table_name, stats in statistics.items():
+                self.statistics[table_name] = self._to_query_statistics(table_name, stats)
+
+    @staticmethod
+    def _to_query_statistics(table_name: str, stats: Any) -> QueryStatistics:
+        if isinstance(stats, QueryStatistics):
+            return stats
+        # StatisticsCollector.TableStatistics
+        converted = QueryStatistics.from_table_statistics(stats)
+        converted.table_name = table_name
+        return converted
+
+    def refresh_statistics(self, db_manager: Any, backend: Optional[str] = None) -> int:
+        """
+        Load catalog statistics for the tables in the workload window
+
+        Reads the backend's own statistics (sqlite_stat1, pg_stats,
+        information_schema) through db_manager.import_catalog_statistics,
+        so candidates are scored against real table sizes. On failure the
+        statistics already loaded (or DEFAULT_ROW_COUNT) stay in use.
+
+        Returns:
+            Number of tables whose statistics were loaded
+        """
+        with self._lock:
+            tables = sorted({table for query in self.workload for table in query.tables})
+        if not tables:
+            return 0
+        try:
+            imported = db_manager.import_catalog_statistics(backend=backend, tables=tables)
+        except Exception as e:
+            logger.debug(f"Index advisor could not import catalog statistics: {e}")
+            return 0
+        self.load_statistics(imported)
+        return len(imported)
+
+    def _stats_for(self, table_name: str) -> QueryStatistics:
+        stats = self.statistics.get(table_name)
+        if stats is None:
+            stats = QueryStatistics(table_name=table_name, row_count=DEFAULT_ROW_COUNT, table_size_mb=0.0)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Workload capture
+    # ------------------------------------------------------------------
+
+    def record_query(self, sql: str, execution_time: float = 0.0) -> Optional[WorkloadQuery]:
+        """Record one executed SQL statement in the workload window"""
+        if not sql:
+            return None
+        is_write = bool(_WRITE_RE.match(sql))
+        if not is_write and not _SELECT_RE.match(sql):
+            return None  # DDL, transaction control, etc.
+
+        tables = self._extract_tables(sql)
+        if not tables:
+            return None
+
+        entry = WorkloadQuery(
+            sql=sql,
+            tables=tables,
+            predicates=self._extract_predicates(sql, tables),
+            order_by=self._extract_order_by(sql, tables),
+            execution_time=execution_time,
+            is_write=is_write
+        )
+        with self._lock:
+            self.workload.append(entry)
+        return entry
+
+    @staticmethod
+    def _extract_tables(sql: str) -> List[str]:
+        tables = []
+        for match in _TABLE_RE.finditer(sql):
+            name = match.group(2)
+            if name.upper() not in _SQL_KEYWORDS and name not in tables:
+                tables.append(name)
+        return tables
+
+    def _resolve_table(self, qualifier: Optional[str], column: str, tables: List[str]) -> str:
+        """Attribute a column to one of the query's tables"""
+        if qualifier and qualifier in tables:
+            return qualifier
+        if len(tables) == 1:
+            return tables[0]
+        for table in tables:
+            stats = self.statistics.get(table)
+            if stats and column in stats.column_stats:
+                return table
+        return tables[0]
+
+    def _extract_predicates(self, sql: str, tables: List[str]) -> List[Dict[str, Any]]:
+        predicates = []
+        for clause in _WHERE_RE.finditer(sql):
+            for match in _PREDICATE_RE.finditer(clause.group(1)):
+                qualifier, column, operator, value = match.groups()
+                if column.upper() in _SQL_KEYWORDS:
+                    continue
+                operator = ' '.join(operator.upper().split())
+                predicates.append({
+                    "table": self._resolve_table(qualifier, column, tables),
+                    "column": column,
+                    "operator": '<>' if operator == '!=' else operator,
+                    "value": value.strip("'"),
+                })
+                # Column-to-column equality (join key): the right side is a probe column too
+                rhs = re.fullmatch(_QUALIFIED_IDENT, value)
+                if operator == '=' and rhs and not value.startswith("'") and rhs.group(2).upper() not in _SQL_KEYWORDS:
+                    rhs_qualifier, rhs_column = rhs.groups()
+                    predicates.append({
+                        "table": self._resolve_table(rhs_qualifier, rhs_column, tables[::-1]),
+                        "column": rhs_column,
+                        "operator": "=",
+                        "value": None,
+                    })
+        return predicates
+
+    def _extract_order_by(self, sql: str, tables: List[str]) -> List[Tuple[str, str]]:
+        match = _ORDER_BY_RE.search(sql)
+        if not match:
+            return []
+        order_columns = []
+        for part in match.group(1).split(','):
+            ident = re.match(rf'\s*{_QUALIFIED_IDENT}', part)
+            if ident:
+                qualifier, column = ident.groups()
+                order_columns.append((self._resolve_table(qualifier, column, tables), column))
+        return order_columns
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def _existing_index_columns(self, table_name: str) -> set:
+        columns = set()
+        stats = self.statistics.get(table_name)
+        if stats:
+            for info in stats.index_info.values():
+                if info.get('columns'):
+                    columns.add(info['columns'][0])
+        for rec in self.applied.values():
+            if rec.candidate.table_name == table_name:
+                columns.add(rec.candidate.column_name)
+        return columns
+
+    def _index_count(self, table_name: str) -> int:
+        stats = self.statistics.get(table_name)
+        count = len(stats.index_info) if stats else 0
+        return count + sum(1 for rec in self.applied.values() if rec.candidate.table_name == table_name)
+
+    def _candidates(self) -> List[IndexCandidate]:
+        seen = set()
+        candidates = []
+        for query in self.workload:
+            if query.is_write:
+                continue
+            usages = [(p['table'], p['column']) for p in query.predicates] + list(query.order_by)
+            for table_name, column_name in usages:
+                key = (table_name, column_name)
+                if key in seen or column_name in self._existing_index_columns(table_name):
+                    continue
+                seen.add(key)
+                candidates.append(IndexCandidate(table_name, column_name))
+        return candidates
+
+    def _query_cost(self, estimator: CostEstimator, query: WorkloadQuery, table_name: str) -> float:
+        conditions = [p for p in query.predicates if p['table'] == table_name]
+        cost, rows = estimator.estimate_scan_cost(table_name, conditions)
+        order_columns = [c for t, c in query.order_by if t == table_name]
+        if order_columns:
+            indexed = self._existing_index_columns(table_name)
+            stats = estimator.statistics.get(table_name)
+            if stats:
+                indexed |= {info['columns'][0] for info in stats.index_info.values() if info.get('columns')}
+            # A leading index on the sort column lets the backend read rows in order
+            if order_columns[0] not in indexed:
+                cost += estimator.estimate_sort_cost(rows)
+        return cost
+
+    def _score(self, candidate: IndexCandidate) -> IndexRecommendation:
+        table_name = candidate.table_name
+        current = self._stats_for(table_name)
+        hypothetical = QueryStatistics(
+            table_name=current.table_name,
+            row_count=current.row_count,
+            table_size_mb=current.table_size_mb,
+            column_stats=current.column_stats,
+            index_info=dict(current.index_info)
+        )
+        hypothetical.index_info[candidate.index_name] = {
+            "columns": [candidate.column_name], "type": "btree", "unique": False, "hypothetical": True
+        }
+
+        before = CostEstimator({**self.statistics, table_name: current})
+        after = CostEstimator({**self.statistics, table_name: hypothetical})
+
+        cost_before = cost_after = 0.0
+        affected = 0
+        writes = 0
+        for query in self.workload:
+            if table_name not in query.tables:
+                continue
+            if query.is_write:
+                writes += 1
+                continue
+            uses_column = any(p['table'] == table_name and p['column'] == candidate.column_name
+                              for p in query.predicates)
+            uses_column = uses_column or (table_name, candidate.column_name) in query.order_by
+            if not uses_column:
+                continue
+            affected += 1
+            cost_before += self._query_cost(before, query, table_name)
+            cost_after += self._query_cost(after, query, table_name)
+
+        # Every write to the table now also maintains this index
+        maintenance = writes * CostEstimator.COST_PER_INDEX_LOOKUP * max(1.0, current.row_count ** 0.5)
+        return IndexRecommendation(
+            candidate=candidate,
+            estimated_cost_before=cost_before,
+            estimated_cost_after=cost_after + maintenance,
+            benefit=cost_before - cost_after - maintenance,
+            queries_affected=affected,
+            write_amplification=1.0 + self._index_count(table_name) + 1
+        )
+
+    def recommend(self, top_n: int = 10) -> List[IndexRecommendation]:
+        """Return candidate indexes ordered by estimated benefit"""
+        with self._lock:
+            scored = [self._score(c) for c in self._candidates()]
+        scored = [r for r in scored if r.benefit >= self.min_benefit]
+        scored.sort(key=lambda r: r.benefit, reverse=True)
+        return scored[:top_n]
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def _replay(self, db_manager: Any, queries: List[str], backend: Optional[str]) -> Optional[float]:
+        if not queries:
+            return None
+        elapsed = 0.0
+        for sql in queries:
+            start = time.perf_counter()
+            result = db_manager.execute_query(sql, backend=backend)
+            elapsed += time.perf_counter() - start
+            if not result.success:
+                return None
+        return elapsed
+
+    @staticmethod
+    def _backend_type(db_manager: Any, backend: Optional[str]) -> str:
+        config = getattr(db_manager, "config", None)
+        if backend and isinstance(config, dict):
+            backend_type = config.get("backends", {}).get(backend, {}).get("type")
+            if backend_type:
+                return backend_type
+        return detect_backend(db_manager)
+
+    def apply(self, recommendation: IndexRecommendation, db_manager: Any,
+              backend: Optional[str] = None, measure: bool = True) -> IndexRecommendation:
+        """
+        Create the recommended index on the backend.
+
+        The DDL is phrased for the backend's type; backends other than
+        SQLite, PostgreSQL and MySQL are refused (status "failed").
+        When measure is set, a few recorded queries that touch the column are
+        replayed before and after CREATE INDEX to record the observed speedup.
+        """
+        candidate = recommendation.candidate
+        try:
+            create_sql = candidate.create_sql(self._backend_type(db_manager, backend))
+        except ValueError as e:
+            recommendation.status = "failed"
+            recommendation.error_message = str(e)
+            logger.warning(f"Not creating index {candidate.index_name}: {e}")
+            return recommendation
+
+        replay = []
+        if measure:
+            with self._lock:
+                for query in reversed(self.workload):
+                    if query.is_write or candidate.table_name not in query.tables:
+                        continue
+                    if any(p['column'] == candidate.column_name for p in query.predicates) or \
+                            (candidate.table_name, candidate.column_name) in query.order_by:
+                        replay.append(query.sql)
+                    if len(replay) >= self.replay_limit:
+                        break
+            recommendation.observed_time_before = self._replay(db_manager, replay, backend)
+
+        result = db_manager.execute_query(create_sql, backend=backend)
+        if not result.success:
+            recommendation.status = "failed"
+            recommendation.error_message = result.error_message
+            logger.warning(f"Failed to create index {candidate.index_name}: {result.error_message}")
+            return recommendation
+
+        recommendation.status = "applied"
+        if measure:
+            recommendation.observed_time_after = self._replay(db_manager, replay, backend)
+
+        with self._lock:
+            self.applied[candidate.index_name] = recommendation
+
+        logger.info(f"Applied index {candidate.index_name} (expected speedup "
+                    f"{recommendation.expected_speedup:.2f}x, observed {recommendation.observed_speedup})")
+        return recommendation
+
+    def auto_apply_recommendations(self, db_manager: Any, backend: Optional[str] = None,
+                                   top_n: int = 3) -> List[IndexRecommendation]:
+        """Apply top recommendations that respect the write-amplification limit"""
+        results = []
+        for rec in self.recommend(top_n=top_n):
+            # Re-check: earlier applications in this loop raise the table's index count
+            rec.write_amplification = 1.0 + self._index_count(rec.candidate.table_name) + 1
+            if rec.write_amplification > self.max_write_amplification:
+                rec.status = "rejected"
+                rec.error_message = (f"write amplification {rec.write_amplification:.1f} exceeds "
+                                     f"limit {self.max_write_amplification:.1f}")
+                results.append(rec)
+                continue
+            results.append(self.apply(rec, db_manager, backend=backend))
+        return results
+
+    def get_report(self) -> Dict[str, Any]:
+        """Summarize the workload window, pending and applied indexes"""
+        with self._lock:
+            column_usage = defaultdict(int)
+            for query in self.workload:
+                for p in query.predicates:
+                    column_usage[f"{p['table']}.{p['column']}"] += 1
+                for table_name, column_name in query.order_by:
+                    column_usage[f"{table_name}.{column_name}"] += 1
+            applied = [rec.to_dict() for rec in self.applied.values()]
+            window = len(self.workload)
+            writes = sum(1 for q in self.workload if q.is_write)
+
+        return {
+            "window_size": window,
+            "write_queries": writes,
+            "column_usage": dict(column_usage),
+            "recommendations": [rec.to_dict() for rec in self.recommend()],
+            "applied": applied,
+            "auto_apply": self.auto_apply,
+            "max_write_amplification": self.max_write_amplification,
+        }
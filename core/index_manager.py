@@ -4,9 +4,15 @@ SAIQL Index Manager (CE Edition)
 ================================
 
 Manages all indexes for SAIQL tables and coordinates index selection.
-CE Edition: Only B-tree and Hash indexes available.
+CE Edition: B-tree, Hash and Trigram indexes available.
+
+Thread safety: the index structures handle their own concurrency (B-tree
+copy-on-write snapshots, hash index striped writer locks, trigram index
+append-only postings), so Index and IndexManager only serialize what spans
+several calls - unique-key check-then-insert and the index registry.
 """
 
+import threading
 from typing import Any, List, Optional, Dict, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
@@ -30,15 +36,18 @@ else:
 try:
     from .btree import BTree
     from .hash_index import HashIndex
+    from .trigram_index import TrigramIndex
 except ImportError:
     from btree import BTree
     from hash_index import HashIndex
+    from trigram_index import TrigramIndex
 
 
 class IndexType(Enum):
     """Supported index types (CE Edition)"""
     BTREE = "btree"
     HASH = "hash"
+    TRIGRAM = "trigram"
 
 
 @dataclass
@@ -58,11 +67,14 @@ class Index:
     def __init__(self, definition: IndexDefinition):
         self.definition = definition
         self.firewall = None
+        self._unique_lock = threading.Lock()
 
         if definition.index_type == IndexType.BTREE:
             self.structure = BTree(order=5)
         elif definition.index_type == IndexType.HASH:
             self.structure = HashIndex(initial_size=1024)
+        elif definition.index_type == IndexType.TRIGRAM:
+            self.structure = TrigramIndex()
         else:
             raise ValueError(f"Unsupported index type: {definition.index_type}")
 
@@ -74,11 +86,15 @@ class Index:
         Raises ValueError if index is unique and key already exists.
         """
         if self.definition.is_unique:
-            existing = self.structure.search(key)
-            if existing:
-                raise ValueError(
-                    f"Duplicate key '{key}' in unique index '{self.definition.index_name}'"
-                )
+            # Check and insert under one lock so two writers can't both pass the check
+            with self._unique_lock:
+                existing = self.structure.search(key)
+                if existing:
+                    raise ValueError(
+                        f"Duplicate key '{key}' in unique index '{self.definition.index_name}'"
+                    )
+                self.structure.insert(key, row_id)
+            return
         self.structure.insert(key, row_id)
 
     def set_firewall(self, firewall: Any) -> None:
@@ -91,6 +107,9 @@ class Index:
 
         Raises ValueError on first duplicate if index is unique.
         """
+        if not self.definition.is_unique and hasattr(self.structure, 'insert_many'):
+            self.structure.insert_many(items)  # Single copy-on-write epoch for the batch
+            return
         for key, row_id in items:
             self.insert(key, row_id)  # Delegates to insert() which checks uniqueness
 
@@ -102,6 +121,18 @@ class Index:
             return self.structure.range_search(min_key, max_key)
         return []
 
+    def like_search(self, pattern: str) -> List[Any]:
+        """Row ids matching a LIKE pattern (trigram indexes only)"""
+        if hasattr(self.structure, 'like_search'):
+            return self.structure.like_search(pattern)
+        return []
+
+    def similarity_search(self, pattern: str, threshold: float = 0.7) -> List[Any]:
+        """Row ids SIMILAR to pattern at threshold (trigram indexes only)"""
+        if hasattr(self.structure, 'similarity_search'):
+            return self.structure.similarity_search(pattern, threshold)
+        return []
+
     def delete(self, key: Any, row_id: Any = None) -> bool:
         return self.structure.delete(key, row_id)
 
@@ -131,6 +162,7 @@ class Index:
                     idx.definition = definition
                     idx.structure = loaded
                     idx.firewall = None
+                    idx._unique_lock = threading.Lock()
                     return idx
         elif definition.index_type == IndexType.HASH:
             if hasattr(HashIndex, 'load_bundle'):
@@ -140,6 +172,7 @@ class Index:
                     idx.definition = definition
                     idx.structure = loaded
                     idx.firewall = None
+                    idx._unique_lock = threading.Lock()
                     return idx
         return None
 
@@ -151,6 +184,7 @@ class IndexManager:
         self.indexes: Dict[str, Index] = {}
         self.storage_path = storage_path
         self._table_indexes: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()  # Guards the registry dicts, not the structures
 
     def _schema_fingerprint(self, table_name: str, column_name: str) -> str:
         return f"{table_name}:{column_name}:v1"
@@ -165,6 +199,19 @@ class IndexManager:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Index:
         """Create a new index"""
+        with self._lock:
+            return self._create_index_locked(index_name, table_name, column_name,
+                                             index_type, is_unique, metadata)
+
+    def _create_index_locked(
+        self,
+        index_name: str,
+        table_name: str,
+        column_name: str,
+        index_type: IndexType,
+        is_unique: bool,
+        metadata: Optional[Dict[str, Any]]
+    ) -> Index:
         if index_name in self.indexes:
             raise ValueError(f"Index {index_name} already exists")
 
@@ -206,8 +253,9 @@ class IndexManager:
         return self.indexes.get(index_name)
 
     def get_table_indexes(self, table_name: str) -> List[Index]:
-        index_names = self._table_indexes.get(table_name, [])
-        return [self.indexes[name] for name in index_names if name in self.indexes]
+        with self._lock:
+            index_names = list(self._table_indexes.get(table_name, []))
+            return [self.indexes[name] for name in index_names if name in self.indexes]
 
     def select_best_index(
         self,
@@ -234,6 +282,13 @@ class IndexManager:
 
         btree_indexes = [idx for idx in column_indexes if idx.definition.index_type == IndexType.BTREE]
         hash_indexes = [idx for idx in column_indexes if idx.definition.index_type == IndexType.HASH]
+        trigram_indexes = [idx for idx in column_indexes if idx.definition.index_type == IndexType.TRIGRAM]
+
+        # RULE 0: Substring and fuzzy matching - only a trigram index avoids a full scan
+        if operation in ('LIKE', 'SIMILAR'):
+            if trigram_indexes:
+                logger.debug(f"Selected Trigram for {operation}")
+                return trigram_indexes[0]
 
         # RULE 1: Range queries - B-tree
         if operation in ('>', '<', '>=', '<=', 'BETWEEN'):
@@ -277,19 +332,20 @@ class IndexManager:
         return column_indexes[0] if column_indexes else None
 
     def drop_index(self, index_name: str) -> bool:
-        if index_name not in self.indexes:
-            return False
+        with self._lock:
+            if index_name not in self.indexes:
+                return False
 
-        index = self.indexes[index_name]
-        table_name = index.definition.table_name
+            index = self.indexes[index_name]
+            table_name = index.definition.table_name
 
-        del self.indexes[index_name]
+            del self.indexes[index_name]
 
-        if table_name in self._table_indexes:
-            self._table_indexes[table_name] = [
-                name for name in self._table_indexes[table_name]
-                if name != index_name
-            ]
+            if table_name in self._table_indexes:
+                self._table_indexes[table_name] = [
+                    name for name in self._table_indexes[table_name]
+                    if name != index_name
+                ]
 
         logger.info(f"Dropped index: {index_name}")
         return True
@@ -341,7 +397,10 @@ class IndexManager:
             "indexes_by_table": {}
         }
 
-        for index_name, index in self.indexes.items():
+        with self._lock:
+            indexes = list(self.indexes.items())
+
+        for index_name, index in indexes:
             idx_type = index.definition.index_type.value
             table = index.definition.table_name
 
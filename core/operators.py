@@ -21,13 +21,280 @@ Version: 1.0.0 (Consolidated)
 
 Change Notes (2026-01-20):
 - Fixed execute_distinct() to preserve insertion order using dict.fromkeys()
+
+Change Notes (2026-10-18):
+- Added execute_top_k() (TOPK): ORDER BY ... LIMIT over rows with a
+  bounded heap (core.top_k), O(k) memory and stable ties
+- Added batch kernels (BATCH_COMPARE, BATCH_LIKE, BATCH_AGGREGATE) over
+  ColumnVector: one type pass per column, then NumPy (or array('d'))
+  comparisons returning selection masks; per-row results and NULL
+  handling match the scalar operators. SUM/AVG/MIN/MAX use them for
+  lists of BATCH_MIN_ROWS or more
+- execute_like() compiles patterns once (compile_like); % and _ are now
+  actually treated as wildcards (re.escape leaves them unescaped, so the
+  old replacement never matched)
+- execute_similarity() now scores trigram containment (trigram_similarity:
+  share of the pattern's trigrams found in the text) instead of shared
+  characters, so it ranks fuzzy name matches sensibly and can be answered
+  from a trigram index (core.trigram_index)
+- Added execute_group_aggregate() (GROUP_AGGREGATE): GROUP BY with
+  COUNT/SUM/AVG/MIN/MAX/COUNT DISTINCT via core.hash_aggregate
 """
 
+import array
+import operator
 import re
-from typing import Dict, List, Any, Optional, Union
+from functools import lru_cache
+from itertools import compress
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Union
 from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 from core.logging import logger
+from core.top_k import top_k
+from core.hash_aggregate import hash_aggregate
+
+# Optional numpy import - batch kernels fall back to typed arrays without it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# NumPy 2 vectorized string functions (np.strings) over StringDType arrays
+NUMPY_STRINGS = NUMPY_AVAILABLE and hasattr(np, 'strings') and hasattr(np, 'dtypes') \
+    and hasattr(np.dtypes, 'StringDType')
+
+# Lists at least this long are aggregated with the batch kernels
+BATCH_MIN_ROWS = 1024
+
+# Largest magnitude every float64 represents exactly (exact != / == comparisons)
+_EXACT_FLOAT_LIMIT = 2 ** 53
+
+_ORDERING = {'>': operator.gt, '<': operator.lt, '>=': operator.ge, '<=': operator.le}
+
+
+@lru_cache(maxsize=256)
+def compile_like(pattern: str) -> 're.Pattern':
+    """Compile a SQL LIKE pattern (% = 0+ chars, _ = 1 char) to a cached regex"""
+    regex = ''.join('.*' if ch == '%' else '.' if ch == '_' else re.escape(ch) for ch in pattern)
+    return re.compile(regex, re.IGNORECASE | re.DOTALL)
+
+
+# Characters re.IGNORECASE matches to an ASCII letter that str.lower() does not map to it
+_CASE_FOLD = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's'})
+
+
+def fold_case(text: str) -> str:
+    """Lowercase text so ASCII literals match it exactly where compile_like matches them"""
+    return text.translate(_CASE_FOLD).lower()
+
+
+def trigrams(text: Any) -> frozenset:
+    """Distinct trigrams of str(text), case-folded and padded as '  text '"""
+    padded = f"  {fold_case(str(text))} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+_pattern_trigrams = lru_cache(maxsize=256)(trigrams)
+
+
+def trigram_similarity(text: Any, pattern: Any) -> float:
+    """Share of the pattern's trigrams that occur in text (0.0 for an empty pattern)"""
+    if str(pattern) == '':
+        return 0.0
+    grams = _pattern_trigrams(str(pattern))
+    return len(grams & trigrams(text)) / len(grams)
+
+
+@lru_cache(maxsize=256)
+def _like_shape(pattern: str) -> Optional[tuple]:
+    """
+    ('exact' | 'prefix' | 'suffix' | 'contains', lowered literal) for ASCII
+    patterns that are a literal with % at either end, else None.
+    """
+    if not pattern.isascii() or '_' in pattern:
+        return None
+    literal = pattern.strip('%')
+    if '%' in literal:
+        return None
+    starts, ends = pattern.startswith('%'), pattern.endswith('%') and len(pattern) > len(literal)
+    kind = 'contains' if starts and ends else 'suffix' if starts else 'prefix' if ends else 'exact'
+    return kind, literal.lower()
+
+
+def _is_numeric(val: Any) -> bool:
+    """Numeric for the = operator: int, float or a float-parsable string (not bool)"""
+    if isinstance(val, bool):
+        return False
+    if isinstance(val, (int, float)):
+        return True
+    if isinstance(val, str):
+        try:
+            float(val)
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+class ColumnVector:
+    """
+    A column prepared once for the batch kernels.
+
+    Values are classified by Python type in a single pass, numeric columns
+    are converted to a float64 vector (NumPy array, or array('d') without
+    NumPy) with NaN at NULLs, and NULLs (None) are kept as a separate mask.
+    NumPy arrays are treated like their tolist() values.
+    """
+
+    def __init__(self, values: Sequence[Any]):
+        self._array = None
+        if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+            if values.dtype.kind in 'iuf':
+                self._array = values
+                self._items = None
+                self.types = frozenset({float} if values.dtype.kind == 'f' else {int})
+                self.has_nulls = False
+                self._prepared = {}
+                return
+            values = values.tolist()
+        self._items = values if isinstance(values, list) else list(values)
+        types = set(map(type, self._items))
+        self.has_nulls = type(None) in types
+        types.discard(type(None))
+        self.types = frozenset(types)
+        self._prepared: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._array) if self._array is not None else len(self._items)
+
+    @property
+    def items(self) -> List[Any]:
+        """Values as Python objects (what the scalar operators see)"""
+        if self._items is None:
+            self._items = self._array.tolist()
+        return self._items
+
+    @property
+    def is_numeric(self) -> bool:
+        """Only int/float values (bool excluded) and NULLs"""
+        return bool(self.types) and self.types <= {int, float}
+
+    @property
+    def is_string(self) -> bool:
+        return self.types == {str}
+
+    def _cached(self, name: str, build):
+        if name not in self._prepared:
+            self._prepared[name] = build()
+        return self._prepared[name]
+
+    def nulls(self):
+        """Mask of NULL positions"""
+        def build():
+            if not self.has_nulls:
+                return _full(len(self), False)
+            if NUMPY_AVAILABLE:
+                return np.array(self.items, dtype=object) == None  # noqa: E711 - elementwise
+            return [x is None for x in self.items]
+        return self._cached('nulls', build)
+
+    def numbers(self):
+        """float64 vector with NaN at NULLs, or None if the column is not numeric"""
+        def build():
+            if self._array is not None:
+                return self._array.astype(np.float64, copy=False)
+            if self.is_numeric:
+                source = self.items
+            elif self.is_string:
+                source = self.parsed()
+                if any(x is None for x, item in zip(source, self.items) if item is not None):
+                    return None
+            else:
+                return None
+            try:
+                if NUMPY_AVAILABLE:
+                    return np.array(source, dtype=np.float64)
+                return array.array('d', (float('nan') if x is None else float(x) for x in source))
+            except OverflowError:
+                return None
+        return self._cached('numbers', build)
+
+    def parsed(self) -> List[Optional[float]]:
+        """String columns: float(value) where it parses, else None"""
+        def build():
+            result = []
+            for item in self.items:
+                try:
+                    result.append(float(item) if item is not None else None)
+                except ValueError:
+                    result.append(None)
+            return result
+        return self._cached('parsed', build)
+
+    def lowered(self):
+        """String columns: value.lower() (None for NULLs)"""
+        def build():
+            lowered = [x.lower() if x is not None else None for x in self.items]
+            if NUMPY_STRINGS and not self.has_nulls:
+                return np.array(lowered, dtype=np.dtypes.StringDType())
+            return np.array(lowered, dtype=object) if NUMPY_AVAILABLE else lowered
+        return self._cached('lowered', build)
+
+    def is_ascii(self) -> bool:
+        """String columns without NULLs whose values are all ASCII"""
+        return self._cached('ascii', lambda: self.is_string and not self.has_nulls
+                            and ''.join(self.items).isascii())
+
+    def objects(self):
+        """Values as an object vector for elementwise == / !="""
+        return self._cached('objects', lambda: np.array(self.items, dtype=object)
+                            if NUMPY_AVAILABLE else self.items)
+
+    def exact_floats(self) -> bool:
+        """True if converting the numeric values to float64 lost nothing"""
+        def build():
+            if self.types <= {float}:
+                return True
+            numbers = self.numbers()
+            if numbers is None:
+                return False
+            if NUMPY_AVAILABLE:
+                # NaN (NULL) compares false, so only real values can fail
+                return not bool((np.abs(numbers) >= _EXACT_FLOAT_LIMIT).any())
+            return all(abs(x) < _EXACT_FLOAT_LIMIT for x in numbers if x == x)
+        return self._cached('exact_floats', build)
+
+
+def _full(length: int, value: bool):
+    return np.full(length, value, dtype=bool) if NUMPY_AVAILABLE else [value] * length
+
+
+def _elementwise(fn, vector, value):
+    """Apply a binary operator to a vector and a scalar, giving a mask"""
+    if NUMPY_AVAILABLE:
+        return np.asarray(fn(vector, value), dtype=bool)
+    return [bool(fn(x, value)) for x in vector]
+
+
+def _mask_or(left, right):
+    return left | right if NUMPY_AVAILABLE else [a or b for a, b in zip(left, right)]
+
+
+def _mask_and_not(left, right):
+    return left & ~right if NUMPY_AVAILABLE else [a and not b for a, b in zip(left, right)]
+
+
+def _mask_not(mask):
+    return ~mask if NUMPY_AVAILABLE else [not a for a in mask]
+
+
+def select(values: Sequence[Any], mask) -> List[Any]:
+    """Values (e.g. rows) where a batch kernel's mask is true"""
+    if NUMPY_AVAILABLE and isinstance(mask, np.ndarray):
+        return [values[i] for i in np.flatnonzero(mask)]
+    return list(compress(values, mask))
 
 @dataclass
 class ExecutionContext:
@@ -101,6 +368,7 @@ class SAIQLOperators:
             'MIN': self.execute_min,
             'MAX': self.execute_max,
             'DISTINCT': self.execute_distinct,
+            'GROUP_AGGREGATE': self.execute_group_aggregate,
             
             # Date/time functions
             'NOW': self.execute_now,
@@ -124,6 +392,12 @@ class SAIQLOperators:
             # Ordering/Limiting
             'ORDER': self.execute_order_by,
             'LIMIT': self.execute_limit,
+            'TOPK': self.execute_top_k,
+            
+            # Batch kernels (column vectors -> masks / aggregate values)
+            'BATCH_COMPARE': self.execute_batch_compare,
+            'BATCH_LIKE': self.execute_batch_like,
+            'BATCH_AGGREGATE': self.execute_batch_aggregate,
         }
     
     def execute_operator(self, operator: str, *args):
@@ -326,14 +600,9 @@ class SAIQLOperators:
     
     def execute_like(self, text: str, pattern: str) -> bool:
         """Execute LIKE pattern matching (SQL semantics)"""
-        # First escape all regex metacharacters, then convert SQL wildcards
-        # This ensures patterns like "test.file" match literally, not as regex
-        escaped = re.escape(pattern)
-        # Convert SQL wildcards: % = 0+ chars, _ = exactly 1 char
-        # re.escape turns % into \% and _ into \_, so we replace those
-        regex_pattern = escaped.replace(r'\%', '.*').replace(r'\_', '.')
-        # Use fullmatch for complete string matching (SQL LIKE matches entire string)
-        return bool(re.fullmatch(regex_pattern, str(text), re.IGNORECASE))
+        # Other characters match literally, so "test.file" is not a regex;
+        # fullmatch because SQL LIKE matches the entire string
+        return compile_like(pattern).fullmatch(str(text)) is not None
     
     def execute_concat(self, *strings) -> str:
         """Execute string concatenation"""
@@ -365,12 +634,16 @@ class SAIQLOperators:
         """Execute SUM aggregate"""
         if not isinstance(data, list):
             data = [data]
+        if len(data) >= BATCH_MIN_ROWS:
+            return self.execute_batch_aggregate('SUM', data)
         return sum(float(x) for x in data if x is not None)
     
     def execute_average(self, data: List[Any]) -> float:
         """Execute AVG aggregate"""
         if not isinstance(data, list):
             data = [data]
+        if len(data) >= BATCH_MIN_ROWS:
+            return self.execute_batch_aggregate('AVG', data)
         numbers = [float(x) for x in data if x is not None]
         return sum(numbers) / len(numbers) if numbers else 0.0
     
@@ -378,6 +651,8 @@ class SAIQLOperators:
         """Execute MIN aggregate"""
         if not data:
             return None
+        if isinstance(data, list) and len(data) >= BATCH_MIN_ROWS:
+            return self.execute_batch_aggregate('MIN', data)
         numbers = [float(x) for x in data if x is not None]
         return min(numbers) if numbers else None
     
@@ -385,9 +660,18 @@ class SAIQLOperators:
         """Execute MAX aggregate"""
         if not data:
             return None
+        if isinstance(data, list) and len(data) >= BATCH_MIN_ROWS:
+            return self.execute_batch_aggregate('MAX', data)
         numbers = [float(x) for x in data if x is not None]
         return max(numbers) if numbers else None
     
+    def execute_group_aggregate(self, data: Iterable[Dict[str, Any]], group_by: Union[str, List[str]],
+                                aggregates: List[Any]) -> List[Dict[str, Any]]:
+        """Execute GROUP BY over rows with hash aggregation (one row per group)"""
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        logger.debug(f"GROUP BY {group_by}: {aggregates}")
+        return hash_aggregate(data, group_by, aggregates)
+    
     def execute_distinct(self, data: List[Any]) -> List[Any]:
         """Execute DISTINCT (remove duplicates while preserving insertion order)"""
         # Use dict.fromkeys() to preserve insertion order (Python 3.7+)
@@ -459,17 +743,8 @@ class SAIQLOperators:
     
     def execute_similarity(self, text: str, pattern: str, threshold: float = 0.7) -> bool:
         """Execute similarity search (SIMILAR)"""
-        # Simple similarity based on common characters
-        text_set = set(text.lower())
-        pattern_set = set(pattern.lower())
-        
-        if not pattern_set:
-            return False
-        
-        intersection = text_set & pattern_set
-        similarity = len(intersection) / len(pattern_set)
-        
-        return similarity >= threshold
+        # Trigram containment; TrigramIndex.similarity_search gives the same answer from an index
+        return trigram_similarity(text, pattern) >= threshold
     
     def execute_is(self, left: Any, right: Any) -> bool:
         """Execute IS comparison (for NULL checks)"""
@@ -545,6 +820,194 @@ class SAIQLOperators:
             "status": "prepared"
         }
     
+    def execute_top_k(self, data: Iterable[Dict[str, Any]], order_by: Union[str, List[Any]],
+                      count: int, presorted: bool = False) -> List[Dict[str, Any]]:
+        """Execute ORDER BY ... LIMIT count over rows, keeping only count rows in memory"""
+        logger.debug(f"TOP-K {count} ORDER BY {order_by}")
+        return top_k(data, order_by, int(count), presorted=presorted)
+    
+    # ========================================================================
+    # BATCH KERNELS
+    # ========================================================================
+    
+    def execute_batch_compare(self, column: Union[Sequence[Any], ColumnVector], op: str, value: Any):
+        """
+        Evaluate "column <op> value" for every element, returning a selection mask.
+
+        Element i of the mask equals self.operators[op](column[i], value),
+        including NULL handling and TypeErrors for NULLs in ordering
+        comparisons. Columns that are not uniformly numeric or string are
+        evaluated element by element with the scalar operator.
+        """
+        if op not in ('=', '==', '!=') and op not in _ORDERING:
+            raise ValueError(f"Unknown comparison operator: {op}")
+        vector = column if isinstance(column, ColumnVector) else ColumnVector(column)
+
+        mask = None
+        if vector.is_numeric or not vector.types:
+            mask = self._compare_numeric(vector, op, value)
+        elif vector.is_string:
+            mask = self._compare_string(vector, op, value)
+
+        if mask is None:
+            scalar = self.operators[op]
+            mask = [bool(scalar(x, value)) for x in vector.items]
+            if NUMPY_AVAILABLE:
+                mask = np.array(mask, dtype=bool)
+        return mask
+
+    def _compare_numeric(self, vector: ColumnVector, op: str, value: Any):
+        """Kernels for int/float columns; None means use the scalar fallback"""
+        numbers = vector.numbers()
+        if numbers is None:
+            return None
+        nulls = vector.nulls()
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+
+        if op == '=':
+            if value is None:
+                return nulls
+            if _is_numeric(value) or isinstance(value, bool):
+                # Both numeric compare as floats; int/float == bool is == 1.0 / 0.0 too
+                return _elementwise(operator.eq, numbers, float(value))
+            if isinstance(value, str):
+                return _full(len(vector), False)
+            return None
+
+        if op == '!=':
+            if value is None:
+                return _mask_not(nulls)
+            if isinstance(value, str):
+                return _full(len(vector), True)
+            if isinstance(value, (int, float)) and vector.exact_floats() and abs(value) < _EXACT_FLOAT_LIMIT:
+                # NULL != number is true
+                return _mask_or(_elementwise(operator.ne, numbers, float(value)), nulls)
+            return None
+
+        if op == '==':
+            if value is None:
+                return nulls
+            if not is_number:
+                return _full(len(vector), False)
+            if vector.types != {type(value)}:
+                return None if len(vector.types) > 1 else _full(len(vector), False)
+            if not (vector.exact_floats() and abs(value) < _EXACT_FLOAT_LIMIT):
+                return None
+            return _mask_and_not(_elementwise(operator.eq, numbers, float(value)), nulls)
+
+        # Ordering: the scalar operators raise for NULLs, so keep that path for them
+        if vector.has_nulls:
+            return None
+        try:
+            bound = float(value)
+        except (TypeError, ValueError):
+            return None
+        return _elementwise(_ORDERING[op], numbers, bound)
+
+    def _compare_string(self, vector: ColumnVector, op: str, value: Any):
+        """Kernels for str columns; None means use the scalar fallback"""
+        nulls = vector.nulls()
+
+        if op == '=':
+            if value is None:
+                return nulls
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if isinstance(value, str) and not _is_numeric(value):
+                # Numeric elements vs non-numeric value fall through to the case-insensitive compare
+                return _elementwise(operator.eq, vector.lowered(), value.lower())
+            if is_number or isinstance(value, str):
+                bound = float(value)
+                parsed = vector.parsed()
+                if is_number:
+                    mask = [p is not None and p == bound for p in parsed]
+                else:
+                    lowered, target = vector.lowered(), value.lower()
+                    mask = [p == bound if p is not None else lowered[i] == target
+                            for i, p in enumerate(parsed)]
+                return np.array(mask, dtype=bool) if NUMPY_AVAILABLE else mask
+            return None
+
+        if op in ('!=', '=='):
+            if value is None:
+                return _mask_not(nulls) if op == '!=' else nulls
+            if isinstance(value, str):
+                fn = operator.ne if op == '!=' else operator.eq
+                return _elementwise(fn, vector.objects(), value)
+            return None
+
+        if vector.has_nulls:
+            return None
+        numbers = vector.numbers()
+        if numbers is None:
+            return None
+        try:
+            bound = float(value)
+        except (TypeError, ValueError):
+            return None
+        return _elementwise(_ORDERING[op], numbers, bound)
+
+    def execute_batch_like(self, column: Union[Sequence[Any], ColumnVector], pattern: str):
+        """Evaluate "column LIKE pattern" for every element (NULL is matched as 'None', as in execute_like)"""
+        vector = column if isinstance(column, ColumnVector) else ColumnVector(column)
+        shape = _like_shape(pattern)
+        if shape and vector.is_ascii():
+            # ASCII text against an ASCII literal: IGNORECASE matching is lower() equality
+            kind, literal = shape
+            lowered = vector.lowered()
+            if kind == 'exact':
+                return _elementwise(operator.eq, lowered, literal)
+            if NUMPY_STRINGS:
+                if kind == 'contains':
+                    return np.strings.find(lowered, literal) >= 0
+                return (np.strings.startswith if kind == 'prefix' else np.strings.endswith)(lowered, literal)
+            test = {'prefix': str.startswith, 'suffix': str.endswith,
+                    'contains': str.__contains__}[kind]
+            results = (test(text, literal) for text in lowered)
+        else:
+            matcher = compile_like(pattern).fullmatch
+            texts = vector.items if vector.is_string and not vector.has_nulls else map(str, vector.items)
+            results = (m is not None for m in map(matcher, texts))
+        if NUMPY_AVAILABLE:
+            return np.fromiter(results, dtype=bool, count=len(vector))
+        return list(results)
+
+    def execute_batch_aggregate(self, function: str, column: Union[Sequence[Any], ColumnVector]) -> Any:
+        """
+        Evaluate COUNT/SUM/AVG/MIN/MAX over a column.
+
+        Results match the scalar aggregates (NULLs skipped, values as float);
+        sums of numeric columns use NumPy's pairwise summation.
+        """
+        function = function.upper()
+        vector = column if isinstance(column, ColumnVector) else ColumnVector(column)
+        if function == 'COUNT':
+            return len(vector)
+        if function not in ('SUM', 'AVG', 'MIN', 'MAX'):
+            raise ValueError(f"Unknown aggregate function: {function}")
+
+        numbers = vector.numbers() if (vector.is_numeric or vector.is_string) else None
+        if numbers is None:
+            # Mixed types: float() each value as the scalar aggregates do
+            values = [float(x) for x in vector.items if x is not None]
+        elif NUMPY_AVAILABLE:
+            values = numbers[~vector.nulls()] if vector.has_nulls else numbers
+        else:
+            values = [x for x, null in zip(numbers, vector.nulls()) if not null] if vector.has_nulls else numbers
+
+        count = len(values)
+        if function == 'SUM':
+            return float(np.sum(values)) if NUMPY_AVAILABLE and count else sum(values)
+        if function == 'AVG':
+            if not count:
+                return 0.0
+            return float(np.sum(values)) / count if NUMPY_AVAILABLE else sum(values) / count
+        if not count:
+            return None
+        if NUMPY_AVAILABLE and not np.isnan(values).any():
+            return float(np.min(values) if function == 'MIN' else np.max(values))
+        # NaN: builtin min/max, whose result depends on where the NaN is
+        return float(min(values) if function == 'MIN' else max(values))
+    
     # ========================================================================
     # UTILITY METHODS
     # ========================================================================
@@ -562,7 +1025,8 @@ class SAIQLOperators:
 
 
 # Export for easy import
-__all__ = ['SAIQLOperators', 'ExecutionContext']
+__all__ = ['SAIQLOperators', 'ExecutionContext', 'ColumnVector', 'compile_like', 'select',
+           'fold_case', 'trigrams', 'trigram_similarity']
 
 
 def main():
@@ -587,12 +1051,12 @@ def main():
     
     print("\nRunning operator tests:\n")
     
-    for name, operator, args in tests:
+    for name, op, args in tests:
         try:
-            result = operators.execute_operator(operator, *args)
-            print(f"[OK] {name:15} | {operator:10} | Args: {args} | Result: {result}")
+            result = operators.execute_operator(op, *args)
+            print(f"[OK] {name:15} | {op:10} | Args: {args} | Result: {result}")
         except Exception as e:
-            print(f"[FAIL] {name:15} | {operator:10} | ERROR: {e}")
+            print(f"[FAIL] {name:15} | {op:10} | ERROR: {e}")
     
     # Show performance stats
     print(f"\nPerformance Statistics:")
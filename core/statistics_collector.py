@@ -12,17 +12,28 @@ Statistics collected:
 - Index availability
 - Average row size
 
+Collection is single-pass and bounded-memory: rows are consumed in batches
+(lists, generators or DB-API fetchmany) into mergeable sketch states from
+stats_sketches (HyperLogLog NDV, heavy-hitter MCVs, reservoir sample for
+equi-depth histograms), so large tables can also be analyzed in parallel.
+
 Author: Apollo & Claude
-Version: 1.0.0
+Version: 1.1.0
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterable, Optional
 from dataclasses import dataclass, field
-from collections import defaultdict
 import json
 from pathlib import Path
 
+try:
+    from .stats_sketches import TableStatisticsState, ColumnStatisticsState
+except ImportError:
+    # Fallback for standalone testing
+    from stats_sketches import TableStatisticsState, ColumnStatisticsState
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,7 +47,8 @@ class ColumnStatistics:
     max_value: Any = None
     avg_length: float = 0.0
     most_common_values: List[Any] = field(default_factory=list)
-    histogram: Dict[Any, int] = field(default_factory=dict)
+    histogram: Dict[Any, int] = field(default_factory=dict)  # Bucket index -> estimated rows
+    histogram_bounds: List[Any] = field(default_factory=list)  # Equi-depth bucket boundaries
 
 
 @dataclass
@@ -68,12 +80,19 @@ class TableStatistics:
         # More sophisticated would use histograms
         return 1.0 / col_stats.distinct_count
     
-    def estimate_join_size(self, other: 'TableStatistics', join_column: str) -> int:
+    def estimate_join_size(self, other: 'TableStatistics', join_column: str,
+                           other_column: Optional[str] = None) -> int:
         """
         Estimate the size of a join result
         
         Uses the formula: |R ⋈ S| ≈ (|R| * |S|) / max(distinct(R.key), distinct(S.key))
+
+        Args:
+            other: Statistics of the other relation
+            join_column: Join column in this relation
+            other_column: Join column in the other relation (defaults to join_column)
         """
+        other_column = other_column or join_column
         if self.row_count == 0 or other.row_count == 0:
             return 0
         
@@ -84,8 +103,8 @@ class TableStatistics:
         if join_column in self.columns:
             self_distinct = max(1, self.columns[join_column].distinct_count)
         
-        if join_column in other.columns:
-            other_distinct = max(1, other.columns[join_column].distinct_count)
+        if other_column in other.columns:
+            other_distinct = max(1, other.columns[other_column].distinct_count)
         
         # Join size estimation
         max_distinct = max(self_distinct, other_distinct)
@@ -94,128 +113,186 @@ class TableStatistics:
         return estimated_size
 
 
+def _collect_partition_state(task: tuple) -> TableStatisticsState:
+    """Worker entry point: build a partial state for one partition of rows"""
+    table_name, rows, batch_size, options = task
+    state = TableStatisticsState(table_name, **options)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            state.update(batch)
+            batch = []
+    state.update(batch)
+    return state
+
+
 class StatisticsCollector:
     """
     Collects and maintains statistics for query optimization
     """
     
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        batch_size: int = 10000,
+        sample_size: int = 10000,
+        mcv_capacity: int = 100,
+        histogram_buckets: int = 10
+    ):
+        """
+        Args:
+            storage_path: Directory for persisted statistics
+            batch_size: Rows consumed per batch (and per fetchmany call)
+            sample_size: Reservoir sample size per column for histograms
+            mcv_capacity: Candidates tracked by the heavy-hitters sketch
+            histogram_buckets: Equi-depth histogram buckets per column
+        """
         self.storage_path = Path(storage_path) if storage_path else Path("stats")
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.histogram_buckets = histogram_buckets
+        self.sketch_options = {"sample_size": sample_size, "mcv_capacity": mcv_capacity}
         
         self.table_stats: Dict[str, TableStatistics] = {}
         self._load_statistics()
     
-    def collect_statistics(self, table_name: str, data: List[Dict[str, Any]]) -> TableStatistics:
+    def collect_statistics(self, table_name: str, data: Iterable[Dict[str, Any]]) -> TableStatistics:
         """
-        Collect statistics from a dataset
+        Collect statistics from a dataset in a single pass
         
         Args:
             table_name: Name of the table
-            data: List of row dictionaries
+            data: Row dictionaries (list or any iterable, e.g. a generator)
             
         Returns:
             TableStatistics object
         """
-        if not data:
+        state = _collect_partition_state((table_name, data, self.batch_size, self.sketch_options))
+        if state.row_count == 0:
             return TableStatistics(table_name=table_name)
-        
-        stats = TableStatistics(table_name=table_name)
-        stats.row_count = len(data)
-        
-        # Calculate total size (approximate)
-        total_size = sum(len(json.dumps(row)) for row in data[:100])  # Sample first 100
-        stats.total_size_bytes = (total_size // min(100, len(data))) * len(data)
-        stats.avg_row_size_bytes = stats.total_size_bytes / max(1, stats.row_count)
-        
-        # Collect column statistics
-        if data:
-            columns = data[0].keys()
-            for column in columns:
-                col_stats = self._collect_column_stats(column, data)
-                stats.columns[column] = col_stats
+        return self.finalize_statistics(state)
+
+    def collect_statistics_from_cursor(
+        self,
+        table_name: str,
+        cursor: Any,
+        batch_size: Optional[int] = None
+    ) -> TableStatistics:
+        """
+        Collect statistics from an executed DB-API cursor using fetchmany
+
+        Args:
+            table_name: Name of the table
+            cursor: Cursor with a pending result set (description must be set)
+            batch_size: Rows per fetchmany call (defaults to self.batch_size)
+
+        Returns:
+            TableStatistics object
+        """
+        batch_size = batch_size or self.batch_size
+        columns = [description[0] for description in cursor.description]
+        state = self.create_state(table_name)
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            state.update_tuples(columns, rows)
+
+        if state.row_count == 0:
+            return TableStatistics(table_name=table_name)
+        return self.finalize_statistics(state)
+
+    def collect_statistics_parallel(
+        self,
+        table_name: str,
+        partitions: List[Iterable[Dict[str, Any]]],
+        max_workers: Optional[int] = None
+    ) -> TableStatistics:
+        """
+        Collect statistics for disjoint partitions in worker processes and merge
+
+        Args:
+            table_name: Name of the table
+            partitions: Picklable row collections (e.g. lists), one per worker task
+            max_workers: Worker processes (default: CPU count)
+
+        Returns:
+            TableStatistics object
+        """
+        tasks = [(table_name, partition, self.batch_size, self.sketch_options) for partition in partitions]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            states = list(pool.map(_collect_partition_state, tasks))
+
+        merged = self.create_state(table_name)
+        for state in states:
+            merged.merge(state)
+        if merged.row_count == 0:
+            return TableStatistics(table_name=table_name)
+        return self.finalize_statistics(merged)
+
+    def create_state(self, table_name: str) -> TableStatisticsState:
+        """Create an empty mergeable state for incremental collection"""
+        return TableStatisticsState(table_name, **self.sketch_options)
+
+    def finalize_statistics(self, state: TableStatisticsState) -> TableStatistics:
+        """
+        Turn a (possibly merged) collection state into cached TableStatistics
+        """
+        stats = TableStatistics(table_name=state.table_name)
+        stats.row_count = state.row_count
+        stats.avg_row_size_bytes = state.avg_row_size_bytes
+        stats.total_size_bytes = int(stats.avg_row_size_bytes * stats.row_count)
+
+        for column, column_state in state.columns.items():
+            stats.columns[column] = self._finalize_column(column_state)
         
         # Store timestamp
         from datetime import datetime
         stats.last_updated = datetime.now().isoformat()
         
         # Cache statistics
-        self.table_stats[table_name] = stats
-        self._save_statistics()
+        self.update_statistics(stats)
         
-        logger.info(f"Collected statistics for {table_name}: {stats.row_count} rows, "
+        logger.info(f"Collected statistics for {state.table_name}: {stats.row_count} rows, "
                    f"{len(stats.columns)} columns")
         
         return stats
     
-    def _collect_column_stats(self, column_name: str, data: List[Dict[str, Any]]) -> ColumnStatistics:
-        """Collect statistics for a single column"""
-        stats = ColumnStatistics(column_name=column_name)
-
-        values = []
-        null_count = 0
-        total_length = 0
-        string_count = 0
-
-        for row in data:
-            value = row.get(column_name)
-            if value is None:
-                null_count += 1
-            else:
-                values.append(value)
-                if isinstance(value, str):
-                    total_length += len(value)
-                    string_count += 1
-
-        stats.null_count = null_count
-
-        if values:
-            # Distinct count - skip if values contain unhashable types (dict/list)
-            try:
-                unique_values = set(values)
-                stats.distinct_count = len(unique_values)
-            except TypeError:
-                # Unhashable values (dict/list), estimate distinct count from sample
-                stats.distinct_count = len(values)  # Upper bound estimate
-
-            # Min/max
-            try:
-                stats.min_value = min(values)
-                stats.max_value = max(values)
-            except TypeError:
-                # Values not comparable
-                pass
+    def _finalize_column(self, state: ColumnStatisticsState) -> ColumnStatistics:
+        """Build ColumnStatistics from a column sketch state"""
+        stats = ColumnStatistics(column_name=state.column_name)
+        stats.null_count = state.null_count
+
+        if state.value_count:
+            # NDV never exceeds the number of non-null values
+            stats.distinct_count = min(state.hll.estimate(), state.value_count)
+            stats.min_value = state.min_value
+            stats.max_value = state.max_value
 
             # Average length for strings (divide by string count, not all values)
-            if string_count > 0:
-                stats.avg_length = total_length / string_count
-
-            # Most common values (top 10) - skip if values contain unhashable types
-            try:
-                value_counts = defaultdict(int)
-                for v in values:
-                    value_counts[v] += 1
-
-                sorted_values = sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
-                stats.most_common_values = [v for v, _ in sorted_values[:10]]
-            except TypeError:
-                # Unhashable values, skip most common calculation
-                pass
-            
-            # Simple histogram (for numeric values)
-            if all(isinstance(v, (int, float)) for v in values[:100]):
-                # Create 10 buckets
-                min_val = stats.min_value
-                max_val = stats.max_value
-                if min_val != max_val:
-                    bucket_size = (max_val - min_val) / 10
-                    for v in values:
-                        bucket = int((v - min_val) / bucket_size)
-                        bucket = min(9, bucket)  # Cap at bucket 9
-                        stats.histogram[bucket] = stats.histogram.get(bucket, 0) + 1
+            if state.string_count > 0:
+                stats.avg_length = state.string_length_total / state.string_count
+
+            # Most common values (top 10) - unavailable for unhashable values
+            if state.hashable:
+                stats.most_common_values = [value for value, _ in state.heavy.top(10)]
+
+            stats.histogram_bounds, stats.histogram = state.equi_depth_histogram(self.histogram_buckets)
         
         return stats
     
+    def update_statistics(self, stats: TableStatistics, persist: bool = True) -> None:
+        """Cache externally produced statistics (e.g. imported from a backend catalog)"""
+        self.table_stats[stats.table_name] = stats
+        if persist:
+            self._save_statistics()
+
+    def save(self) -> None:
+        """Persist all cached statistics"""
+        self._save_statistics()
+
     def get_statistics(self, table_name: str) -> Optional[TableStatistics]:
         """Get cached statistics for a table"""
         return self.table_stats.get(table_name)
@@ -338,7 +415,10 @@ class StatisticsCollector:
                             "null_count": col_stats.null_count,
                             "min_value": self._serialize_value(col_stats.min_value),
                             "max_value": self._serialize_value(col_stats.max_value),
-                            "avg_length": col_stats.avg_length
+                            "avg_length": col_stats.avg_length,
+                            "most_common_values": [self._serialize_value(v) for v in col_stats.most_common_values],
+                            "histogram_bounds": [self._serialize_value(v) for v in col_stats.histogram_bounds],
+                            "histogram": {str(k): v for k, v in col_stats.histogram.items()}
                         }
                         for col_name, col_stats in stats.columns.items()
                     }
@@ -377,7 +457,12 @@ class StatisticsCollector:
                         null_count=col_data["null_count"],
                         min_value=self._deserialize_value(col_data.get("min_value")),
                         max_value=self._deserialize_value(col_data.get("max_value")),
-                        avg_length=col_data["avg_length"]
+                        avg_length=col_data["avg_length"],
+                        most_common_values=[self._deserialize_value(v)
+                                            for v in col_data.get("most_common_values", [])],
+                        histogram_bounds=[self._deserialize_value(v)
+                                          for v in col_data.get("histogram_bounds", [])],
+                        histogram={int(k): v for k, v in col_data.get("histogram", {}).items()}
                     )
                     stats.columns[col_name] = col_stats
                 
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+SAIQL Statistics Sketches
+=========================
+
+Bounded-memory, single-pass sketches used by StatisticsCollector:
+
+- HyperLogLog: distinct-value (NDV) estimation, exact below a sparse threshold
+- HeavyHitters: space-saving style most-common-value tracking
+- ReservoirSample: uniform row sample feeding equi-depth histograms
+- ColumnStatisticsState / TableStatisticsState: mergeable partial states
+
+Every sketch is a plain picklable object with merge(), so partitions of a
+large table can be analyzed in separate processes and combined. Hashes are
+process-independent (no reliance on Python's randomized hash()).
+
+Author: Apollo & Claude
+Version: 1.0.0
+"""
+
+import hashlib
+import json
+import math
+import random
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_MASK64 = (1 << 64) - 1
+
+
+def hash64(value: Any) -> int:
+    """Deterministic 64-bit hash, stable across processes and runs"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        # splitmix64 finalizer for integers
+        x = (value + 0x9E3779B97F4A7C15) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return x ^ (x >> 31)
+    if isinstance(value, str):
+        data = b"s" + value.encode("utf-8", "surrogatepass")
+    elif isinstance(value, bytes):
+        data = b"b" + value
+    else:
+        data = type(value).__name__.encode() + b":" + repr(value).encode("utf-8", "backslashreplace")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter.
+
+    Keeps exact hashes while the sketch is small (sparse mode), then switches
+    to 2^precision one-byte registers. Standard error is about
+    1.04 / sqrt(2^precision), i.e. ~0.8% at the default precision of 14.
+    """
+
+    def __init__(self, precision: int = 14, sparse_limit: int = 2048):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.sparse_limit = sparse_limit
+        self.sparse: Optional[set] = set()
+        self.registers: Optional[bytearray] = None
+
+    @property
+    def m(self) -> int:
+        return 1 << self.precision
+
+    def add_hash(self, h: int) -> None:
+        """Add a precomputed 64-bit hash"""
+        if self.sparse is not None:
+            self.sparse.add(h)
+            if len(self.sparse) > self.sparse_limit:
+                self._densify()
+            return
+        self._add_register(h)
+
+    def add(self, value: Any) -> None:
+        """Add a value"""
+        self.add_hash(hash64(value))
+
+    def update(self, values: Iterable[Any]) -> None:
+        """Add many values"""
+        for value in values:
+            self.add_hash(hash64(value))
+
+    def _add_register(self, h: int) -> None:
+        p = self.precision
+        index = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def _densify(self) -> None:
+        hashes, self.sparse = self.sparse, None
+        self.registers = bytearray(self.m)
+        for h in hashes:
+            self._add_register(h)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Merge another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        if other.sparse is not None:
+            for h in other.sparse:
+                self.add_hash(h)
+            return self
+        if self.sparse is not None:
+            self._densify()
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values"""
+        if self.sparse is not None:
+            return len(self.sparse)
+
+        m = self.m
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class HeavyHitters:
+    """
+    Space-saving style heavy-hitters sketch.
+
+    Tracks at most 2 * capacity candidates; when full it keeps the top
+    `capacity` and new keys start at the evicted floor count, so counts are
+    overestimates by at most `floor`. Exact while distinct keys <= capacity.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.floor = 0
+
+    def update_counts(self, counts: Dict[Any, int]) -> None:
+        """Add pre-aggregated (value -> count) pairs"""
+        table = self.counts
+        floor = self.floor
+        for value, count in counts.items():
+            current = table.get(value)
+            table[value] = (floor if current is None else current) + count
+        if len(table) > 2 * self.capacity:
+            self._prune()
+
+    def update(self, values: Iterable[Any]) -> None:
+        """Add raw values"""
+        self.update_counts(Counter(values))
+
+    def _prune(self) -> None:
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        self.floor = max(self.floor, ranked[self.capacity][1])
+        self.counts = dict(ranked[:self.capacity])
+
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        """Merge another sketch into this one"""
+        table = self.counts
+        for value, count in other.counts.items():
+            table[value] = table.get(value, self.floor) + count
+        for value in table.keys() - other.counts.keys():
+            table[value] += other.floor
+        self.floor += other.floor
+        if len(table) > 2 * self.capacity:
+            self._prune()
+        return self
+
+    def top(self, n: int = 10) -> List[Tuple[Any, int]]:
+        """Most frequent values with their (over)estimated counts"""
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class ReservoirSample:
+    """
+    Uniform fixed-size sample of a stream (Algorithm L).
+
+    Skips ahead geometrically once full, so cost after warm-up is
+    O(size * log(n / size)) random draws rather than one per item.
+    """
+
+    def __init__(self, size: int = 10000, seed: Optional[int] = None):
+        self.size = size
+        self.items: List[Any] = []
+        self.seen = 0
+        self._rng = random.Random(seed)
+        self._w = 1.0
+        self._next = 0
+
+    def _advance(self) -> None:
+        rng = self._rng
+        self._w *= math.exp(math.log(rng.random() or 1e-300) / self.size)
+        self._next += int(math.log(rng.random() or 1e-300) / math.log1p(-self._w)) + 1
+
+    def update(self, values: List[Any]) -> None:
+        """Offer a batch of values"""
+        start = self.seen
+        self.seen += len(values)
+        position = 0
+
+        if len(self.items) < self.size:
+            take = min(self.size - len(self.items), len(values))
+            self.items.extend(values[:take])
+            position = take
+            if len(self.items) == self.size:
+                self._next = start + take - 1
+                self._advance()
+
+        while len(self.items) == self.size:
+            offset = self._next - start
+            if offset >= len(values) or offset < position:
+                break
+            self.items[self._rng.randrange(self.size)] = values[offset]
+            self._advance()
+
+    def merge(self, other: 'ReservoirSample') -> 'ReservoirSample':
+        """
+        Combine two samples into a uniform sample of the union.
+
+        The number of slots taken from each side follows the hypergeometric
+        split of the combined stream (by rows seen), then each side
+        contributes a uniform subset of its own sample.
+        """
+        total = self.seen + other.seen
+        k = min(self.size, len(self.items) + len(other.items))
+        rng = self._rng
+        remaining_self, remaining_other = self.seen, other.seen
+        from_self = 0
+        for _ in range(k):
+            if rng.random() * (remaining_self + remaining_other) < remaining_self:
+                from_self += 1
+                remaining_self -= 1
+            else:
+                remaining_other -= 1
+        from_self = max(k - len(other.items), min(from_self, len(self.items)))
+        self.items = rng.sample(self.items, from_self) + rng.sample(other.items, k - from_self)
+        self.seen = total
+        # Restart skip-ahead state for the combined stream
+        if len(self.items) == self.size:
+            self._w = 1.0
+            self._next = total - 1
+            self._advance()
+        return self
+
+
+class ColumnStatisticsState:
+    """Mergeable single-pass state for one column"""
+
+    def __init__(self, column_name: str, sample_size: int = 10000, mcv_capacity: int = 100,
+                 hll_precision: int = 14, seed: Optional[int] = None):
+        self.column_name = column_name
+        self.null_count = 0
+        self.value_count = 0
+        self.min_value: Any = None
+        self.max_value: Any = None
+        self.comparable = True
+        self.string_length_total = 0
+        self.string_count = 0
+        self.hashable = True
+        self.hll = HyperLogLog(precision=hll_precision)
+        self.heavy = HeavyHitters(capacity=mcv_capacity)
+        self.sample = ReservoirSample(size=sample_size, seed=seed)
+
+    def update(self, values: List[Any]) -> None:
+        """Consume one batch of column values (None is SQL NULL)"""
+        present = [v for v in values if v is not None]
+        self.null_count += len(values) - len(present)
+        if not present:
+            return
+        self.value_count += len(present)
+
+        strings = [v for v in present if isinstance(v, str)]
+        if strings:
+            self.string_count += len(strings)
+            self.string_length_total += sum(map(len, strings))
+
+        if self.comparable:
+            try:
+                low, high = min(present), max(present)
+                self.min_value = low if self.min_value is None else min(self.min_value, low)
+                self.max_value = high if self.max_value is None else max(self.max_value, high)
+            except TypeError:
+                self.comparable = False
+                self.min_value = self.max_value = None
+
+        counts = None
+        if self.hashable:
+            try:
+                counts = Counter(present)
+            except TypeError:
+                self.hashable = False
+        if counts is not None:
+            # Hash each distinct batch value once
+            add_hash = self.hll.add_hash
+            for value in counts:
+                add_hash(hash64(value))
+            self.heavy.update_counts(counts)
+        else:
+            self.hll.update(present)
+
+        self.sample.update(present)
+
+    def merge(self, other: 'ColumnStatisticsState') -> 'ColumnStatisticsState':
+        """Merge a state computed over a disjoint set of rows"""
+        self.null_count += other.null_count
+        self.value_count += other.value_count
+        self.string_count += other.string_count
+        self.string_length_total += other.string_length_total
+        self.hashable = self.hashable and other.hashable
+        self.comparable = self.comparable and other.comparable
+        if self.comparable:
+            try:
+                for attr, pick in (("min_value", min), ("max_value", max)):
+                    candidates = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+                    setattr(self, attr, pick(candidates) if candidates else None)
+            except TypeError:
+                self.comparable = False
+        if not self.comparable:
+            self.min_value = self.max_value = None
+        self.hll.merge(other.hll)
+        self.heavy.merge(other.heavy)
+        self.sample.merge(other.sample)
+        return self
+
+    def equi_depth_histogram(self, buckets: int = 10) -> Tuple[List[Any], Dict[int, int]]:
+        """
+        Equi-depth histogram from the reservoir sample.
+
+        Returns (bounds, counts): bucket i covers [bounds[i], bounds[i+1]] and
+        counts[i] is its estimated row count scaled to the whole column.
+        """
+        if not self.comparable or not self.sample.items:
+            return [], {}
+        try:
+            ordered = sorted(self.sample.items)
+        except TypeError:
+            return [], {}
+
+        n = len(ordered)
+        buckets = max(1, min(buckets, n))
+        cut_points = [min(n - 1, (i * n) // buckets) for i in range(buckets)] + [n - 1]
+        bounds = [ordered[i] for i in cut_points]
+        scale = self.value_count / n
+        counts = {}
+        for i in range(buckets):
+            size = (cut_points[i + 1] - cut_points[i]) + (1 if i == buckets - 1 else 0)
+            counts[i] = int(round(size * scale))
+        return bounds, counts
+
+
+class TableStatisticsState:
+    """Mergeable single-pass state for a table"""
+
+    SIZE_SAMPLE_ROWS = 100
+
+    def __init__(self, table_name: str, **column_options: Any):
+        self.table_name = table_name
+        self.row_count = 0
+        self.columns: Dict[str, ColumnStatisticsState] = {}
+        self.size_sample_bytes = 0
+        self.size_sample_rows = 0
+        self._column_options = column_options
+
+    def update_columns(self, columns: Dict[str, List[Any]], row_count: int) -> None:
+        """Consume one batch given as column name -> values"""
+        for name in self.columns.keys() - columns.keys():
+            self.columns[name].update([None] * row_count)
+        for name, values in columns.items():
+            state = self.columns.get(name)
+            if state is None:
+                state = self.columns[name] = ColumnStatisticsState(name, **self._column_options)
+                # Column absent from earlier rows: those rows are NULL
+                state.null_count += self.row_count
+            state.update(values)
+        self.row_count += row_count
+
+    def _sample_row_sizes(self, rows: List[Any], as_dict: Any = None) -> None:
+        """Measure serialized size of the first SIZE_SAMPLE_ROWS rows seen"""
+        if self.size_sample_rows >= self.SIZE_SAMPLE_ROWS:
+            return
+        sample = rows[:self.SIZE_SAMPLE_ROWS - self.size_sample_rows]
+        if as_dict is not None:
+            sample = [as_dict(row) for row in sample]
+        self.size_sample_bytes += sum(len(json.dumps(row, default=str)) for row in sample)
+        self.size_sample_rows += len(sample)
+
+    def update_tuples(self, column_names: List[str], rows: List[Any]) -> None:
+        """Consume one batch of positional rows (e.g. from cursor.fetchmany)"""
+        if not rows:
+            return
+        self._sample_row_sizes(rows, lambda row: dict(zip(column_names, row)))
+        self.update_columns(dict(zip(column_names, map(list, zip(*rows)))), len(rows))
+
+    def update(self, rows: List[Dict[str, Any]]) -> None:
+        """Consume one batch of row dicts"""
+        if not rows:
+            return
+        self._sample_row_sizes(rows)
+        names: Dict[str, None] = dict.fromkeys(self.columns)
+        for row in rows:
+            for key in row:
+                if key not in names:
+                    names[key] = None
+        self.update_columns({name: [row.get(name) for row in rows] for name in names}, len(rows))
+
+    def merge(self, other: 'TableStatisticsState') -> 'TableStatisticsState':
+        """Merge a state computed over a disjoint set of rows"""
+        for name in self.columns.keys() - other.columns.keys():
+            self.columns[name].null_count += other.row_count
+        for name, state in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(state)
+            else:
+                state.null_count += self.row_count
+                self.columns[name] = state
+        self.row_count += other.row_count
+        self.size_sample_bytes += other.size_sample_bytes
+        self.size_sample_rows += other.size_sample_rows
+        return self
+
+    @property
+    def avg_row_size_bytes(self) -> float:
+        return self.size_sample_bytes / self.size_sample_rows if self.size_sample_rows else 0.0
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+SAIQL Top-K Operator
+====================
+
+Bounded-heap evaluation of ORDER BY ... LIMIT k:
+
+- TopK keeps only the k best rows seen so far in a heap whose root is the
+  current worst row, so memory is O(k) and each row costs one key build
+  plus, at most, an O(log k) heap replacement
+- Ties are broken by arrival order (earlier rows win), so the result is
+  identical to a stable full sort followed by slicing
+- Multi-column keys with mixed ASC/DESC directions; NULLs sort first for
+  ASC and last for DESC (SQLite/MySQL semantics)
+- top_k() consumes any iterable and stops reading as soon as the answer is
+  known (LIMIT without ORDER BY, or input already in key order)
+
+Author: Apollo & Claude
+Version: 1.0.0
+"""
+
+import heapq
+import re
+from itertools import islice
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+# [(column, descending)]
+OrderSpec = List[Tuple[str, bool]]
+
+_ORDER_ITEM_RE = re.compile(r'^\s*["`\[]?(.+?)["`\]]?(?:\s+(ASC|DESC))?\s*$', re.IGNORECASE)
+
+
+def parse_order_by(order_by: Union[str, Sequence[Any]]) -> OrderSpec:
+    """
+    Normalize an ORDER BY specification.
+
+    Accepts "a DESC, b", ["a DESC", "b"] or [("a", "DESC"), ("b", "ASC")].
+    """
+    items = order_by.split(',') if isinstance(order_by, str) else list(order_by)
+    spec = []
+    for item in items:
+        if isinstance(item, (tuple, list)):
+            column, direction = item[0], item[1] if len(item) > 1 else "ASC"
+            descending = direction is True or str(direction).upper() == "DESC"
+        else:
+            match = _ORDER_ITEM_RE.match(str(item))
+            if not match:
+                raise ValueError(f"Invalid ORDER BY item: {item!r}")
+            column, descending = match.group(1), (match.group(2) or "ASC").upper() == "DESC"
+        spec.append((column, descending))
+    if not spec:
+        raise ValueError("ORDER BY requires at least one column")
+    return spec
+
+
+class _Descending:
+    """Inverts comparisons for DESC columns whose values cannot be negated"""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def _dict_getter(row: Any, column: str) -> Any:
+    return row.get(column)
+
+
+def make_sort_key(order_by: Union[str, Sequence[Any]],
+                  getter: Optional[Callable[[Any, str], Any]] = None) -> Callable[[Any], tuple]:
+    """
+    Build a key function whose ascending order is the ORDER BY order.
+
+    Each column contributes a (null_rank, value) pair; DESC numbers are
+    negated and other DESC values wrapped so tuple comparison stays in C
+    for the common numeric case.
+    """
+    spec = parse_order_by(order_by)
+    get = getter or _dict_getter
+
+    def key(row: Any) -> tuple:
+        parts = []
+        for column, descending in spec:
+            value = get(row, column)
+            if value is None:
+                parts.append((1, 0) if descending else (0, 0))
+            elif not descending:
+                parts.append((1, value))
+            elif isinstance(value, (int, float)):
+                parts.append((0, -value))
+            else:
+                parts.append((0, _Descending(value)))
+        return tuple(parts)
+
+    return key
+
+
+class _Entry:
+    """Heap entry ordered worst-first, so heap[0] is the row to evict"""
+    __slots__ = ("key", "seq", "row")
+
+    def __init__(self, key: tuple, seq: int, row: Any):
+        self.key = key
+        self.seq = seq
+        self.row = row
+
+    def __lt__(self, other: '_Entry') -> bool:
+        return (self.key, self.seq) > (other.key, other.seq)
+
+
+class TopK:
+    """
+    Streaming ORDER BY ... LIMIT k
+
+    Example:
+        top = TopK(100, "timestamp DESC")
+        for batch in source:
+            top.extend(batch)
+        rows = top.result()
+    """
+
+    def __init__(self, k: int, order_by: Union[str, Sequence[Any]],
+                 getter: Optional[Callable[[Any, str], Any]] = None):
+        """
+        Args:
+            k: Number of rows to keep (LIMIT)
+            order_by: ORDER BY specification (see parse_order_by)
+            getter: Reads a column from a row; defaults to dict.get
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        self.k = k
+        self.order_by = parse_order_by(order_by)
+        self._key = make_sort_key(self.order_by, getter)
+        self._heap: List[_Entry] = []
+        self._seq = 0
+        self.rows_seen = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def full(self) -> bool:
+        """True once k rows are held; later rows must beat the worst to enter"""
+        return len(self._heap) >= self.k
+
+    def push(self, row: Any) -> bool:
+        """Offer one row; returns True if it is (for now) among the top k"""
+        self.rows_seen += 1
+        if self.k == 0:
+            return False
+        key = self._key(row)
+        seq = self._seq
+        self._seq += 1
+        heap = self._heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, _Entry(key, seq, row))
+            return True
+        worst = heap[0]
+        # Equal keys lose to the earlier row, which keeps the result stable
+        if key < worst.key:
+            heapq.heapreplace(heap, _Entry(key, seq, row))
+            return True
+        return False
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        """Offer every row of an iterable"""
+        for row in rows:
+            self.push(row)
+
+    def result(self) -> List[Any]:
+        """The top k rows in ORDER BY order"""
+        return [entry.row for entry in sorted(self._heap, key=lambda e: (e.key, e.seq))]
+
+
+def top_k(rows: Iterable[Any], order_by: Optional[Union[str, Sequence[Any]]], k: int,
+          presorted: bool = False, getter: Optional[Callable[[Any, str], Any]] = None) -> List[Any]:
+    """
+    Evaluate ORDER BY ... LIMIT k over an iterable.
+
+    Without order_by, or with presorted=True (input already in ORDER BY
+    order, e.g. from an index), the first k rows are the answer and the
+    rest of the iterable is never read.
+    """
+    if not order_by or presorted:
+        return list(islice(rows, k))
+    top = TopK(k, order_by, getter)
+    top.extend(rows)
+    return top.result()
+
+
+__all__ = ['TopK', 'top_k', 'parse_order_by', 'make_sort_key', 'OrderSpec']
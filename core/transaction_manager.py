@@ -14,6 +14,30 @@ Change Notes (2026-01-20):
 - Added module-level logger for proper logging
 - Fixed undefined self.logger in cleanup_expired_transactions
 - Replaced print() debug statements with logger calls
+
+Change Notes (2026-10-18):
+- LockManager: lock table striped by resource hash with per-resource FIFO
+  wait queues; releases wake only the waiters they grant, and each
+  transaction's held resources are tracked so release_all_locks only
+  visits those
+- DeadlockDetector: event-driven; each new wait edge searches only from
+  that edge, and a resolver thread blocks until a cycle is reported
+  instead of polling the whole graph every second
+- Deadlock victims are chosen by abort cost (locks held + operations),
+  and a victim waiting for a lock is woken immediately
+- Hierarchical locking over ':'-separated resources (table:page:row) with
+  IS/IX intent locks on ancestors, in-place lock conversion (e.g. S -> X,
+  IX + S -> SIX), and escalation to a table lock past
+  escalation_threshold locks
+- MVCC for in-process resources (core/mvcc.py): lock-free snapshot reads,
+  buffered writes installed as versions at commit, version garbage
+  collection, first-updater-wins for REPEATABLE_READ/SERIALIZABLE and
+  SSI antidependency checks for SERIALIZABLE; _check_isolation_constraints
+  no longer scans every active transaction
+- Optional write-ahead log (core/wal.py, wal_path=...): CRC-framed redo
+  records made durable with group commit outside the manager lock,
+  checkpoints, and crash recovery on startup; transaction_log is now a
+  bounded deque
 """
 
 import logging
@@ -21,11 +45,20 @@ import threading
 import time
 import uuid
 import json
-from typing import Dict, List, Any, Optional, Set, Tuple, Callable
+import queue
+from typing import Deque, Dict, List, Any, Optional, Sequence, Set, Tuple, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+
+try:
+    from .mvcc import SerializableConflictTracker, TimestampOracle, VersionStore
+    from .wal import WriteAheadLog
+except ImportError:
+    # Fallback for standalone testing
+    from mvcc import SerializableConflictTracker, TimestampOracle, VersionStore
+    from wal import WriteAheadLog
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +88,24 @@ class LockMode(Enum):
     INTENT_EXCLUSIVE = "IX"  # Intent to write
     SHARED_INTENT_EXCLUSIVE = "SIX"  # Read with intent to write
 
+_IS, _IX, _S, _SIX, _X = (LockMode.INTENT_SHARED, LockMode.INTENT_EXCLUSIVE, LockMode.SHARED,
+                          LockMode.SHARED_INTENT_EXCLUSIVE, LockMode.EXCLUSIVE)
+
+# Weakest mode at least as strong as both (lock conversion target)
+_MODE_SUPREMUM: Dict[Tuple[LockMode, LockMode], LockMode] = {}
+for _a, _b, _sup in [(_IS, _IX, _IX), (_IS, _S, _S), (_IS, _SIX, _SIX), (_IS, _X, _X),
+                     (_IX, _S, _SIX), (_IX, _SIX, _SIX), (_IX, _X, _X),
+                     (_S, _SIX, _SIX), (_S, _X, _X), (_SIX, _X, _X)]:
+    _MODE_SUPREMUM[(_a, _b)] = _MODE_SUPREMUM[(_b, _a)] = _sup
+for _a in LockMode:
+    _MODE_SUPREMUM[(_a, _a)] = _a
+
+# Intent mode taken on every ancestor before locking a descendant in mode
+_INTENT_FOR = {_IS: _IS, _S: _IS, _IX: _IX, _SIX: _IX, _X: _IX}
+
+# Descendant modes implied by holding a mode on an ancestor
+_COVERS = {_X: set(LockMode), _S: {_IS, _S}, _SIX: {_IS, _S}, _IX: set(), _IS: set()}
+
 @dataclass
 class Lock:
     """Database lock representation"""
@@ -81,6 +132,12 @@ class Transaction:
     read_set: Set[str] = field(default_factory=set)
     write_set: Set[str] = field(default_factory=set)
     locks_held: Set[str] = field(default_factory=set)
+
+    # MVCC: reads see versions committed at or before snapshot_ts; writes
+    # are buffered (resource -> (value, deleted)) until commit
+    snapshot_ts: int = 0
+    commit_ts: Optional[int] = None
+    write_buffer: Dict[str, Tuple[Any, bool]] = field(default_factory=dict)
     
     # Deadlock detection
     waiting_for: Optional[str] = None
@@ -104,104 +161,193 @@ class Transaction:
             self.write_set.add(resource)
 
 class DeadlockDetector:
-    """Wait-for graph based deadlock detection"""
+    """
+    Wait-for graph based deadlock detection
+
+    Detection is event-driven: adding an edge waiting -> blocking searches
+    for a path from blocking back to waiting, which only explores what the
+    new edge can reach. A cycle is found the moment it forms and handed to
+    a resolver thread (so the callback never runs under the caller's
+    locks); with nothing waiting, no detection work happens at all.
+    """
 
     def __init__(self):
         self.wait_for_graph: Dict[str, Set[str]] = defaultdict(set)
+        self._waited_on_by: Dict[str, Set[str]] = defaultdict(set)
         self._graph_lock = threading.Lock()
-        self.detection_interval = 1.0  # seconds
+        self._cycles: "queue.Queue[Optional[List[str]]]" = queue.Queue()
         self._running = False
         self._detector_thread = None
+        self.stats = {"edges_added": 0, "cycles_detected": 0}
 
-    def add_wait_edge(self, waiting_tx: str, blocking_tx: str):
-        """Add edge to wait-for graph"""
+    def add_wait_edge(self, waiting_tx: str, blocking_tx: str) -> Optional[List[str]]:
+        """Add edge to wait-for graph; returns the cycle it closes, if any"""
         with self._graph_lock:
+            if blocking_tx in self.wait_for_graph[waiting_tx]:
+                return None
             self.wait_for_graph[waiting_tx].add(blocking_tx)
+            self._waited_on_by[blocking_tx].add(waiting_tx)
+            self.stats["edges_added"] += 1
+            path = self._find_path(blocking_tx, waiting_tx)
+            if path is None:
+                return None
+            self.stats["cycles_detected"] += 1
+        cycle = [waiting_tx] + path
+        if self._running:
+            self._cycles.put(cycle)
+        return cycle
+
+    def _find_path(self, start: str, target: str) -> Optional[List[str]]:
+        """Path of wait edges from start to target (graph lock held)"""
+        if start == target:
+            return [start]
+        visited = {start}
+        path = [start]
+        stack = [iter(self.wait_for_graph.get(start, ()))]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                path.pop()
+                continue
+            if node == target:
+                return path + [node]
+            if node not in visited:
+                visited.add(node)
+                path.append(node)
+                stack.append(iter(self.wait_for_graph.get(node, ())))
+        return None
 
     def remove_wait_edge(self, waiting_tx: str, blocking_tx: str):
         """Remove edge from wait-for graph"""
         with self._graph_lock:
-            if waiting_tx in self.wait_for_graph:
-                self.wait_for_graph[waiting_tx].discard(blocking_tx)
+            self._remove_edge(waiting_tx, blocking_tx)
+
+    def _remove_edge(self, waiting_tx: str, blocking_tx: str):
+        blocking = self.wait_for_graph.get(waiting_tx)
+        if blocking is not None:
+            blocking.discard(blocking_tx)
+            if not blocking:
+                del self.wait_for_graph[waiting_tx]
+        waiters = self._waited_on_by.get(blocking_tx)
+        if waiters is not None:
+            waiters.discard(waiting_tx)
+            if not waiters:
+                del self._waited_on_by[blocking_tx]
 
     def clear_transaction_edges(self, transaction_id: str):
         """Remove all edges involving a transaction (called on commit/abort)"""
         with self._graph_lock:
-            # Remove edges where this tx is waiting
-            if transaction_id in self.wait_for_graph:
-                del self.wait_for_graph[transaction_id]
-            # Remove edges where other txs are waiting on this one
-            for waiting_tx in list(self.wait_for_graph.keys()):
-                self.wait_for_graph[waiting_tx].discard(transaction_id)
+            for blocking_tx in list(self.wait_for_graph.get(transaction_id, ())):
+                self._remove_edge(transaction_id, blocking_tx)
+            for waiting_tx in list(self._waited_on_by.get(transaction_id, ())):
+                self._remove_edge(waiting_tx, transaction_id)
 
-    def detect_deadlock(self) -> Optional[List[str]]:
-        """Detect cycles in wait-for graph using DFS"""
-        # Snapshot the graph under lock to avoid mutation during iteration
+    def has_cycle(self, cycle: List[str]) -> bool:
+        """Whether every edge of a reported cycle is still in the graph"""
         with self._graph_lock:
-            graph_snapshot = {k: set(v) for k, v in self.wait_for_graph.items()}
-
-        visited = set()
-        rec_stack = set()
-
-        def dfs(node: str, path: List[str]) -> Optional[List[str]]:
-            if node in rec_stack:
-                # Found cycle - return the cycle
-                cycle_start = path.index(node)
-                return path[cycle_start:] + [node]
-
-            if node in visited:
-                return None
-
-            visited.add(node)
-            rec_stack.add(node)
-
-            for neighbor in graph_snapshot.get(node, set()):
-                cycle = dfs(neighbor, path + [node])
-                if cycle:
-                    return cycle
-
-            rec_stack.remove(node)
-            return None
-
-        for tx_id in graph_snapshot:
-            if tx_id not in visited:
-                cycle = dfs(tx_id, [])
-                if cycle:
-                    return cycle
+            return all(b in self.wait_for_graph.get(a, ()) for a, b in zip(cycle, cycle[1:]))
 
+    def detect_deadlock(self) -> Optional[List[str]]:
+        """Search the whole graph for a cycle (diagnostics; detection itself is incremental)"""
+        with self._graph_lock:
+            for tx_id in list(self.wait_for_graph):
+                for blocking_tx in self.wait_for_graph.get(tx_id, ()):
+                    path = self._find_path(blocking_tx, tx_id)
+                    if path is not None:
+                        return [tx_id] + path
         return None
-    
+
     def start_detection(self, callback: Callable[[List[str]], None]):
-        """Start background deadlock detection"""
+        """Start the resolver thread that hands detected cycles to callback"""
         self._running = True
-        
-        def detection_loop():
-            while self._running:
+
+        def resolver_loop():
+            while True:
+                # Blocks without polling until a cycle is reported
+                cycle = self._cycles.get()
+                if cycle is None:
+                    break
                 try:
-                    cycle = self.detect_deadlock()
-                    if cycle:
-                        callback(cycle)
-                    time.sleep(self.detection_interval)
+                    callback(cycle)
                 except Exception as e:
-                    logger.error(f"Deadlock detector error: {e}")
-        
-        self._detector_thread = threading.Thread(target=detection_loop, daemon=True)
+                    logger.error(f"Deadlock resolver error: {e}")
+
+        self._detector_thread = threading.Thread(target=resolver_loop, daemon=True)
         self._detector_thread.start()
-    
+
     def stop_detection(self):
-        """Stop background deadlock detection"""
-        self._running = False
+        """Stop the resolver thread"""
+        if self._running:
+            self._running = False
+            self._cycles.put(None)
         if self._detector_thread:
             self._detector_thread.join(timeout=2.0)
 
-class LockManager:
-    """Lock manager with deadlock detection"""
+# Number of independently locked partitions of the lock table
+LOCK_STRIPES = 64
+
+
+@dataclass(eq=False)
+class _LockRequest:
+    """A transaction waiting in a resource's FIFO queue"""
+    transaction_id: str
+    mode: LockMode
+    condition: threading.Condition
+    granted: bool = False
+    cancelled: bool = False
+    blockers: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class _ResourceLocks:
+    """Granted locks and FIFO wait queue of one resource"""
+    granted: List[Lock] = field(default_factory=list)
+    waiters: deque = field(default_factory=deque)
+
+
+class _LockStripe:
+    """One partition of the lock table, guarded by its own mutex"""
+
+    __slots__ = ('mutex', 'resources')
 
     def __init__(self):
-        self.locks: Dict[str, List[Lock]] = defaultdict(list)
+        self.mutex = threading.Lock()
+        self.resources: Dict[str, _ResourceLocks] = {}
+
+
+class LockManager:
+    """
+    Lock manager with deadlock detection
+
+    The lock table is striped by resource hash, so transactions working on
+    different resources rarely contend on the same mutex. Each resource
+    keeps a FIFO queue of waiters; a release grants queued requests in
+    order and wakes only the waiters it granted. Each transaction's held
+    resources are tracked, so release_all_locks touches only those.
+
+    Resources form a hierarchy by separator: "orders:p12:r5" is a row of
+    page "orders:p12" of table "orders". Locking a resource first takes the
+    matching intent lock (IS or IX) on each ancestor, and an S/SIX/X lock
+    on an ancestor covers its descendants without further entries. A
+    transaction asking for a stronger mode on a resource it already holds
+    converts its lock in place. Once a transaction holds more than
+    escalation_threshold locks under one table, they are traded for a
+    single S or X lock on the table when that can be granted without
+    waiting.
+    """
+
+    def __init__(self, num_stripes: int = LOCK_STRIPES, escalation_threshold: int = 1000,
+                 hierarchy_separator: Optional[str] = ":"):
         self.lock_matrix = self._build_compatibility_matrix()
-        self._lock = threading.RLock()
-        self._condition = threading.Condition(self._lock)
+        self.escalation_threshold = escalation_threshold
+        self.hierarchy_separator = hierarchy_separator
+        self._stripes = [_LockStripe() for _ in range(num_stripes)]
+        self._held: Dict[str, Set[str]] = {}
+        self._children: Dict[str, Dict[str, Set[str]]] = {}
+        self._waiting: Dict[str, Tuple[str, _LockRequest]] = {}
+        self._held_lock = threading.Lock()
+        self.stats = {"conversions": 0, "escalations": 0}
         self.deadlock_detector = DeadlockDetector()
         self._external_deadlock_handler: Optional[Callable[[List[str]], None]] = None
         self.deadlock_detector.start_detection(self._handle_deadlock)
@@ -254,81 +400,284 @@ class LockManager:
 
         return (mode1, mode2) in compatible_pairs
     
+    def _stripe(self, resource_id: str) -> _LockStripe:
+        return self._stripes[hash(resource_id) % len(self._stripes)]
+
+    def _blockers(self, entry: _ResourceLocks, mode: LockMode, transaction_id: str,
+                  ahead: Sequence[_LockRequest] = ()) -> Set[str]:
+        """Transactions a request for mode waits on
+
+        These are the holders of incompatible locks and, since the queue is
+        FIFO, the requests queued ahead of it that it conflicts with. A
+        request that conflicts with nothing ahead still waits for those
+        requests to be granted first, so it then waits on all of them.
+        """
+        blockers = {
+            lock.transaction_id for lock in entry.granted
+            if lock.transaction_id != transaction_id and not self.lock_matrix[(mode, lock.mode)]
+        }
+        queued = {request.transaction_id for request in ahead if request.transaction_id != transaction_id}
+        conflicting = {
+            request.transaction_id for request in ahead
+            if request.transaction_id != transaction_id and not self.lock_matrix[(mode, request.mode)]
+        }
+        return blockers | (conflicting if conflicting or blockers else queued)
+
+    def _grant(self, entry: _ResourceLocks, resource_id: str, mode: LockMode, transaction_id: str):
+        for lock in entry.granted:
+            if lock.transaction_id == transaction_id:
+                # Conversion: one entry per transaction, upgraded in place
+                lock.mode = mode
+                self.stats["conversions"] += 1
+                return
+        entry.granted.append(Lock(resource_id, mode, transaction_id, timeout=None))
+        with self._held_lock:
+            self._held.setdefault(transaction_id, set()).add(resource_id)
+
+    def _set_wait_edges(self, request: _LockRequest, blockers: Set[str]):
+        """Point the waiter's wait-for edges at its current blockers"""
+        for old_blocker in request.blockers - blockers:
+            self.deadlock_detector.remove_wait_edge(request.transaction_id, old_blocker)
+        for new_blocker in blockers - request.blockers:
+            self.deadlock_detector.add_wait_edge(request.transaction_id, new_blocker)
+        request.blockers = blockers
+
+    def _grant_waiters(self, entry: _ResourceLocks, resource_id: str):
+        """Grant queued requests in FIFO order and wake exactly those (stripe mutex held)"""
+        entry.granted = [lock for lock in entry.granted if not lock.is_expired()]
+        while entry.waiters:
+            request = entry.waiters[0]
+            blockers = self._blockers(entry, request.mode, request.transaction_id)
+            if blockers:
+                break
+            entry.waiters.popleft()
+            self._grant(entry, resource_id, request.mode, request.transaction_id)
+            self._set_wait_edges(request, set())
+            request.granted = True
+            request.condition.notify()
+        self._point_wait_edges(entry)
+
+    def _point_wait_edges(self, entry: _ResourceLocks):
+        """Re-point every queued request's edges at the holders and the requests ahead of it"""
+        waiters = list(entry.waiters)
+        for position, request in enumerate(waiters):
+            self._set_wait_edges(request, self._blockers(entry, request.mode, request.transaction_id,
+                                                         waiters[:position]))
+
+    def _ancestors(self, resource_id: str) -> List[str]:
+        """Enclosing resources, outermost (the table) first"""
+        if not self.hierarchy_separator:
+            return []
+        parts = resource_id.split(self.hierarchy_separator)
+        return [self.hierarchy_separator.join(parts[:i]) for i in range(1, len(parts))]
+
+    def held_mode(self, resource_id: str, transaction_id: str) -> Optional[LockMode]:
+        """Mode a transaction holds on a resource, if any"""
+        stripe = self._stripe(resource_id)
+        with stripe.mutex:
+            entry = stripe.resources.get(resource_id)
+            if entry is not None:
+                for lock in entry.granted:
+                    if lock.transaction_id == transaction_id:
+                        return lock.mode
+        return None
+
     def acquire_lock(self, resource_id: str, mode: LockMode, transaction_id: str, timeout: float = 30.0) -> bool:
         """Acquire a lock with timeout and deadlock detection"""
         end_time = time.time() + timeout
-        blocking_txs: Set[str] = set()  # Track ALL blocking transactions
+        ancestors = self._ancestors(resource_id)
 
-        with self._condition:
-            while True:
-                # Clean up expired locks
-                self.locks[resource_id] = [l for l in self.locks[resource_id] if not l.is_expired()]
-
-                # Check if we already hold a compatible lock
-                for existing_lock in self.locks[resource_id]:
-                    if existing_lock.transaction_id == transaction_id:
-                        if existing_lock.mode == mode:
-                            return True
-                        # NOTE: Lock escalation/conversion not yet implemented
-
-                # Find ALL incompatible locks (not just the first one)
-                current_blockers: Set[str] = set()
-                for existing_lock in self.locks[resource_id]:
-                    if existing_lock.transaction_id != transaction_id:
-                        if not self.lock_matrix[(mode, existing_lock.mode)]:
-                            current_blockers.add(existing_lock.transaction_id)
-
-                if not current_blockers:
-                    # No conflicts - acquire the lock
-                    new_lock = Lock(resource_id, mode, transaction_id, timeout=None)
-                    self.locks[resource_id].append(new_lock)
-                    # Remove all wait edges since we got the lock
-                    for old_blocker in blocking_txs:
-                        self.deadlock_detector.remove_wait_edge(transaction_id, old_blocker)
-                    return True
-
-                # Update wait-for graph edges for ALL blockers
-                # Remove edges for transactions that are no longer blocking
-                for old_blocker in blocking_txs - current_blockers:
-                    self.deadlock_detector.remove_wait_edge(transaction_id, old_blocker)
-                # Add edges for new blockers
-                for new_blocker in current_blockers - blocking_txs:
-                    self.deadlock_detector.add_wait_edge(transaction_id, new_blocker)
-                blocking_txs = current_blockers
-
-                # Calculate remaining wait time
-                remaining = end_time - time.time()
-                if remaining <= 0:
-                    # Timeout - remove all wait edges
-                    for blocker in blocking_txs:
-                        self.deadlock_detector.remove_wait_edge(transaction_id, blocker)
-                    return False
+        for ancestor in ancestors:
+            held = self.held_mode(ancestor, transaction_id)
+            if held is not None and mode in _COVERS[held]:
+                return True
+        intent = _INTENT_FOR[mode]
+        for ancestor in ancestors:
+            if not self._acquire(ancestor, intent, transaction_id, end_time):
+                return False
+        if not self._acquire(resource_id, mode, transaction_id, end_time):
+            return False
+
+        if ancestors and self.escalation_threshold:
+            with self._held_lock:
+                children = self._children.setdefault(transaction_id, {}).setdefault(ancestors[0], set())
+                children.add(resource_id)
+                count = len(children)
+            # Try at threshold + 1 and again after every further threshold locks
+            if count > self.escalation_threshold and (count - 1) % self.escalation_threshold == 0:
+                self._escalate(ancestors[0], transaction_id)
+        return True
+
+    def _escalate(self, table: str, transaction_id: str) -> bool:
+        """Replace a transaction's locks under table with one table lock"""
+        target = _X if self.held_mode(table, transaction_id) in (_IX, _SIX) else _S
+        # Escalation is opportunistic: never wait for it
+        if not self._acquire(table, target, transaction_id, end_time=0.0):
+            return False
+        prefix = table + self.hierarchy_separator
+        with self._held_lock:
+            self._children.get(transaction_id, {}).pop(table, None)
+            held = self._held.get(transaction_id, set())
+            # Rows and the intent locks on pages between them and the table
+            children = {resource_id for resource_id in held if resource_id.startswith(prefix)}
+            held.difference_update(children)
+        for resource_id in children:
+            self._release(resource_id, transaction_id)
+        self.stats["escalations"] += 1
+        logger.debug(f"Escalated {len(children)} locks of {transaction_id} to {target.value} on {table}")
+        return True
+
+    def _acquire(self, resource_id: str, mode: LockMode, transaction_id: str, end_time: float) -> bool:
+        """Acquire or convert a lock on one resource, waiting until end_time"""
+        stripe = self._stripe(resource_id)
+
+        with stripe.mutex:
+            entry = stripe.resources.get(resource_id)
+            if entry is None:
+                entry = stripe.resources[resource_id] = _ResourceLocks()
+            entry.granted = [lock for lock in entry.granted if not lock.is_expired()]
+
+            # Check if we already hold a lock at least this strong
+            holds = False
+            for existing_lock in entry.granted:
+                if existing_lock.transaction_id == transaction_id:
+                    target = _MODE_SUPREMUM[(existing_lock.mode, mode)]
+                    if target == existing_lock.mode:
+                        return True
+                    mode, holds = target, True
+
+            # New requests queue behind earlier waiters; a conversion goes
+            # first, since queued waiters may be waiting on the lock it holds
+            blockers = self._blockers(entry, mode, transaction_id, () if holds else entry.waiters)
+            if not blockers:
+                self._grant(entry, resource_id, mode, transaction_id)
+                return True
+            if end_time <= time.time():
+                self._discard_if_idle(stripe, resource_id, entry)
+                return False
+
+            request = _LockRequest(transaction_id, mode, threading.Condition(stripe.mutex))
+            with self._held_lock:
+                self._waiting[transaction_id] = (resource_id, request)
+            if holds:
+                # Everything queued now also waits on the conversion
+                entry.waiters.appendleft(request)
+                self._point_wait_edges(entry)
+            else:
+                entry.waiters.append(request)
+                self._set_wait_edges(request, blockers)
+
+            try:
+                while not request.granted:
+                    remaining = end_time - time.time()
+                    if request.cancelled or remaining <= 0:
+                        # Timeout - leave the queue; requests behind us may now be grantable
+                        self._dequeue(stripe, entry, resource_id, request)
+                        return False
+                    # Releases notify only the requests they grant
+                    request.condition.wait(timeout=remaining)
+                return True
+            finally:
+                with self._held_lock:
+                    if self._waiting.get(transaction_id, (None, None))[1] is request:
+                        del self._waiting[transaction_id]
+
+    def _dequeue(self, stripe: _LockStripe, entry: _ResourceLocks, resource_id: str, request: _LockRequest):
+        """Withdraw a waiting request (stripe mutex held)"""
+        if request in entry.waiters:
+            entry.waiters.remove(request)
+        self._set_wait_edges(request, set())
+        self._grant_waiters(entry, resource_id)
+        self._discard_if_idle(stripe, resource_id, entry)
+
+    def cancel_wait(self, transaction_id: str) -> bool:
+        """Make a transaction's pending acquire_lock return False now"""
+        with self._held_lock:
+            resource_id, request = self._waiting.get(transaction_id, (None, None))
+        if request is None:
+            return False
+        stripe = self._stripe(resource_id)
+        with stripe.mutex:
+            if request.granted or request.cancelled:
+                return False
+            request.cancelled = True
+            entry = stripe.resources.get(resource_id)
+            if entry is not None:
+                self._dequeue(stripe, entry, resource_id, request)
+            request.condition.notify()
+            return True
+
+    @staticmethod
+    def _discard_if_idle(stripe: _LockStripe, resource_id: str, entry: _ResourceLocks):
+        if not entry.granted and not entry.waiters:
+            stripe.resources.pop(resource_id, None)
+
+    def _release(self, resource_id: str, transaction_id: str):
+        stripe = self._stripe(resource_id)
+        with stripe.mutex:
+            entry = stripe.resources.get(resource_id)
+            if entry is None:
+                return
+            entry.granted = [lock for lock in entry.granted if lock.transaction_id != transaction_id]
+            self._grant_waiters(entry, resource_id)
+            self._discard_if_idle(stripe, resource_id, entry)
 
-                # Wait for notification (releases _lock while waiting)
-                self._condition.wait(timeout=min(remaining, 0.1))
-    
     def release_lock(self, resource_id: str, transaction_id: str):
         """Release all locks held by transaction on resource"""
-        with self._condition:
-            self.locks[resource_id] = [
-                lock for lock in self.locks[resource_id]
-                if lock.transaction_id != transaction_id
-            ]
-            self._condition.notify_all()
+        ancestors = self._ancestors(resource_id)
+        with self._held_lock:
+            held = self._held.get(transaction_id)
+            if held is not None:
+                held.discard(resource_id)
+                if not held:
+                    del self._held[transaction_id]
+            if ancestors:
+                self._children.get(transaction_id, {}).get(ancestors[0], set()).discard(resource_id)
+        self._release(resource_id, transaction_id)
 
     def release_all_locks(self, transaction_id: str):
         """Release all locks held by a transaction"""
-        with self._condition:
-            for resource_id in list(self.locks.keys()):
-                self.locks[resource_id] = [
-                    lock for lock in self.locks[resource_id]
-                    if lock.transaction_id != transaction_id
-                ]
-            self._condition.notify_all()
-    
+        # A deadlock victim may still be queued for another lock
+        self.cancel_wait(transaction_id)
+        with self._held_lock:
+            held = self._held.pop(transaction_id, ())
+            self._children.pop(transaction_id, None)
+        for resource_id in held:
+            self._release(resource_id, transaction_id)
+
+    def held_resources(self, transaction_id: str) -> Set[str]:
+        """Resources on which a transaction holds locks"""
+        with self._held_lock:
+            return set(self._held.get(transaction_id, ()))
+
+    @property
+    def locks(self) -> Dict[str, List[Lock]]:
+        """Snapshot of granted locks by resource"""
+        snapshot = {}
+        for stripe in self._stripes:
+            with stripe.mutex:
+                for resource_id, entry in stripe.resources.items():
+                    if entry.granted:
+                        snapshot[resource_id] = list(entry.granted)
+        return snapshot
+
+    def get_lock_count(self) -> int:
+        """Number of granted locks"""
+        total = 0
+        for stripe in self._stripes:
+            with stripe.mutex:
+                total += sum(len(entry.granted) for entry in stripe.resources.values())
+        return total
+
+    def waiting_transactions(self) -> Set[str]:
+        """Transactions currently queued for a lock"""
+        with self._held_lock:
+            return set(self._waiting)
+
     def _handle_deadlock(self, cycle: List[str]):
         """Handle detected deadlock by delegating to external handler"""
-        if not cycle:
+        if not cycle or not self.deadlock_detector.has_cycle(cycle):
+            # Already broken by a timeout or release
             return
 
         logger.warning(f"Deadlock detected in cycle: {' -> '.join(cycle)}")
@@ -336,15 +685,50 @@ class LockManager:
         # Delegate to external handler (TransactionManager) if set
         if self._external_deadlock_handler:
             self._external_deadlock_handler(cycle)
+        else:
+            # Fail the wait of the member holding the fewest locks
+            victim = min(set(cycle), key=lambda tx_id: len(self.held_resources(tx_id)))
+            self.cancel_wait(victim)
 
 class TransactionManager:
-    """Production-grade transaction manager with ACID guarantees"""
+    """
+    Production-grade transaction manager with ACID guarantees
+
+    Resources managed in-process are multi-versioned. Reads never take
+    locks: they are served from the version chain at the transaction's
+    snapshot (REPEATABLE_READ, SERIALIZABLE) or at the latest commit
+    (READ_COMMITTED, READ_UNCOMMITTED), so readers never wait for writers.
+    Writes take exclusive locks, are buffered, and become a new version
+    at commit. REPEATABLE_READ and SERIALIZABLE abort a write to a
+    resource changed since their snapshot (first updater wins);
+    SERIALIZABLE additionally aborts transactions that would close a
+    read-write antidependency cycle.
+
+    With wal_path set, committed writes are made durable in a write-ahead
+    log before they become visible, and the committed state is recovered
+    from it on startup. Concurrent commits share fsyncs (group commit).
+    """
     
-    def __init__(self):
+    def __init__(self, version_gc_interval: int = 256, wal_path: Optional[str] = None,
+                 group_commit_window: float = 0.0, wal_sync: bool = True):
         self.active_transactions: Dict[str, Transaction] = {}
         self.lock_manager = LockManager()
         self._lock = threading.RLock()
 
+        # Multi-version storage
+        self.oracle = TimestampOracle()
+        self.versions = VersionStore()
+        self.ssi = SerializableConflictTracker()
+        self.version_gc_interval = version_gc_interval
+        self._commits_since_gc = 0
+
+        # Durability
+        self.wal: Optional[WriteAheadLog] = None
+        self._checkpoint_lock = threading.Lock()
+        if wal_path:
+            self.wal = WriteAheadLog(wal_path, group_commit_window=group_commit_window, sync=wal_sync)
+            self._recover()
+
         # Register deadlock handler with lock manager
         self.lock_manager.set_deadlock_handler(self._resolve_deadlock)
 
@@ -357,30 +741,44 @@ class TransactionManager:
             "average_transaction_time": 0.0
         }
 
-        # Recovery log (simplified)
-        self.transaction_log: List[Dict[str, Any]] = []
+        # Recent transaction activity (durability is the WAL's job)
+        self.transaction_log: Deque[Dict[str, Any]] = deque(maxlen=10000)
+
+    def _recover(self):
+        """Rebuild committed state from the checkpoint and WAL records"""
+        recovered = self.wal.recover()
+        if recovered.checkpoint_data:
+            self.versions.install({resource: (value, False) for resource, value in
+                                   recovered.checkpoint_data.items()}, recovered.checkpoint_ts, "checkpoint")
+        for record in recovered.records:
+            self.versions.install({resource: (value, deleted) for resource, value, deleted in record["writes"]},
+                                  record["ts"], record["tx"])
+        self.oracle = TimestampOracle(start=recovered.last_ts)
+        if recovered.records or recovered.checkpoint_data:
+            logger.info(f"Recovered {len(recovered.checkpoint_data)} resources from checkpoint "
+                        f"and {len(recovered.records)} WAL records up to ts={recovered.last_ts}")
 
     def _resolve_deadlock(self, cycle: List[str]):
-        """Resolve deadlock by aborting the youngest transaction in the cycle"""
+        """Resolve deadlock by aborting the cheapest transaction in the cycle
+
+        Cost is the locks held plus operations performed, i.e. the work an
+        abort throws away; ties go to the youngest transaction.
+        """
         with self._lock:
+            candidates = [self.active_transactions[tx_id] for tx_id in set(cycle)
+                          if tx_id in self.active_transactions]
+            if not candidates:
+                return
             self.transaction_stats["deadlocks_detected"] += 1
 
-            # Find youngest transaction in cycle (most recently started)
-            youngest_tx_id = None
-            youngest_start_time = None
+            def abort_cost(tx: Transaction) -> Tuple[int, float]:
+                work = len(self.lock_manager.held_resources(tx.transaction_id)) + len(tx.operations)
+                return work, -tx.start_time.timestamp()
 
-            for tx_id in cycle:
-                if tx_id in self.active_transactions:
-                    tx = self.active_transactions[tx_id]
-                    if youngest_start_time is None or tx.start_time > youngest_start_time:
-                        youngest_start_time = tx.start_time
-                        youngest_tx_id = tx_id
+            victim = min(candidates, key=abort_cost)
+            logger.warning(f"Resolving deadlock by aborting transaction: {victim.transaction_id}")
+            self._abort_transaction_internal(victim.transaction_id)
 
-            # Abort the youngest transaction to break the cycle
-            if youngest_tx_id:
-                logger.warning(f"Resolving deadlock by aborting transaction: {youngest_tx_id}")
-                self._abort_transaction_internal(youngest_tx_id)
-    
     def begin_transaction(self, isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED) -> str:
         """Begin a new transaction"""
         with self._lock:
@@ -388,8 +786,11 @@ class TransactionManager:
             
             transaction = Transaction(
                 transaction_id=transaction_id,
-                isolation_level=isolation_level
+                isolation_level=isolation_level,
+                snapshot_ts=self.oracle.current()
             )
+            if isolation_level == IsolationLevel.SERIALIZABLE:
+                self.ssi.begin(transaction_id, transaction.snapshot_ts)
             
             self.active_transactions[transaction_id] = transaction
             self.transaction_stats["total_transactions"] += 1
@@ -430,45 +831,101 @@ class TransactionManager:
                 # Apply changes (in real system, write to persistent storage)
                 for operation in transaction.operations:
                     self._apply_operation(operation)
-                
-                transaction.state = TransactionState.COMMITTED
-                
-                # Log commit
-                log_entry = {
-                    "action": "COMMIT",
-                    "transaction_id": transaction_id,
-                    "operations_count": len(transaction.operations),
-                    "timestamp": datetime.now().isoformat()
-                }
-                self.transaction_log.append(log_entry)
-                
-                # Update stats
-                self.transaction_stats["committed_transactions"] += 1
-                duration = (datetime.now() - transaction.start_time).total_seconds()
-                self._update_average_time(duration)
 
-                # Clean up wait-for graph edges and release locks
-                self.lock_manager.clear_transaction_wait_edges(transaction_id)
-                self.lock_manager.release_all_locks(transaction_id)
-                del self.active_transactions[transaction_id]
+                transaction.commit_ts = self.oracle.allocate()
+                self.ssi.commit(transaction_id, transaction.commit_ts)
+            except Exception as e:
+                logger.error(f"Commit of {transaction_id} failed: {e}")
+                self._abort_transaction_internal(transaction_id, force=True)
+                return False
 
-                return True
-                
+        # Make the redo record durable outside self._lock, so concurrent
+        # commits can share one fsync
+        if self.wal is not None and transaction.write_buffer:
+            try:
+                self.wal.append({
+                    "ts": transaction.commit_ts,
+                    "tx": transaction_id,
+                    "writes": [[resource, value, deleted]
+                               for resource, (value, deleted) in transaction.write_buffer.items()],
+                })
             except Exception as e:
-                self._abort_transaction_internal(transaction_id)
+                logger.error(f"WAL append for {transaction_id} failed: {e}")
+                with self._lock:
+                    self.oracle.publish(transaction.commit_ts)
+                    self._abort_transaction_internal(transaction_id, force=True)
                 return False
+
+        with self._lock:
+            # Publish buffered writes as versions visible to later snapshots
+            self.versions.install(transaction.write_buffer, transaction.commit_ts, transaction_id)
+            self.oracle.publish(transaction.commit_ts)
+            
+            transaction.state = TransactionState.COMMITTED
+            
+            # Log commit
+            log_entry = {
+                "action": "COMMIT",
+                "transaction_id": transaction_id,
+                "operations_count": len(transaction.operations),
+                "timestamp": datetime.now().isoformat()
+            }
+            self.transaction_log.append(log_entry)
+            
+            # Update stats
+            self.transaction_stats["committed_transactions"] += 1
+            duration = (datetime.now() - transaction.start_time).total_seconds()
+            self._update_average_time(duration)
+
+            # Clean up wait-for graph edges and release locks
+            self.lock_manager.clear_transaction_wait_edges(transaction_id)
+            self.lock_manager.release_all_locks(transaction_id)
+            del self.active_transactions[transaction_id]
+
+            self._commits_since_gc += 1
+            if self.version_gc_interval and self._commits_since_gc >= self.version_gc_interval:
+                self.collect_garbage()
+
+        if self.wal is not None and self.wal.needs_checkpoint():
+            self.checkpoint()
+        return True
+
+    def checkpoint(self) -> bool:
+        """Write the committed state to the WAL checkpoint and trim the log
+
+        Returns:
+            False if there is no WAL or another checkpoint is running
+        """
+        if self.wal is None or not self._checkpoint_lock.acquire(blocking=False):
+            return False
+        try:
+            # Every commit at or before the published timestamp is installed
+            ts = self.oracle.current()
+            self.wal.checkpoint(ts, self.versions.snapshot(ts))
+            return True
+        finally:
+            self._checkpoint_lock.release()
+
+    def close(self):
+        """Stop deadlock detection and close the WAL"""
+        self.lock_manager.deadlock_detector.stop_detection()
+        if self.wal is not None:
+            self.wal.close()
     
     def abort_transaction(self, transaction_id: str) -> bool:
         """Abort a transaction"""
         with self._lock:
             return self._abort_transaction_internal(transaction_id)
     
-    def _abort_transaction_internal(self, transaction_id: str) -> bool:
+    def _abort_transaction_internal(self, transaction_id: str, force: bool = False) -> bool:
         """Internal abort implementation"""
         if transaction_id not in self.active_transactions:
             return False
         
         transaction = self.active_transactions[transaction_id]
+        if transaction.state == TransactionState.COMMITTING and not force:
+            # Its commit record may already be durable
+            return False
         transaction.state = TransactionState.ABORTING
         
         # Undo operations (simplified - in real system, use undo log)
@@ -488,6 +945,7 @@ class TransactionManager:
         
         # Update stats
         self.transaction_stats["aborted_transactions"] += 1
+        self.ssi.abort(transaction_id)
 
         # Clean up wait-for graph edges and release locks
         self.lock_manager.clear_transaction_wait_edges(transaction_id)
@@ -496,8 +954,40 @@ class TransactionManager:
 
         return True
     
+    def read(self, transaction_id: str, resource: str, default: Any = None) -> Any:
+        """Read a resource without locking; default if it is missing or the read fails"""
+        ok, value = self._snapshot_read(transaction_id, resource, default)
+        return value if ok else default
+
+    def _snapshot_read(self, transaction_id: str, resource: str, default: Any = None) -> Tuple[bool, Any]:
+        with self._lock:
+            transaction = self.active_transactions.get(transaction_id)
+            if transaction is None or transaction.state != TransactionState.ACTIVE:
+                return False, default
+
+            if resource in transaction.write_buffer:
+                # Own uncommitted write
+                value, deleted = transaction.write_buffer[resource]
+                value = default if deleted else value
+            else:
+                if transaction.isolation_level in (IsolationLevel.REPEATABLE_READ, IsolationLevel.SERIALIZABLE):
+                    ts = transaction.snapshot_ts
+                else:
+                    ts = self.oracle.current()
+                value = self.versions.read(resource, ts, default)
+
+            if not self._check_isolation_constraints(transaction, "READ", resource):
+                self._abort_transaction_internal(transaction_id)
+                return False, default
+            transaction.add_operation("READ", resource)
+            return True, value
+
     def execute_operation(self, transaction_id: str, operation_type: str, resource: str, data: Any = None) -> bool:
         """Execute an operation within a transaction"""
+        if operation_type == "READ":
+            # Snapshot read: no shared lock, never waits for writers
+            return self._snapshot_read(transaction_id, resource)[0]
+
         # Phase 1: Validate and determine lock mode (under lock)
         with self._lock:
             if transaction_id not in self.active_transactions:
@@ -508,11 +998,7 @@ class TransactionManager:
             if transaction.state != TransactionState.ACTIVE:
                 return False
 
-            # Determine required lock mode
-            if operation_type == "READ":
-                lock_mode = LockMode.SHARED
-            else:
-                lock_mode = LockMode.EXCLUSIVE
+            lock_mode = LockMode.EXCLUSIVE
 
         # Phase 2: Acquire lock (outside self._lock to avoid blocking commit/abort)
         # This can block waiting for other transactions to release locks
@@ -546,70 +1032,75 @@ class TransactionManager:
 
             # Execute operation based on isolation level
             if not self._check_isolation_constraints(transaction, operation_type, resource):
-                # Release the lock we just acquired before failing
-                self.lock_manager.release_lock(resource, transaction_id)
-                transaction.locks_held.discard(resource)
+                # Serialization failure: the transaction cannot commit
+                self._abort_transaction_internal(transaction_id)
                 return False
 
-            # Log the operation
+            # Log the operation and buffer the write
             transaction.add_operation(operation_type, resource, data)
+            transaction.write_buffer[resource] = (data, operation_type == "DELETE")
 
             return True
     
     def _validate_transaction(self, transaction: Transaction) -> bool:
-        """Validate transaction can commit (simplified validation)"""
-        # Check for write-write conflicts, phantom reads, etc.
-        # Simplified implementation
+        """Validate transaction can commit"""
+        # SSI: refuse to commit the pivot of two read-write antidependencies
+        if transaction.isolation_level == IsolationLevel.SERIALIZABLE:
+            return self.ssi.can_commit(transaction.transaction_id)
         return True
     
     def _apply_operation(self, operation: Dict[str, Any]):
         """Apply operation to persistent storage.
 
-        CE Edition: Operations are applied directly via the database adapter's
-        execute methods rather than through this centralized hook. This method
-        exists for interface consistency with the full transaction protocol.
+        In-process resources are made durable by commit_transaction, which
+        writes the transaction's buffered writes to the WAL as one redo
+        record and installs them in the version store. Adapter-backed
+        operations are applied directly via the database adapter's execute
+        methods; this hook exists for interface consistency.
         """
-        # CE: Direct adapter execution; no centralized write-ahead log
         pass
 
     def _undo_operation(self, operation: Dict[str, Any]):
         """Undo operation using undo log.
 
-        CE Edition: Rollback is handled by the underlying database's native
-        transaction support (SQLite, PostgreSQL, etc.) rather than through
-        application-level undo logging. This method exists for interface
-        consistency with the full transaction protocol.
+        Writes stay in the transaction's write buffer until commit, so an
+        aborted transaction has changed neither the version store nor the
+        WAL and there is nothing to undo. Adapter-backed operations rely on
+        the database's native rollback (SQLite, PostgreSQL, etc.).
         """
-        # CE: Relies on native database rollback; no application-level undo log
         pass
     
     def _check_isolation_constraints(self, transaction: Transaction, operation_type: str, resource: str) -> bool:
-        """Check isolation level constraints"""
+        """Check isolation level constraints
+
+        Reads only see committed versions, so dirty reads are impossible at
+        every level and READ_UNCOMMITTED/READ_COMMITTED need no checks.
+        """
         isolation = transaction.isolation_level
-        
-        if isolation == IsolationLevel.READ_UNCOMMITTED:
-            # Dirty reads allowed
-            return True
-        elif isolation == IsolationLevel.READ_COMMITTED:
-            # No dirty reads, but non-repeatable reads allowed
+
+        if isolation in (IsolationLevel.REPEATABLE_READ, IsolationLevel.SERIALIZABLE):
+            # First updater wins: the snapshot must not miss a newer version
+            if operation_type != "READ" and self.versions.latest_ts(resource) > transaction.snapshot_ts:
+                return False
+        if isolation == IsolationLevel.SERIALIZABLE:
             if operation_type == "READ":
-                # Check if resource has uncommitted writes
-                for other_tx in self.active_transactions.values():
-                    if other_tx.transaction_id != transaction.transaction_id:
-                        if resource in other_tx.write_set and other_tx.state == TransactionState.ACTIVE:
-                            return False
-            return True
-        elif isolation == IsolationLevel.REPEATABLE_READ:
-            # No dirty reads, no non-repeatable reads
-            if operation_type == "READ" and resource in transaction.read_set:
-                # Ensure same value is read
-                pass  # Simplified
-            return True
-        elif isolation == IsolationLevel.SERIALIZABLE:
-            # Full serialization - prevent all anomalies
-            return True
-        
+                return self.ssi.record_read(transaction.transaction_id, resource)
+            return self.ssi.record_write(transaction.transaction_id, resource)
+
         return True
+
+    def collect_garbage(self) -> int:
+        """Drop versions and SSI state no active snapshot can see
+
+        Returns:
+            Number of versions removed
+        """
+        with self._lock:
+            snapshots = [tx.snapshot_ts for tx in self.active_transactions.values()]
+            watermark = min(snapshots) if snapshots else self.oracle.current()
+            self._commits_since_gc = 0
+            self.ssi.prune(watermark)
+            return self.versions.collect(watermark)
     
     def _update_average_time(self, duration: float):
         """Update average transaction time"""
@@ -624,7 +1115,8 @@ class TransactionManager:
             return {
                 **self.transaction_stats.copy(),
                 "active_transactions": len(self.active_transactions),
-                "total_locks": sum(len(locks) for locks in self.lock_manager.locks.values())
+                "total_locks": self.lock_manager.get_lock_count(),
+                **self.versions.get_statistics()
             }
     
     def get_active_transactions(self) -> List[Dict[str, Any]]:
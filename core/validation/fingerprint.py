@@ -23,12 +23,20 @@ Fingerprint Method Documentation:
    - Table fingerprints are sorted alphabetically by table name
    - Fingerprints are concatenated with table names
    - Result is hashed via SHA256
+
+3. Streaming table fingerprint (row batches, bounded memory):
+   - Each row is serialized and hashed as in (1)
+   - Row hashes are summed as integers modulo 2^bits, so the result does
+     not depend on row order and needs no in-memory sort
+   - The row count and the sum are hashed together
+   - Not comparable with (1); both sides of a comparison must use the same
+     method
 """
 
 import hashlib
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from dataclasses import dataclass, field
 
 from .schemas import TableFingerprint, DatasetFingerprint
@@ -180,6 +188,54 @@ class FingerprintCalculator:
             null_counts=null_counts
         )
 
+    def compute_streaming_fingerprint(
+        self,
+        table_name: str,
+        batches: Iterable[List[Dict[str, Any]]],
+        columns: Optional[List[str]] = None
+    ) -> TableFingerprint:
+        """
+        Compute an order-independent fingerprint from row batches.
+
+        Consumes batches one at a time (e.g. from an adapter's iter_data()),
+        so memory is bounded by the batch size. sample_size is not applied:
+        sampling needs the sorted prefix of the table.
+
+        Args:
+            table_name: Name of the table
+            batches: Iterable of row dictionary lists
+            columns: Column names in order (if None, derived from first row)
+
+        Returns:
+            TableFingerprint with hash and statistics
+        """
+        hasher = self._get_hasher()
+        modulus = 1 << (8 * hasher().digest_size)
+        accumulator = 0
+        row_count = 0
+        null_counts: Optional[Dict[str, int]] = None
+
+        for batch in batches:
+            for row in batch:
+                if columns is None:
+                    columns = sorted(row.keys())
+                if null_counts is None:
+                    null_counts = {col: 0 for col in columns if col not in self.config.excluded_columns}
+                for col in null_counts:
+                    if row.get(col) is None:
+                        null_counts[col] += 1
+                digest = hasher(self._serialize_row(row, columns).encode('utf-8')).digest()
+                accumulator = (accumulator + int.from_bytes(digest, 'big')) % modulus
+                row_count += 1
+
+        return TableFingerprint(
+            table_name=table_name,
+            row_count=row_count,
+            fingerprint=self._hash_string(f"{row_count}:{accumulator:x}"),
+            column_count=len([c for c in (columns or []) if c not in self.config.excluded_columns]),
+            null_counts=null_counts or {}
+        )
+
     def compute_dataset_fingerprint(
         self,
         table_fingerprints: List[TableFingerprint]
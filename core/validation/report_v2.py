@@ -15,12 +15,12 @@ Version: 1.0.0
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from pathlib import Path
 
 from .schemas import (
     ValidationReportV2, TableTypeParity, TypeMapping,
-    ConstraintParity, ParityStatus, LimitationsReport, Limitation
+    ConstraintParity, ParityStatus, LimitationsReport, Limitation, TableFingerprint
 )
 from .fingerprint import FingerprintCalculator, FingerprintConfig
 
@@ -316,6 +316,36 @@ class ValidationReportGenerator:
         return paths
 
 
+# Rows per batch when streaming tables for data parity
+STREAM_BATCH_SIZE = 10000
+
+
+def _iter_table_batches(adapter: Any, table_name: str,
+                        batch_size: int = STREAM_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Row batches from adapter.iter_data() if supported, else one extract_data() batch"""
+    if hasattr(adapter, 'iter_data'):
+        yield from adapter.iter_data(table_name, batch_size=batch_size)
+    else:
+        yield adapter.extract_data(table_name).get('data', [])
+
+
+def _fingerprint_table(calc: FingerprintCalculator, adapter: Any, table_name: str,
+                       columns: List[str]) -> TableFingerprint:
+    """
+    Fingerprint one side of a table comparison.
+
+    Streams through the order-independent fingerprint, so adapters with
+    iter_data() are compared in bounded memory. Sampling needs the sorted
+    prefix of the table and falls back to the materialized fingerprint.
+    """
+    if calc.config.sample_size:
+        rows = adapter.extract_data(table_name).get('data', [])
+        return calc.compute_table_fingerprint(table_name, rows, columns)
+    return calc.compute_streaming_fingerprint(
+        table_name, _iter_table_batches(adapter, table_name), columns
+    )
+
+
 def compare_adapters(
     source_adapter: Any,
     target_adapter: Any,
@@ -374,31 +404,18 @@ def compare_adapters(
     for table_name in tables:
         try:
             # Data parity
-            source_data = source_adapter.extract_data(table_name)
-            target_data = target_adapter.extract_data(table_name)
-
-            source_rows = source_data.get('data', [])
-            target_rows = target_data.get('data', [])
-
-            # Compute fingerprints
             source_schema = source_adapter.get_schema(table_name)
             source_cols = [c['name'] for c in source_schema.get('columns', [])]
-
-            source_fp = fingerprint_calc.compute_table_fingerprint(
-                table_name, source_rows, source_cols
-            )
-
             target_schema = target_adapter.get_schema(table_name)
             target_cols = [c['name'] for c in target_schema.get('columns', [])]
 
-            target_fp = fingerprint_calc.compute_table_fingerprint(
-                table_name, target_rows, target_cols
-            )
+            source_fp = _fingerprint_table(fingerprint_calc, source_adapter, table_name, source_cols)
+            target_fp = _fingerprint_table(fingerprint_calc, target_adapter, table_name, target_cols)
 
             generator.add_data_parity(
                 table_name,
-                len(source_rows),
-                len(target_rows),
+                source_fp.row_count,
+                target_fp.row_count,
                 source_fp.fingerprint,
                 target_fp.fingerprint
             )
@@ -4,6 +4,12 @@ FILE Adapter with L2/L3/L4 support for CSV and Excel sources.
 L2 (Views): Derived datasets over files with deterministic config
 L3 (Transform Pipelines): Deterministic transform pipelines producing output artifacts
 L4 (File Event Automation): Trigger-like automation with simulated events
+
+Single-table views with a LIMIT are streamed in chunks: ORDER BY ... LIMIT k
+keeps only k candidate rows (bounded-heap Top-K), and a LIMIT without
+ORDER BY stops reading the file once k rows have matched. Single-table
+aggregate views (COUNT/SUM/AVG/MIN/MAX/COUNT DISTINCT with an optional
+GROUP BY) are streamed through partial hash aggregation.
 """
 
 import os
@@ -16,6 +22,9 @@ from datetime import datetime
 from dataclasses import dataclass, field
 import pandas as pd
 
+from core.top_k import TopK, make_sort_key, parse_order_by
+from core.hash_aggregate import AggregateSpec, HashAggregator
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -50,6 +59,36 @@ VALIDATION_RULES = {
 # Event types for L4 triggers
 EVENT_TYPES = {'on_ingest', 'on_change', 'on_batch_complete'}
 
+# Rows read per chunk when a view is streamed
+VIEW_STREAM_BATCH_SIZE = 10000
+
+# Single-table SELECT ... LIMIT n that query_view can stream
+_STREAMABLE_VIEW_RE = re.compile(
+    r'^\s*SELECT\s+(?P<columns>\*|\w+(?:\s*,\s*\w+)*)\s+FROM\s+(?P<table>\w+)'
+    r'(?:\s+WHERE\s+(?P<where>.+?))?'
+    r'(?:\s+ORDER\s+BY\s+(?P<order>.+?))?'
+    r'\s+LIMIT\s+(?P<limit>\d+)\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Single-table SELECT <columns / aggregates> ... [GROUP BY ...] views query_view can stream
+_AGGREGATE_VIEW_RE = re.compile(
+    r'^\s*SELECT\s+(?P<select>.+?)\s+FROM\s+(?P<table>\w+)'
+    r'(?:\s+WHERE\s+(?P<where>.+?))?'
+    r'(?:\s+GROUP\s+BY\s+(?P<group>\w+(?:\s*,\s*\w+)*))?'
+    r'(?:\s+ORDER\s+BY\s+(?P<order>.+?))?'
+    r'(?:\s+LIMIT\s+(?P<limit>\d+))?\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Conditions _apply_single_filter evaluates exactly (anything else is not streamed)
+_SIMPLE_CONDITION_RES = (
+    re.compile(r'(?:\w+\.)?\w+\s*(>=|<=|!=|=|>|<)\s*\d+(?:\.\d+)?'),
+    re.compile(r"(?:\w+\.)?\w+\s*(!=|=)\s*'[^']+'"),
+    re.compile(r'(?:\w+\.)?\w+\s*(!=|=)\s*"[^"]+"'),
+    re.compile(r'(?:\w+\.)?\w+\s+IS\s+(NOT\s+)?NULL', re.IGNORECASE),
+)
+
 
 # ============================================================================
 # Data Classes
@@ -305,25 +344,28 @@ class FileAdapter:
 
     def fetch_rows(self, table_name: str, batch_size: int = 1000) -> Generator[List[Dict[str, Any]], None, None]:
         """Yield batches of rows from a table."""
+        for chunk in self._iter_frames(table_name, batch_size):
+            yield chunk.where(pd.notnull(chunk), None).to_dict('records')
+
+    def _iter_frames(self, table_name: str, batch_size: int) -> Generator[pd.DataFrame, None, None]:
+        """Yield a table as DataFrame chunks (CSV is read incrementally)."""
         file_path = self.tables[table_name]
         config = self.table_configs.get(table_name)
 
-        def process_chunk(chunk):
-            return chunk.where(pd.notnull(chunk), None).to_dict('records')
-
         if file_path.suffix == '.csv':
             read_kwargs = {}
             if config:
                 read_kwargs['delimiter'] = config.config.get('delimiter', ',')
                 read_kwargs['quotechar'] = config.config.get('quote_char', '"')
                 read_kwargs['encoding'] = config.config.get('encoding', 'utf-8')
-            for chunk in pd.read_csv(file_path, chunksize=batch_size, **read_kwargs):
-                yield process_chunk(chunk)
+            with pd.read_csv(file_path, chunksize=batch_size, **read_kwargs) as reader:
+                for chunk in reader:
+                    yield chunk
         else:
             df = pd.read_excel(file_path)
             total = len(df)
             for i in range(0, total, batch_size):
-                yield process_chunk(df.iloc[i:i+batch_size])
+                yield df.iloc[i:i+batch_size]
 
     def _read_table(self, table_name: str) -> pd.DataFrame:
         """Read entire table into DataFrame."""
@@ -418,6 +460,12 @@ class FileAdapter:
         if not view:
             raise ValueError(f"View not found: {name}")
 
+        streamed = self._stream_view(view)
+        if streamed is None:
+            streamed = self._aggregate_view(view)
+        if streamed is not None:
+            return streamed
+
         # Load required tables into a context
         context = {}
         for table_name in view.source_tables:
@@ -459,13 +507,24 @@ class FileAdapter:
         if actual_table is None:
             raise ValueError(f"Table not found in context: {table_name}")
 
-        # Handle WHERE clause for simple conditions
-        where_match = re.search(r'WHERE\s+(.+?)(?:ORDER|GROUP|$)', sql_upper, re.DOTALL)
+        # Handle WHERE clause for simple conditions (original case: string literals
+        # compare exactly, as in the streamed view paths)
+        where_match = re.search(r'WHERE\s+(.+?)(?:ORDER|GROUP|LIMIT|$)', sql, re.IGNORECASE | re.DOTALL)
         if where_match:
             condition = where_match.group(1).strip()
             actual_table = self._apply_filter(actual_table, condition)
 
-        # Handle column selection
+        # Handle ORDER BY / LIMIT (before projection: the sort key may not be selected)
+        order_match = re.search(r'ORDER\s+BY\s+(.+?)(?:\s+LIMIT\b|;|$)', sql, re.IGNORECASE | re.DOTALL)
+        limit_match = re.search(r'LIMIT\s+(\d+)', sql_upper)
+        actual_table = self._order_frame(actual_table,
+                                         order_match.group(1).strip() if order_match else None,
+                                         int(limit_match.group(1)) if limit_match else None)
+
+        return self._project_columns(actual_table, sql_upper)
+
+    def _project_columns(self, df: pd.DataFrame, sql_upper: str) -> pd.DataFrame:
+        """Apply the SELECT column list of a simple query."""
         select_match = re.search(r'SELECT\s+(.+?)\s+FROM', sql_upper)
         if select_match:
             cols_str = select_match.group(1).strip()
@@ -474,14 +533,146 @@ class FileAdapter:
                 # Map to actual column names
                 actual_cols = []
                 for col in cols:
-                    for c in actual_table.columns:
+                    for c in df.columns:
                         if c.lower() == col:
                             actual_cols.append(c)
                             break
                 if actual_cols:
-                    actual_table = actual_table[actual_cols]
+                    df = df[actual_cols]
+        return df
+
+    def _order_frame(self, df: pd.DataFrame, order_by: Optional[str], limit: Optional[int]) -> pd.DataFrame:
+        """
+        Apply ORDER BY and/or LIMIT to a DataFrame.
+
+        ORDER BY ... LIMIT k selects rows with a bounded heap instead of
+        sorting the whole frame; ties keep their input order and NULLs
+        sort first ascending, last descending.
+        """
+        if not order_by:
+            return df.head(limit) if limit is not None else df
 
-        return actual_table
+        spec = []
+        for column, descending in parse_order_by(order_by):
+            actual_col = self._find_column(df, column)
+            if actual_col is None:
+                raise ValueError(f"ORDER BY column not found: {column}")
+            spec.append((actual_col, descending))
+
+        values = {col: df[col].astype(object).where(df[col].notna(), None).tolist() for col, _ in spec}
+
+        def getter(position: int, col: str) -> Any:
+            return values[col][position]
+
+        if limit is None:
+            positions = sorted(range(len(df)), key=make_sort_key(spec, getter))
+        else:
+            top = TopK(limit, spec, getter)
+            top.extend(range(len(df)))
+            positions = top.result()
+        return df.iloc[positions]
+
+    @staticmethod
+    def _is_simple_filter(where: str) -> bool:
+        """True if every AND-ed condition is one _apply_single_filter evaluates exactly."""
+        parts = re.split(r'\s+AND\s+', where.strip(), flags=re.IGNORECASE)
+        return all(any(p.fullmatch(part.strip()) for p in _SIMPLE_CONDITION_RES) for part in parts)
+
+    def _aggregate_view(self, view: ViewDefinition) -> Optional[pd.DataFrame]:
+        """
+        Evaluate a single-table aggregate view (aggregates plus GROUP BY
+        columns, optional WHERE / ORDER BY / LIMIT) by streaming its file
+        through partial hash aggregation; memory is one chunk plus the
+        group table.
+
+        Returns None if the view is not of that shape.
+        """
+        match = _AGGREGATE_VIEW_RE.match(view.definition)
+        if not match or view.dependencies:
+            return None
+        table_name = next((name for name in self.tables if name.lower() == match.group('table').lower()), None)
+        if table_name is None:
+            return None
+        where = match.group('where')
+        if where and not self._is_simple_filter(where):
+            return None
+        group_by = [c.strip() for c in match.group('group').split(',')] if match.group('group') else []
+
+        # Every select item must be a GROUP BY column or an aggregate
+        outputs, aggregates = [], []
+        for item in match.group('select').split(','):
+            item = item.strip()
+            if re.fullmatch(r'\w+', item):
+                if item.lower() not in (g.lower() for g in group_by):
+                    return None
+                outputs.append(item)
+                continue
+            try:
+                spec = AggregateSpec.parse(item)
+            except ValueError:
+                return None
+            aggregates.append(spec)
+            outputs.append(spec.alias)
+        if not aggregates:
+            return None
+
+        needed = list(dict.fromkeys(group_by + [spec.column for spec in aggregates if spec.column != '*']))
+
+        def batches() -> Generator[List[Dict[str, Any]], None, None]:
+            columns = None
+            for chunk in self._iter_frames(table_name, VIEW_STREAM_BATCH_SIZE):
+                if columns is None:
+                    columns = {}
+                    for name in needed:
+                        actual = self._find_column(chunk, name)
+                        if actual is None:
+                            raise ValueError(f"Column not found in {table_name}: {name}")
+                        columns[actual] = name
+                if where:
+                    chunk = self._apply_filter(chunk, where.strip())
+                # Only the grouped/aggregated columns, under the names the view uses
+                chunk = chunk[list(columns)].rename(columns=columns)
+                yield chunk.astype(object).where(chunk.notna(), None).to_dict('records')
+
+        rows, stats = HashAggregator(group_by, aggregates).execute_batches(batches())
+        logger.debug(f"Aggregated view {view.name} from {table_name}: "
+                     f"{stats.input_rows} rows, {stats.groups} groups")
+        result = pd.DataFrame(rows, columns=group_by + [spec.alias for spec in aggregates])[outputs]
+        limit = match.group('limit')
+        return self._order_frame(result, match.group('order'), int(limit) if limit else None).reset_index(drop=True)
+
+    def _stream_view(self, view: ViewDefinition) -> Optional[pd.DataFrame]:
+        """
+        Evaluate a single-table SELECT ... [ORDER BY ...] LIMIT n view by
+        streaming its file in chunks, holding at most n + one chunk of rows.
+
+        Returns None if the view is not of that shape.
+        """
+        match = _STREAMABLE_VIEW_RE.match(view.definition)
+        if not match or view.dependencies:
+            return None
+        table_name = next((name for name in self.tables if name.lower() == match.group('table').lower()), None)
+        if table_name is None:
+            return None
+        where = match.group('where')
+        if where and not self._is_simple_filter(where):
+            return None
+        order_by = match.group('order')
+        limit = int(match.group('limit'))
+
+        kept: Optional[pd.DataFrame] = None
+        for chunk in self._iter_frames(table_name, VIEW_STREAM_BATCH_SIZE):
+            if where:
+                chunk = self._apply_filter(chunk, where.strip())
+            kept = chunk if kept is None else pd.concat([kept, chunk])
+            kept = self._order_frame(kept, order_by, limit)
+            if not order_by and len(kept) >= limit:
+                break  # First n matches are the answer; stop reading
+
+        if kept is None:
+            kept = self._read_table(table_name).head(0)
+        logger.debug(f"Streamed view {view.name} from {table_name} ({len(kept)} rows)")
+        return self._project_columns(kept.reset_index(drop=True), view.definition.upper())
 
     def emit_view_definition(self, name: str) -> str:
         """Emit view definition as SQL-like string."""
@@ -725,6 +916,10 @@ class FileAdapter:
             by_cols = [c.split('.')[-1] for c in step['by']]
             ascending = step.get('order', 'ASC').upper() == 'ASC'
 
+            if step.get('limit') is not None:
+                direction = 'ASC' if ascending else 'DESC'
+                return self._order_frame(df, ', '.join(f"{c} {direction}" for c in by_cols), int(step['limit']))
+
             # Find actual column names
             actual_cols = []
             for c in by_cols:
@@ -10,6 +10,7 @@ This module provides a production-ready MySQL adapter for SAIQL with:
 - Performance monitoring
 - Prepared statement caching
 - Connection health checks
+- Streaming extraction (SSCursor) and bulk load (LOAD DATA LOCAL INFILE / packed INSERT)
 
 Author: Apollo & Claude  
 Version: 1.0.0
@@ -27,11 +28,12 @@ Usage:
 
 import pymysql
 import pymysql.cursors
+from pymysql.constants import SERVER_STATUS
 from pymysql import OperationalError, DatabaseError, IntegrityError, MySQLError
 import logging
 import time
 import threading
-from typing import Dict, List, Any, Optional, Union, Tuple, ContextManager
+from typing import Dict, List, Any, Optional, Union, Tuple, ContextManager, Iterator, Iterable
 from dataclasses import dataclass, field
 from contextlib import contextmanager
 from enum import Enum
@@ -39,8 +41,12 @@ import json
 import ssl
 from urllib.parse import urlparse
 import warnings
-import queue
 import re
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from core.connection_pool import ConnectionPool as SharedConnectionPool, PoolConfig
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -116,6 +122,28 @@ class ConnectionConfig:
     sql_mode: str = "STRICT_TRANS_TABLES,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO"
     autocommit: bool = False
     
+    # Pool lifecycle (seconds; 0 disables max lifetime / idle eviction / the reaper thread)
+    pool_validation_idle_time: float = 30.0
+    pool_max_lifetime: float = 1800.0
+    pool_idle_timeout: float = 600.0
+    pool_reaper_interval: float = 30.0
+    
+    # Allow LOAD DATA LOCAL INFILE (the server may then request client files,
+    # so only enable for trusted servers)
+    local_infile: bool = False
+    
+    def pool_config(self) -> PoolConfig:
+        """Pool settings for the shared connection pool"""
+        return PoolConfig(
+            min_size=self.min_connections,
+            max_size=self.max_connections,
+            checkout_timeout=self.connection_timeout,
+            validation_idle_time=self.pool_validation_idle_time,
+            max_lifetime=self.pool_max_lifetime,
+            idle_timeout=self.pool_idle_timeout,
+            reaper_interval=self.pool_reaper_interval
+        )
+    
     def to_connection_params(self) -> Dict[str, Any]:
         """Convert to PyMySQL connection parameters"""
         params = {
@@ -129,6 +157,7 @@ class ConnectionConfig:
             'write_timeout': self.write_timeout,
             'charset': self.charset,
             'autocommit': self.autocommit,
+            'local_infile': self.local_infile,
             'cursorclass': pymysql.cursors.DictCursor
         }
         
@@ -171,98 +200,53 @@ class QueryMetrics:
     cache_hit: bool = False
     prepared_statement: bool = False
 
-class ConnectionPool:
-    """Thread-safe MySQL connection pool"""
+class ConnectionPool(SharedConnectionPool):
+    """
+    Thread-safe MySQL connection pool
+
+    Connections are pinged only after sitting idle past
+    pool_validation_idle_time, and retired after pool_max_lifetime
+    (well inside the session wait_timeout set below).
+    """
     
     def __init__(self, config: ConnectionConfig):
-        self.config = config
-        self.pool = queue.Queue(maxsize=config.max_connections)
-        self.created_connections = 0
-        self._lock = threading.RLock()
-        
-        # Pre-populate pool with minimum connections
-        for _ in range(config.min_connections):
-            conn = self._create_connection()
-            if conn:
-                self.pool.put(conn)
+        self.connection_config = config
+        super().__init__(
+            self._create_connection,
+            config.pool_config(),
+            validate=self._ping,
+            reset=self._reset,
+            is_usable=lambda conn: conn.open,
+            name=f"mysql:{config.host}:{config.port}/{config.database}"
+        )
     
     def _create_connection(self):
         """Create a new MySQL connection"""
-        try:
-            connection_params = self.config.to_connection_params()
-            conn = pymysql.connect(**connection_params)
-            
-            # Set session variables
-            with conn.cursor() as cursor:
-                cursor.execute(f"SET sql_mode = '{self.config.sql_mode}'")
-                cursor.execute("SET time_zone = '+00:00'")  # Use UTC
-                cursor.execute("SET SESSION wait_timeout = 3600")  # 1 hour
-                cursor.execute("SET SESSION interactive_timeout = 3600")
-            
-            conn.commit()
-            self.created_connections += 1
-            logger.debug(f"Created new MySQL connection ({self.created_connections} total)")
-            return conn
-            
-        except Exception as e:
-            logger.error(f"Failed to create MySQL connection: {e}")
-            return None
-    
-    def get_connection(self, timeout: int = 30):
-        """Get connection from pool"""
-        try:
-            # Try to get connection from pool
-            try:
-                conn = self.pool.get(timeout=timeout)
-                # Test connection
-                conn.ping(reconnect=True)
-                return conn
-            except queue.Empty:
-                # Pool is empty, create new connection if under limit
-                with self._lock:
-                    if self.created_connections < self.config.max_connections:
-                        conn = self._create_connection()
-                        if conn:
-                            return conn
-                        
-                # Still no connection available
-                raise RuntimeError("No connections available and max pool size reached")
-                
-        except Exception as e:
-            logger.error(f"Failed to get connection from pool: {e}")
-            raise
+        connection_params = self.connection_config.to_connection_params()
+        conn = pymysql.connect(**connection_params)
+        
+        # Set session variables
+        with conn.cursor() as cursor:
+            cursor.execute(f"SET sql_mode = '{self.connection_config.sql_mode}'")
+            cursor.execute("SET time_zone = '+00:00'")  # Use UTC
+            cursor.execute("SET SESSION wait_timeout = 3600")  # 1 hour
+            cursor.execute("SET SESSION interactive_timeout = 3600")
+        
+        conn.commit()
+        logger.debug(f"Created new MySQL connection ({self.stats['created'] + 1} total)")
+        return conn
     
-    def return_connection(self, conn):
-        """Return connection to pool"""
-        try:
-            if conn and conn.open:
-                self.pool.put_nowait(conn)
-            else:
-                # Connection is closed, create replacement if needed
-                with self._lock:
-                    if self.pool.qsize() < self.config.min_connections:
-                        new_conn = self._create_connection()
-                        if new_conn:
-                            self.pool.put_nowait(new_conn)
-        except queue.Full:
-            # Pool is full, close connection
-            try:
-                conn.close()
-            except:
-                pass
-        except Exception as e:
-            logger.warning(f"Error returning connection to pool: {e}")
+    @staticmethod
+    def _ping(conn) -> bool:
+        conn.ping(reconnect=False)
+        return True
     
-    def close_all(self):
-        """Close all connections in pool"""
-        while not self.pool.empty():
-            try:
-                conn = self.pool.get_nowait()
-                conn.close()
-            except queue.Empty:
-                break
-            except Exception as e:
-                logger.warning(f"Error closing pooled connection: {e}")
+    @staticmethod
+    def _reset(conn):
+        # Don't hand the next borrower an open transaction (and its snapshot);
+        # the status flag is client-side, so idle connections cost no round trip
+        if conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            conn.rollback()
 
 class PreparedStatementCache:
     """Cache for prepared statements"""
@@ -321,6 +305,73 @@ class PreparedStatementCache:
                 return stmt_id
             return None
 
+# ===== Bulk load =====
+#
+# LOAD DATA LOCAL INFILE reads rows spooled to a temp file in its default
+# format (tab-separated, backslash escapes, \N for NULL). Without it, rows
+# are packed into multi-row INSERTs sized to max_allowed_packet. MariaDB
+# accepts both unchanged.
+
+# Bytes kept free in each packed INSERT for protocol framing
+INSERT_PACKET_HEADROOM = 4096
+
+_LOAD_ESCAPE_RE = re.compile(rb'[\\\t\n\r\x00]')
+_LOAD_ESCAPES = {b'\\': b'\\\\', b'\t': b'\\t', b'\n': b'\\n', b'\r': b'\\r', b'\x00': b'\\0'}
+_TRUE_STRINGS = {'1', 't', 'true', 'y', 'yes', 'on'}
+
+
+def _quote_ident(name: str) -> str:
+    return '`' + name.replace('`', '``') + '`'
+
+
+def _bulk_ir_types(column_types: Optional[List[Any]], count: int) -> List[Any]:
+    """IRType per column from MySQL type names, TypeInfo or IRType values"""
+    from core.type_registry import TypeRegistry, TypeInfo, IRType
+
+    if column_types is None:
+        return [IRType.UNKNOWN] * count
+    ir_types = []
+    for column_type in column_types:
+        if isinstance(column_type, IRType):
+            ir_types.append(column_type)
+        elif isinstance(column_type, TypeInfo):
+            ir_types.append(column_type.ir_type)
+        elif column_type:
+            ir_types.append(TypeRegistry.map_to_ir('mysql', str(column_type)).ir_type)
+        else:
+            ir_types.append(IRType.UNKNOWN)
+    return ir_types
+
+
+def _adapt_bulk_value(value: Any, ir_type: Any) -> Any:
+    """Python value -> a value PyMySQL literals and LOAD DATA both accept"""
+    from core.type_registry import IRType
+
+    if isinstance(value, bool):
+        return int(value)
+    if ir_type == IRType.BOOLEAN and isinstance(value, str):
+        return int(value.strip().lower() in _TRUE_STRINGS)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, memoryview):
+        return bytes(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # Sessions run in UTC (see ConnectionPool)
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _encode_load_field(value: Any) -> bytes:
+    """Adapted value -> escaped LOAD DATA field"""
+    if value is None:
+        return b'\\N'
+    if isinstance(value, (bytes, bytearray)):
+        raw = bytes(value)
+    else:
+        raw = str(value).encode('utf-8')
+    return _LOAD_ESCAPE_RE.sub(lambda m: _LOAD_ESCAPES[m.group(0)], raw)
+
+
 class MySQLAdapter:
     """
     Production-ready MySQL adapter for SAIQL
@@ -347,6 +398,7 @@ class MySQLAdapter:
         self.state = ConnectionState.DISCONNECTED
         self.pool = None
         self.prepared_statements = PreparedStatementCache()
+        self._local_infile: Optional[bool] = None  # server-side setting, probed once
         
         # Statistics
         self.stats = {
@@ -609,7 +661,8 @@ class MySQLAdapter:
             'retries_attempted': self.stats['retries_attempted'],
             'avg_execution_time': self.stats['total_execution_time'] / max(total_queries, 1),
             'total_execution_time': self.stats['total_execution_time'],
-            'prepared_statements_cached': len(self.prepared_statements.cache)
+            'prepared_statements_cached': len(self.prepared_statements.cache),
+            'pool': self.pool.metrics() if self.pool else None
         }
     
     # ===== Phase 11 L0 Methods =====
@@ -714,17 +767,8 @@ class MySQLAdapter:
 
         return schema
 
-    def extract_data(
-        self,
-        table_name: str,
-        order_by: Optional[List[str]] = None,
-        chunk_size: int = 10000
-    ) -> Dict[str, Any]:
-        """
-        Extract data from table with deterministic ordering (L0 method).
-        """
-        start_time = time.time()
-
+    def _extract_query(self, table_name: str, order_by: Optional[List[str]] = None) -> Tuple[str, str]:
+        """SELECT * with deterministic ordering (by first column unless order_by given)"""
         if order_by:
             order_clause = ', '.join([f'`{col}`' for col in order_by])
         else:
@@ -736,9 +780,23 @@ class MySQLAdapter:
                 order_clause = ""
 
         if order_clause:
-            query = f'SELECT * FROM `{table_name}` ORDER BY {order_clause}'
-        else:
-            query = f'SELECT * FROM `{table_name}`'
+            return f'SELECT * FROM `{table_name}` ORDER BY {order_clause}', order_clause
+        return f'SELECT * FROM `{table_name}`', order_clause
+
+    def extract_data(
+        self,
+        table_name: str,
+        order_by: Optional[List[str]] = None,
+        chunk_size: int = 10000
+    ) -> Dict[str, Any]:
+        """
+        Extract data from table with deterministic ordering (L0 method).
+
+        Loads every row into memory; use iter_data() to stream large tables.
+        """
+        start_time = time.time()
+
+        query, order_clause = self._extract_query(table_name, order_by)
 
         result = self.execute_query(query)
 
@@ -765,6 +823,177 @@ class MySQLAdapter:
             }
         }
 
+    def iter_data(
+        self,
+        table_name: str,
+        order_by: Optional[List[str]] = None,
+        batch_size: int = 10000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream table rows in batches through an unbuffered SSCursor.
+
+        Same query and ordering as extract_data(), but rows are read off the
+        socket as batches are requested, so client memory is bounded by the
+        batch size. The pooled connection is busy until the generator is
+        exhausted or closed; closing early drains the unread rows (the
+        protocol has no other way to end a result set).
+
+        Yields:
+            Lists of at most batch_size row dicts, in ORDER BY order
+        """
+        query, _ = self._extract_query(table_name, order_by)
+        total_rows = 0
+        start_time = time.time()
+
+        with self.get_connection() as (connection, _):
+            cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+            try:
+                cursor.execute(query)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    total_rows += len(rows)
+                    yield list(rows)
+            finally:
+                cursor.close()
+                connection.rollback()
+
+        self.stats['queries_executed'] += 1
+        logger.info(f"Streaming complete: {total_rows} rows from {table_name} "
+                    f"({time.time() - start_time:.2f}s)")
+
+    def bulk_load(
+        self,
+        table_name: str,
+        rows: Iterable[Any],
+        columns: List[str],
+        column_types: Optional[List[Any]] = None,
+        use_load_data: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Load many rows in one transaction.
+
+        Uses LOAD DATA LOCAL INFILE from a temp file when the client config
+        and the server's local_infile setting allow it, otherwise multi-row
+        INSERTs packed up to max_allowed_packet. Values are adapted per
+        column via TypeRegistry types (e.g. 'true'/'false' into BOOLEAN).
+
+        Args:
+            table_name: Target table
+            rows: Iterable of sequences in `columns` order, or of dicts
+            columns: Target column names
+            column_types: MySQL type names / TypeInfo / IRType per column
+            use_load_data: Force (True) or skip (False) LOAD DATA; None = detect
+
+        Returns:
+            Dict with success, rows_affected, method, execution_time and error
+        """
+        start_time = time.time()
+        result = {'success': False, 'rows_affected': 0, 'method': None,
+                  'execution_time': 0.0, 'error': None}
+        ir_types = _bulk_ir_types(column_types, len(columns))
+
+        try:
+            with self.get_connection() as (connection, _):
+                try:
+                    if use_load_data is None:
+                        use_load_data = self._local_infile_enabled(connection)
+                    if use_load_data:
+                        result['method'] = 'load_data'
+                        result['rows_affected'] = self._load_data_local(
+                            connection, table_name, rows, columns, ir_types)
+                    else:
+                        result['method'] = 'insert'
+                        result['rows_affected'] = self._packed_insert(
+                            connection, table_name, rows, columns, ir_types)
+                    connection.commit()
+                    result['success'] = True
+                except Exception as e:
+                    connection.rollback()
+                    result['error'] = f"Bulk load into {table_name} failed: {str(e)}"
+        except Exception as e:
+            result['error'] = f"Bulk load setup failed: {str(e)}"
+
+        result['execution_time'] = time.time() - start_time
+        self.stats['queries_executed'] += 1
+        if not result['success']:
+            self.stats['failed_queries'] += 1
+            logger.error(result['error'])
+        return result
+
+    def _local_infile_enabled(self, connection) -> bool:
+        """True if both this client and the server allow LOAD DATA LOCAL"""
+        if not self.config.local_infile:
+            return False
+        if self._local_infile is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT @@GLOBAL.local_infile AS local_infile")
+                row = cursor.fetchone()
+            value = row['local_infile'] if isinstance(row, dict) else row[0]
+            self._local_infile = str(value).upper() in ('1', 'ON')
+            logger.info(f"Server local_infile: {'enabled' if self._local_infile else 'disabled'}")
+        return self._local_infile
+
+    def _load_data_local(self, connection, table_name: str, rows: Iterable[Any],
+                         columns: List[str], ir_types: List[Any]) -> int:
+        """Spool rows to a temp file and LOAD DATA LOCAL INFILE it"""
+        with tempfile.NamedTemporaryFile('wb', prefix='saiql_load_', suffix='.tsv',
+                                         delete=False) as spool:
+            path = spool.name
+            for row in rows:
+                if isinstance(row, dict):
+                    row = [row.get(column) for column in columns]
+                spool.write(b'\t'.join(_encode_load_field(_adapt_bulk_value(value, ir_type))
+                                        for value, ir_type in zip(row, ir_types)) + b'\n')
+        try:
+            # CHARACTER SET binary: fields are loaded unconverted (text was
+            # written as UTF-8, binary columns get their raw bytes)
+            sql = (f"LOAD DATA LOCAL INFILE %s INTO TABLE {_quote_ident(table_name)} "
+                   "CHARACTER SET binary "
+                   "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                   f"({', '.join(_quote_ident(column) for column in columns)})")
+            with connection.cursor() as cursor:
+                cursor.execute(sql, (path,))
+                return cursor.rowcount
+        finally:
+            os.unlink(path)
+
+    def _packed_insert(self, connection, table_name: str, rows: Iterable[Any],
+                       columns: List[str], ir_types: List[Any]) -> int:
+        """Multi-row INSERTs, each as large as max_allowed_packet allows"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT @@max_allowed_packet AS max_allowed_packet")
+            row = cursor.fetchone()
+            packet = int(row['max_allowed_packet'] if isinstance(row, dict) else row[0])
+            budget = max(packet - INSERT_PACKET_HEADROOM, 1024)
+
+            prefix = (f"INSERT INTO {_quote_ident(table_name)} "
+                      f"({', '.join(_quote_ident(column) for column in columns)}) VALUES ")
+            values: List[str] = []
+            size = len(prefix.encode('utf-8'))
+            inserted = 0
+
+            def flush():
+                nonlocal inserted
+                cursor.execute(prefix + ', '.join(values))
+                inserted += cursor.rowcount
+
+            for row in rows:
+                if isinstance(row, dict):
+                    row = [row.get(column) for column in columns]
+                literal = '(' + ', '.join(connection.literal(_adapt_bulk_value(value, ir_type))
+                                          for value, ir_type in zip(row, ir_types)) + ')'
+                length = len(literal.encode('utf-8')) + 2
+                if values and size + length > budget:
+                    flush()
+                    values, size = [], len(prefix.encode('utf-8'))
+                values.append(literal)
+                size += length
+            if values:
+                flush()
+            return inserted
+
     # ===== Phase 11 L1 Methods =====
 
     def get_primary_keys(self, table_name: str) -> List[str]:
@@ -868,6 +1097,22 @@ class MySQLAdapter:
             'is_primary': (row.get('index_name') or row.get('INDEX_NAME')) == 'PRIMARY'
         } for row in result['data']]
 
+    def get_catalog_statistics(self, tables: Optional[List[str]] = None,
+                               analyze: bool = False) -> Dict[str, Any]:
+        """
+        Import optimizer statistics from information_schema (TABLES,
+        STATISTICS and, on MySQL 8, COLUMN_STATISTICS histograms).
+
+        Args:
+            tables: Restrict to these tables (default: all in DATABASE())
+            analyze: Run ANALYZE TABLE first
+
+        Returns:
+            Mapping of table name -> TableStatistics
+        """
+        from core.catalog_statistics import CatalogStatisticsImporter
+        return CatalogStatisticsImporter(self, backend='mysql').import_statistics(tables, analyze=analyze)
+
     # =========================================================================
     # L2 Methods (Views)
     # =========================================================================
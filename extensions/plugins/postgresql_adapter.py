@@ -10,6 +10,7 @@ This module provides a production-ready PostgreSQL adapter for SAIQL with:
 - Performance monitoring
 - Prepared statement caching
 - Connection health checks
+- Streaming extraction (server-side cursors) and COPY bulk load/unload
 
 Author: Apollo & Claude  
 Version: 1.0.0
@@ -26,14 +27,19 @@ Usage:
 """
 
 import psycopg2
-import psycopg2.pool
+import psycopg2.extensions
 import psycopg2.extras
 import psycopg2.sql
 from psycopg2 import OperationalError, DatabaseError, IntegrityError
 import logging
 import time
 import threading
-from typing import Dict, List, Any, Optional, Union, Tuple, ContextManager
+import uuid
+import queue
+import re
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Union, Tuple, ContextManager, Iterator, Iterable
 from dataclasses import dataclass, field
 from contextlib import contextmanager
 from enum import Enum
@@ -42,6 +48,8 @@ import ssl
 from urllib.parse import urlparse
 import warnings
 
+from core.connection_pool import ConnectionPool as SharedConnectionPool, PoolConfig
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -95,6 +103,24 @@ class ConnectionConfig:
     application_name: str = "SAIQL-Bravo"
     search_path: str = "public"
     
+    # Pool lifecycle (seconds; 0 disables max lifetime / idle eviction / the reaper thread)
+    pool_validation_idle_time: float = 30.0
+    pool_max_lifetime: float = 1800.0
+    pool_idle_timeout: float = 600.0
+    pool_reaper_interval: float = 30.0
+    
+    def pool_config(self) -> PoolConfig:
+        """Pool settings for the shared connection pool"""
+        return PoolConfig(
+            min_size=self.min_connections,
+            max_size=self.max_connections,
+            checkout_timeout=self.connection_timeout,
+            validation_idle_time=self.pool_validation_idle_time,
+            max_lifetime=self.pool_max_lifetime,
+            idle_timeout=self.pool_idle_timeout,
+            reaper_interval=self.pool_reaper_interval
+        )
+    
     def to_connection_params(self) -> Dict[str, Any]:
         """Convert to psycopg2 connection parameters"""
         params = {
@@ -189,6 +215,323 @@ class PreparedStatementCache:
                 return stmt_name
             return None
 
+# ===== COPY streaming =====
+#
+# Rows travel in PostgreSQL's text COPY format: tab-separated columns,
+# backslash escapes, \N for NULL. Unlike CSV it keeps NULL and the empty
+# string apart without quoting rules on either side.
+
+# Bytes per read() handed to COPY FROM; bounds the client-side buffer
+COPY_READ_SIZE = 256 * 1024
+
+# Chunks of COPY TO output buffered ahead of the consumer
+COPY_OUT_CHUNKS = 16
+
+_COPY_NULL = '\\N'
+_COPY_ESCAPE_RE = re.compile(r'[\\\t\n\r]')
+_COPY_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+_COPY_UNESCAPE_RE = re.compile(r'\\(x[0-9a-fA-F]{1,2}|[0-7]{1,3}|.)')
+_COPY_UNESCAPES = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _copy_ir_types(column_types: Optional[List[Any]], count: int) -> List[Any]:
+    """IRType per column from PostgreSQL type names, TypeInfo or IRType values"""
+    from core.type_registry import TypeRegistry, TypeInfo, IRType
+
+    if column_types is None:
+        return [IRType.UNKNOWN] * count
+    ir_types = []
+    for column_type in column_types:
+        if isinstance(column_type, IRType):
+            ir_types.append(column_type)
+        elif isinstance(column_type, TypeInfo):
+            ir_types.append(column_type.ir_type)
+        elif column_type:
+            ir_types.append(TypeRegistry.map_to_ir('postgres', str(column_type)).ir_type)
+        else:
+            ir_types.append(IRType.UNKNOWN)
+    return ir_types
+
+
+def _encode_copy_value(value: Any, ir_type: Any) -> str:
+    """Python value -> escaped COPY text field"""
+    from core.type_registry import IRType
+
+    if value is None:
+        return _COPY_NULL
+    if isinstance(value, bool) or (ir_type == IRType.BOOLEAN and isinstance(value, int)):
+        text = 't' if value else 'f'
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        text = '\\x' + bytes(value).hex()
+    elif isinstance(value, (dict, list)):
+        text = json.dumps(value, default=str)
+    elif isinstance(value, (datetime, date, dt_time)):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return _COPY_ESCAPE_RE.sub(lambda m: _COPY_ESCAPES[m.group(0)], text)
+
+
+def _unescape_copy_text(text: str) -> str:
+    def replace(match):
+        code = match.group(1)
+        if code[0] == 'x' and len(code) > 1:
+            return chr(int(code[1:], 16))
+        if code[0] in '01234567':
+            return chr(int(code, 8))
+        return _COPY_UNESCAPES.get(code, code)
+    return _COPY_UNESCAPE_RE.sub(replace, text)
+
+
+def _decode_bytea(text: str) -> bytes:
+    if text.startswith('\\x'):
+        return bytes.fromhex(text[2:])
+    return text.encode('latin-1')
+
+
+def _copy_decoders(ir_types: List[Any]) -> List[Optional[Any]]:
+    """Text -> Python converter per column (None leaves the text as is)"""
+    from core.type_registry import IRType
+
+    by_type = {
+        IRType.SMALLINT: int, IRType.INTEGER: int, IRType.BIGINT: int,
+        IRType.DECIMAL: Decimal, IRType.REAL: float, IRType.DOUBLE: float,
+        IRType.BOOLEAN: lambda text: text == 't',
+        IRType.BYTEA: _decode_bytea,
+        IRType.DATE: date.fromisoformat,
+        IRType.TIMESTAMP: datetime.fromisoformat,
+        IRType.TIMESTAMP_TZ: datetime.fromisoformat,
+        IRType.JSON: json.loads, IRType.JSONB: json.loads,
+    }
+    return [by_type.get(ir_type) for ir_type in ir_types]
+
+
+def _decode_copy_line(line: str, decoders: List[Optional[Any]]) -> Tuple[Any, ...]:
+    values = []
+    for i, text in enumerate(line.split('\t')):
+        if text == _COPY_NULL:
+            values.append(None)
+            continue
+        if '\\' in text:
+            text = _unescape_copy_text(text)
+        value = text
+        decoder = decoders[i] if i < len(decoders) else None
+        if decoder is not None:
+            try:
+                value = decoder(text)
+            except (ValueError, ArithmeticError):
+                pass  # e.g. 'infinity' dates: keep PostgreSQL's text
+        values.append(value)
+    return tuple(values)
+
+
+class _CopyInStream:
+    """
+    Readable file for COPY FROM that encodes rows on demand
+
+    Holds at most one read() worth of encoded text plus one row, however
+    long the row iterator is.
+    """
+
+    def __init__(self, rows: Iterable[Any], columns: List[str], ir_types: List[Any]):
+        self._rows = iter(rows)
+        self._columns = columns
+        self._types = ir_types
+        self._buffer = b''
+        self.rows = 0
+
+    def _encode_row(self, row: Any) -> bytes:
+        if isinstance(row, dict):
+            row = [row.get(column) for column in self._columns]
+        fields = [_encode_copy_value(value, ir_type) for value, ir_type in zip(row, self._types)]
+        return ('\t'.join(fields) + '\n').encode('utf-8')
+
+    def read(self, size: int = -1) -> bytes:
+        chunks, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = self._encode_row(row)
+            chunks.append(line)
+            length += len(line)
+            self.rows += 1
+        data = b''.join(chunks)
+        if size < 0:
+            self._buffer = b''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    readline = read
+
+
+class _CopyOutSink:
+    """Writable file for COPY TO that hands chunks to a bounded queue"""
+
+    _DONE = object()
+
+    def __init__(self, max_chunks: int):
+        self.chunks: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self.cancelled = threading.Event()
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def write(self, data):
+        self._put(data)
+
+    def finish(self, error: Optional[BaseException] = None):
+        self._put(error if error is not None else self._DONE)
+
+
+def copy_in_rows(connection, table_name: str, rows: Iterable[Any], columns: List[str],
+                 column_types: Optional[List[Any]] = None, read_size: int = COPY_READ_SIZE) -> int:
+    """
+    Bulk load rows into a table with COPY FROM STDIN
+
+    Runs in the connection's current transaction; the caller commits.
+
+    Args:
+        connection: psycopg2 connection
+        table_name: Target table (quoted as given)
+        rows: Iterable of sequences in `columns` order, or of dicts
+        columns: Target column names
+        column_types: PostgreSQL type names / TypeInfo / IRType per column,
+                      used to adapt values (e.g. 0/1 into BOOLEAN)
+        read_size: Bytes encoded per read, bounding client memory
+
+    Returns:
+        Number of rows sent
+    """
+    stream = _CopyInStream(rows, columns, _copy_ir_types(column_types, len(columns)))
+    sql = (f"COPY {_quote_ident(table_name)} "
+           f"({', '.join(_quote_ident(column) for column in columns)}) FROM STDIN")
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, stream, size=read_size)
+    return stream.rows
+
+
+def copy_out_rows(connection, query: str, column_types: Optional[List[Any]] = None,
+                  batch_size: int = 10000, max_chunks: int = COPY_OUT_CHUNKS) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Stream a query's result with COPY (query) TO STDOUT
+
+    COPY runs on a background thread writing into a bounded queue, so at
+    most max_chunks of output plus one batch of rows are held in memory.
+    Closing the generator early cancels the COPY on the server.
+
+    Args:
+        connection: psycopg2 connection (runs in its current transaction)
+        query: SELECT to export
+        column_types: PostgreSQL type names / TypeInfo / IRType per result
+                      column; values of unknown types are returned as text
+        batch_size: Rows per yielded batch
+
+    Yields:
+        Lists of at most batch_size row tuples
+    """
+    sink = _CopyOutSink(max_chunks)
+    decoders = _copy_decoders(_copy_ir_types(column_types, 0)) if column_types else []
+
+    def produce():
+        try:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(f"COPY ({query}) TO STDOUT", sink)
+            sink.finish()
+        except BaseException as e:
+            sink.finish(e)
+
+    producer = threading.Thread(target=produce, name="saiql-copy-out", daemon=True)
+    producer.start()
+    finished = False
+    try:
+        pending, batch = b'', []
+        while True:
+            chunk = sink.chunks.get()
+            if chunk is _CopyOutSink._DONE:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                batch.append(_decode_copy_line(line.decode('utf-8'), decoders))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+        finished = True
+    finally:
+        if not finished:
+            sink.cancelled.set()
+            try:
+                connection.cancel()
+            except Exception as e:
+                logger.debug(f"COPY cancel failed: {e}")
+        producer.join()
+
+
+class ConnectionPool(SharedConnectionPool):
+    """
+    Thread-safe PostgreSQL connection pool
+
+    Session settings are applied once per connection rather than per
+    checkout; connections are validated only after sitting idle past
+    pool_validation_idle_time and retired after pool_max_lifetime.
+    """
+
+    def __init__(self, config: ConnectionConfig):
+        self.connection_config = config
+        super().__init__(
+            self._create_connection,
+            config.pool_config(),
+            validate=self._ping,
+            reset=self._reset,
+            is_usable=self._usable,
+            name=f"postgresql:{config.host}:{config.port}/{config.database}"
+        )
+
+    def _create_connection(self):
+        """Create a new PostgreSQL connection"""
+        conn = psycopg2.connect(**self.connection_config.to_connection_params())
+        with conn.cursor() as cursor:
+            cursor.execute(f"SET statement_timeout = {self.connection_config.statement_timeout * 1000}")
+            cursor.execute(f"SET idle_in_transaction_session_timeout = {self.connection_config.idle_in_transaction_timeout * 1000}")
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def _ping(conn) -> bool:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        ConnectionPool._reset(conn)
+        return True
+
+    @staticmethod
+    def _usable(conn) -> bool:
+        return (not conn.closed and
+                conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN)
+
+    @staticmethod
+    def _reset(conn):
+        # Same as psycopg2's own pool: roll back whatever the borrower left open
+        if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+
+
 class PostgreSQLAdapter:
     """
     Production-ready PostgreSQL adapter for SAIQL
@@ -239,16 +582,10 @@ class PostgreSQLAdapter:
         try:
             with self._pool_lock:
                 if self.pool:
-                    self.pool.closeall()
-                
-                connection_params = self.config.to_connection_params()
+                    self.pool.close_all()
                 
                 # Create connection pool
-                self.pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=self.config.min_connections,
-                    maxconn=self.config.max_connections,
-                    **connection_params
-                )
+                self.pool = ConnectionPool(self.config)
                 
                 self.state = ConnectionState.CONNECTED
                 self.stats['connections_created'] += self.config.min_connections
@@ -267,20 +604,18 @@ class PostgreSQLAdapter:
     def get_connection(self, autocommit: bool = False):
         """Get connection from pool with automatic cleanup"""
         connection = None
+        pool = None
         start_time = time.time()
         
         try:
             with self._pool_lock:
-                if not self.pool:
-                    raise RuntimeError("Connection pool not initialized")
-                
-                connection = self.pool.getconn()
-                connection.autocommit = autocommit
-                
-                # Set session parameters
-                with connection.cursor() as cursor:
-                    cursor.execute(f"SET statement_timeout = {self.config.statement_timeout * 1000}")
-                    cursor.execute(f"SET idle_in_transaction_session_timeout = {self.config.idle_in_transaction_timeout * 1000}")
+                pool = self.pool
+            if not pool:
+                raise RuntimeError("Connection pool not initialized")
+            
+            # Blocks outside _pool_lock when the pool is saturated
+            connection = pool.get_connection(timeout=self.config.connection_timeout)
+            connection.autocommit = autocommit
             
             connection_time = time.time() - start_time
             yield connection, connection_time
@@ -296,9 +631,7 @@ class PostgreSQLAdapter:
         finally:
             if connection:
                 try:
-                    with self._pool_lock:
-                        if self.pool:
-                            self.pool.putconn(connection)
+                    pool.return_connection(connection)
                 except Exception as e:
                     logger.error(f"Error returning connection to pool: {e}")
     
@@ -490,7 +823,8 @@ class PostgreSQLAdapter:
             'retries_attempted': self.stats['retries_attempted'],
             'avg_execution_time': self.stats['total_execution_time'] / max(total_queries, 1),
             'total_execution_time': self.stats['total_execution_time'],
-            'prepared_statements_cached': len(self.prepared_statements.cache)
+            'prepared_statements_cached': len(self.prepared_statements.cache),
+            'pool': self.pool.metrics() if self.pool else None
         }
     
     # ===== Phase 11 L0 Methods =====
@@ -617,6 +951,27 @@ class PostgreSQLAdapter:
 
         return schema
 
+    def _order_clause(self, table_name: str, order_by: Optional[List[str]] = None) -> str:
+        """ORDER BY column list for deterministic extraction ("" if the table has no columns)"""
+        if order_by:
+            return ', '.join([f'"{col}"' for col in order_by])
+
+        # Default: order by first column for determinism
+        schema = self.get_schema(table_name)
+        if schema['columns']:
+            first_col = schema['columns'][0]['name']
+            logger.info(f"Using first column for deterministic ordering: {first_col}")
+            return f'"{first_col}"'
+
+        logger.warning(f"No columns found for {table_name}, extraction may not be deterministic")
+        return ""
+
+    def _extract_query(self, table_name: str, order_clause: str) -> str:
+        query = f'SELECT * FROM "{table_name.lower()}"'
+        if order_clause:
+            query += f' ORDER BY {order_clause}'
+        return query
+
     def extract_data(
         self,
         table_name: str,
@@ -639,32 +994,13 @@ class PostgreSQLAdapter:
 
         Phase 11 L0 Implementation:
         - Simple SELECT * with ORDER BY
-        - All rows loaded into memory (no streaming)
+        - All rows loaded into memory; use iter_data() to stream large tables
         - Deterministic ordering required for repeatability
         """
         start_time = time.time()
 
-        # Determine ORDER BY clause
-        if order_by:
-            order_clause = ', '.join([f'"{col}"' for col in order_by])
-        else:
-            # Default: order by first column for determinism
-            schema = self.get_schema(table_name)
-            if schema['columns']:
-                first_col = schema['columns'][0]['name']
-                order_clause = f'"{first_col}"'
-                logger.info(f"Using first column for deterministic ordering: {first_col}")
-            else:
-                order_clause = ""
-                logger.warning(f"No columns found for {table_name}, extraction may not be deterministic")
-
-        # Build query
-        table_lower = table_name.lower()
-
-        if order_clause:
-            query = f'SELECT * FROM "{table_lower}" ORDER BY {order_clause}'
-        else:
-            query = f'SELECT * FROM "{table_lower}"'
+        order_clause = self._order_clause(table_name, order_by)
+        query = self._extract_query(table_name, order_clause)
 
         logger.info(f"Extracting data from {table_name}...")
 
@@ -695,6 +1031,118 @@ class PostgreSQLAdapter:
             }
         }
 
+    def iter_data(
+        self,
+        table_name: str,
+        order_by: Optional[List[str]] = None,
+        batch_size: int = 10000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream table rows in batches through a server-side cursor.
+
+        Same query and ordering as extract_data(), but the result set stays
+        on the server in a named cursor and is fetched batch_size rows at a
+        time, so memory is bounded by the batch size rather than the table.
+
+        The cursor lives in a read transaction on a pooled connection until
+        the generator is exhausted or closed; consumers should not stall
+        between batches for longer than idle_in_transaction_timeout.
+
+        Args:
+            table_name: Table name
+            order_by: Columns to order by (if None, uses first column)
+            batch_size: Rows per batch (also the cursor's itersize)
+
+        Yields:
+            Lists of at most batch_size row dicts, in ORDER BY order
+        """
+        query = self._extract_query(table_name, self._order_clause(table_name, order_by))
+        cursor_name = f"saiql_extract_{uuid.uuid4().hex}"
+        total_rows = 0
+        start_time = time.time()
+
+        logger.info(f"Streaming data from {table_name} in batches of {batch_size}...")
+
+        with self.get_connection(autocommit=False) as (connection, _):
+            try:
+                with connection.cursor(name=cursor_name,
+                                       cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(query)
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        total_rows += len(rows)
+                        yield [dict(row) for row in rows]
+            finally:
+                # Read-only: nothing to keep, and this closes the server-side portal
+                connection.rollback()
+
+        self.stats['queries_executed'] += 1
+        logger.info(f"Streaming complete: {total_rows} rows from {table_name} "
+                    f"({time.time() - start_time:.2f}s)")
+
+    def copy_in(
+        self,
+        table_name: str,
+        rows: Iterable[Any],
+        columns: List[str],
+        column_types: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Bulk load rows with COPY FROM STDIN in one transaction.
+
+        Rows are encoded as COPY reads them, so memory stays bounded for any
+        row iterator. Values are adapted per column via TypeRegistry types
+        (see copy_in_rows).
+
+        Returns:
+            Dict with success, rows_affected, execution_time and error
+        """
+        start_time = time.time()
+        result = {'success': False, 'rows_affected': 0, 'execution_time': 0.0, 'error': None}
+
+        try:
+            with self.get_connection() as (connection, _):
+                try:
+                    result['rows_affected'] = copy_in_rows(
+                        connection, table_name, rows, columns, column_types)
+                    connection.commit()
+                    result['success'] = True
+                except Exception as e:
+                    connection.rollback()
+                    result['error'] = f"COPY into {table_name} failed: {str(e)}"
+        except Exception as e:
+            result['error'] = f"COPY setup failed: {str(e)}"
+
+        result['execution_time'] = time.time() - start_time
+        self.stats['queries_executed'] += 1
+        if not result['success']:
+            self.stats['failed_queries'] += 1
+            logger.error(result['error'])
+        return result
+
+    def copy_out(
+        self,
+        query: str,
+        column_types: Optional[List[Any]] = None,
+        batch_size: int = 10000
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Stream a query's rows with COPY (query) TO STDOUT.
+
+        Yields lists of at most batch_size row tuples, decoded per column
+        via TypeRegistry types (unknown types stay text). Memory is bounded
+        by a small chunk queue plus one batch (see copy_out_rows).
+        """
+        with self.get_connection(autocommit=False) as (connection, _):
+            try:
+                yield from copy_out_rows(connection, query, column_types, batch_size)
+            finally:
+                connection.rollback()
+        self.stats['queries_executed'] += 1
+
     # ===== Phase 11 L1 Methods =====
 
     def get_primary_keys(self, table_name: str) -> List[str]:
@@ -850,6 +1298,23 @@ class PostgreSQLAdapter:
 
         return list(indexes.values())
 
+    def get_catalog_statistics(self, tables: Optional[List[str]] = None,
+                               schema: str = 'public', analyze: bool = False) -> Dict[str, Any]:
+        """
+        Import optimizer statistics from pg_class.reltuples and pg_stats.
+
+        Args:
+            tables: Restrict to these tables (default: all in schema)
+            schema: Schema name
+            analyze: Run ANALYZE first
+
+        Returns:
+            Mapping of table name -> TableStatistics
+        """
+        from core.catalog_statistics import CatalogStatisticsImporter
+        importer = CatalogStatisticsImporter(self, backend='postgresql', schema=schema)
+        return importer.import_statistics(tables, analyze=analyze)
+
     # =========================================================================
     # L2 Methods (Views)
     # =========================================================================
@@ -1672,7 +2137,7 @@ class PostgreSQLAdapter:
         try:
             with self._pool_lock:
                 if self.pool:
-                    self.pool.closeall()
+                    self.pool.close_all()
                     self.stats['connections_closed'] += self.config.max_connections
                     self.pool = None
 
@@ -304,6 +304,27 @@ class SQLiteAdapter:
             }
         }
 
+    def get_catalog_statistics(
+        self,
+        tables: Optional[List[str]] = None,
+        analyze: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Import optimizer statistics from sqlite_stat1/sqlite_stat4.
+
+        No table data is read into Python; run with analyze=True (or
+        ANALYZE beforehand) so the stat tables are populated.
+
+        Args:
+            tables: Restrict to these tables (default: all)
+            analyze: Run ANALYZE first
+
+        Returns:
+            Mapping of table name -> TableStatistics
+        """
+        from core.catalog_statistics import CatalogStatisticsImporter
+        return CatalogStatisticsImporter(self, backend='sqlite').import_statistics(tables, analyze=analyze)
+
     # =========================================================================
     # L2 Methods (Views)
     # =========================================================================
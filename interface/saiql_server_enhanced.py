@@ -48,12 +48,16 @@ try:
     from core.parser import SAIQLParser
     from core.symbolic_engine import SymbolicEngine, ExecutionResult, ExecutionStatus
     from security.auth_manager import AuthManager
+    from core.database_manager import DatabaseManager
+    from core.engine import SAIQLEngine
     # CE Edition: QueryComponents not available, use placeholder
     QueryComponents = None
 except ImportError as e:
     logging.error(f"Failed to import SAIQL components: {e}")
     SAIQLParser = None
     SymbolicEngine = None
+    DatabaseManager = None
+    SAIQLEngine = None
     QueryComponents = None
 
 # Configure logging
@@ -72,9 +76,10 @@ QUERY_DURATION = Histogram('saiql_query_duration_seconds', 'SAIQL query executio
 
 # Pydantic models
 class QueryRequest(BaseModel):
-    """SAIQL query request model"""
+    """SAIQL query request model (with backend set, query is compiled and run on that backend)"""
     query: str
     options: Optional[Dict[str, Any]] = None
+    backend: Optional[str] = None
 
 class QueryResponse(BaseModel):
     """SAIQL query response model"""
@@ -106,6 +111,8 @@ app_start_time = time.time()
 saiql_parser = None
 saiql_engine = None
 auth_manager = None
+db_manager = None
+backend_engine = None
 
 # Security: HTTP Bearer authentication scheme
 security = HTTPBearer(auto_error=True)
@@ -199,7 +206,7 @@ app = create_app()
 @app.on_event("startup")
 async def startup_event():
     """Initialize application components on startup"""
-    global saiql_parser, saiql_engine, auth_manager
+    global saiql_parser, saiql_engine, auth_manager, db_manager, backend_engine
 
     logger.info("Starting SAIQL-Delta Enhanced Server (CE Edition)...")
 
@@ -217,10 +224,19 @@ async def startup_event():
         logger.error(f"Failed to initialize server: {e}")
         raise
 
+    # Database backends are optional; without them backend queries return 503
+    try:
+        db_manager = DatabaseManager()
+        backend_engine = SAIQLEngine()
+    except Exception as e:
+        logger.warning(f"Database backends unavailable: {e}")
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on server shutdown"""
     logger.info("Shutting down SAIQL-Delta server...")
+    if db_manager:
+        await db_manager.close_all_async()
 
 # Health check endpoints
 @app.get("/health", response_model=HealthResponse)
@@ -329,6 +345,9 @@ async def execute_query(request: QueryRequest, user_id: str = Depends(verify_tok
 
         logger.info(f"[user={user_id}] Executing SAIQL query: {request.query[:100]}...")
         
+        if request.backend:
+            return await _execute_backend_query(request, start_time, query_id)
+        
         # Parse query
         if not saiql_parser:
             raise HTTPException(status_code=503, detail="SAIQL parser not initialized")
@@ -380,6 +399,30 @@ async def execute_query(request: QueryRequest, user_id: str = Depends(verify_tok
             query_id=query_id
         )
 
+async def _execute_backend_query(request: QueryRequest, start_time: float, query_id: str) -> QueryResponse:
+    """Compile request.query with the SAIQL engine and await its SQL on a DatabaseManager backend"""
+    if not db_manager or not backend_engine:
+        raise HTTPException(status_code=503, detail="Database backends not initialized")
+    
+    result = await backend_engine.execute_async(request.query, db_manager, backend=request.backend)
+    execution_time = time.time() - start_time
+    
+    QUERY_COUNT.labels(status="success" if result.success else "error").inc()
+    QUERY_DURATION.observe(execution_time)
+    
+    return QueryResponse(
+        success=result.success,
+        data=result.data if result.success else None,
+        error=result.error_message,
+        execution_time=execution_time,
+        query_id=query_id,
+        metadata={
+            "rows_affected": result.rows_affected,
+            "sql_generated": result.sql_generated,
+            "backend": request.backend
+        }
+    )
+
 @app.post("/api/v1/parse")
 async def parse_query(request: QueryRequest, user_id: str = Depends(verify_token)):
     """
@@ -31,6 +31,8 @@ from core.transaction_manager import TransactionManager, IsolationLevel
 from core.execution_planner import QueryOptimizer, create_sample_statistics
 from core.monitor import AdvancedPerformanceMonitor
 from core.logging import logger, LogCategory
+from core.database_manager import DatabaseManager
+from core.engine import SAIQLEngine
 from security.auth_manager import AuthManager, AuthResult, UserRole
 
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -58,6 +60,8 @@ class ProductionSAIQLServer:
         self.query_optimizer = QueryOptimizer()
         self.performance_monitor = AdvancedPerformanceMonitor()
         self.auth_manager = AuthManager()
+        self._db_manager = None  # created on first backend query
+        self._engine = None  # compiles backend queries; created on first use
         self.auth_required = self.config.get("security", {}).get("enable_authentication", True)
 
         if not self.auth_required:
@@ -81,6 +85,21 @@ class ProductionSAIQLServer:
         logger.info("SAIQL Production Server initialized", 
                    category=LogCategory.SYSTEM, version="5.0.0")
     
+    @property
+    def db_manager(self) -> DatabaseManager:
+        """Database backends for SAIQL queries (config: database.config_path)"""
+        if self._db_manager is None:
+            self._db_manager = DatabaseManager(
+                config_path=self.config.get("database", {}).get("config_path"))
+        return self._db_manager
+    
+    @property
+    def engine(self) -> SAIQLEngine:
+        """SAIQL engine that guards and compiles backend queries"""
+        if self._engine is None:
+            self._engine = SAIQLEngine()
+        return self._engine
+    
     def _load_config(self) -> Dict[str, Any]:
         """Load production configuration with env var overrides"""
         import os
@@ -340,18 +359,29 @@ class ProductionSAIQLServer:
                                query_type=query_request.get("operation", "unknown"))
                     
                     with self.performance_monitor.profile_query(query_id, str(query_request)) as profile:
-                        # Execute query using runtime in thread pool to avoid blocking event loop
-                        operation = query_request.get("operation", "*")
                         params = query_request.get("parameters", [])
+                        query = query_request.get("query")
                         
-                        # Run synchronous runtime method in executor
-                        loop = asyncio.get_running_loop()
-                        result = await loop.run_in_executor(
-                            None,  # Use default executor
-                            self.runtime.execute_operator,
-                            operation,
-                            *params
-                        )
+                        if query is not None:
+                            # SAIQL query: guarded and compiled by the engine, the SQL
+                            # awaited on a database backend
+                            query_result = await self.engine.execute_async(
+                                query, self.db_manager, backend=query_request.get("backend"))
+                            if not query_result.success:
+                                raise RuntimeError(query_result.error_message)
+                            result = query_result.data
+                        else:
+                            # Execute query using runtime in thread pool to avoid blocking event loop
+                            operation = query_request.get("operation", "*")
+                            
+                            # Run synchronous runtime method in executor
+                            loop = asyncio.get_running_loop()
+                            result = await loop.run_in_executor(
+                                None,  # Use default executor
+                                self.runtime.execute_operator,
+                                operation,
+                                *params
+                            )
                         
                         # Update profile
                         profile.estimated_cost = 10.0
@@ -494,6 +524,9 @@ class ProductionSAIQLServer:
         # Stop monitoring
         self.performance_monitor.stop_monitoring()
         
+        if self._db_manager is not None:
+            await self._db_manager.close_all_async()
+        
         # Clean up resources
         logger.info("SAIQL server shutdown complete", category=LogCategory.SYSTEM)
     
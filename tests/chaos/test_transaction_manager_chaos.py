@@ -19,7 +19,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 try:
-    from core.transaction_manager import TransactionManager
+    from core.transaction_manager import LockManager, LockMode, TransactionManager
     from core.database_manager import DatabaseManager
     from config.secure_config import get_current_config
 except ImportError:
@@ -198,8 +198,62 @@ def test_concurrent_stress():
     assert end_time - start_time < 30  # Should complete within 30 seconds
     assert report["chaos_test_summary"]["timeout_rate"] < 0.1  # Less than 10% timeouts
 
+def benchmark_lock_throughput(num_threads: int, ops_per_thread: int = 4000,
+                              resources: int = 1024, hot_fraction: float = 0.05) -> float:
+    """Lock acquire/release pairs per second across num_threads threads.
+
+    Each operation takes a random resource (a few percent of them on a
+    small hot set that forces waiting) in SHARED or EXCLUSIVE mode and
+    releases it, like a short transaction touching one row.
+    """
+    lock_manager = LockManager()
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(worker_id: int):
+        rng = random.Random(worker_id)
+        barrier.wait()
+        for i in range(ops_per_thread):
+            if rng.random() < hot_fraction:
+                resource = f"hot:{rng.randrange(4)}"
+            else:
+                resource = f"row:{rng.randrange(resources)}"
+            mode = LockMode.EXCLUSIVE if rng.random() < 0.3 else LockMode.SHARED
+            tx_id = f"tx{worker_id}:{i}"
+            if lock_manager.acquire_lock(resource, mode, tx_id, timeout=10.0):
+                lock_manager.release_all_locks(tx_id)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    lock_manager.deadlock_detector.stop_detection()
+    assert lock_manager.get_lock_count() == 0
+    return num_threads * ops_per_thread / elapsed
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_lock_manager_throughput_scaling():
+    """Report lock throughput as threads are added
+
+    Rates depend on the machine and its load, so they are reported rather
+    than asserted; the benchmark itself checks every lock was released.
+    """
+    throughput = {threads: benchmark_lock_throughput(threads) for threads in (1, 2, 4, 8, 16)}
+
+    print("Lock Manager Throughput:")
+    for threads, ops in throughput.items():
+        print(f"  {threads:>2} threads: {ops:,.0f} acquire/release per second "
+              f"({ops / throughput[1]:.2f}x one thread)")
+
+
 if __name__ == "__main__":
     print("Running Transaction Manager Chaos Tests...")
     test_transaction_manager_chaos()
     test_concurrent_stress()
+    test_lock_manager_throughput_scaling()
     print("Chaos testing completed!")
\ No newline at end of file
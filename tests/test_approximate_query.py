@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Approximate Query Processing
+=================================================
+
+Tests eligibility of aggregate queries, that Bernoulli, block and
+stratified estimates bracket the exact answers with their confidence
+intervals, incremental maintenance of stratified samples on insert, and
+the engine's APPROXIMATE execution mode.
+"""
+
+import random
+import sqlite3
+import subprocess
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.approximate_query import (
+    ApproximateQueryExecutor, ApproximationSettings, SampleManager, SamplingMethod, plan_approximation
+)
+from core.database_manager import DatabaseManager
+from core.engine import SAIQLEngine, ExecutionContext, ExecutionMode
+
+ROWS = 200_000
+
+QUERY = ('SELECT symbol, COUNT(*) AS n, COUNT(volume) AS counted, SUM(volume) AS total, AVG(close) AS mean '
+         'FROM "backhistory" WHERE "backhistory"."close" > 5 GROUP BY symbol')
+
+
+def _populate(path, rows=ROWS):
+    rng = random.Random(2)
+    symbols = ["BTC"] * 60 + ["ETH"] * 30 + ["SOL"] * 9 + ["RARE"]
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE backhistory (id INTEGER PRIMARY KEY, symbol TEXT, close REAL, volume INTEGER)")
+    data = []
+    for _ in range(rows):
+        symbol = rng.choice(symbols)
+        data.append((symbol, rng.gauss(100.0 if symbol == "BTC" else 10.0, 4.0),
+                     None if rng.random() < 0.1 else rng.randrange(1000)))
+    conn.executemany("INSERT INTO backhistory (symbol, close, volume) VALUES (?, ?, ?)", data)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("approximate") / "backhistory.db")
+    _populate(path)
+    return path
+
+
+def database(path):
+    return DatabaseManager(config={"default_backend": "sqlite",
+                                   "backends": {"sqlite": {"type": "sqlite", "path": path}}})
+
+
+def assert_brackets(exact_rows, rows, intervals, keys=("n", "counted", "total", "mean"), rel=0.15):
+    """Every exact value lies in its interval and the estimate is close"""
+    assert [row["symbol"] for row in rows] == [row["symbol"] for row in exact_rows]
+    for exact, row, interval in zip(exact_rows, rows, intervals):
+        for key in keys:
+            # Fully sampled strata have zero-width intervals; allow float rounding
+            slack = 1e-9 * abs(exact[key])
+            assert interval[key]["low"] - slack <= exact[key] <= interval[key]["high"] + slack, (row["symbol"], key)
+            assert row[key] == pytest.approx(exact[key], rel=rel)
+
+
+class TestPlanning:
+    """Test which queries can be approximated"""
+
+    def test_eligible(self):
+        plan, reason = plan_approximation(QUERY + ";")
+        assert reason == ""
+        assert plan.table == "backhistory" and plan.group_by == ["symbol"]
+        assert plan.where == '"backhistory"."close" > 5'
+        assert [spec.alias for spec in plan.aggregates] == ["n", "counted", "total", "mean"]
+        assert plan.value_columns == ["volume", "close"]
+
+        plan, _ = plan_approximation('SELECT COUNT(*)\nFROM "users";')
+        assert plan.aggregates[0].alias == "COUNT(*)"
+
+    @pytest.mark.parametrize("sql", [
+        'SELECT MAX(close) FROM backhistory',
+        'SELECT COUNT(DISTINCT symbol) FROM backhistory',
+        'SELECT name FROM users',
+        'SELECT COUNT(*) FROM a JOIN b ON a.id = b.id',
+        'SELECT SUM(close * volume) FROM backhistory',
+        'SELECT COUNT(*) FROM backhistory WHERE id IN (SELECT id FROM other)',
+        'SELECT symbol, COUNT(*) FROM backhistory GROUP BY lower(symbol)',
+    ])
+    def test_ineligible(self, sql):
+        plan, reason = plan_approximation(sql)
+        assert plan is None and reason
+
+
+class TestEstimates:
+    """Test estimates and confidence intervals against exact answers"""
+
+    @pytest.mark.parametrize("method", [SamplingMethod.BERNOULLI, SamplingMethod.BLOCK])
+    def test_sampled_methods(self, db_path, method):
+        db = database(db_path)
+        exact = db.execute_query(QUERY).data
+        executor = ApproximateQueryExecutor()
+        settings = ApproximationSettings(method=method, sample_fraction=0.1, confidence=0.99,
+                                         block_size=64, seed=7)
+
+        rows, metadata = executor.execute(db, QUERY, settings)
+
+        assert metadata["method"] == method.value and metadata["applied"]
+        assert 0.08 * ROWS < metadata["sample_rows"] < 0.12 * ROWS
+        assert_brackets(exact, rows, metadata["confidence_intervals"], rel=0.5)
+        btc = next(row for row in rows if row["symbol"] == "BTC")
+        assert btc["mean"] == pytest.approx(100.0, abs=0.5)
+
+    def test_repeatable_with_seed(self, db_path):
+        db = database(db_path)
+        executor = ApproximateQueryExecutor()
+        settings = ApproximationSettings(method=SamplingMethod.BERNOULLI, seed=11)
+        assert executor.execute(db, QUERY, settings)[0] == executor.execute(db, QUERY, settings)[0]
+
+    def test_stratified_keeps_rare_groups(self, tmp_path):
+        path = str(tmp_path / "stratified.db")
+        _populate(path)
+        db = database(path)
+        exact = db.execute_query(QUERY).data
+        executor = ApproximateQueryExecutor(SampleManager(seed=3))
+        info = executor.sample_manager.create_sample(db, "backhistory", "symbol", rows_per_stratum=2000)
+
+        rows, metadata = executor.execute(db, QUERY, ApproximationSettings(confidence=0.99))
+
+        assert info["strata"] == 4 and info["population"] == ROWS
+        assert info["sample_rows"] == sum(min(row["n"], 2000) for row in db.execute_query(
+            "SELECT COUNT(*) AS n FROM backhistory GROUP BY symbol").data)
+        assert metadata["method"] == "stratified"
+        assert_brackets(exact, rows, metadata["confidence_intervals"])
+        rare = next(row for row in rows if row["symbol"] == "RARE")
+        assert rare["n"] == pytest.approx(exact[2]["n"], rel=0.05)
+
+    def test_empty_global_aggregate(self, db_path):
+        db = database(db_path)
+        rows, metadata = ApproximateQueryExecutor().execute(
+            db, 'SELECT COUNT(*), AVG(close) FROM "backhistory" WHERE "backhistory"."close" > 1000',
+            ApproximationSettings(method=SamplingMethod.BLOCK, seed=1))
+        assert rows == [{"COUNT(*)": 0, "AVG(close)": None}]
+        assert metadata["confidence_intervals"] == [{"COUNT(*)": {"low": 0.0, "high": 0.0, "std_error": 0.0},
+                                                     "AVG(close)": None}]
+
+    def test_small_tables_and_ineligible_queries_skipped(self, db_path):
+        db = database(db_path)
+        executor = ApproximateQueryExecutor()
+        assert executor.execute(db, QUERY, ApproximationSettings(min_table_rows=10 * ROWS)) is None
+        assert "rows" in executor.last_skip_reason
+        assert executor.execute(db, 'SELECT MIN(close) FROM backhistory', ApproximationSettings()) is None
+        assert executor.execute(db, QUERY, ApproximationSettings(method=SamplingMethod.STRATIFIED)) is None
+        assert "no stratified sample" in executor.last_skip_reason
+
+
+class TestEngineApproximateMode:
+    """Test APPROXIMATE execution and sample maintenance through the engine"""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        path = str(tmp_path / "engine.db")
+        _populate(path, rows=20_000)
+        engine = SAIQLEngine(db_path=path)
+        engine.sample_manager = SampleManager(seed=5)
+        engine.approximate_executor.sample_manager = engine.sample_manager
+        yield engine
+        engine.shutdown()
+
+    def test_execution_mode_selects_sampling(self, engine):
+        context = ExecutionContext(session_id="", execution_mode=ExecutionMode.APPROXIMATE,
+                                   approximation=ApproximationSettings(method=SamplingMethod.BLOCK,
+                                                                       sample_fraction=0.2, block_size=32,
+                                                                       min_table_rows=1000, seed=3))
+        approximate = engine.execute("*COUNT[backhistory]::*>>oQ", context)
+        exact = engine.execute("*COUNT[backhistory]::*>>oQ")
+
+        assert approximate.success and exact.success
+        assert exact.data == [{"COUNT(*)": 20_000}] and "approximate" not in exact.metadata
+        interval = approximate.metadata["approximate"]["confidence_intervals"][0]["COUNT(*)"]
+        assert interval["low"] <= 20_000 <= interval["high"]
+        assert approximate.data[0]["COUNT(*)"] != 20_000
+        assert not exact.cache_hit
+
+    def test_ineligible_runs_exactly(self, engine):
+        context = ExecutionContext(session_id="", execution_mode=ExecutionMode.APPROXIMATE)
+        result = engine.execute("*COUNT[backhistory]::*>>oQ", context)
+        assert result.data == [{"COUNT(*)": 20_000}]
+        assert result.metadata["approximate"]["applied"] is False
+
+    def test_inserts_maintain_stratified_sample(self, engine):
+        engine.create_sample("backhistory", "symbol", rows_per_stratum=50)
+        new_rows = [{"symbol": symbol, "close": 1.0, "volume": i}
+                    for i, symbol in enumerate(["BTC"] * 300 + ["NEW"] * 30)]
+
+        assert engine.insert_rows("backhistory", new_rows) == 330
+
+        db = engine._create_db_manager()
+        actual = {row["symbol"]: row["n"] for row in db.execute_query(
+            "SELECT symbol, COUNT(*) AS n FROM backhistory GROUP BY symbol").data}
+        sampled = {row["symbol"]: row["n"] for row in db.execute_query(
+            "SELECT symbol, COUNT(*) AS n FROM saiql_sample_backhistory GROUP BY symbol").data}
+        strata = {stratum: (population, size)
+                  for stratum, population, size in engine.sample_manager.strata(db, "backhistory")}
+        orphans = db.execute_query("SELECT COUNT(*) AS n FROM saiql_sample_backhistory s WHERE NOT EXISTS "
+                                   "(SELECT 1 FROM backhistory b WHERE b.id = s.id)").data[0]["n"]
+
+        assert strata == {symbol: (n, min(n, 50)) for symbol, n in actual.items()}
+        assert sampled == {symbol: min(n, 50) for symbol, n in actual.items()}
+        assert orphans == 0
+
+        context = ExecutionContext(session_id="", execution_mode=ExecutionMode.APPROXIMATE,
+                                   approximation=ApproximationSettings(min_table_rows=1000))
+        result = engine.execute("*COUNT[backhistory]::*>>oQ", context)
+        assert result.metadata["approximate"]["method"] == "stratified"
+        assert result.data == [{"COUNT(*)": 20_330}]
+
+    def test_insert_rejects_bad_identifiers(self, engine):
+        with pytest.raises(ValueError):
+            engine.insert_rows("backhistory; DROP TABLE x", [{"symbol": "BTC"}])
+        with pytest.raises(ValueError):
+            engine.insert_rows("backhistory", [{"symbol) VALUES (1); --": "BTC"}])
+
+    def test_engine_import_stays_light(self):
+        # Approximate mode pulls in hash_aggregate/join_engine/numpy; plain imports must not
+        code = "import sys, core.engine; print('core.approximate_query' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.join(os.path.dirname(__file__), '..'))
+        assert result.stdout.strip() == "False", result.stderr
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
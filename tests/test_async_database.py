@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Async Database Adapters
+======================================
+
+Tests DatabaseManager's async interface: native asyncpg/aiomysql adapters
+when the drivers import, the worker-thread fallback for SQLite (and for
+PostgreSQL without a driver), SAIQLEngine.execute_async and the production
+server's query endpoint built on it, and a local load test against the old
+run_in_executor pattern. The async drivers are played by fake modules whose
+round trips cost a fixed latency.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.database_manager import (
+    AsyncMySQLAdapter, AsyncPostgreSQLAdapter, DatabaseManager, DatabaseResult,
+    ThreadedAsyncAdapter, _numbered_placeholders
+)
+
+
+class FakeAsyncPool:
+    """asyncpg/aiomysql-style pool: max_size connections, each round trip sleeps"""
+
+    def __init__(self, latency, settings):
+        self.latency = latency
+        self.settings = settings
+        self.slots = asyncio.Semaphore(settings.get('max_size') or settings.get('maxsize'))
+        self.calls = []
+        self.closed = False
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                await pool.slots.acquire()
+                return FakeAsyncConnection(pool)
+
+            async def __aexit__(self, *exc):
+                pool.slots.release()
+
+        return Acquire()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    # asyncpg
+    async def fetch(self, query, *args):
+        self.pool.calls.append(('fetch', query, args))
+        await asyncio.sleep(self.pool.latency)
+        return [{'id': 1, 'name': 'ada'}]
+
+    async def execute(self, query, *args):
+        self.pool.calls.append(('execute', query, args))
+        await asyncio.sleep(self.pool.latency)
+        return "INSERT 0 3"
+
+    # aiomysql
+    def cursor(self):
+        return FakeAsyncCursor(self.pool)
+
+    async def commit(self):
+        self.pool.calls.append(('commit',))
+
+    async def rollback(self):
+        self.pool.calls.append(('rollback',))
+
+
+class FakeAsyncCursor:
+    def __init__(self, pool):
+        self.pool = pool
+        self.description = None
+        self.rowcount = -1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def execute(self, sql, params=None):
+        self.pool.calls.append(('cursor', sql, params))
+        await asyncio.sleep(self.pool.latency)
+        if 'missing' in sql:
+            raise RuntimeError("Table 'missing' doesn't exist")
+        if sql.startswith('SELECT'):
+            self.description = [('id',)]
+        else:
+            self.rowcount = 2
+
+    async def fetchall(self):
+        return [{'id': 7}]
+
+
+def fake_driver(name, latency=0.0):
+    """Module standing in for asyncpg or aiomysql"""
+    module = types.ModuleType(name)
+    module.pools = []
+    module.DictCursor = object()
+
+    async def create_pool(**settings):
+        pool = FakeAsyncPool(latency, settings)
+        module.pools.append(pool)
+        return pool
+
+    module.create_pool = create_pool
+    return module
+
+
+def manager_config(tmp_path, **backends):
+    return {
+        'default_backend': 'sqlite',
+        'backends': dict(sqlite={'type': 'sqlite', 'path': str(tmp_path / "async.db")}, **backends)
+    }
+
+
+PG_BACKEND = {'type': 'postgresql', 'host': 'db', 'database': 'app', 'max_connections': 50}
+
+
+class TestNativeAdapters:
+    """Test the asyncpg and aiomysql adapters"""
+
+    def test_placeholders(self):
+        assert _numbered_placeholders("SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' AND c = %s") == \
+            "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c = $2"
+
+    def test_postgresql(self, monkeypatch):
+        asyncpg = fake_driver('asyncpg')
+        monkeypatch.setitem(sys.modules, 'asyncpg', asyncpg)
+        adapter = AsyncPostgreSQLAdapter(PG_BACKEND)
+
+        async def run():
+            rows = await adapter.execute_query("SELECT * FROM users WHERE id = %s", (1,))
+            insert = await adapter.execute_query("INSERT INTO users VALUES (%s), (%s), (%s)", (1, 2, 3))
+            literal = await adapter.execute_query("SELECT '100%' AS pct")
+            await adapter.close()
+            return rows, insert, literal
+
+        rows, insert, literal = asyncio.run(run())
+        assert rows.success and rows.data == [{'id': 1, 'name': 'ada'}] and rows.backend == 'postgresql'
+        assert insert.rows_affected == 3
+        [pool] = asyncpg.pools
+        assert pool.settings['database'] == 'app' and pool.closed
+        assert pool.calls == [('fetch', "SELECT * FROM users WHERE id = $1", (1,)),
+                              ('execute', "INSERT INTO users VALUES ($1), ($2), ($3)", (1, 2, 3)),
+                              ('fetch', "SELECT '100%' AS pct", ())]
+
+    def test_mysql(self, monkeypatch):
+        aiomysql = fake_driver('aiomysql')
+        monkeypatch.setitem(sys.modules, 'aiomysql', aiomysql)
+        adapter = AsyncMySQLAdapter({'type': 'mysql', 'database': 'app'})
+
+        async def run():
+            return [await adapter.execute_query("SELECT id FROM t WHERE id = %s", (7,)),
+                    await adapter.execute_query("UPDATE t SET x = 1"),
+                    await adapter.execute_query("SELECT * FROM missing")]
+
+        select, update, missing = asyncio.run(run())
+        assert select.data == [{'id': 7}] and update.rows_affected == 2
+        assert not missing.success and "doesn't exist" in missing.error_message
+        [pool] = aiomysql.pools
+        assert pool.settings['db'] == 'app' and pool.settings['cursorclass'] is aiomysql.DictCursor
+        assert [call[0] for call in pool.calls] == ['cursor', 'commit', 'cursor', 'commit', 'cursor', 'rollback']
+        assert adapter.get_statistics()['failed_queries'] == 1
+
+
+class TestDatabaseManagerAsync:
+    """Test adapter selection and the thread-backed fallback"""
+
+    def test_sqlite_runs_on_bounded_worker_threads(self, tmp_path):
+        manager = DatabaseManager(config=manager_config(tmp_path))
+        manager.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        threads = set()
+
+        async def insert(i):
+            threads.add(threading.current_thread().name)  # the event loop thread
+            return await manager.execute_query_async("INSERT INTO items (name) VALUES (?)", (f"item {i}",))
+
+        async def run():
+            results = await asyncio.gather(*(insert(i) for i in range(40)))
+            return results, await manager.execute_query_async("SELECT COUNT(*) AS n FROM items")
+
+        results, count = asyncio.run(run())
+        assert all(r.success and r.rows_affected == 1 for r in results)
+        assert count.data == [{'n': 40}] and count.backend == 'sqlite'
+
+        adapter = manager.get_async_adapter()
+        assert isinstance(adapter, ThreadedAsyncAdapter) and adapter.max_workers == 4
+        assert threads == {threading.main_thread().name}
+        workers = [t for t in threading.enumerate() if t.name.startswith('saiql-sqlite')]
+        assert 0 < len(workers) <= 4
+        assert manager.get_statistics()['async_backend_stats']['sqlite']['mode'] == 'threaded'
+
+        asyncio.run(manager.close_all_async())
+        assert manager.async_adapters == {} and manager.adapters == {}
+
+    def test_native_driver_preferred(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'asyncpg', fake_driver('asyncpg'))
+        manager = DatabaseManager(config=manager_config(tmp_path, pg=PG_BACKEND))
+        adapter = manager.get_async_adapter('pg')
+        assert isinstance(adapter, AsyncPostgreSQLAdapter)
+        assert manager.get_async_adapter('pg') is adapter
+        assert 'pg' not in manager.adapters  # no blocking pool was opened
+
+    def test_fallback_without_driver(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'asyncpg', None)  # import fails
+        manager = DatabaseManager(config=manager_config(tmp_path, pg=dict(PG_BACKEND, async_workers=2)))
+        manager.adapters['pg'] = SimpleNamespace(
+            config=PG_BACKEND, execute_query=lambda sql, params: sql, close=lambda: None)
+
+        adapter = manager.get_async_adapter('pg')
+        assert isinstance(adapter, ThreadedAsyncAdapter) and adapter.max_workers == 2
+        assert asyncio.run(manager.execute_query_async("SELECT 1", backend='pg')) == "SELECT 1"
+        manager.close_all()
+
+
+class TestProductionServerQueries:
+    """Test that the production server compiles SAIQL and awaits the SQL on DatabaseManager"""
+
+    def test_query_endpoint(self, tmp_path):
+        from fastapi.testclient import TestClient
+        from core.engine import SAIQLEngine
+        import saiql_production_server
+
+        config = {"saiql": {}, "server": {}, "security": {"enable_authentication": False}, "logging": {}}
+        with patch.object(saiql_production_server.ProductionSAIQLServer, '_load_config', return_value=config), \
+             patch.object(saiql_production_server, 'AdvancedPerformanceMonitor'), \
+             patch.object(saiql_production_server, 'AuthManager'):
+            server = saiql_production_server.ProductionSAIQLServer()
+
+        profile = SimpleNamespace(execution_time=0.0)
+        server.performance_monitor.profile_query.return_value.__enter__.return_value = profile
+        server._db_manager = DatabaseManager(config=manager_config(tmp_path))
+        server._engine = SAIQLEngine(db_path=str(tmp_path / "engine.db"))
+        server.db_manager.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+        server.db_manager.execute("INSERT INTO users VALUES (1, 'ada'), (2, 'grace')")
+
+        client = TestClient(server.app)
+        response = client.post("/query", json={"query": "*3[users]::name>>oQ"})
+        assert response.status_code == 200
+        assert response.json()["result"] == [{"name": "ada"}, {"name": "grace"}]
+
+        response = client.post("/query", json={"query": "*3[missing]::name>>oQ"})
+        assert response.status_code == 400 and "no such table" in response.json()["detail"]
+
+        # Raw SQL never reaches the backend: it fails to compile, and "sql" is not a query key
+        response = client.post("/query", json={"query": "DROP TABLE users"})
+        assert response.status_code == 400
+        client.post("/query", json={"sql": "DROP TABLE users"})
+        assert server.db_manager.execute_query("SELECT COUNT(*) AS n FROM users").data == [{"n": 2}]
+
+        server._engine.shutdown()
+        asyncio.run(server._db_manager.close_all_async())
+
+
+class TestEngineExecuteAsync:
+    """Test SAIQLEngine.execute_async: guarded, compiled, then awaited"""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        from core.engine import SAIQLEngine
+        engine = SAIQLEngine(db_path=str(tmp_path / "engine.db"))
+        yield engine
+        engine.shutdown()
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        manager = DatabaseManager(config=manager_config(tmp_path))
+        manager.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+        manager.execute("INSERT INTO users VALUES (1, 'ada')")
+        yield manager
+        asyncio.run(manager.close_all_async())
+
+    def test_compiled_sql_is_awaited(self, engine, manager):
+        awaited = []
+        execute_query_async = manager.execute_query_async
+
+        async def spy(sql, params=None, backend=None):
+            awaited.append(sql)
+            return await execute_query_async(sql, params, backend=backend)
+
+        manager.execute_query_async = spy
+        result = asyncio.run(engine.execute_async("*3[users]::name>>oQ", manager))
+        assert result.success and result.data == [{'name': 'ada'}]
+        assert awaited == [result.sql_generated] and result.sql_generated.startswith('SELECT')
+
+    def test_guards_run_before_the_backend(self, engine, manager):
+        async def fail(*args, **kwargs):
+            raise AssertionError("backend reached")
+
+        manager.execute_query_async = fail
+        result = asyncio.run(engine.execute_async("DELETE FROM users", manager))
+        assert not result.success and result.error_phase == 'compilation'
+
+        with patch.object(engine.firewall, 'pre_prompt_guard',
+                          return_value=SimpleNamespace(action="BLOCK", reasons=["test"])):
+            result = asyncio.run(engine.execute_async("*3[users]::name>>oQ", manager))
+        assert not result.success and result.error_phase == 'security_guard'
+
+    def test_output_guard_applies(self, engine, manager):
+        with patch.object(engine.firewall, 'post_output_guard',
+                          return_value=SimpleNamespace(action="BLOCK", reasons=["test"])):
+            result = asyncio.run(engine.execute_async("*3[users]::name>>oQ", manager))
+        assert result.data == [] and result.metadata['firewall_decision'] == "BLOCK"
+
+
+class SlowSyncAdapter:
+    """Blocking adapter: each query holds its thread for `latency`"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def execute_query(self, sql, params=None):
+        time.sleep(self.latency)
+        return DatabaseResult(True, [{'id': 1}], 1, self.latency, 'postgresql', sql)
+
+
+class TestLoad:
+    """Local load test: executor-bound blocking calls vs native async"""
+
+    REQUESTS = 400
+    CONCURRENCY = 200
+    LATENCY = 0.02
+
+    def drive(self, call):
+        """Run REQUESTS calls, CONCURRENCY at a time; returns (rps, p50 latency, peak threads)"""
+        peak = [threading.active_count()]
+        latencies = []
+
+        async def one(limit):
+            async with limit:
+                start = time.perf_counter()
+                result = await call()
+                latencies.append(time.perf_counter() - start)
+                peak[0] = max(peak[0], threading.active_count())
+                assert result.success
+
+        async def run():
+            # Same default executor sizing every run, independent of earlier tests
+            loop = asyncio.get_running_loop()
+            executor = ThreadPoolExecutor()
+            loop.set_default_executor(executor)
+            limit = asyncio.Semaphore(self.CONCURRENCY)
+            start = time.perf_counter()
+            await asyncio.gather(*(one(limit) for _ in range(self.REQUESTS)))
+            elapsed = time.perf_counter() - start
+            executor.shutdown(wait=True)
+            return elapsed
+
+        elapsed = asyncio.run(run())
+        latencies.sort()
+        return self.REQUESTS / elapsed, latencies[len(latencies) // 2], peak[0]
+
+    @pytest.mark.performance
+    @pytest.mark.slow
+    def test_native_async_vs_executor(self, monkeypatch):
+        """Report both patterns' rates; only the thread counts are asserted
+
+        The executor side scales with the default executor's min(32, cpu + 4)
+        threads, so the throughput ratio depends on the machine.
+        """
+        # Old pattern: blocking adapter pushed onto the loop's default executor
+        blocking = SlowSyncAdapter(self.LATENCY)
+
+        async def executor_call():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, blocking.execute_query, "SELECT 1", None)
+
+        baseline_threads = threading.active_count()
+        executor_rps, executor_p50, executor_threads = self.drive(executor_call)
+
+        # Same backend latency and connection budget (50), awaited natively
+        monkeypatch.setitem(sys.modules, 'asyncpg', fake_driver('asyncpg', latency=self.LATENCY))
+        adapter = AsyncPostgreSQLAdapter(PG_BACKEND)
+        native_rps, native_p50, native_threads = self.drive(
+            lambda: adapter.execute_query("SELECT 1"))
+
+        print(f"\n{self.REQUESTS} requests, {self.CONCURRENCY} concurrent, {self.LATENCY * 1000:.0f}ms backend: "
+              f"executor {executor_rps:,.0f} req/s p50 {executor_p50 * 1000:.0f}ms "
+              f"(+{executor_threads - baseline_threads} threads); "
+              f"native {native_rps:,.0f} req/s p50 {native_p50 * 1000:.0f}ms "
+              f"(+{native_threads - baseline_threads} threads)")
+        assert native_threads <= baseline_threads < executor_threads
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Batch Operator Kernels
+===========================================
+
+Tests that the column-at-a-time kernels of SAIQLOperators give exactly the
+per-element results (including NULL handling and errors) of the scalar
+operators, and that they are substantially faster on large columns.
+"""
+
+import math
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import numpy as np
+
+from core.operators import SAIQLOperators, ColumnVector, compile_like, select
+
+COMPARISONS = ['=', '==', '!=', '>', '<', '>=', '<=']
+
+COLUMNS = {
+    "ints": [3, -1, 0, 7, 2 ** 40, 3],
+    "floats": [1.5, -0.0, 3.0, float("nan"), 1e300, 2.25],
+    "mixed_numbers": [1, 2.0, 3, 4.5, 0],
+    "ints_with_nulls": [1, None, 3, None, 5],
+    "numeric_strings": ["1", "2.5", " 3 ", "1e3", "-7"],
+    "strings": ["Alpha", "beta", "ALPHA", "gamma", "10", "1e1"],
+    "strings_with_nulls": ["Alpha", None, "beta", None],
+    "bools": [True, False, True],
+    "mixed": [1, "1", None, 2.0, True, "abc"],
+    "nulls": [None, None],
+    "huge_ints": [2 ** 60, 2 ** 60 + 1, 3],
+}
+
+VALUES = [3, 3.0, 1, 2.25, "3", "alpha", "ALPHA", "10", True, None, 2 ** 60]
+
+
+def scalar_results(operators, op, column, value):
+    """Per-element results of the scalar operator, or the exception type it raises"""
+    try:
+        return [bool(operators.operators[op](x, value)) for x in column]
+    except Exception as e:
+        return type(e)
+
+
+def batch_results(operators, op, column, value):
+    try:
+        return [bool(x) for x in operators.execute_batch_compare(column, op, value)]
+    except Exception as e:
+        return type(e)
+
+
+class TestBatchCompare:
+    """Test comparison kernels against the scalar operators"""
+
+    @pytest.mark.parametrize("name", sorted(COLUMNS))
+    @pytest.mark.parametrize("op", COMPARISONS)
+    def test_matches_scalar(self, name, op):
+        operators = SAIQLOperators()
+        column = COLUMNS[name]
+        for value in VALUES:
+            expected = scalar_results(operators, op, column, value)
+            assert batch_results(operators, op, column, value) == expected, (name, op, value)
+
+    def test_numpy_column_matches_list(self):
+        operators = SAIQLOperators()
+        array = np.array([5, 1, 9, 3], dtype=np.int64)
+        for op in COMPARISONS:
+            for value in (3, 3.0, "3", None):
+                expected = scalar_results(operators, op, array.tolist(), value)
+                assert batch_results(operators, op, array, value) == expected
+
+    def test_null_ordering_raises_like_scalar(self):
+        operators = SAIQLOperators()
+        with pytest.raises(TypeError):
+            operators.execute_batch_compare([1, None], '>', 0)
+
+    def test_prepared_vector_reused(self):
+        operators = SAIQLOperators()
+        vector = ColumnVector(list(range(100)))
+        low = operators.execute_batch_compare(vector, '<', 10)
+        high = operators.execute_batch_compare(vector, '>=', 95)
+        assert int(low.sum()) == 10 and int(high.sum()) == 5
+        assert select(list(range(100)), high) == [95, 96, 97, 98, 99]
+
+    def test_registered_operator(self):
+        operators = SAIQLOperators()
+        mask = operators.execute_operator('BATCH_COMPARE', [1, 5, 9], '>', 4)
+        assert mask.tolist() == [False, True, True]
+
+
+class TestBatchLike:
+    """Test LIKE kernels and pattern compilation"""
+
+    def test_wildcards(self):
+        operators = SAIQLOperators()
+        assert operators.execute_like("hello", "he%")
+        assert operators.execute_like("hello", "h_llo")
+        assert not operators.execute_like("hello", "h_lo")
+        assert operators.execute_like("test.file", "test.file")
+        assert not operators.execute_like("testXfile", "test.file")
+        assert operators.execute_like("line1\nline2", "line1%")
+
+    def test_pattern_cached(self):
+        assert compile_like("a%b") is compile_like("a%b")
+
+    @pytest.mark.parametrize("pattern", ["al%", "%HA", "%et%", "beta", "%", "b_ta", "a%a", "%1e%", "n%"])
+    def test_matches_scalar(self, pattern):
+        operators = SAIQLOperators()
+        for column in (COLUMNS["strings"], COLUMNS["strings_with_nulls"], COLUMNS["mixed"],
+                       ["Kelvin K", "straße", "ok"]):
+            expected = [operators.execute_like(x, pattern) for x in column]
+            assert operators.execute_batch_like(column, pattern).tolist() == expected, (pattern, column)
+
+
+class TestBatchAggregate:
+    """Test aggregate kernels against the scalar aggregates"""
+
+    @pytest.mark.parametrize("name", ["ints", "mixed_numbers", "ints_with_nulls", "numeric_strings",
+                                      "bools", "nulls"])
+    @pytest.mark.parametrize("function", ["COUNT", "SUM", "AVG", "MIN", "MAX"])
+    def test_matches_scalar(self, name, function):
+        operators = SAIQLOperators()
+        column = COLUMNS[name]
+        scalar = {"COUNT": operators.execute_count, "SUM": operators.execute_sum,
+                  "AVG": operators.execute_average, "MIN": operators.execute_min,
+                  "MAX": operators.execute_max}[function](list(column))
+        batch = operators.execute_batch_aggregate(function, column)
+        assert batch == pytest.approx(scalar) if scalar is not None else batch is None
+        assert type(batch) is type(scalar)
+
+    def test_non_numeric_strings_raise(self):
+        operators = SAIQLOperators()
+        with pytest.raises(ValueError):
+            operators.execute_batch_aggregate("SUM", ["1", "x"])
+
+    def test_large_lists_use_kernels(self):
+        operators = SAIQLOperators()
+        data = [float(i) for i in range(5000)] + [None]
+        assert operators.execute_sum(data) == sum(range(5000))
+        assert operators.execute_average(data) == pytest.approx(2499.5)
+        assert operators.execute_min(data) == 0.0 and operators.execute_max(data) == 4999.0
+
+
+class TestThroughput:
+    """Test that kernels beat per-element evaluation by an order of magnitude"""
+
+    def test_numeric_predicate_and_sum(self):
+        operators = SAIQLOperators()
+        rng = np.random.default_rng(3)
+        column = rng.random(200_000) * 100
+        values = column.tolist()
+
+        start = time.perf_counter()
+        scalar_mask = [operators.execute_greater_than(x, 50) for x in values]
+        scalar_sum = sum(float(x) for x in values if x is not None)
+        scalar_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_mask = operators.execute_batch_compare(column, '>', 50)
+        batch_sum = operators.execute_batch_aggregate('SUM', column)
+        batch_time = time.perf_counter() - start
+
+        assert batch_mask.tolist() == scalar_mask
+        assert math.isclose(batch_sum, scalar_sum, rel_tol=1e-12)
+        assert batch_time * 10 < scalar_time
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
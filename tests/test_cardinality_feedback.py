@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Cardinality Feedback
+=========================================
+
+Tests that actual row counts captured after execution are turned into
+correction factors that CostEstimator applies on later plans.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.cardinality_feedback import (
+    CardinalityFeedback, scan_signature, join_signature, plan_fingerprint
+)
+from core.execution_planner import QueryOptimizer, QueryStatistics
+
+
+def filter_query():
+    return {"operation": "SELECT", "table": "users", "columns": ["*"],
+            "conditions": [{"column": "status", "operator": "=", "value": "banned"}]}
+
+
+def users_statistics():
+    return {"users": QueryStatistics("users", 100000, 50.0, {"status": {"distinct_count": 5}})}
+
+
+def join_statistics():
+    # Statistics assume uniform kinds; the data below is heavily skewed
+    return {
+        "accounts": QueryStatistics("accounts", 100, 1.0, {"id": {"distinct_count": 100},
+                                                            "tier": {"distinct_count": 4}}),
+        "events": QueryStatistics("events", 1000, 1.0, {"account_id": {"distinct_count": 100},
+                                                         "kind": {"distinct_count": 10}}),
+        "tags": QueryStatistics("tags", 50, 1.0, {"event_kind": {"distinct_count": 10}}),
+    }
+
+
+def join_query():
+    return {
+        "operation": "SELECT",
+        "table": "events",
+        "joins": [
+            {"type": "INNER", "table": "accounts",
+             "conditions": [{"column": "id", "operator": "=", "value": "events.account_id"}]},
+            {"type": "INNER", "table": "tags",
+             "conditions": [{"column": "event_kind", "operator": "=", "value": "events.kind"}]},
+        ]
+    }
+
+
+def join_tables():
+    return {
+        "accounts": [{"id": i, "tier": i % 4} for i in range(100)],
+        "events": [{"id": i, "account_id": i % 100, "kind": 0} for i in range(1000)],
+        # Every tag applies to kind 0, so the tags join is 10x larger than estimated
+        "tags": [{"event_kind": 0, "label": f"t{i}"} for i in range(50)],
+    }
+
+
+def optimizer_with(statistics, feedback):
+    optimizer = QueryOptimizer(feedback=feedback)
+    optimizer.load_statistics(statistics)
+    return optimizer
+
+
+class TestSignatures:
+    """Test literal-free node signatures"""
+
+    def test_scan_signature_ignores_values_and_order(self):
+        a = scan_signature("users", [{"column": "age", "operator": ">", "value": 30},
+                                     {"column": "status", "operator": "=", "value": "x"}])
+        b = scan_signature("users", [{"column": "status", "operator": "=", "value": "y"},
+                                     {"column": "age", "operator": ">", "value": 99}])
+        assert a == b == "users: age > ?, status = ?"
+
+    def test_join_signature_ignores_orientation(self):
+        forward = join_signature([{"column": "orders.user_id", "operator": "=", "value": "users.id"}])
+        backward = join_signature([{"column": "users.id", "operator": "=", "value": "orders.user_id"}])
+        assert forward == backward
+
+
+class TestScanFeedback:
+    """Test feedback on single-table plans"""
+
+    def test_correction_applied_on_next_plan(self):
+        feedback = CardinalityFeedback()
+        optimizer = optimizer_with(users_statistics(), feedback)
+
+        plan, _ = optimizer.optimize_query(filter_query())
+        assert plan.estimated_rows == 20000
+        assert optimizer.record_actuals(plan, 50) == 1
+
+        replanned, _ = optimizer.optimize_query(filter_query())
+        assert 40 <= replanned.estimated_rows <= 60
+        assert replanned.cardinality_correction < 0.01
+        assert replanned.to_dict()["cardinality_correction"] == replanned.cardinality_correction
+
+    def test_repeated_feedback_converges_without_compounding(self):
+        feedback = CardinalityFeedback()
+        optimizer = optimizer_with(users_statistics(), feedback)
+
+        for _ in range(5):
+            plan, _ = optimizer.optimize_query(filter_query())
+            optimizer.record_actuals(plan, 500)
+
+        plan, _ = optimizer.optimize_query(filter_query())
+        assert 450 <= plan.estimated_rows <= 550
+
+    def test_min_observations_delays_correction(self):
+        feedback = CardinalityFeedback(min_observations=2)
+        optimizer = optimizer_with(users_statistics(), feedback)
+
+        plan, _ = optimizer.optimize_query(filter_query())
+        optimizer.record_actuals(plan, 50)
+        assert optimizer.optimize_query(filter_query())[0].estimated_rows == 20000
+
+
+class TestJoinFeedback:
+    """Test feedback captured by in-process join execution"""
+
+    def test_actual_rows_captured_per_node(self):
+        feedback = CardinalityFeedback()
+        optimizer = optimizer_with(join_statistics(), feedback)
+        plan, _ = optimizer.optimize_query(join_query())
+
+        rows = optimizer.execute_join_plan(plan, join_tables())
+
+        def nodes(node):
+            yield node
+            for child in node.children:
+                yield from nodes(child)
+
+        assert plan.actual_rows == len(rows) == 50000
+        assert all(node.actual_rows is not None for node in nodes(optimizer._join_tree(plan)))
+        assert feedback.get_report()["signatures"] == 5  # 3 scans + 2 joins
+
+    def test_join_estimate_corrected_after_execution(self):
+        feedback = CardinalityFeedback()
+        optimizer = optimizer_with(join_statistics(), feedback)
+        plan, _ = optimizer.optimize_query(join_query())
+        before = plan.estimated_rows
+        optimizer.execute_join_plan(plan, join_tables())
+
+        replanned, _ = optimizer.optimize_query(join_query())
+        assert before == 5000
+        assert 25000 <= replanned.estimated_rows <= 100000
+
+    def test_scan_error_not_learned_by_join(self):
+        # The kind filter is misestimated (1/10 of events); the join predicates are exact
+        statistics = {
+            "accounts": QueryStatistics("accounts", 100, 1.0, {"id": {"distinct_count": 100}}),
+            "events": QueryStatistics("events", 1000, 1.0, {"account_id": {"distinct_count": 100},
+                                                             "kind": {"distinct_count": 10}}),
+            "regions": QueryStatistics("regions", 100, 1.0, {"account_id": {"distinct_count": 100}}),
+        }
+        tables = {
+            "accounts": [{"id": i} for i in range(100)],
+            "events": [{"id": i, "account_id": i % 100, "kind": 0} for i in range(1000)],
+            "regions": [{"account_id": i} for i in range(100)],
+        }
+        query = {
+            "operation": "SELECT",
+            "table": "events",
+            "conditions": [{"column": "kind", "operator": "=", "value": 0}],
+            "joins": [
+                {"type": "INNER", "table": "accounts",
+                 "conditions": [{"column": "id", "operator": "=", "value": "events.account_id"}]},
+                {"type": "INNER", "table": "regions",
+                 "conditions": [{"column": "account_id", "operator": "=", "value": "accounts.id"}]},
+            ]
+        }
+        feedback = CardinalityFeedback()
+        optimizer = optimizer_with(statistics, feedback)
+
+        plan, _ = optimizer.optimize_query(query)
+        optimizer.execute_join_plan(plan, tables)
+
+        scan = feedback.entries["events: kind = ?"]
+        join = feedback.entries[join_signature([{"column": "events.account_id", "operator": "=",
+                                                  "value": "accounts.id"}])]
+        assert scan.q_error > 5
+        assert join.q_error < 1.5
+
+    def test_fingerprint_stable_across_join_orders(self):
+        feedback = CardinalityFeedback()
+        optimizer = optimizer_with(join_statistics(), feedback)
+        first, _ = optimizer.optimize_query(join_query())
+        optimizer.execute_join_plan(first, join_tables())
+        second, _ = optimizer.optimize_query(join_query())
+
+        assert plan_fingerprint(first) == plan_fingerprint(second)
+
+
+class TestReporting:
+    """Test misestimation report and persistence"""
+
+    def test_most_misestimated_ordering(self):
+        feedback = CardinalityFeedback()
+        feedback.record("t: a = ?", "scan", 100, 110)
+        feedback.record("t: b = ?", "scan", 100, 1)
+        feedback.record("t: c = ?", "scan", 10, 1000)
+
+        worst = feedback.most_misestimated(limit=2)
+        assert [entry["signature"] for entry in worst] == ["t: c = ?", "t: b = ?"]
+        assert worst[0]["direction"] == "under"
+        assert worst[1]["direction"] == "over"
+
+    def test_persistence_round_trip(self, tmp_path):
+        feedback = CardinalityFeedback(storage_path=str(tmp_path))
+        optimizer = optimizer_with(users_statistics(), feedback)
+        plan, _ = optimizer.optimize_query(filter_query())
+        optimizer.record_actuals(plan, 50)
+
+        reloaded = CardinalityFeedback(storage_path=str(tmp_path))
+        signature = scan_signature("users", filter_query()["conditions"])
+        assert reloaded.correction(signature) == pytest.approx(feedback.correction(signature))
+        assert reloaded.get_report()["queries"] == 1
+
+    def test_reset_forgets_signature(self):
+        feedback = CardinalityFeedback()
+        feedback.record("t: a = ?", "scan", 100, 1)
+        feedback.reset("t: a = ?")
+        assert feedback.correction("t: a = ?") == 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
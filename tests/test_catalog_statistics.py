@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Catalog Statistics Import
+==============================================
+
+SQLite is exercised end to end (ANALYZE -> sqlite_stat1 -> TableStatistics).
+PostgreSQL and MySQL catalog mappings are exercised with canned catalog
+rows returned through the adapters' execute_query() result format.
+"""
+
+import json
+import sqlite3
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.catalog_statistics import CatalogStatisticsImporter, decode_sqlite_record, detect_backend
+from core.statistics_collector import StatisticsCollector, ColumnStatistics
+from core.execution_planner import QueryOptimizer
+from core.database_manager import DatabaseManager
+from extensions.plugins.sqlite_adapter import SQLiteAdapter
+
+
+def _populate(conn):
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, status TEXT, city TEXT)")
+    conn.execute("CREATE INDEX idx_users_status ON users(status)")
+    conn.execute("CREATE INDEX idx_users_city_status ON users(city, status)")
+    conn.executemany("INSERT INTO users (status, city) VALUES (?, ?)",
+                     [(f"s{i % 4}", f"c{i % 50}") for i in range(2000)])
+    conn.execute("CREATE TABLE notes (body TEXT)")
+    conn.executemany("INSERT INTO notes VALUES (?)", [("x",)] * 30)
+    conn.commit()
+
+
+class FakeCatalogSource:
+    """Returns canned catalog rows keyed by a substring of the SQL"""
+
+    def __init__(self, responses, failing=()):
+        self.responses = responses
+        self.failing = failing
+        self.queries = []
+
+    def execute_query(self, sql, params=None):
+        self.queries.append(sql)
+        for marker in self.failing:
+            if marker in sql:
+                return {'success': False, 'data': [], 'error': f"unknown table {marker}"}
+        for marker, rows in self.responses.items():
+            if marker in sql:
+                return {'success': True, 'data': rows, 'error': None}
+        return {'success': True, 'data': [], 'error': None}
+
+
+class TestSQLiteCatalog:
+    """Test sqlite_stat1 import"""
+
+    def test_stat1_row_counts_and_ndv(self):
+        conn = sqlite3.connect(":memory:")
+        _populate(conn)
+        conn.execute("ANALYZE")
+
+        stats = CatalogStatisticsImporter(conn).import_statistics()
+        users = stats["users"]
+
+        assert users.row_count == 2000
+        assert users.columns["id"].distinct_count == 2000  # rowid alias
+        assert users.columns["status"].distinct_count == 4
+        assert users.columns["city"].distinct_count == 50
+        assert set(users.indexes) == {"idx_users_status", "idx_users_city_status"}
+        assert users.last_updated
+
+    def test_unanalyzed_table_falls_back_to_count(self):
+        conn = sqlite3.connect(":memory:")
+        _populate(conn)
+
+        stats = CatalogStatisticsImporter(conn).import_statistics(tables=["notes"])
+        assert list(stats) == ["notes"]
+        assert stats["notes"].row_count == 30
+        assert stats["notes"].columns["body"].distinct_count == 0  # unknown
+
+    def test_stat1_without_counts_falls_back_to_count(self):
+        conn = sqlite3.connect(":memory:")
+        _populate(conn)
+        conn.execute("ANALYZE")
+        conn.execute("UPDATE sqlite_stat1 SET stat = 'unordered' WHERE tbl = 'users'")
+
+        stats = CatalogStatisticsImporter(conn).import_statistics(tables=["users"])
+        assert stats["users"].row_count == 2000
+
+    def test_plugin_adapter_and_manager_entry_points(self, tmp_path):
+        db_path = str(tmp_path / "catalog.db")
+        conn = sqlite3.connect(db_path)
+        _populate(conn)
+        conn.close()
+
+        adapter = SQLiteAdapter(database=db_path)
+        stats = adapter.get_catalog_statistics(analyze=True)
+        adapter.close()
+        assert stats["users"].columns["status"].distinct_count == 4
+
+        manager = DatabaseManager(config={
+            "default_backend": "sqlite",
+            "backends": {"sqlite": {"type": "sqlite", "path": db_path}}
+        })
+        assert detect_backend(manager) == "sqlite"
+        assert manager.import_catalog_statistics(tables=["users"])["users"].row_count == 2000
+        manager.close_all()
+
+    def test_decode_stat4_record(self):
+        # header: size 3, int8, 3-byte text; body: 42, 'abc'
+        blob = bytes([3, 1, 12 + 2 * 3 + 1, 42]) + b"abc"
+        assert decode_sqlite_record(blob) == [42, "abc"]
+
+    def test_stat4_samples_give_mcvs_and_histogram(self):
+        def sample(value, neq, nlt, ndlt):
+            return {"sample": bytes([2, 1, value]), "neq": f"{neq} 1", "nlt": f"{nlt} 0", "ndlt": f"{ndlt} 0"}
+
+        col_stats = ColumnStatistics("k")
+        CatalogStatisticsImporter._apply_sqlite_stat4(col_stats, [
+            sample(1, 10, 0, 0), sample(5, 300, 100, 4), sample(9, 20, 900, 8)
+        ])
+
+        assert col_stats.most_common_values[0] == 5
+        assert col_stats.histogram_bounds == [1, 5, 9]
+        assert col_stats.histogram == {0: 100, 1: 820}
+        assert col_stats.distinct_count == 9
+
+
+class TestPostgreSQLCatalog:
+    """Test pg_class / pg_stats mapping"""
+
+    def _source(self):
+        return FakeCatalogSource({
+            "FROM pg_class": [
+                {"table_name": "orders", "reltuples": 10000.0, "relpages": 100,
+                 "n_live_tup": 9000, "size_bytes": 819200},
+                {"table_name": "fresh", "reltuples": -1.0, "relpages": 0, "n_live_tup": 42, "size_bytes": 0},
+            ],
+            "FROM pg_stats": [
+                {"table_name": "orders", "column_name": "status", "data_type": "character varying(20)",
+                 "null_frac": 0.1, "avg_width": 7,
+                 "n_distinct": 3.0, "most_common_vals": ["shipped", "pending"],
+                 "most_common_freqs": [0.6, 0.3], "histogram_bounds": None},
+                {"table_name": "orders", "column_name": "id", "data_type": "integer",
+                 "null_frac": 0.0, "avg_width": 4,
+                 "n_distinct": -1.0, "most_common_vals": None, "most_common_freqs": None,
+                 "histogram_bounds": ["1", "2500", "5000", "7500", "10000"]},
+                {"table_name": "orders", "column_name": "zip", "data_type": "text",
+                 "null_frac": 0.0, "avg_width": 5,
+                 "n_distinct": 40.0, "most_common_vals": ["00123", "10001"], "most_common_freqs": [0.2, 0.1],
+                 "histogram_bounds": ["00501", "02134", "90210", "99950"]},
+                {"table_name": "orders", "column_name": "total", "data_type": "numeric(10,2)",
+                 "null_frac": 0.0, "avg_width": 6,
+                 "n_distinct": -0.5, "most_common_vals": None, "most_common_freqs": None,
+                 "histogram_bounds": ["0.50", "19.99", "250.00"]},
+            ],
+            "FROM pg_indexes": [{"table_name": "orders", "index_name": "orders_pkey"}],
+        })
+
+    def test_pg_stats_mapping(self):
+        stats = CatalogStatisticsImporter(self._source(), backend="postgresql").import_statistics()
+        orders = stats["orders"]
+
+        assert orders.row_count == 10000
+        assert orders.avg_row_size_bytes == pytest.approx(81.92)
+        assert orders.columns["status"].distinct_count == 3
+        assert orders.columns["status"].null_count == 1000
+        assert orders.columns["status"].most_common_values == ["shipped", "pending"]
+        assert orders.columns["id"].distinct_count == 10000  # n_distinct = -1.0
+        assert orders.columns["id"].histogram_bounds == [1, 2500, 5000, 7500, 10000]
+        assert orders.columns["id"].histogram == {0: 2500, 1: 2500, 2: 2500, 3: 2500}
+        assert orders.columns["id"].min_value == 1 and orders.columns["id"].max_value == 10000
+        assert orders.indexes == ["orders_pkey"]
+
+    def test_values_keep_the_column_type(self):
+        orders = CatalogStatisticsImporter(self._source(), backend="postgresql").import_statistics()["orders"]
+
+        # Numeric-looking text stays text: '00123' is not 123
+        assert orders.columns["zip"].most_common_values == ["00123", "10001"]
+        assert orders.columns["zip"].histogram_bounds == ["00501", "02134", "90210", "99950"]
+        assert orders.columns["zip"].min_value == "00123" and orders.columns["zip"].max_value == "99950"
+        assert orders.columns["total"].histogram_bounds == [0.5, 19.99, 250.0]
+
+    def test_never_analyzed_uses_live_tuples(self):
+        stats = CatalogStatisticsImporter(self._source(), backend="postgresql").import_statistics(["fresh"])
+        assert list(stats) == ["fresh"]
+        assert stats["fresh"].row_count == 42
+
+
+class TestMySQLCatalog:
+    """Test information_schema mapping"""
+
+    def _responses(self):
+        return {
+            "information_schema.TABLES": [
+                {"table_name": "items", "table_rows": 5000, "avg_row_length": 64, "data_length": 320000}
+            ],
+            "information_schema.COLUMNS": [
+                {"table_name": "items", "column_name": "id"},
+                {"table_name": "items", "column_name": "color"},
+                {"table_name": "items", "column_name": "price"},
+            ],
+            "information_schema.STATISTICS": [
+                {"table_name": "items", "index_name": "PRIMARY", "column_name": "id",
+                 "seq_in_index": 1, "cardinality": 4980},
+            ],
+            "information_schema.COLUMN_STATISTICS": [
+                {"table_name": "items", "column_name": "color", "histogram": json.dumps({
+                    "histogram-type": "singleton", "null-values": 0.02,
+                    "buckets": [["base64:type254:Ymx1ZQ==", 0.3], ["base64:type254:cmVk", 0.98]]
+                })},
+                {"table_name": "items", "column_name": "price", "histogram": {
+                    "histogram-type": "equi-height", "null-values": 0.0,
+                    "buckets": [[1, 10, 0.5, 10], [11, 100, 1.0, 60]]
+                }},
+            ],
+        }
+
+    def test_information_schema_and_histograms(self):
+        stats = CatalogStatisticsImporter(FakeCatalogSource(self._responses()), backend="mysql").import_statistics()
+        items = stats["items"]
+
+        assert items.row_count == 5000
+        assert items.indexes == ["PRIMARY"]
+        assert items.columns["id"].distinct_count == 4980
+        assert items.columns["color"].distinct_count == 2
+        assert items.columns["color"].most_common_values == ["red", "blue"]
+        assert items.columns["color"].null_count == 100
+        assert items.columns["price"].histogram_bounds == [1, 10, 100]
+        assert items.columns["price"].histogram == {0: 2500, 1: 2500}
+        assert items.columns["price"].distinct_count == 70
+
+    def test_mysql57_without_column_statistics(self):
+        source = FakeCatalogSource(self._responses(), failing=("COLUMN_STATISTICS",))
+        stats = CatalogStatisticsImporter(source, backend="mysql").import_statistics()
+        assert stats["items"].columns["id"].distinct_count == 4980
+        assert stats["items"].columns["color"].most_common_values == []
+
+
+class TestScheduledRefresh:
+    """Test background refresh into collector and optimizer"""
+
+    def test_refresh_updates_collector_and_optimizer(self, tmp_path):
+        adapter = SQLiteAdapter(database=str(tmp_path / "refresh.db"))
+        _populate(adapter._connection)
+        collector = StatisticsCollector(storage_path=str(tmp_path / "stats"))
+        optimizer = QueryOptimizer()
+
+        importer = CatalogStatisticsImporter(adapter, collector=collector, optimizer=optimizer)
+        importer.start_refresh(interval=0.05, analyze=True)
+        try:
+            deadline = time.time() + 5
+            while collector.get_statistics("users") is None and time.time() < deadline:
+                time.sleep(0.02)
+            assert collector.get_statistics("users").row_count == 2000
+
+            adapter.execute_query("INSERT INTO users (status, city) SELECT status, city FROM users")
+            while collector.get_statistics("users").row_count != 4000 and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            importer.stop_refresh()
+            adapter.close()
+
+        assert collector.get_statistics("users").row_count == 4000
+        planner_stats = optimizer.cost_estimator.statistics["users"]
+        assert planner_stats.row_count == 4000
+        assert planner_stats.column_stats["status"]["distinct_count"] == 4
+        assert "distinct_count" not in optimizer.cost_estimator.statistics["notes"].column_stats["body"]
+
+        # Imported statistics are persisted like collected ones
+        assert StatisticsCollector(storage_path=str(tmp_path / "stats")).get_statistics("users").row_count == 4000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
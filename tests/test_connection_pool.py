@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Shared Connection Pool
+=========================================
+
+Tests validation by idle age, max lifetime, the reaper/pre-warmer and the
+wait/saturation metrics of core.connection_pool, and that the MySQL and
+PostgreSQL adapters use it. Servers are played by a fake DB-API driver
+whose round trips cost a fixed latency, so the overhead removed from the
+checkout path can be measured.
+"""
+
+import os
+import sys
+import threading
+import time
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.connection_pool import ConnectionPool, LatencyHistogram, PoolConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeDriver:
+    """DB-API stand-in: every round trip to the "server" costs rtt seconds"""
+
+    IN_TRANS = 1  # pymysql SERVER_STATUS_IN_TRANS
+
+    def __init__(self, rtt=0.0):
+        self.rtt = rtt
+        self.connections = []
+        self.round_trips = 0
+        self.pings = 0
+        self.statements = []
+        self.fail_connect = False
+
+    def connect(self, **params):
+        if self.fail_connect:
+            raise ConnectionError("server unreachable")
+        connection = FakeConnection(self)
+        self.connections.append(connection)
+        return connection
+
+    def round_trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+
+class FakeInfo:
+    transaction_status = 0  # psycopg2 TRANSACTION_STATUS_IDLE
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, sql, params=None):
+        self.connection.driver.statements.append(sql)
+        self.connection.driver.round_trip()
+        if not self.connection.autocommit:
+            self.connection.server_status |= FakeDriver.IN_TRANS
+            self.connection.info.transaction_status = 2  # INTRANS
+
+    def fetchone(self):
+        return {'1': 1}
+
+
+class FakeConnection:
+    def __init__(self, driver):
+        self.driver = driver
+        self.open = True
+        self.closed = 0
+        self.alive = True
+        self.autocommit = False
+        self.server_status = 0
+        self.info = FakeInfo()
+        self.rollbacks = 0
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def ping(self, reconnect=True):
+        self.driver.pings += 1
+        self.driver.round_trip()
+        if not self.alive:
+            raise ConnectionError("MySQL server has gone away")
+
+    def _end_transaction(self):
+        self.driver.round_trip()
+        self.server_status &= ~FakeDriver.IN_TRANS
+        self.info.transaction_status = 0
+
+    def commit(self):
+        self._end_transaction()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self._end_transaction()
+
+    def close(self):
+        self.open = False
+        self.closed = 1
+
+
+def make_pool(driver, clock=None, **settings):
+    settings.setdefault('reaper_interval', 0)
+    config = PoolConfig(**settings)
+    return ConnectionPool(driver.connect, config, validate=lambda conn: conn.ping() or True,
+                          is_usable=lambda conn: conn.open, name="test", clock=clock or time.monotonic)
+
+
+class TestValidation:
+    """Test that only connections idle past the threshold are validated"""
+
+    def test_hot_connections_skip_validation(self):
+        driver, clock = FakeDriver(), FakeClock()
+        pool = make_pool(driver, clock, min_size=1, validation_idle_time=30)
+
+        for _ in range(50):
+            pool.return_connection(pool.get_connection())
+            clock.advance(1)
+        assert driver.pings == 0 and len(driver.connections) == 1
+
+        clock.advance(31)
+        pool.return_connection(pool.get_connection())
+        assert driver.pings == 1 and pool.metrics()['validations'] == 1
+
+    def test_dead_connection_replaced(self):
+        driver, clock = FakeDriver(), FakeClock()
+        pool = make_pool(driver, clock, min_size=1, validation_idle_time=30)
+        driver.connections[0].alive = False
+        clock.advance(60)
+
+        conn = pool.get_connection()
+        assert conn is driver.connections[1] and not driver.connections[0].open
+        metrics = pool.metrics()
+        assert metrics['validation_failures'] == 1 and metrics['size'] == 1
+
+
+class TestLifetime:
+    """Test max-lifetime retirement"""
+
+    def test_expired_connections_retired(self):
+        driver, clock = FakeDriver(), FakeClock()
+        pool = make_pool(driver, clock, min_size=1, max_lifetime=100)
+
+        held = pool.get_connection()
+        clock.advance(101)
+        pool.return_connection(held)
+        assert not held.open and pool.metrics()['retired_lifetime'] == 1
+
+        fresh = pool.get_connection()
+        assert fresh is driver.connections[-1] and fresh.open
+
+    def test_lifetimes_are_jittered(self):
+        driver = FakeDriver()
+        pool = make_pool(driver, min_size=20, max_size=20, max_lifetime=1000)
+        expiries = {entry.expires_at - entry.created_at for entry in pool._idle}
+        assert len(expiries) > 1 and all(900 <= e <= 1000 for e in expiries)
+
+
+class TestReaper:
+    """Test idle eviction and pre-warming"""
+
+    def test_reap_idle_above_min_and_prewarm(self):
+        driver, clock = FakeDriver(), FakeClock()
+        pool = make_pool(driver, clock, min_size=2, max_size=10, idle_timeout=60, max_lifetime=0)
+
+        burst = [pool.get_connection() for _ in range(6)]
+        for conn in burst:
+            pool.return_connection(conn)
+        assert pool.metrics()['idle'] == 6
+
+        clock.advance(30)
+        assert pool.reap() == 0
+        clock.advance(31)
+        assert pool.reap() == 4
+        metrics = pool.metrics()
+        assert metrics['idle'] == 2 and metrics['reaped_idle'] == 4
+
+        # Connections lost while checked out are replaced by the pre-warmer
+        for conn in [pool.get_connection(), pool.get_connection()]:
+            pool.return_connection(conn, discard=True)
+        assert pool.metrics()['size'] == 0
+        pool.reap()
+        assert pool.metrics()['idle'] == 2
+
+    def test_prewarm_survives_connect_failures(self):
+        driver = FakeDriver()
+        driver.fail_connect = True
+        pool = make_pool(driver, min_size=3)
+        assert pool.metrics()['size'] == 0 and pool.stats['create_failures'] == 1
+
+        driver.fail_connect = False
+        pool.reap()
+        assert pool.metrics()['idle'] == 3
+
+    def test_background_reaper(self):
+        driver = FakeDriver()
+        pool = make_pool(driver, min_size=1, max_size=5, idle_timeout=0.05, reaper_interval=0.02)
+        conns = [pool.get_connection() for _ in range(4)]
+        for conn in conns:
+            pool.return_connection(conn)
+
+        deadline = time.time() + 5
+        while pool.metrics()['idle'] > 1 and time.time() < deadline:
+            time.sleep(0.01)
+        assert pool.metrics()['idle'] == 1
+        pool.close_all()
+        assert not pool._reaper.is_alive()
+
+
+class TestSlotAccounting:
+    """Test that connections being validated or reset still count toward max_size"""
+
+    def test_slow_reset_does_not_open_extra_connections(self):
+        driver = FakeDriver()
+        resetting, release = threading.Event(), threading.Event()
+
+        def slow_reset(conn):
+            resetting.set()
+            release.wait(5)
+
+        pool = ConnectionPool(driver.connect, PoolConfig(min_size=0, max_size=1, reaper_interval=0),
+                              reset=slow_reset, name="test")
+        conn = pool.get_connection()
+        returner = threading.Thread(target=pool.return_connection, args=(conn,))
+        returner.start()
+        assert resetting.wait(5)
+        assert pool.metrics()['size'] == 1
+
+        # The checkout waits for the reset instead of opening a second connection
+        threading.Timer(0.05, release.set).start()
+        assert pool.get_connection(timeout=5) is conn
+        returner.join(timeout=5)
+        pool.return_connection(conn)
+        metrics = pool.metrics()
+        assert len(driver.connections) == 1
+        assert metrics['idle'] == 1 and metrics['in_use'] == 0
+
+    def test_slow_validation_does_not_open_extra_connections(self):
+        driver, clock = FakeDriver(), FakeClock()
+        validating, release = threading.Event(), threading.Event()
+
+        def slow_validate(conn):
+            validating.set()
+            return release.wait(5)
+
+        pool = ConnectionPool(driver.connect, PoolConfig(min_size=1, max_size=1, reaper_interval=0),
+                              validate=slow_validate, name="test", clock=clock)
+        clock.advance(60)
+        first = []
+        checkout = threading.Thread(target=lambda: first.append(pool.get_connection()))
+        checkout.start()
+        assert validating.wait(5)
+        assert pool.metrics()['size'] == 1
+
+        with pytest.raises(RuntimeError, match="max pool size reached"):
+            pool.get_connection(timeout=0)
+        release.set()
+        checkout.join(timeout=5)
+        assert first == driver.connections and pool.metrics()['in_use'] == 1
+
+
+class TestMetrics:
+    """Test checkout-wait histogram and saturation gauges"""
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for ms in [0.05] * 90 + [7] * 9 + [20000]:
+            histogram.observe(ms / 1000)
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 100 and snapshot['buckets']['le_0.1'] == 90
+        assert snapshot['buckets']['le_10'] == 9 and snapshot['buckets']['le_inf'] == 1
+        assert snapshot['p50_ms'] == 0.1 and snapshot['p95_ms'] == 10 and snapshot['p99_ms'] == 10
+        assert snapshot['max_ms'] == pytest.approx(20000)
+
+    def test_saturation_and_waits(self):
+        driver = FakeDriver()
+        pool = make_pool(driver, min_size=0, max_size=2)
+        held = [pool.get_connection(), pool.get_connection()]
+
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.get_connection(timeout=5)))
+        waiter.start()
+        deadline = time.time() + 5
+        while pool.metrics()['waiting'] == 0 and time.time() < deadline:
+            time.sleep(0.005)
+
+        metrics = pool.metrics()
+        assert metrics['saturation'] == 1.0 and metrics['waiting'] == 1
+        time.sleep(0.03)
+        pool.return_connection(held[0])
+        waiter.join(timeout=5)
+
+        assert got == [held[0]]
+        wait = pool.metrics()['checkout_wait']
+        assert wait['count'] == 3 and wait['max_ms'] >= 25
+
+        with pytest.raises(RuntimeError, match="max pool size reached"):
+            pool.get_connection(timeout=0.01)
+        assert pool.metrics()['checkout_timeouts'] == 1
+
+
+class TestAdapterPools:
+    """Test the adapters' pools against the fake driver"""
+
+    CHECKOUTS = 100
+    RTT = 0.002
+
+    def checkout_loop(self, adapter):
+        start = time.perf_counter()
+        for _ in range(self.CHECKOUTS):
+            with adapter.get_connection() as (connection, _):
+                pass
+        return time.perf_counter() - start
+
+    def test_mysql_checkout_skips_ping(self, monkeypatch):
+        pytest.importorskip("pymysql")
+        import extensions.plugins.mysql_adapter as mysql_adapter
+
+        driver = FakeDriver(rtt=self.RTT)
+        monkeypatch.setattr(mysql_adapter.pymysql, "connect", driver.connect)
+
+        def adapter(validation_idle_time):
+            return mysql_adapter.MySQLAdapter(mysql_adapter.ConnectionConfig(
+                min_connections=1, pool_reaper_interval=0,
+                pool_validation_idle_time=validation_idle_time))
+
+        # Validating every checkout is what the pool used to do
+        every = adapter(0)
+        pings = driver.pings
+        every_time = self.checkout_loop(every)
+        assert driver.pings - pings == self.CHECKOUTS
+
+        idle_aged = adapter(30)
+        pings = driver.pings
+        idle_time = self.checkout_loop(idle_aged)
+        assert driver.pings == pings
+        print(f"\n{self.CHECKOUTS} checkouts at {self.RTT * 1000:.0f}ms RTT: "
+              f"ping every checkout {every_time * 1000:.1f}ms, idle-aged validation {idle_time * 1000:.1f}ms")
+        assert every_time - idle_time > self.CHECKOUTS * self.RTT * 0.5
+
+        stats = idle_aged.get_statistics()['pool']
+        assert stats['checkouts'] > self.CHECKOUTS and stats['in_use'] == 0
+        every.close()
+        idle_aged.close()
+
+    def test_mysql_reset_rolls_back_open_transactions(self, monkeypatch):
+        pytest.importorskip("pymysql")
+        import extensions.plugins.mysql_adapter as mysql_adapter
+
+        driver = FakeDriver()
+        monkeypatch.setattr(mysql_adapter.pymysql, "connect", driver.connect)
+        adapter = mysql_adapter.MySQLAdapter(mysql_adapter.ConnectionConfig(
+            min_connections=1, pool_reaper_interval=0))
+        [connection] = driver.connections
+
+        with adapter.get_connection() as (conn, _):
+            conn.cursor().execute("SELECT * FROM t")
+        assert connection.rollbacks == 2  # health check and the SELECT above
+        with adapter.get_connection() as (conn, _):
+            pass
+        assert connection.rollbacks == 2
+        adapter.close()
+
+    def test_postgresql_session_setup_once_per_connection(self, monkeypatch):
+        pytest.importorskip("psycopg2")
+        import extensions.plugins.postgresql_adapter as postgresql_adapter
+
+        driver = FakeDriver(rtt=self.RTT)
+        monkeypatch.setattr(postgresql_adapter.psycopg2, "connect", driver.connect)
+        adapter = postgresql_adapter.PostgreSQLAdapter(postgresql_adapter.ConnectionConfig(
+            min_connections=1, pool_reaper_interval=0))
+
+        self.checkout_loop(adapter)
+        session_sets = [sql for sql in driver.statements if sql.startswith('SET')]
+        assert len(session_sets) == 2 * len(driver.connections) == 2
+        assert driver.round_trips < 10
+
+        # A connection that broke while checked out is dropped on return
+        [connection] = driver.connections
+        with adapter.get_connection() as (conn, _):
+            conn.closed = 1
+        with adapter.get_connection() as (conn, _):
+            assert conn is not connection
+        assert adapter.get_statistics()['pool']['discarded'] == 1
+        adapter.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
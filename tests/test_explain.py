@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL EXPLAIN / EXPLAIN ANALYZE
+==============================================
+
+Tests the AST -> logical plan / planner query translation, per-node
+measurement of physical plans on SQLite and the engine's EXPLAIN entry
+points.
+"""
+
+import sqlite3
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.explain import (
+    PlanAnalyzer, backend_explain_sql, count_sql, is_data_modifying, logical_plan_from_ast,
+    planner_query_from_ast
+)
+from core.execution_planner import QueryOptimizer, QueryStatistics, OperationType
+from core.parser import (
+    QueryNode, FunctionCallNode, ContainerNode, TableReferenceNode, ColumnListNode,
+    BinaryOperationNode, ColumnReferenceNode, LiteralNode, NodeType
+)
+from core.database_manager import DatabaseManager, DatabaseResult
+from core.engine import SAIQLEngine
+from core.errors import RuntimeError as SAIQLRuntimeError
+
+
+def filtered_select_ast():
+    """*3[users]::name,age with age > 30 AND status = 'active'"""
+    target = ContainerNode(node_type=NodeType.CONTAINER,
+                           contents=[TableReferenceNode(node_type=NodeType.TABLE_REFERENCE, table_name="users")])
+    target.columns = ColumnListNode(node_type=NodeType.COLUMN_LIST, columns=["name", "age"])
+
+    def comparison(column, operator, value):
+        return BinaryOperationNode(node_type=NodeType.BINARY_OPERATION, operator=operator,
+                                   left=ColumnReferenceNode(node_type=NodeType.COLUMN_REFERENCE, column_name=column),
+                                   right=LiteralNode(node_type=NodeType.STRING_LITERAL, value=value))
+
+    condition = BinaryOperationNode(node_type=NodeType.BINARY_OPERATION, operator="&&",
+                                    left=comparison("age", ">", 30), right=comparison("status", "==", "active"))
+    return QueryNode(node_type=NodeType.QUERY, query_type="SELECT",
+                     operation=FunctionCallNode(node_type=NodeType.FUNCTION_CALL, function_name="*3"),
+                     target=target, output=LiteralNode(node_type=NodeType.STRING_LITERAL, value="oQ"),
+                     conditions=[condition])
+
+
+def _populate(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER, status TEXT)")
+    conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, total REAL)")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, order_id INTEGER, sku TEXT)")
+    conn.executemany("INSERT INTO users (name, age, status) VALUES (?, ?, ?)",
+                     [(f"u{i}", i % 80, "active" if i % 3 else "banned") for i in range(600)])
+    conn.executemany("INSERT INTO orders (user_id, total) VALUES (?, ?)",
+                     [(i % 600 + 1, i * 1.5) for i in range(2000)])
+    conn.executemany("INSERT INTO items (order_id, sku) VALUES (?, ?)",
+                     [(i % 2000 + 1, f"sku{i % 40}") for i in range(5000)])
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "explain.db")
+    _populate(path)
+    return path
+
+
+@pytest.fixture
+def engine(db_path):
+    engine = SAIQLEngine(db_path=db_path)
+    yield engine
+    engine.shutdown()
+
+
+class TestPlanTranslation:
+    """Test compiled AST -> logical plan and planner query"""
+
+    def test_logical_plan_operators(self):
+        plan = logical_plan_from_ast(filtered_select_ast())
+
+        assert plan["node"] == "Output" and plan["format"] == "oQ"
+        project = plan["children"][0]
+        assert project["node"] == "Project" and project["columns"] == ["name", "age"]
+        assert project["children"][0]["node"] == "Filter"
+        assert project["children"][0]["children"][0] == {"node": "Scan", "table": "users"}
+
+    def test_planner_query_flattens_and_conditions(self):
+        query = planner_query_from_ast(filtered_select_ast())
+
+        assert query["table"] == "users"
+        assert query["conditions"] == [
+            {"column": "age", "operator": ">", "value": 30},
+            {"column": "status", "operator": "=", "value": "active"},
+        ]
+
+    def test_backend_explain_statements(self):
+        sql = 'SELECT "name" FROM "users";'
+        assert backend_explain_sql(sql, "sqlite") == 'EXPLAIN QUERY PLAN SELECT "name" FROM "users"'
+        assert backend_explain_sql(sql, "postgresql", analyze=True).startswith("EXPLAIN (ANALYZE, BUFFERS")
+        # Only PostgreSQL's ANALYZE replaces the measured run; MySQL's would be a second one
+        assert backend_explain_sql(sql, "mysql", analyze=True).startswith("EXPLAIN FORMAT=JSON ")
+        assert backend_explain_sql(sql, "oracle") is None
+
+    def test_data_modifying_statements(self):
+        assert not is_data_modifying('SELECT "name" FROM "users"')
+        assert not is_data_modifying("WITH t AS (SELECT 1) SELECT * FROM t")
+        for sql in ["INSERT INTO t VALUES (1)", "update t set a = 1", "DELETE FROM t",
+                    "CREATE TABLE t (a INT)", "DROP TABLE t",
+                    "WITH moved AS (DELETE FROM t RETURNING *) SELECT * FROM moved"]:
+            assert is_data_modifying(sql), sql
+
+
+class TestPlanAnalyzer:
+    """Test per-node actual rows on SQLite"""
+
+    def test_join_tree_nodes_measured(self, db_path):
+        manager = DatabaseManager(config={
+            "default_backend": "sqlite",
+            "backends": {"sqlite": {"type": "sqlite", "path": db_path}}
+        })
+        statistics = {name: QueryStatistics.from_table_statistics(stats)
+                      for name, stats in manager.import_catalog_statistics().items()}
+        optimizer = QueryOptimizer()
+        optimizer.load_statistics(statistics)
+        plan, _ = optimizer.optimize_query({
+            "operation": "SELECT",
+            "table": "users",
+            "conditions": [{"column": "status", "operator": "=", "value": "banned"}],
+            "joins": [
+                {"type": "INNER", "table": "orders",
+                 "conditions": [{"column": "user_id", "operator": "=", "value": "users.id"}]},
+                {"type": "INNER", "table": "items",
+                 "conditions": [{"column": "order_id", "operator": "=", "value": "orders.id"}]},
+            ]
+        })
+
+        PlanAnalyzer(manager).annotate(plan, result_rows=1668, execution_ms=2.0)
+        join_tree = QueryOptimizer._join_tree(plan)
+        scans = {}
+
+        def walk(node):
+            assert node.actual_rows is not None and node.actual_time_ms is not None
+            if node.operation != OperationType.JOIN:
+                scans[node.table_name] = node.actual_rows
+            for child in node.children:
+                walk(child)
+
+        walk(join_tree)
+        manager.close_all()
+
+        assert scans == {"users": 200, "orders": 2000, "items": 5000}
+        assert join_tree.actual_rows == 1668
+        assert plan.actual_rows == 1668 and plan.actual_time_ms == 2.0
+
+    def test_postgresql_actuals_need_no_probes(self):
+        optimizer = QueryOptimizer()
+        optimizer.load_statistics({})
+        plan, _ = optimizer.optimize_query({
+            "operation": "SELECT", "table": "users",
+            "joins": [
+                {"type": "INNER", "table": "orders",
+                 "conditions": [{"column": "user_id", "operator": "=", "value": "users.id"}]},
+                {"type": "INNER", "table": "items",
+                 "conditions": [{"column": "order_id", "operator": "=", "value": "orders.id"}]},
+            ]
+        })
+
+        def scan(table, rows, loops=1):
+            return {"Node Type": "Seq Scan", "Relation Name": table, "Actual Rows": rows,
+                    "Actual Loops": loops, "Actual Total Time": 1.0}
+
+        backend_plan = {
+            "Node Type": "Hash Join", "Actual Rows": 4000, "Actual Loops": 1, "Actual Total Time": 9.5,
+            "Plans": [
+                {"Node Type": "Nested Loop", "Actual Rows": 1500, "Actual Loops": 1, "Actual Total Time": 5.0,
+                 "Plans": [scan("users", 200), scan("orders", 3, loops=200)]},
+                {"Node Type": "Hash", "Actual Rows": 5000, "Actual Loops": 1, "Actual Total Time": 2.0,
+                 "Plans": [scan("items", 5000)]}]}
+
+        # No database: a COUNT(*) probe would fail
+        PlanAnalyzer(None, backend_plan=backend_plan).annotate(plan, result_rows=4000, execution_ms=10.0)
+        join_tree = QueryOptimizer._join_tree(plan)
+        scans = {}
+
+        def walk(node):
+            if node.operation != OperationType.JOIN:
+                scans[node.table_name] = node.actual_rows
+            for child in node.children:
+                walk(child)
+
+        walk(join_tree)
+        assert scans == {"users": 200, "orders": 600, "items": 5000}
+        assert join_tree.actual_rows == 4000 and join_tree.actual_time_ms == 9.5
+        assert plan.actual_rows == 4000 and plan.actual_time_ms == 10.0
+
+    def test_count_sql_qualifies_leaf_filters(self):
+        optimizer = QueryOptimizer()
+        optimizer.load_statistics({})
+        plan, _ = optimizer.optimize_query({
+            "operation": "SELECT", "table": "users",
+            "conditions": [{"column": "name", "operator": "=", "value": "o'brien"}]
+        })
+        assert count_sql(plan) == 'SELECT COUNT(*) AS n FROM "users" WHERE "users"."name" = \'o\'\'brien\''
+
+
+class TestEngineExplain:
+    """Test SAIQLEngine.explain and the EXPLAIN query prefix"""
+
+    def test_explain_without_execution(self, engine):
+        explained = engine.explain("*3[users]::name,age>>oQ")
+
+        assert explained.backend == "sqlite"
+        assert explained.physical_plan["estimated_rows"] == 600
+        assert explained.physical_plan["actual_rows"] is None
+        assert any("users" in row["detail"] for row in explained.backend_plan)
+        assert explained.data == []
+        assert {"lexing", "parsing", "compilation", "planning"} <= set(explained.phase_times)
+
+    def test_explain_analyze_annotates_and_feeds_back(self, engine):
+        explained = engine.explain("*COUNT[users]::*>>oQ", analyze=True)
+        aggregate = explained.physical_plan["children"][0]
+
+        assert explained.actual_rows == 1
+        assert explained.physical_plan["actual_rows"] == 600
+        assert aggregate["operation"] == "AGGREGATE"
+        assert aggregate["estimated_rows"] == 1 and aggregate["actual_rows"] == 1
+        assert explained.phase_times["execution"] > 0
+        assert engine.cardinality_feedback.get_report()["queries"] == 1
+
+    def test_feedback_persists_next_to_the_database(self, engine, db_path):
+        engine.explain("*COUNT[users]::*>>oQ", analyze=True)
+        assert os.path.exists(os.path.join(os.path.dirname(db_path), "cardinality_feedback.json"))
+
+        reopened = SAIQLEngine(db_path=db_path)
+        try:
+            assert reopened.cardinality_feedback.get_report()["queries"] == 1
+        finally:
+            reopened.shutdown()
+
+    def test_execute_with_explain_prefix(self, engine):
+        result = engine.execute("EXPLAIN ANALYZE *3[users]::name>>oQ")
+        lines = [row["QUERY PLAN"] for row in result.data]
+
+        assert result.success
+        assert result.sql_generated.startswith('SELECT "name"')
+        assert "Physical Plan:" in lines and "Rows: 600" in lines
+        assert any("actual rows=600" in line for line in lines)
+        assert result.metadata["explain"]["analyze"] is True
+        assert not result.cache_hit
+
+    def test_analyze_refuses_data_modifying_statements(self, engine, monkeypatch):
+        compile_query = engine._compile_query
+
+        def compile_delete(query, context, timings):
+            result = compile_query(query, context, timings)
+            result.sql_code = 'DELETE FROM "users"'
+            return result
+
+        monkeypatch.setattr(engine, "_compile_query", compile_delete)
+        with pytest.raises(SAIQLRuntimeError, match="data-modifying"):
+            engine.explain("*3[users]::name>>oQ", analyze=True)
+        # Plain EXPLAIN does not execute it, so it is allowed
+        assert engine.explain("*3[users]::name>>oQ").sql == 'DELETE FROM "users"'
+
+        conn = sqlite3.connect(engine.config["database"]["path"])
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 600
+        conn.close()
+
+    def test_postgresql_analyze_runs_the_query_once(self, engine, monkeypatch):
+        analyzed = [{"Plan": {
+            "Node Type": "Hash Join", "Actual Rows": 1500, "Actual Loops": 1, "Actual Total Time": 9.5,
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "orders", "Actual Rows": 2000,
+                 "Actual Loops": 1, "Actual Total Time": 3.0},
+                {"Node Type": "Hash", "Actual Rows": 200, "Actual Loops": 1, "Actual Total Time": 1.5,
+                 "Plans": [{"Node Type": "Seq Scan", "Relation Name": "users", "Actual Rows": 200,
+                            "Actual Loops": 1, "Actual Total Time": 1.2}]}]},
+            "Execution Time": 10.25}]
+
+        class PostgresManager:
+            default_backend = "pg"
+            config = {"backends": {"pg": {"type": "postgresql"}}}
+            statements = []
+
+            def execute_query(self, sql, params=None):
+                self.statements.append(sql)
+                return DatabaseResult(success=True, data=[{"QUERY PLAN": analyzed}], rows_affected=1,
+                                      execution_time=0.0, backend="postgresql", sql_executed=sql)
+
+            def import_catalog_statistics(self, tables=None):
+                return {}
+
+            def close_all(self):
+                pass
+
+        monkeypatch.setattr(engine, "_create_db_manager", PostgresManager)
+        explained = engine.explain("*3[users]::name>>oQ", analyze=True)
+
+        [statement] = PostgresManager.statements
+        assert statement.startswith("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT")
+        assert explained.actual_rows == 1500 and explained.phase_times["execution"] == 0.01025
+        assert explained.physical_plan["actual_rows"] == 1500
+        assert explained.physical_plan["actual_time_ms"] == 10.25
+
+    def test_explain_reports_phase_of_errors(self, engine):
+        result = engine.execute("EXPLAIN *3[users]::name|age>30>>oQ")
+        assert not result.success
+        assert result.error_phase == "lexical_analysis"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
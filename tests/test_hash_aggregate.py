@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Hash Aggregation
+=====================================
+
+Tests GROUP BY hash aggregation against a naive reference across batch
+sizes, spilling and worker processes, and its use by SAIQLOperators, the
+planner's in-process join execution and FileAdapter aggregate views.
+"""
+
+import os
+import random
+import shutil
+import pytest
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pandas as pd
+
+from core.hash_aggregate import AggregateSpec, HashAggregator, hash_aggregate
+from core.operators import SAIQLOperators
+from core.execution_planner import QueryOptimizer, QueryStatistics
+from extensions.plugins.file_adapter import FileAdapter, ViewDefinition
+
+BACKHISTORY_CSV = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                               '../speed_test/data/backhistory_sample.csv'))
+
+AGGREGATES = ["COUNT(*) AS n", "COUNT(amount) AS counted", "SUM(amount) AS total", "AVG(amount) AS mean",
+              "MIN(amount) AS low", "MAX(amount) AS high", "COUNT(DISTINCT user) AS users"]
+
+
+def sample_rows(n=5000, groups=50, seed=11):
+    rng = random.Random(seed)
+    return [{"region": rng.choice(["eu", "us", None]),
+             "bucket": rng.randrange(groups),
+             "user": rng.choice([None, *range(30)]),
+             "amount": rng.choice([None, rng.randrange(1000)])} for _ in range(n)]
+
+
+def reference(rows, group_by):
+    """Naive GROUP BY in first-appearance order"""
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[c] for c in group_by), []).append(row)
+    output = []
+    for key, members in groups.items():
+        amounts = [r["amount"] for r in members if r["amount"] is not None]
+        result = dict(zip(group_by, key))
+        result.update({
+            "n": len(members),
+            "counted": len(amounts),
+            "total": sum(amounts) if amounts else None,
+            "mean": sum(amounts) / len(amounts) if amounts else None,
+            "low": min(amounts) if amounts else None,
+            "high": max(amounts) if amounts else None,
+            "users": len({r["user"] for r in members if r["user"] is not None}),
+        })
+        output.append(result)
+    return output
+
+
+class TestAggregateSpec:
+    """Test aggregate expression parsing"""
+
+    def test_parse_forms(self):
+        assert AggregateSpec.parse("count(*)") == AggregateSpec("COUNT", "*", "COUNT(*)")
+        assert AggregateSpec.parse("COUNT(DISTINCT user_id) AS users") == \
+            AggregateSpec("COUNT_DISTINCT", "user_id", "users")
+        assert AggregateSpec.parse(("sum", "total")) == AggregateSpec("SUM", "total", "SUM(total)")
+
+    @pytest.mark.parametrize("spec", ["MEDIAN(x)", "SUM(*)", "total"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            AggregateSpec.parse(spec)
+
+
+class TestHashAggregator:
+    """Test results against the reference"""
+
+    @pytest.mark.parametrize("batch_size", [1, 97, 10000])
+    def test_matches_reference(self, batch_size):
+        rows = sample_rows()
+        result, stats = HashAggregator(["region", "bucket"], AGGREGATES, batch_size=batch_size).execute(rows)
+
+        expected = reference(rows, ["region", "bucket"])
+        assert result == expected
+        assert stats.input_rows == 5000 and stats.groups == len(expected)
+
+    def test_global_aggregate(self):
+        rows = sample_rows(500)
+        assert hash_aggregate(rows, [], AGGREGATES) == reference(rows, [])
+
+    def test_global_aggregate_of_nothing(self):
+        assert hash_aggregate([], [], ["COUNT(*)", "SUM(x)", "AVG(x)", "COUNT(DISTINCT x)"]) == [
+            {"COUNT(*)": 0, "SUM(x)": None, "AVG(x)": None, "COUNT(DISTINCT x)": 0}
+        ]
+        assert hash_aggregate([], ["g"], ["COUNT(*)"]) == []
+
+    def test_spills_when_group_table_too_large(self, tmp_path):
+        rows = sample_rows(5000, groups=1000)
+        aggregator = HashAggregator(["bucket"], AGGREGATES, batch_size=500, max_groups=100,
+                                    spill_dir=str(tmp_path), num_partitions=8)
+
+        result, stats = aggregator.execute(rows)
+
+        assert result == reference(rows, ["bucket"])
+        assert stats.partitions == 8 and stats.spilled_bytes > 0
+        assert os.listdir(tmp_path) == []
+
+    def test_parallel_matches_serial(self):
+        rows = sample_rows(20000, groups=300)
+        aggregator = HashAggregator(["region", "bucket"], AGGREGATES, parallel_threshold=1000, max_workers=2)
+
+        result, stats = aggregator.execute(rows)
+
+        assert stats.workers == 2 and stats.batches == 4
+        assert result == reference(rows, ["region", "bucket"])
+
+    def test_streamed_batches(self):
+        batches = (sample_rows(100, seed=seed) for seed in range(10))
+        rows = [row for seed in range(10) for row in sample_rows(100, seed=seed)]
+
+        result, stats = HashAggregator(["region"], AGGREGATES).execute_batches(batches)
+
+        assert result == reference(rows, ["region"])
+        assert stats.batches == 10
+
+
+class TestIntegration:
+    """Test SAIQLOperators, planner and FileAdapter use"""
+
+    def test_group_aggregate_operator(self):
+        rows = sample_rows(300)
+        result = SAIQLOperators().execute_operator("GROUP_AGGREGATE", rows, "region", AGGREGATES)
+        assert result == reference(rows, ["region"])
+
+    def test_join_plan_grouped(self):
+        optimizer = QueryOptimizer()
+        optimizer.load_statistics({
+            "users": QueryStatistics("users", 10, 50.0, {"id": {"distinct_count": 10}}),
+            "orders": QueryStatistics("orders", 100, 50.0, {"user_id": {"distinct_count": 10}}),
+            "regions": QueryStatistics("regions", 10, 50.0, {"user_id": {"distinct_count": 10}}),
+        })
+        plan, _ = optimizer.optimize_query({
+            "operation": "SELECT", "table": "orders",
+            "joins": [{"type": "INNER", "table": "users",
+                       "conditions": [{"column": "id", "operator": "=", "value": "orders.user_id"}]},
+                      {"type": "INNER", "table": "regions",
+                       "conditions": [{"column": "user_id", "operator": "=", "value": "users.id"}]}],
+            "group_by": ["regions.name"],
+            "aggregates": ["COUNT(*) AS orders", "SUM(orders.total) AS revenue"],
+            "order_by": "revenue DESC", "limit": 1
+        })
+        tables = {
+            "users": [{"id": i} for i in range(10)],
+            "regions": [{"user_id": i, "name": "eu" if i < 3 else "us"} for i in range(10)],
+            "orders": [{"id": i, "user_id": i % 10, "total": 10 if i % 10 < 3 else 1} for i in range(100)],
+        }
+
+        rows = optimizer.execute_join_plan(plan, tables)
+        aggregate = next(child for child in plan.children if child.operation.value == "AGGREGATE")
+
+        assert rows == [{"regions.name": "eu", "orders": 30, "revenue": 300}]
+        assert aggregate.actual_rows == 2
+        assert aggregate.to_dict()["aggregates"] == ["COUNT(*) AS orders", "SUM(orders.total) AS revenue"]
+
+    def test_file_adapter_aggregate_view(self, tmp_path, monkeypatch):
+        if not os.path.exists(BACKHISTORY_CSV):
+            pytest.skip("backhistory sample not available")
+        shutil.copy(BACKHISTORY_CSV, tmp_path / "backhistory.csv")
+        monkeypatch.setattr("extensions.plugins.file_adapter.VIEW_STREAM_BATCH_SIZE", 700)
+        adapter = FileAdapter(str(tmp_path))
+        adapter.create_view("by_symbol", ViewDefinition(
+            name="by_symbol", description="", source_tables=["backhistory"], columns=[],
+            definition="SELECT symbol, COUNT(*) AS n, AVG(close) AS avg_close, MAX(volume) AS peak "
+                       "FROM backhistory WHERE granularity = 60 GROUP BY symbol ORDER BY n DESC, symbol"))
+
+        result = adapter.query_view("by_symbol")
+
+        df = pd.read_csv(BACKHISTORY_CSV)
+        df = df[df["granularity"] == 60]
+        expected = (df.groupby("symbol", as_index=False)
+                    .agg(n=("close", "size"), avg_close=("close", "mean"), peak=("volume", "max"))
+                    .sort_values(["n", "symbol"], ascending=[False, True]).reset_index(drop=True))
+        assert list(result.columns) == ["symbol", "n", "avg_close", "peak"]
+        assert result["symbol"].tolist() == expected["symbol"].tolist()
+        assert result["n"].tolist() == expected["n"].tolist()
+        assert result["avg_close"].astype(float).tolist() == pytest.approx(expected["avg_close"].tolist())
+        assert result["peak"].astype(float).tolist() == pytest.approx(expected["peak"].tolist())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
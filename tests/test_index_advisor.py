@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Index Advisor
+==================================
+
+Tests workload capture, candidate scoring and CREATE INDEX materialization
+against a real SQLite backend.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.index_advisor import IndexAdvisor, IndexCandidate
+from core.database_manager import DatabaseManager
+from core.execution_planner import create_sample_statistics
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    config = {
+        "default_backend": "sqlite",
+        "backends": {"sqlite": {"type": "sqlite", "path": str(tmp_path / "advisor.db")}}
+    }
+    manager = DatabaseManager(config=config)
+    manager.execute_query("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT, ts INTEGER)")
+    manager.execute_transaction([
+        {"sql": "INSERT INTO events (kind, ts) VALUES (?, ?)", "params": (f"k{i % 500}", i)}
+        for i in range(5000)
+    ])
+    yield manager
+    manager.close_all()
+
+
+class TestWorkloadCapture:
+    """Test predicate and ORDER BY extraction"""
+
+    def test_records_predicates_and_order_by(self):
+        advisor = IndexAdvisor()
+        entry = advisor.record_query(
+            'SELECT * FROM "events" WHERE ("kind" = \'k1\') AND ("ts" > 10) ORDER BY "ts" DESC LIMIT 5'
+        )
+
+        assert entry.tables == ["events"]
+        assert [(p["column"], p["operator"]) for p in entry.predicates] == [("kind", "="), ("ts", ">")]
+        assert entry.order_by == [("events", "ts")]
+
+    def test_join_columns_attributed_to_tables(self):
+        advisor = IndexAdvisor(statistics=create_sample_statistics())
+        entry = advisor.record_query(
+            'SELECT * FROM users INNER JOIN orders ON (users.id = orders.user_id)'
+        )
+
+        columns = {(p["table"], p["column"]) for p in entry.predicates}
+        assert ("users", "id") in columns
+        assert ("orders", "user_id") in columns
+
+    def test_ignores_ddl_and_window_is_bounded(self):
+        advisor = IndexAdvisor(window_size=3)
+        assert advisor.record_query("CREATE TABLE t (a INTEGER)") is None
+        for i in range(10):
+            advisor.record_query(f"SELECT * FROM t WHERE a = {i}")
+        assert len(advisor.workload) == 3
+
+
+class TestRecommendations:
+    """Test cost-based candidate scoring"""
+
+    def test_skips_existing_indexes(self):
+        advisor = IndexAdvisor(statistics=create_sample_statistics())
+        for _ in range(5):
+            advisor.record_query("SELECT * FROM users WHERE status = 'active'")
+            advisor.record_query("SELECT * FROM users WHERE age > 30")
+
+        recommended = [(r.candidate.table_name, r.candidate.column_name) for r in advisor.recommend()]
+        assert ("users", "age") in recommended
+        assert ("users", "status") not in recommended  # idx_users_status already exists
+
+    def test_frequent_predicates_rank_higher(self):
+        advisor = IndexAdvisor(statistics=create_sample_statistics())
+        for _ in range(10):
+            advisor.record_query("SELECT * FROM users WHERE age > 30")
+        advisor.record_query("SELECT * FROM users WHERE name = 'x'")
+
+        recommendations = advisor.recommend()
+        assert recommendations[0].candidate.column_name == "age"
+        assert recommendations[0].expected_speedup > 1.0
+
+    def test_writes_reduce_benefit(self):
+        read_only = IndexAdvisor(statistics=create_sample_statistics())
+        write_heavy = IndexAdvisor(statistics=create_sample_statistics())
+        for advisor in (read_only, write_heavy):
+            for _ in range(5):
+                advisor.record_query("SELECT * FROM users WHERE age > 30")
+        for _ in range(200):
+            write_heavy.record_query("INSERT INTO users (name, age) VALUES ('a', 1)")
+
+        assert write_heavy.recommend()[0].benefit < read_only.recommend()[0].benefit
+
+
+class TestApply:
+    """Test CREATE INDEX materialization"""
+
+    def test_apply_creates_backend_index(self, db_manager):
+        advisor = IndexAdvisor()
+        for i in range(5):
+            advisor.record_query(f"SELECT * FROM events WHERE kind = 'k{i}'")
+
+        recommendation = advisor.recommend()[0]
+        applied = advisor.apply(recommendation, db_manager)
+
+        assert applied.status == "applied"
+        assert applied.observed_speedup is not None
+        indexes = db_manager.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'events'"
+        ).data
+        assert {"name": "idx_saiql_events_kind"} in indexes
+
+        # Applied indexes are no longer recommended
+        assert all(r.candidate.column_name != "kind" for r in advisor.recommend())
+        assert advisor.get_report()["applied"][0]["index_name"] == "idx_saiql_events_kind"
+
+    def test_auto_apply_respects_write_amplification(self, db_manager):
+        advisor = IndexAdvisor(max_write_amplification=2.0)
+        for _ in range(5):
+            advisor.record_query("SELECT * FROM events WHERE kind = 'k1'")
+            advisor.record_query("SELECT * FROM events WHERE ts > 100")
+
+        results = advisor.auto_apply_recommendations(db_manager)
+
+        assert [r.status for r in results].count("applied") == 1
+        assert [r.status for r in results].count("rejected") == 1
+
+    def test_catalog_statistics_change_the_ranking(self, db_manager):
+        db_manager.execute_query("CREATE TABLE tags (id INTEGER PRIMARY KEY, label TEXT)")
+        db_manager.execute_transaction([
+            {"sql": "INSERT INTO tags (label) VALUES (?)", "params": (f"t{i}",)} for i in range(50)
+        ])
+        advisor = IndexAdvisor()
+        for i in range(5):
+            # tags is queried more often, but events is 100x larger
+            advisor.record_query(f"SELECT * FROM tags WHERE label = 't{i}'")
+            advisor.record_query(f"SELECT * FROM tags WHERE label = 't{i + 5}'")
+            advisor.record_query(f"SELECT * FROM events WHERE kind = 'k{i}'")
+
+        # Without statistics every table is assumed to hold DEFAULT_ROW_COUNT rows
+        assert advisor.recommend()[0].candidate.table_name == "tags"
+
+        assert advisor.refresh_statistics(db_manager) == 2
+        assert advisor.statistics["events"].row_count == 5000
+        assert advisor.statistics["tags"].row_count == 50
+        assert advisor.recommend()[0].candidate.table_name == "events"
+
+    def test_engine_feeds_catalog_statistics(self, db_manager, tmp_path):
+        from core.engine import SAIQLEngine
+
+        engine = SAIQLEngine(db_path=str(tmp_path / "advisor.db"))
+        try:
+            engine.index_advisor.record_query("SELECT * FROM events WHERE kind = 'k1'")
+            engine.get_index_advisor_report()
+            assert "events" not in engine.index_advisor.statistics  # plain reads stay read-only
+
+            report = engine.get_index_advisor_report(refresh=True)
+            assert engine.index_advisor.statistics["events"].row_count == 5000
+            assert report["recommendations"][0]["table"] == "events"
+        finally:
+            engine.shutdown()
+
+    def test_ddl_per_backend(self):
+        candidate = IndexCandidate("events", "kind")
+        assert candidate.create_sql("postgresql") == \
+            'CREATE INDEX IF NOT EXISTS "idx_saiql_events_kind" ON "events" ("kind")'
+        assert candidate.create_sql("mysql") == \
+            'CREATE INDEX `idx_saiql_events_kind` ON `events` (`kind`)'
+        with pytest.raises(ValueError):
+            candidate.create_sql("oracle")
+
+    def test_unsupported_backend_is_refused(self, db_manager):
+        advisor = IndexAdvisor()
+        advisor.record_query("SELECT * FROM events WHERE kind = 'k1'")
+        db_manager.config["backends"]["warehouse"] = {"type": "bigquery"}
+        executed = []
+        db_manager.execute_query = lambda sql, backend=None: executed.append(sql)
+
+        result = advisor.apply(advisor.recommend()[0], db_manager, backend="warehouse")
+
+        assert result.status == "failed" and "bigquery" in result.error_message
+        assert executed == []
+
+    def test_apply_failure_is_reported(self, db_manager):
+        advisor = IndexAdvisor()
+        advisor.record_query("SELECT * FROM missing_table WHERE x = 1")
+        recommendation = advisor.recommend()[0]
+
+        result = advisor.apply(recommendation, db_manager, measure=False)
+
+        assert result.status == "failed"
+        assert result.error_message
+        assert IndexCandidate("missing_table", "x").index_name not in advisor.applied
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Concurrency Stress Tests for SAIQL Indexes
+==========================================
+
+Readers run against B-tree and hash indexes while writers insert and
+delete. Verifies that readers never see torn structures, that writes are
+not lost, and that readers are not blocked by an in-progress writer.
+"""
+
+import pytest
+import sys
+import os
+import random
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.btree import BTree
+from core.hash_index import HashIndex
+from core.index_manager import IndexManager, IndexType
+
+
+def _run_threads(targets):
+    threads = [threading.Thread(target=t) for t in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=60)
+    assert not any(t.is_alive() for t in threads)
+
+
+def _check_btree_invariants(tree: BTree):
+    keys = [k for k, _ in tree.traverse()]
+    assert keys == sorted(keys)
+    assert len(keys) == len(set(keys)) == len(tree)
+
+
+class TestBTreeConcurrency:
+    """Copy-on-write B-tree under concurrent readers and writers"""
+
+    def test_concurrent_insert_and_search(self):
+        tree = BTree(order=5)
+        errors = []
+        done = threading.Event()
+        writers = 4
+        per_writer = 1000
+
+        def writer(offset):
+            def run():
+                try:
+                    for i in range(per_writer):
+                        tree.insert(offset * per_writer + i, f"v{offset}-{i}")
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+            return run
+
+        def reader():
+            try:
+                while not done.is_set():
+                    key = random.randrange(writers * per_writer)
+                    result = tree.search(key)
+                    # A key is either absent or fully present - never a torn value
+                    if result is not None:
+                        assert result == [f"v{key // per_writer}-{key % per_writer}"]
+                    snapshot = tree.range_search(100, 200)
+                    assert [k for k, _ in snapshot] == sorted(k for k, _ in snapshot)
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for r in readers:
+            r.start()
+        _run_threads([writer(w) for w in range(writers)])
+        done.set()
+        for r in readers:
+            r.join(timeout=60)
+
+        assert not errors
+        assert len(tree) == writers * per_writer
+        _check_btree_invariants(tree)
+        assert all(tree.search(k) is not None for k in range(writers * per_writer))
+
+    def test_concurrent_delete_keeps_tree_valid(self):
+        tree = BTree(order=4)
+        for i in range(2000):
+            tree.insert(i, i)
+        errors = []
+
+        def deleter(parity):
+            def run():
+                try:
+                    for i in range(parity, 2000, 2):
+                        assert tree.delete(i)
+                except Exception as e:
+                    errors.append(e)
+            return run
+
+        def reader():
+            try:
+                for _ in range(2000):
+                    keys = [k for k, _ in tree.traverse()]
+                    assert keys == sorted(keys)
+            except Exception as e:
+                errors.append(e)
+
+        _run_threads([deleter(0), deleter(1), reader, reader])
+
+        assert not errors
+        assert len(tree) == 0
+        assert list(tree.traverse()) == []
+
+    def test_snapshot_is_isolated_from_later_writes(self):
+        tree = BTree(order=3)
+        for i in range(50):
+            tree.insert(i, i)
+        snapshot = tree.root
+
+        for i in range(50, 100):
+            tree.insert(i, i)
+        tree.insert(10, "dup")
+        tree.delete(20)
+
+        assert tree._search_node(snapshot, 10) == [10]
+        assert tree._search_node(snapshot, 20) == [20]
+        assert tree._search_node(snapshot, 75) is None
+
+    def test_insert_many_is_atomic_for_readers(self):
+        tree = BTree(order=5)
+        tree.insert_many([(i, i) for i in range(500)])
+        snapshot = tree.root
+
+        tree.insert_many([(i, i) for i in range(500, 1000)] + [(0, "dup")])
+
+        assert len(tree) == 1000
+        assert tree.search(0) == [0, "dup"]
+        assert tree._search_node(snapshot, 0) == [0]
+        assert tree._search_node(snapshot, 700) is None
+        _check_btree_invariants(tree)
+
+    def test_readers_not_blocked_by_writer(self):
+        tree = BTree(order=5)
+        for i in range(100):
+            tree.insert(i, i)
+
+        result = []
+        with tree._write_lock:  # Simulate a long-running writer
+            t = threading.Thread(target=lambda: result.append(tree.search(42)))
+            t.start()
+            t.join(timeout=5)
+            assert not t.is_alive()
+        assert result == [[42]]
+
+    def test_failed_insert_leaves_tree_unchanged(self):
+        tree = BTree(order=3)
+        for i in range(20):
+            tree.insert(i, i)
+        root = tree.root
+
+        with pytest.raises(TypeError):
+            tree.insert("not-comparable", 1)
+
+        assert tree.root is root
+        assert len(tree) == 20
+        _check_btree_invariants(tree)
+
+
+class TestHashIndexConcurrency:
+    """Striped hash index under concurrent readers and writers"""
+
+    def test_concurrent_insert_with_resizes(self):
+        index = HashIndex(initial_size=8, stripes=8)
+        errors = []
+        done = threading.Event()
+        writers = 4
+        per_writer = 2000
+
+        def writer(offset):
+            def run():
+                try:
+                    for i in range(per_writer):
+                        index.insert(offset * per_writer + i, i)
+                except Exception as e:
+                    errors.append(e)
+            return run
+
+        def reader():
+            try:
+                while not done.is_set():
+                    key = random.randrange(writers * per_writer)
+                    result = index.search(key)
+                    if result is not None:
+                        assert result == [key % per_writer]
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for r in readers:
+            r.start()
+        _run_threads([writer(w) for w in range(writers)])
+        done.set()
+        for r in readers:
+            r.join(timeout=60)
+
+        assert not errors
+        assert len(index) == writers * per_writer
+        assert index.size > 8  # Resized while readers were running
+        assert all(index.search(k) == [k % per_writer] for k in range(writers * per_writer))
+
+    def test_concurrent_duplicate_values(self):
+        index = HashIndex(initial_size=16)
+
+        def writer(offset):
+            return lambda: [index.insert(i % 10, offset * 1000 + i) for i in range(500)]
+
+        _run_threads([writer(w) for w in range(4)])
+
+        assert len(index) == 10
+        assert sum(len(index.search(k)) for k in range(10)) == 2000
+
+    def test_readers_not_blocked_by_writers(self):
+        index = HashIndex(initial_size=64, stripes=4)
+        for i in range(10):
+            index.insert(i, i)
+
+        result = []
+        for lock in index._stripes:
+            lock.acquire()
+        try:
+            t = threading.Thread(target=lambda: result.append(index.search(3)))
+            t.start()
+            t.join(timeout=5)
+            assert not t.is_alive()
+        finally:
+            for lock in index._stripes:
+                lock.release()
+        assert result == [[3]]
+
+
+class TestIndexManagerConcurrency:
+    """Unique indexes reject duplicates under concurrent inserts"""
+
+    @pytest.mark.parametrize("index_type", [IndexType.BTREE, IndexType.HASH])
+    def test_unique_insert_race(self, index_type):
+        manager = IndexManager()
+        index = manager.create_index("u_email", "users", "email", index_type, is_unique=True)
+        successes = []
+        barrier = threading.Barrier(8)
+
+        def writer(n):
+            def run():
+                barrier.wait()
+                try:
+                    index.insert("same@example.com", n)
+                    successes.append(n)
+                except ValueError:
+                    pass
+            return run
+
+        _run_threads([writer(n) for n in range(8)])
+
+        assert len(successes) == 1
+        assert index.search("same@example.com") == successes
+
+
+class TestReadScaling:
+    """Read throughput must not collapse while a writer is active"""
+
+    def test_read_throughput_under_write_load(self):
+        tree = BTree(order=16)
+        for i in range(20000):
+            tree.insert(i, i)
+
+        def measure_reads(duration=0.3):
+            count = 0
+            end = time.perf_counter() + duration
+            while time.perf_counter() < end:
+                tree.search(random.randrange(20000))
+                count += 1
+            return count
+
+        baseline = measure_reads()
+
+        stop = threading.Event()
+
+        def writer():
+            i = 20000
+            while not stop.is_set():
+                tree.insert(i, i)
+                i += 1
+
+        w = threading.Thread(target=writer)
+        w.start()
+        try:
+            under_load = measure_reads()
+        finally:
+            stop.set()
+            w.join(timeout=10)
+
+        # With the GIL the writer takes CPU share, but readers must keep
+        # making progress rather than queueing behind a lock.
+        assert under_load > baseline * 0.1
+        _check_btree_invariants(tree)
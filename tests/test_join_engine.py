@@ -15,7 +15,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../'
 
 from core.join_engine import (
     HashJoinExecutor, MergeJoinExecutor, NestedLoopJoinExecutor,
-    JoinExecutor, JoinType, JoinAlgorithm
+    JoinExecutor, JoinType, JoinAlgorithm, ColumnarHashJoinExecutor,
+    GraceHashJoinExecutor, ParallelHashJoinExecutor, estimate_rows_memory
 )
 
 
@@ -128,6 +129,156 @@ class TestNestedLoopJoin:
         assert stats.algorithm_used == JoinAlgorithm.NESTED_LOOP
 
 
+class TestColumnarHashJoin:
+    """Test NumPy columnar hash join"""
+
+    LEFT = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"},
+            {"id": None, "name": "Nobody"}, {"id": 4, "name": "Dana"}]
+    RIGHT = [{"user_id": 1, "amount": 100}, {"user_id": 1, "amount": 150},
+             {"user_id": 2, "amount": 200}, {"user_id": None, "amount": 0},
+             {"user_id": 9, "amount": 900}]
+
+    @staticmethod
+    def _normalize(rows):
+        return sorted(repr(sorted(row.items())) for row in rows)
+
+    @pytest.mark.parametrize("join_type", [JoinType.INNER, JoinType.LEFT, JoinType.RIGHT, JoinType.FULL])
+    def test_matches_row_executor(self, join_type):
+        """Columnar output equals HashJoinExecutor output for every join type"""
+        expected, _ = HashJoinExecutor(join_type).execute(self.LEFT, self.RIGHT, "id", "user_id")
+        actual, stats = ColumnarHashJoinExecutor(join_type).execute_rows(self.LEFT, self.RIGHT, "id", "user_id")
+
+        assert self._normalize(actual) == self._normalize(expected)
+        assert stats.algorithm_used == JoinAlgorithm.COLUMNAR_HASH
+
+    def test_null_keys_never_match(self):
+        """NULL keys on both sides produce no matches"""
+        left = {"k": [None, None, 1.0, float("nan")]}
+        right = {"k": [None, 1.0, float("nan")]}
+
+        result, _ = ColumnarHashJoinExecutor(JoinType.INNER).execute(left, right, "k", "k")
+
+        assert result.left_indices.tolist() == [2]
+        assert result.right_indices.tolist() == [1]
+
+    def test_lazy_column_gather(self):
+        """Columns are gathered on demand and NULL-extended rows hold None"""
+        import numpy as np
+        left = {"id": np.array([1, 2, 3]), "score": np.array([0.5, 0.6, 0.7])}
+        right = {"id": np.array([3, 1, 1])}
+
+        result, _ = ColumnarHashJoinExecutor(JoinType.LEFT).execute(left, right, "id", "id")
+
+        assert result.column_names == ["left_id", "left_score", "right_id"]
+        assert result.left_indices.tolist() == [0, 0, 1, 2]
+        assert result.column("right_id").tolist() == [1, 1, None, 3]
+        assert result.column("left_score").dtype == np.float64
+        with pytest.raises(KeyError):
+            result.column("missing")
+
+    def test_mixed_key_types_use_python_equality(self):
+        """Mixed-type keys are not coerced: 1 matches 1.0 but not '1'"""
+        left = {"k": [1, "1", (1,)]}
+        right = {"k": [1.0, "x", (1,)]}
+
+        result, _ = ColumnarHashJoinExecutor().execute(left, right, "k", "k")
+
+        assert list(zip(result.left_indices.tolist(), result.right_indices.tolist())) == [(0, 0), (2, 2)]
+        assert result.column("left_k").tolist() == [1, (1,)]
+
+    def test_empty_inputs(self):
+        """Empty tables join cleanly"""
+        result, stats = ColumnarHashJoinExecutor(JoinType.FULL).execute_rows([], [{"id": 1}], "id", "id")
+
+        assert result == [{"right_id": 1}]
+        assert stats.output_rows == 1
+
+
+class TestGraceHashJoin:
+    """Test partitioned spill-to-disk hash join"""
+
+    LEFT = [{"id": i % 40 if i % 7 else None, "name": f"u{i}"} for i in range(120)]
+    RIGHT = [{"user_id": i % 50, "amount": i} for i in range(90)]
+
+    @staticmethod
+    def _normalize(rows):
+        return sorted(repr(sorted(row.items())) for row in rows)
+
+    @pytest.mark.parametrize("join_type", [JoinType.INNER, JoinType.LEFT, JoinType.RIGHT, JoinType.FULL])
+    def test_matches_in_memory_hash_join(self, join_type, tmp_path):
+        """Partitioned output equals HashJoinExecutor output"""
+        expected, _ = HashJoinExecutor(join_type).execute(self.LEFT, self.RIGHT, "id", "user_id")
+        executor = GraceHashJoinExecutor(join_type, num_partitions=4, spill_dir=str(tmp_path))
+        actual, stats = executor.execute(iter(self.LEFT), iter(self.RIGHT), "id", "user_id")
+
+        assert self._normalize(actual) == self._normalize(expected)
+        assert stats.algorithm_used == JoinAlgorithm.GRACE_HASH
+        assert stats.left_rows == 120 and stats.right_rows == 90
+        assert stats.spilled_bytes > 0
+        assert list(tmp_path.iterdir()) == []  # Spill files cleaned up
+
+    def test_recurses_on_oversized_partitions(self, tmp_path):
+        """Partitions over the budget are re-partitioned, skewed keys still join"""
+        left = [{"k": i % 200} for i in range(400)] + [{"k": -1}] * 50
+        right = [{"k": i % 200} for i in range(200)] + [{"k": -1}] * 3
+        executor = GraceHashJoinExecutor(num_partitions=2, spill_dir=str(tmp_path))
+        executor.max_memory_bytes = 2048
+
+        results, stats = executor.execute(left, right, "k", "k")
+
+        assert len(results) == 400 + 150
+        assert stats.partitions > 2
+
+    def test_condition_receives_left_then_right(self):
+        """Extra join condition is evaluated on (left_row, right_row)"""
+        executor = GraceHashJoinExecutor(num_partitions=3)
+        results, _ = executor.execute(self.LEFT, self.RIGHT, "id", "user_id",
+                                      condition=lambda l, r: r["amount"] > 45)
+
+        assert results and all(row["right_amount"] > 45 for row in results)
+
+
+class TestParallelHashJoin:
+    """Test multi-process partitioned hash join"""
+
+    LEFT = [{"id": i % 30 if i % 9 else None, "name": f"u{i}"} for i in range(100)]
+    RIGHT = [{"user_id": i % 40, "amount": i} for i in range(80)]
+
+    @staticmethod
+    def _normalize(rows):
+        return sorted(repr(sorted(row.items())) for row in rows)
+
+    @pytest.mark.parametrize("join_type", [JoinType.INNER, JoinType.LEFT, JoinType.RIGHT, JoinType.FULL])
+    def test_matches_serial_hash_join(self, join_type):
+        """Worker-process output equals HashJoinExecutor output"""
+        expected, _ = HashJoinExecutor(join_type).execute(self.LEFT, self.RIGHT, "id", "user_id")
+        actual, stats = ParallelHashJoinExecutor(join_type, max_workers=2).execute(
+            self.LEFT, self.RIGHT, "id", "user_id")
+
+        assert self._normalize(actual) == self._normalize(expected)
+        assert stats.algorithm_used == JoinAlgorithm.PARALLEL_HASH
+        assert stats.partitions > 1
+
+    def test_order_is_independent_of_partitioning(self):
+        """Same output order for any worker and partition count"""
+        runs = [
+            ParallelHashJoinExecutor(JoinType.FULL, max_workers=workers, num_partitions=partitions)
+            .execute(self.LEFT, self.RIGHT, "id", "user_id")[0]
+            for workers, partitions in [(1, 1), (1, 7), (2, 3)]
+        ]
+
+        assert runs[0] == runs[1] == runs[2]
+        left_ids = [row["left_name"] for row in runs[0] if "left_name" in row]
+        assert left_ids == sorted(left_ids, key=lambda name: int(name[1:]))
+
+    def test_mixed_numeric_keys_share_partitions(self):
+        """1 and 1.0 hash to the same partition and match"""
+        results, _ = ParallelHashJoinExecutor(num_partitions=5, max_workers=1).execute(
+            [{"k": 1}, {"k": 2}], [{"k": 1.0}, {"k": "2"}], "k", "k")
+
+        assert results == [{"left_k": 1, "right_k": 1.0}]
+
+
 class TestJoinExecutor:
     """Test smart join executor (algorithm selection)"""
     
@@ -154,6 +305,40 @@ class TestJoinExecutor:
         assert stats.algorithm_used == JoinAlgorithm.HASH
         assert len(results) == 2000
 
+    def test_algorithm_selection_over_memory_budget(self):
+        """Build side larger than max_memory_mb selects grace hash join"""
+        left = [{"id": i, "payload": "x" * 1000} for i in range(2000)]
+        right = [{"id": i, "note": "y" * 1000} for i in range(3000)]
+        assert estimate_rows_memory(left) > 1024 * 1024
+
+        executor = JoinExecutor(max_memory_mb=1)
+        results, stats = executor.execute(left, right, "id", "id")
+
+        assert stats.algorithm_used == JoinAlgorithm.GRACE_HASH
+        assert len(results) == 2000
+        assert JoinExecutor()._select_algorithm(left, right) == JoinAlgorithm.HASH
+
+    def test_algorithm_selection_parallel_threshold(self):
+        """Equi-joins above parallel_threshold run in worker processes"""
+        left = [{"id": i} for i in range(300)]
+        right = [{"id": i % 100} for i in range(300)]
+
+        executor = JoinExecutor(parallel_threshold=500, max_workers=2)
+        results, stats = executor.execute(left, right, "id", "id")
+
+        assert stats.algorithm_used == JoinAlgorithm.PARALLEL_HASH
+        assert len(results) == 300
+        assert executor._select_algorithm(left, right, condition=lambda l, r: True) != JoinAlgorithm.PARALLEL_HASH
+        assert JoinExecutor(max_workers=1)._select_algorithm(left * 5000, right) != JoinAlgorithm.PARALLEL_HASH
+
+    def test_algorithm_selection_streamed_input(self):
+        """Iterators without a length are joined with grace hash join"""
+        executor = JoinExecutor()
+        results, stats = executor.execute(iter([{"id": 1}]), iter([{"id": 1}]), "id", "id")
+
+        assert stats.algorithm_used == JoinAlgorithm.GRACE_HASH
+        assert results == [{"left_id": 1, "right_id": 1}]
+
 
 class TestJoinStatistics:
     """Test join statistics collection"""
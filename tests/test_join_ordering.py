@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Join Ordering
+==================================
+
+Tests dynamic-programming join enumeration in QueryOptimizer and the
+SQL / in-process execution of the chosen join tree.
+"""
+
+import itertools
+import sqlite3
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.execution_planner import QueryOptimizer, QueryStatistics, OperationType, JoinType
+from core.statistics_collector import TableStatistics, ColumnStatistics
+
+
+def star_statistics():
+    return {
+        "customers": QueryStatistics("customers", 10000, 5.0, {"id": {"distinct_count": 10000},
+                                                                "region": {"distinct_count": 10}}),
+        "orders": QueryStatistics("orders", 1000000, 500.0, {"id": {"distinct_count": 1000000},
+                                                              "customer_id": {"distinct_count": 10000}}),
+        "items": QueryStatistics("items", 5000000, 900.0, {"order_id": {"distinct_count": 1000000},
+                                                            "product_id": {"distinct_count": 1000}}),
+        "products": QueryStatistics("products", 1000, 1.0, {"id": {"distinct_count": 1000},
+                                                             "category": {"distinct_count": 50}}),
+    }
+
+
+def star_query():
+    return {
+        "operation": "SELECT",
+        "table": "items",
+        "columns": ["*"],
+        "joins": [
+            {"type": "INNER", "table": "orders",
+             "conditions": [{"column": "id", "operator": "=", "value": "items.order_id"}]},
+            {"type": "INNER", "table": "customers",
+             "conditions": [{"column": "id", "operator": "=", "value": "orders.customer_id"},
+                            {"column": "region", "operator": "=", "value": "EU"}]},
+            {"type": "INNER", "table": "products",
+             "conditions": [{"column": "id", "operator": "=", "value": "items.product_id"},
+                            {"column": "category", "operator": "=", "value": "books"}]},
+        ]
+    }
+
+
+def chain_query(tables):
+    return {
+        "operation": "SELECT",
+        "table": tables[0],
+        "joins": [
+            {"type": "INNER", "table": table,
+             "conditions": [{"column": "prev_id", "operator": "=", "value": f"{tables[i]}.id"}]}
+            for i, table in enumerate(tables[1:])
+        ]
+    }
+
+
+def optimizer_for(statistics):
+    optimizer = QueryOptimizer()
+    optimizer.load_statistics(statistics)
+    return optimizer
+
+
+def left_deep_costs(optimizer, leaves, edges):
+    """Cost of every connected left-deep order, for comparison with DP"""
+    costs = []
+    for order in itertools.permutations(leaves):
+        tree = leaves[order[0]]
+        for name in order[1:]:
+            crossing = optimizer._crossing_edges(tree, leaves[name], edges)
+            if not crossing:
+                break
+            tree = optimizer._make_join_node(tree, leaves[name], crossing)
+        else:
+            costs.append(tree.estimated_cost)
+    return costs
+
+
+class TestJoinSizeEstimation:
+    """Test TableStatistics.estimate_join_size with differing column names"""
+
+    def test_other_column(self):
+        users = TableStatistics("users", row_count=1000, columns={"id": ColumnStatistics("id", distinct_count=1000)})
+        orders = TableStatistics("orders", row_count=5000,
+                                 columns={"user_id": ColumnStatistics("user_id", distinct_count=800)})
+
+        assert users.estimate_join_size(orders, "id", "user_id") == 5000
+        assert users.estimate_join_size(orders, "id") == 5000 * 1000 // 1000  # Missing column defaults to 1
+
+
+class TestDynamicProgrammingOrder:
+    """Test DP join enumeration"""
+
+    def test_filters_applied_before_large_joins(self):
+        optimizer = optimizer_for(star_statistics())
+        plan, report = optimizer.optimize_query(star_query())
+
+        join_tree = plan.children[-1]
+        assert join_tree.operation == OperationType.JOIN
+        assert sorted(report["join_order"]) == ["customers", "items", "orders", "products"]
+        # The filtered dimension tables are joined to their fact table first
+        subtrees = [sorted(child.relations) for child in join_tree.children]
+        assert ["items", "products"] in subtrees
+        assert ["customers", "orders"] in subtrees
+        assert plan.estimated_rows == join_tree.estimated_rows
+
+    def test_dp_beats_every_left_deep_order(self):
+        optimizer = optimizer_for(star_statistics())
+        plan = optimizer.build_logical_plan(star_query())
+        joins = [child for child in plan.children if child.operation == OperationType.JOIN]
+        leaves, edges = optimizer._extract_join_graph(plan, joins)
+
+        best = optimizer._dp_join_order(leaves, edges)
+
+        assert best.estimated_cost <= min(left_deep_costs(optimizer, leaves, edges)) + 1e-9
+
+    def test_outer_joins_keep_written_order(self):
+        query = star_query()
+        query["joins"][1]["type"] = "LEFT"
+        optimizer = optimizer_for(star_statistics())
+        plan, report = optimizer.optimize_query(query)
+
+        assert report["join_order"] == []
+        assert [child.table_name for child in plan.children] == ["orders", "customers", "products"]
+
+    def test_single_join_unchanged(self):
+        query = star_query()
+        query["joins"] = query["joins"][:1]
+        plan, report = optimizer_for(star_statistics()).optimize_query(query)
+
+        assert report["join_order"] == []
+        assert plan.children[0].table_name == "orders"
+
+    def test_greedy_fallback_above_limit(self):
+        tables = [f"t{i}" for i in range(14)]
+        statistics = {
+            name: QueryStatistics(name, 100 * (i + 1), 1.0, {"id": {"distinct_count": 100 * (i + 1)}})
+            for i, name in enumerate(tables)
+        }
+        optimizer = optimizer_for(statistics)
+        optimizer.MAX_DP_RELATIONS = 4
+
+        plan, report = optimizer.optimize_query(chain_query(tables))
+
+        assert sorted(report["join_order"]) == sorted(tables)
+        # Chain graph: every join in the tree has a predicate (no cross products)
+        stack = [plan.children[-1]]
+        while stack:
+            node = stack.pop()
+            if node.operation == OperationType.JOIN:
+                assert node.join_type == JoinType.INNER and node.conditions
+                stack.extend(node.children)
+
+
+class TestJoinPlanExecution:
+    """Test feeding the chosen join tree to SQL and JoinExecutor"""
+
+    @pytest.fixture
+    def tables(self):
+        return {
+            "customers": [{"id": i, "region": "EU" if i % 3 == 0 else "US"} for i in range(30)],
+            "orders": [{"id": i, "customer_id": i % 30} for i in range(120)],
+            "items": [{"order_id": i % 120, "product_id": i % 17, "qty": i} for i in range(400)],
+            "products": [{"id": i, "category": "books" if i % 4 == 0 else "toys"} for i in range(17)],
+        }
+
+    def test_sql_matches_in_process_execution(self, tables):
+        optimizer = optimizer_for(star_statistics())
+        plan, _ = optimizer.optimize_query(star_query())
+
+        connection = sqlite3.connect(":memory:")
+        for name, rows in tables.items():
+            columns = list(rows[0])
+            connection.execute(f'CREATE TABLE "{name}" ({", ".join(columns)})')
+            connection.executemany(f'INSERT INTO "{name}" VALUES ({", ".join("?" * len(columns))})',
+                                   [tuple(row.values()) for row in rows])
+        sql = (f'SELECT "items"."qty" FROM {optimizer.build_join_sql(plan)} '
+               f'WHERE "customers"."region" = \'EU\' AND "products"."category" = \'books\'')
+        expected = sorted(row[0] for row in connection.execute(sql))
+
+        rows = optimizer.execute_join_plan(plan, tables)
+
+        assert expected
+        assert sorted(row["items.qty"] for row in rows) == expected
+        assert all(row["customers.region"] == "EU" and row["products.category"] == "books" for row in rows)
+
+    def test_requires_join_tree(self, tables):
+        query = star_query()
+        query["joins"] = query["joins"][:1]
+        optimizer = optimizer_for(star_statistics())
+        plan, _ = optimizer.optimize_query(query)
+
+        with pytest.raises(ValueError):
+            optimizer.execute_join_plan(plan, tables)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the SAIQL Lock Manager
+=====================================
+
+Tests lock compatibility, FIFO granting from per-resource wait queues,
+that releases wake only the waiters they grant, timeouts, that
+release_all_locks only visits the transaction's own resources,
+event-driven deadlock detection with cost-based victims, and intent
+locks, conversion and escalation over the table:page:row hierarchy.
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.transaction_manager import DeadlockDetector, LockManager, LockMode, TransactionManager
+
+
+@pytest.fixture
+def manager():
+    manager = LockManager(num_stripes=8)
+    yield manager
+    manager.deadlock_detector.stop_detection()
+
+
+def start_waiter(manager, resource, mode, tx, order, timeout=10.0):
+    results = {}
+
+    def run():
+        results[tx] = manager.acquire_lock(resource, mode, tx, timeout=timeout)
+        order.append(tx)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, results
+
+
+def wait_queued(manager, resource, count):
+    entry = manager._stripe(resource).resources[resource]
+    deadline = time.time() + 5
+    while len(entry.waiters) < count and time.time() < deadline:
+        time.sleep(0.005)
+    assert len(entry.waiters) == count
+    return entry
+
+
+class TestLockModes:
+    """Test grants that do not need to wait"""
+
+    def test_shared_compatible_exclusive_not(self, manager):
+        assert manager.acquire_lock("r", LockMode.SHARED, "t1")
+        assert manager.acquire_lock("r", LockMode.SHARED, "t2")
+        assert manager.acquire_lock("r", LockMode.SHARED, "t2")
+        assert not manager.acquire_lock("r", LockMode.EXCLUSIVE, "t3", timeout=0.05)
+        assert manager.get_lock_count() == 2
+        assert manager.held_resources("t1") == {"r"}
+
+    def test_release_all_only_held_resources(self, manager):
+        for i in range(100):
+            manager.acquire_lock(f"other:{i}", LockMode.EXCLUSIVE, "busy")
+        manager.acquire_lock("a", LockMode.EXCLUSIVE, "t1")
+        manager.acquire_lock("b", LockMode.SHARED, "t1")
+
+        manager.release_all_locks("t1")
+
+        assert manager.held_resources("t1") == set()
+        # 100 row locks plus the IX intent lock on their table
+        assert manager.get_lock_count() == 101
+        assert set(manager.locks) == {"other"} | {f"other:{i}" for i in range(100)}
+        assert "a" not in manager._stripe("a").resources
+
+
+class TestWaitQueues:
+    """Test FIFO granting and targeted wakeups"""
+
+    def test_fifo_order(self, manager):
+        order = []
+        manager.acquire_lock("r", LockMode.EXCLUSIVE, "holder")
+        threads = []
+        for i in range(5):
+            threads.append(start_waiter(manager, "r", LockMode.EXCLUSIVE, f"w{i}", order)[0])
+            wait_queued(manager, "r", i + 1)
+
+        manager.release_lock("r", "holder")
+        for i in range(5):
+            deadline = time.time() + 5
+            while len(order) <= i and time.time() < deadline:
+                time.sleep(0.005)
+            manager.release_lock("r", f"w{i}")
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == [f"w{i}" for i in range(5)]
+
+    def test_release_grants_compatible_prefix_only(self, manager):
+        order = []
+        manager.acquire_lock("r", LockMode.EXCLUSIVE, "holder")
+        readers = [start_waiter(manager, "r", LockMode.SHARED, f"s{i}", order) for i in range(3)]
+        wait_queued(manager, "r", 3)
+        writer, results = start_waiter(manager, "r", LockMode.EXCLUSIVE, "x", order, timeout=0.5)
+        entry = wait_queued(manager, "r", 4)
+        # A late reader queues behind the writer instead of starving it
+        late, _ = start_waiter(manager, "r", LockMode.SHARED, "late", order)
+        wait_queued(manager, "r", 5)
+
+        manager.release_lock("r", "holder")
+        for thread, _ in readers:
+            thread.join(timeout=5)
+
+        assert sorted(order) == ["s0", "s1", "s2"]
+        assert [request.transaction_id for request in entry.waiters] == ["x", "late"]
+        assert entry.waiters[0].blockers == {"s0", "s1", "s2"}
+
+        writer.join(timeout=5)
+        late.join(timeout=5)
+        assert results["x"] is False and order[-1] == "late"
+
+    def test_targeted_wakeup(self, manager):
+        order = []
+        manager.acquire_lock("a", LockMode.EXCLUSIVE, "holder_a")
+        manager.acquire_lock("b", LockMode.EXCLUSIVE, "holder_b")
+        waiter_a, _ = start_waiter(manager, "a", LockMode.EXCLUSIVE, "wa", order)
+        waiter_b, _ = start_waiter(manager, "b", LockMode.EXCLUSIVE, "wb", order)
+        request_b = wait_queued(manager, "b", 1).waiters[0]
+        wait_queued(manager, "a", 1)
+
+        notified = []
+        original = request_b.condition.notify
+        request_b.condition.notify = lambda *args: (notified.append(True), original(*args))
+        manager.release_lock("a", "holder_a")
+        waiter_a.join(timeout=5)
+
+        assert order == ["wa"] and not notified
+        manager.release_lock("b", "holder_b")
+        waiter_b.join(timeout=5)
+        assert order == ["wa", "wb"] and notified
+
+    def test_queued_requests_wait_on_conflicting_requests_ahead(self, manager):
+        order = []
+        manager.acquire_lock("r", LockMode.SHARED, "reader")
+        manager.acquire_lock("r", LockMode.SHARED, "x2")
+        writer, _ = start_waiter(manager, "r", LockMode.EXCLUSIVE, "x", order, timeout=0.5)
+        wait_queued(manager, "r", 1)
+        # Compatible with the holders, but queued behind the writer
+        late, _ = start_waiter(manager, "r", LockMode.SHARED, "late", order)
+        entry = wait_queued(manager, "r", 2)
+
+        graph = manager.deadlock_detector.wait_for_graph
+        assert graph["x"] == {"reader", "x2"} and graph["late"] == {"x"}
+        assert entry.waiters[1].blockers == {"x"}
+
+        # A conversion jumps the queue; requests behind it now wait on it too
+        converter, _ = start_waiter(manager, "r", LockMode.EXCLUSIVE, "x2", order, timeout=0.2)
+        wait_queued(manager, "r", 3)
+        assert graph["x"] == {"reader", "x2"} and graph["late"] == {"x", "x2"}
+
+        converter.join(timeout=5)
+        writer.join(timeout=5)
+        late.join(timeout=5)
+        assert order == ["x2", "x", "late"]
+        assert dict(graph) == {}
+
+    def test_timeout_unblocks_requests_behind(self, manager):
+        order = []
+        manager.acquire_lock("r", LockMode.SHARED, "reader")
+        writer, results = start_waiter(manager, "r", LockMode.EXCLUSIVE, "x", order, timeout=0.2)
+        wait_queued(manager, "r", 1)
+        reader, _ = start_waiter(manager, "r", LockMode.SHARED, "r2", order)
+
+        writer.join(timeout=5)
+        reader.join(timeout=5)
+
+        assert results["x"] is False and order == ["x", "r2"]
+        assert manager.deadlock_detector.wait_for_graph.get("x", set()) == set()
+
+
+class TestTransactionManagerLocks:
+    """Test lock accounting through the transaction manager"""
+
+    def test_mutual_exclusion_under_contention(self):
+        tm = TransactionManager()
+        counter = {"value": 0, "inside": 0, "overlap": False}
+
+        def worker():
+            for _ in range(50):
+                tx = tm.begin_transaction()
+                if tm.execute_operation(tx, "WRITE", "counter"):
+                    counter["inside"] += 1
+                    counter["overlap"] |= counter["inside"] > 1
+                    counter["value"] += 1
+                    counter["inside"] -= 1
+                    tm.commit_transaction(tx)
+                else:
+                    tm.abort_transaction(tx)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        stats = tm.get_transaction_stats()
+        assert counter["value"] == 400 and not counter["overlap"]
+        assert stats["total_locks"] == 0 and stats["active_transactions"] == 0
+        tm.lock_manager.deadlock_detector.stop_detection()
+
+
+class TestDeadlockDetection:
+    """Test incremental cycle detection and victim selection"""
+
+    def test_cycle_found_from_new_edge(self):
+        detector = DeadlockDetector()
+        assert detector.add_wait_edge("a", "b") is None
+        assert detector.add_wait_edge("b", "c") is None
+        assert detector.add_wait_edge("x", "a") is None
+        assert detector.add_wait_edge("c", "a") == ["c", "a", "b", "c"]
+        assert detector.has_cycle(["c", "a", "b", "c"])
+        assert detector.stats == {"edges_added": 4, "cycles_detected": 1}
+
+        detector.clear_transaction_edges("a")
+        assert not detector.has_cycle(["c", "a", "b", "c"])
+        assert detector.detect_deadlock() is None
+        assert dict(detector.wait_for_graph) == {"b": {"c"}}
+
+    def test_lock_manager_fails_cheapest_waiter(self, manager):
+        order = []
+        manager.acquire_lock("a", LockMode.EXCLUSIVE, "big")
+        manager.acquire_lock("a2", LockMode.EXCLUSIVE, "big")
+        manager.acquire_lock("b", LockMode.EXCLUSIVE, "small")
+        big, big_result = start_waiter(manager, "b", LockMode.EXCLUSIVE, "big", order)
+        wait_queued(manager, "b", 1)
+        small, small_result = start_waiter(manager, "a", LockMode.EXCLUSIVE, "small", order)
+
+        small.join(timeout=2)
+        assert not small.is_alive() and small_result["small"] is False
+        manager.release_all_locks("small")
+        big.join(timeout=2)
+        assert big_result["big"] is True and order == ["small", "big"]
+
+    def test_cycle_through_queue_order(self, manager):
+        order = []
+        manager.acquire_lock("a", LockMode.SHARED, "t1")
+        manager.acquire_lock("b", LockMode.EXCLUSIVE, "t3")
+        t2, t2_result = start_waiter(manager, "a", LockMode.EXCLUSIVE, "t2", order)
+        wait_queued(manager, "a", 1)
+        t1, t1_result = start_waiter(manager, "b", LockMode.EXCLUSIVE, "t1", order)
+        wait_queued(manager, "b", 1)
+
+        # t3's S(a) is compatible with t1's S but queues behind t2's X:
+        # t3 -> t2 -> t1 -> t3 closes only through the queue
+        start = time.perf_counter()
+        t3, t3_result = start_waiter(manager, "a", LockMode.SHARED, "t3", order)
+        t2.join(timeout=2)
+        elapsed = time.perf_counter() - start
+
+        # t2 holds nothing, so it is the victim, well inside the 10s timeout
+        assert not t2.is_alive() and t2_result["t2"] is False and elapsed < 0.5
+        t3.join(timeout=2)
+        assert t3_result["t3"] is True
+        manager.release_all_locks("t3")
+        t1.join(timeout=2)
+        assert t1_result["t1"] is True and order == ["t2", "t3", "t1"]
+        assert manager.deadlock_detector.stats["cycles_detected"] == 1
+
+    def test_transaction_manager_resolves_within_milliseconds(self):
+        tm = TransactionManager()
+        old, young = tm.begin_transaction(), tm.begin_transaction()
+        assert tm.execute_operation(old, "WRITE", "x")
+        assert tm.execute_operation(old, "WRITE", "x2")
+        assert tm.execute_operation(young, "WRITE", "y")
+        results = {}
+
+        def run(tx, resource):
+            results[tx] = tm.execute_operation(tx, "WRITE", resource)
+            results[tx + ":at"] = time.perf_counter()
+
+        blocked = threading.Thread(target=run, args=(old, "y"))
+        blocked.start()
+        wait_queued(tm.lock_manager, "y", 1)
+        start = time.perf_counter()
+        run(young, "x")
+        blocked.join(timeout=5)
+
+        # The younger transaction did less work, so it is the victim
+        assert results[young] is False and results[old] is True
+        assert results[young + ":at"] - start < 0.5
+        assert tm.get_transaction_stats()["deadlocks_detected"] == 1
+        assert tm.commit_transaction(old)
+        assert tm.lock_manager.get_lock_count() == 0
+        tm.lock_manager.deadlock_detector.stop_detection()
+
+
+class TestHierarchicalLocks:
+    """Test intent locks, conversion and escalation"""
+
+    def test_intent_locks_on_ancestors(self, manager):
+        assert manager.acquire_lock("t:p1:r1", LockMode.EXCLUSIVE, "t1")
+        assert manager.held_mode("t", "t1") == LockMode.INTENT_EXCLUSIVE
+        assert manager.held_mode("t:p1", "t1") == LockMode.INTENT_EXCLUSIVE
+        assert manager.acquire_lock("t:p1:r2", LockMode.EXCLUSIVE, "t2")
+        assert manager.acquire_lock("t:p2:r1", LockMode.SHARED, "t3")
+        assert manager.held_mode("t", "t3") == LockMode.INTENT_SHARED
+
+        # Table-level S conflicts with the writers' IX; row S only with its row's X
+        assert not manager.acquire_lock("t", LockMode.SHARED, "t4", timeout=0.05)
+        assert not manager.acquire_lock("t:p1:r1", LockMode.SHARED, "t4", timeout=0.05)
+        assert manager.acquire_lock("t:p1:r3", LockMode.SHARED, "t4")
+
+    def test_ancestor_lock_covers_descendants(self, manager):
+        assert manager.acquire_lock("t", LockMode.SHARED, "t1")
+        assert manager.acquire_lock("t:p1:r1", LockMode.SHARED, "t1")
+        assert manager.get_lock_count() == 1
+
+        # Writing a row under a table S lock converts the table lock to SIX
+        assert manager.acquire_lock("t:p1:r1", LockMode.EXCLUSIVE, "t1")
+        assert manager.held_mode("t", "t1") == LockMode.SHARED_INTENT_EXCLUSIVE
+        assert manager.held_mode("t:p1:r1", "t1") == LockMode.EXCLUSIVE
+        assert manager.acquire_lock("t:p2:r9", LockMode.SHARED, "t1")
+        assert manager.held_mode("t:p2:r9", "t1") is None
+
+    def test_conversion_in_place(self, manager):
+        order = []
+        assert manager.acquire_lock("r", LockMode.SHARED, "t1")
+        assert manager.acquire_lock("r", LockMode.SHARED, "t2")
+        waiter, _ = start_waiter(manager, "r", LockMode.EXCLUSIVE, "t3", order)
+        wait_queued(manager, "r", 1)
+        converter, results = start_waiter(manager, "r", LockMode.EXCLUSIVE, "t1", order)
+        entry = wait_queued(manager, "r", 2)
+
+        # The conversion waits for the other reader, ahead of the queued writer
+        assert [request.transaction_id for request in entry.waiters] == ["t1", "t3"]
+        manager.release_all_locks("t2")
+        converter.join(timeout=5)
+        assert results["t1"] is True and order == ["t1"]
+        assert [(lock.transaction_id, lock.mode) for lock in entry.granted] == [("t1", LockMode.EXCLUSIVE)]
+        assert manager.stats["conversions"] == 1
+
+        manager.release_all_locks("t1")
+        waiter.join(timeout=5)
+        assert order == ["t1", "t3"]
+
+    def test_escalation_bounds_bulk_transactions(self):
+        manager = LockManager(escalation_threshold=1000)
+        start = time.perf_counter()
+        for i in range(100_000):
+            assert manager.acquire_lock(f"orders:p{i // 100}:r{i}", LockMode.EXCLUSIVE, "bulk")
+        elapsed = time.perf_counter() - start
+
+        assert manager.stats["escalations"] == 1
+        assert manager.locks == {"orders": manager.locks["orders"]}
+        assert manager.held_mode("orders", "bulk") == LockMode.EXCLUSIVE
+        assert manager.held_resources("bulk") == {"orders"}
+        assert elapsed < 10
+        manager.release_all_locks("bulk")
+        assert manager.get_lock_count() == 0
+        manager.deadlock_detector.stop_detection()
+
+    def test_escalation_only_without_waiting(self):
+        manager = LockManager(escalation_threshold=10)
+        assert manager.acquire_lock("t:r999", LockMode.SHARED, "reader")
+        for i in range(25):
+            assert manager.acquire_lock(f"t:r{i}", LockMode.SHARED, "scan")
+        assert manager.acquire_lock("u:r1", LockMode.EXCLUSIVE, "writer")
+        for i in range(11):
+            assert manager.acquire_lock(f"u:r{i + 2}", LockMode.SHARED, "scan")
+
+        # "reader" only holds IS on t, compatible with S, so t escalates;
+        # "writer" holds IX on u, so u does not
+        assert manager.held_mode("t", "scan") == LockMode.SHARED
+        assert manager.held_mode("u", "scan") == LockMode.INTENT_SHARED
+        assert manager.stats["escalations"] == 1
+        assert len(manager.held_resources("scan")) == 1 + 1 + 11
+        manager.deadlock_detector.stop_detection()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
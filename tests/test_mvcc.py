@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL MVCC
+=========================
+
+Tests version chains and garbage collection, lock-free snapshot reads in
+TransactionManager at each isolation level, first-updater-wins write
+conflicts, SSI detection of write skew, and that readers are not stalled
+by a long-running writer.
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.mvcc import SerializableConflictTracker, TimestampOracle, VersionStore
+from core.transaction_manager import IsolationLevel, TransactionManager
+
+RC = IsolationLevel.READ_COMMITTED
+RR = IsolationLevel.REPEATABLE_READ
+SER = IsolationLevel.SERIALIZABLE
+
+
+@pytest.fixture
+def tm():
+    tm = TransactionManager(version_gc_interval=0)
+    yield tm
+    tm.lock_manager.deadlock_detector.stop_detection()
+
+
+def commit_write(tm, resource, value, operation="WRITE"):
+    tx = tm.begin_transaction()
+    assert tm.execute_operation(tx, operation, resource, value)
+    assert tm.commit_transaction(tx)
+
+
+class TestVersionStore:
+    """Test version chains, the oracle and garbage collection"""
+
+    def test_reads_at_snapshot(self):
+        store, oracle = VersionStore(), TimestampOracle()
+        for value in ("a", "b", "c"):
+            ts = oracle.allocate()
+            store.install({"r": (value, False)}, ts, "tx")
+            oracle.publish(ts)
+        store.install({"r": (None, True)}, oracle.allocate(), "tx")
+
+        assert [store.read("r", ts) for ts in range(5)] == [None, "a", "b", "c", None]
+        assert store.read("missing", 3, default=0) == 0
+        assert oracle.current() == 3 and store.latest_ts("r") == 4
+
+    def test_collect(self):
+        store = VersionStore()
+        for ts in range(1, 6):
+            store.install({"r": (ts, False), "gone": (ts, ts == 5)}, ts, "tx")
+
+        assert store.collect(watermark=3) == 4
+        assert [store.read("r", ts) for ts in (3, 4, 5)] == [3, 4, 5]
+        assert store.collect(watermark=5) == 2 + 3
+        assert store.get_statistics() == {"version_chains": 1, "versions": 1}
+
+
+class TestSnapshotReads:
+    """Test isolation levels over versioned resources"""
+
+    def test_read_committed_and_repeatable_read(self, tm):
+        commit_write(tm, "acct:1", 100)
+        rc, rr = tm.begin_transaction(RC), tm.begin_transaction(RR)
+        assert tm.read(rc, "acct:1") == tm.read(rr, "acct:1") == 100
+
+        commit_write(tm, "acct:1", 50)
+
+        assert tm.read(rc, "acct:1") == 50
+        assert tm.read(rr, "acct:1") == 100
+        assert tm.commit_transaction(rc) and tm.commit_transaction(rr)
+
+    def test_uncommitted_writes_visible_only_to_writer(self, tm):
+        commit_write(tm, "k", "old")
+        writer, reader = tm.begin_transaction(), tm.begin_transaction(IsolationLevel.READ_UNCOMMITTED)
+        assert tm.execute_operation(writer, "WRITE", "k", "new")
+        assert tm.read(writer, "k") == "new" and tm.read(reader, "k") == "old"
+        assert tm.execute_operation(writer, "DELETE", "k")
+        assert tm.read(writer, "k", default="none") == "none"
+
+        assert tm.abort_transaction(writer)
+        tx = tm.begin_transaction()
+        assert tm.read(tx, "k") == "old"
+
+    def test_reads_take_no_locks(self, tm):
+        commit_write(tm, "k", 1)
+        tx = tm.begin_transaction(SER)
+        for _ in range(10):
+            assert tm.execute_operation(tx, "READ", "k")
+        assert tm.lock_manager.held_resources(tx) == set()
+        assert tm.commit_transaction(tx)
+
+
+class TestWriteConflicts:
+    """Test first-updater-wins and serializable snapshot isolation"""
+
+    def test_first_updater_wins(self, tm):
+        commit_write(tm, "k", 1)
+        rr, rc = tm.begin_transaction(RR), tm.begin_transaction(RC)
+        commit_write(tm, "k", 2)
+
+        # rr's snapshot predates the committed write; updating would lose it
+        assert not tm.execute_operation(rr, "WRITE", "k", 3)
+        assert rr not in tm.active_transactions
+        assert tm.execute_operation(rc, "WRITE", "k", 3) and tm.commit_transaction(rc)
+
+    def write_skew(self, tm, isolation):
+        """Two on-call doctors each go off call if the other is still on"""
+        commit_write(tm, "oncall:alice", True)
+        commit_write(tm, "oncall:bob", True)
+        t1, t2 = tm.begin_transaction(isolation), tm.begin_transaction(isolation)
+        outcomes = []
+        for tx, me in ((t1, "alice"), (t2, "bob")):
+            on_call = [tm.read(tx, f"oncall:{name}") for name in ("alice", "bob")]
+            assert on_call == [True, True]
+            outcomes.append(tm.execute_operation(tx, "WRITE", f"oncall:{me}", False))
+        outcomes += [tm.commit_transaction(t1), tm.commit_transaction(t2)]
+        check = tm.begin_transaction()
+        return outcomes, [tm.read(check, f"oncall:{name}") for name in ("alice", "bob")]
+
+    def test_snapshot_isolation_allows_write_skew(self, tm):
+        outcomes, state = self.write_skew(tm, RR)
+        assert all(outcomes) and state == [False, False]
+
+    def test_serializable_prevents_write_skew(self, tm):
+        outcomes, state = self.write_skew(tm, SER)
+        assert outcomes.count(False) == 1 and True in state
+
+    def test_serializable_disjoint_transactions_commit(self, tm):
+        t1, t2 = tm.begin_transaction(SER), tm.begin_transaction(SER)
+        tm.read(t1, "a")
+        tm.read(t2, "b")
+        assert tm.execute_operation(t1, "WRITE", "a", 1)
+        assert tm.execute_operation(t2, "WRITE", "b", 2)
+        assert tm.commit_transaction(t1) and tm.commit_transaction(t2)
+
+    def test_committed_pivot_aborts_the_closing_transaction(self):
+        ssi = SerializableConflictTracker()
+        for tx in ("t1", "t2", "t3"):
+            ssi.begin(tx, snapshot_ts=0)
+        # t2 -> t3 (t2 read y, t3 writes y), then t2 commits
+        assert ssi.record_read("t2", "y") and ssi.record_write("t3", "y")
+        assert ssi.record_write("t2", "x") and ssi.can_commit("t2")
+        ssi.commit("t2", 1)
+        # t1 reading x (written by t2) makes committed t2 a pivot
+        assert not ssi.record_read("t1", "x")
+        ssi.abort("t1")
+        ssi.commit("t3", 2)
+        assert ssi.prune(watermark=2) == 2 and len(ssi) == 0
+
+
+class TestGarbageCollection:
+    """Test that old versions are reclaimed but never under an active snapshot"""
+
+    def test_collection_respects_active_snapshots(self, tm):
+        commit_write(tm, "k", 0)
+        reader = tm.begin_transaction(RR)
+        for i in range(1, 50):
+            commit_write(tm, "k", i)
+
+        tm.collect_garbage()
+        assert tm.read(reader, "k") == 0
+        assert tm.get_transaction_stats()["versions"] == 50
+
+        tm.commit_transaction(reader)
+        tm.collect_garbage()
+        assert tm.get_transaction_stats()["versions"] == 1
+
+    def test_automatic_collection(self):
+        tm = TransactionManager(version_gc_interval=10)
+        for i in range(100):
+            commit_write(tm, "k", i)
+        assert tm.get_transaction_stats()["versions"] <= 10
+        tm.lock_manager.deadlock_detector.stop_detection()
+
+
+class TestReadersAndWriters:
+    """Test that read-heavy work does not stall behind a long writer"""
+
+    def test_readers_do_not_wait_for_writer(self, tm):
+        for i in range(20):
+            commit_write(tm, f"item:{i}", i)
+        writer = tm.begin_transaction()
+        for i in range(20):
+            assert tm.execute_operation(writer, "WRITE", f"item:{i}", -i)
+
+        reads = []
+
+        def reader():
+            for _ in range(50):
+                tx = tm.begin_transaction(RR)
+                reads.append(sum(tm.read(tx, f"item:{i}") for i in range(20)))
+                tm.commit_transaction(tx)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        elapsed = time.perf_counter() - start
+
+        # The writer still holds its exclusive locks
+        assert len(reads) == 200 and set(reads) == {sum(range(20))}
+        assert elapsed < 5
+        assert tm.commit_transaction(writer)
+        tx = tm.begin_transaction()
+        assert tm.read(tx, "item:3") == -3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for MySQL/MariaDB Streaming and Bulk Load
+====================================================
+
+Tests MySQLAdapter.iter_data over an unbuffered SSCursor, bulk_load via
+LOAD DATA LOCAL INFILE and via multi-row INSERTs packed to
+max_allowed_packet, and that DBMigrator bulk loads MySQL and MariaDB
+targets. The server is played by a fake PyMySQL connection.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+pymysql = pytest.importorskip("pymysql")
+import pymysql.converters
+
+from extensions.plugins.mysql_adapter import ConnectionConfig, MySQLAdapter, INSERT_PACKET_HEADROOM
+import tools.db_migrator as db_migrator
+
+
+class FakeCursor:
+    def __init__(self, server, cursor_class):
+        self.server = server
+        self.cursor_class = cursor_class
+        self.rows = []
+        self.rowcount = -1
+        self.fetch_sizes = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql, args=None):
+        self.server.statements.append(sql)
+        if '@@GLOBAL.local_infile' in sql:
+            self.server.probes += 1
+            self.rows = [{'local_infile': self.server.local_infile}]
+        elif '@@max_allowed_packet' in sql:
+            self.rows = [{'max_allowed_packet': self.server.max_allowed_packet}]
+        elif sql.startswith('INSERT'):
+            if self.server.fail_inserts:
+                raise pymysql.err.IntegrityError(1062, "Duplicate entry")
+            self.rowcount = sql.count('), (') + 1
+        elif sql.startswith('LOAD DATA'):
+            with open(args[0], 'rb') as f:
+                self.server.loaded_files.append((args[0], f.read()))
+            self.rowcount = self.server.loaded_files[-1][1].count(b'\n')
+        elif sql.startswith('SELECT'):
+            self.server.cursor_classes.append(self.cursor_class)
+            self.rows = list(self.server.table)
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+        self.server.closed_cursors += 1
+
+
+class FakeServer:
+    """PyMySQL connection stand-in recording what reaches the server"""
+
+    def __init__(self, table=(), local_infile=0, max_allowed_packet=64 * 1024 * 1024):
+        self.table = list(table)
+        self.local_infile = local_infile
+        self.max_allowed_packet = max_allowed_packet
+        self.statements = []
+        self.loaded_files = []
+        self.cursor_classes = []
+        self.probes = 0
+        self.closed_cursors = 0
+        self.commits = self.rollbacks = 0
+        self.fail_inserts = False
+        self.open = True
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self, cursor_class)
+
+    def literal(self, value):
+        if isinstance(value, bytes):
+            return "X'" + value.hex() + "'"
+        return pymysql.converters.escape_item(value, 'utf8mb4')
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def ping(self, reconnect=True):
+        pass
+
+    @property
+    def inserts(self):
+        return [sql for sql in self.statements if sql.startswith('INSERT')]
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+        self.checked_out = 0
+
+    def get_connection(self, timeout=30):
+        self.checked_out += 1
+        return self.connection
+
+    def return_connection(self, connection):
+        self.checked_out -= 1
+
+
+def make_adapter(server, local_infile=False):
+    """MySQLAdapter wired to a fake pool (no server needed)"""
+    adapter = MySQLAdapter.__new__(MySQLAdapter)
+    adapter.config = ConnectionConfig(local_infile=local_infile)
+    adapter.pool = FakePool(server)
+    adapter._local_infile = None
+    adapter.stats = {'queries_executed': 0, 'failed_queries': 0}
+    return adapter
+
+
+class TestIterData:
+    """Test unbuffered streaming extraction"""
+
+    def test_batches_from_sscursor(self):
+        server = FakeServer([{'id': i} for i in range(25)])
+        adapter = make_adapter(server)
+        batches = list(adapter.iter_data('people', order_by=['id'], batch_size=10))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert server.cursor_classes == [pymysql.cursors.SSDictCursor]
+        assert server.statements == ['SELECT * FROM `people` ORDER BY `id`']
+        assert server.closed_cursors == 1 and server.rollbacks == 1
+        assert adapter.pool.checked_out == 0
+
+    def test_early_close_releases_connection(self):
+        server = FakeServer([{'id': i} for i in range(100)])
+        adapter = make_adapter(server)
+        stream = adapter.iter_data('people', order_by=['id'], batch_size=10)
+        next(stream)
+        stream.close()
+        assert server.closed_cursors == 1 and adapter.pool.checked_out == 0
+
+
+class TestPackedInsert:
+    """Test multi-row INSERTs bounded by max_allowed_packet"""
+
+    def test_statements_fit_the_packet(self):
+        packet = INSERT_PACKET_HEADROOM + 2000
+        server = FakeServer(max_allowed_packet=packet)
+        adapter = make_adapter(server)
+        rows = [(i, f"name {i}", None) for i in range(500)]
+        result = adapter.bulk_load('people', rows, ['id', 'name', 'note'])
+
+        assert result['success'] and result['method'] == 'insert' and result['rows_affected'] == 500
+        assert len(server.inserts) > 5
+        assert all(len(sql.encode('utf-8')) <= 2000 for sql in server.inserts)
+        assert server.inserts[0].startswith("INSERT INTO `people` (`id`, `name`, `note`) VALUES (0, 'name 0', NULL), ")
+        assert server.commits == 1
+
+    def test_value_adaptation(self):
+        server = FakeServer()
+        adapter = make_adapter(server)
+        stamp = datetime(2024, 1, 2, 5, 0, tzinfo=timezone(timedelta(hours=2)))
+        rows = [{'flag': 'true', 'doc': {'a': 1}, 'at': stamp, 'raw': b'\x00\x01'},
+                {'flag': False, 'doc': None, 'at': None, 'raw': memoryview(b'z')}]
+        result = adapter.bulk_load('t', rows, ['flag', 'doc', 'at', 'raw'],
+                                   ['TINYINT(1)', 'JSON', 'DATETIME', 'LONGBLOB'])
+
+        assert result['success']
+        [sql] = server.inserts
+        assert sql.endswith("VALUES (1, '{\\\"a\\\": 1}', '2024-01-02 03:00:00', X'0001'), "
+                            "(0, NULL, NULL, X'7a')")
+
+    def test_failure_rolls_back(self):
+        server = FakeServer()
+        server.fail_inserts = True
+        result = make_adapter(server).bulk_load('t', [(1,)], ['id'])
+        assert not result['success'] and 'Duplicate entry' in result['error']
+        assert server.rollbacks == 1 and server.commits == 0
+
+
+class TestLoadDataLocal:
+    """Test LOAD DATA LOCAL INFILE when client and server allow it"""
+
+    def test_load_data_spools_escaped_rows(self):
+        server = FakeServer(local_infile=1)
+        adapter = make_adapter(server, local_infile=True)
+        rows = [(1, 'tab\there', None, b'\x00\\'), (2, 'line\nbreak', '', True)]
+        result = adapter.bulk_load('My`Table', rows, ['id', 'name', 'note', 'payload'])
+
+        assert result['success'] and result['method'] == 'load_data' and result['rows_affected'] == 2
+        [(path, contents)] = server.loaded_files
+        assert contents == (b'1\ttab\\there\t\\N\t\\0\\\\\n'
+                            b'2\tline\\nbreak\t\t1\n')
+        assert not os.path.exists(path)
+        [load] = [sql for sql in server.statements if sql.startswith('LOAD DATA')]
+        assert "INTO TABLE `My``Table` CHARACTER SET binary" in load
+        assert "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'" in load
+        assert load.endswith("(`id`, `name`, `note`, `payload`)")
+
+    @pytest.mark.parametrize("server_setting", [0, 'OFF'])
+    def test_server_disabled_falls_back_to_insert(self, server_setting):
+        server = FakeServer(local_infile=server_setting)
+        adapter = make_adapter(server, local_infile=True)
+        for _ in range(2):
+            assert adapter.bulk_load('t', [(1,), (2,)], ['id'])['method'] == 'insert'
+        # The server setting is probed once per adapter
+        assert server.probes == 1 and not server.loaded_files
+
+    def test_client_disabled_never_probes(self):
+        server = FakeServer(local_infile=1)
+        assert make_adapter(server).bulk_load('t', [(1,)], ['id'])['method'] == 'insert'
+        assert server.probes == 0
+
+
+class FakeDatabaseManager:
+    def __init__(self, config=None):
+        self.config = config
+        self.adapters = {}
+
+
+class TestMigratorBulkLoad:
+    """Test that DBMigrator bulk loads MySQL and MariaDB targets"""
+
+    SCHEMA = {
+        'columns': [{'name': 'id', 'type': 'INT', 'nullable': False},
+                    {'name': 'active', 'type': 'TINYINT(1)', 'nullable': True}],
+        'pk': ['id'], 'fks': []
+    }
+
+    @pytest.mark.parametrize("scheme", ["mysql+pymysql", "mariadb"])
+    def test_mysql_family_target(self, tmp_path, monkeypatch, scheme):
+        import sqlite3
+
+        source = tmp_path / "source.db"
+        with sqlite3.connect(source) as conn:
+            conn.execute("CREATE TABLE flags (id INTEGER PRIMARY KEY, active BOOLEAN)")
+            conn.executemany("INSERT INTO flags VALUES (?, ?)", [(i, i % 2) for i in range(25000)])
+
+        monkeypatch.setattr(db_migrator, "DatabaseManager", FakeDatabaseManager)
+        migrator = db_migrator.DBMigrator(f"sqlite:///{source}", target_url=f"{scheme}://u:p@db/target",
+                                          checkpoint_file=str(tmp_path / "state.json"),
+                                          mysql_local_infile=True)
+        assert migrator.target_config['type'] == 'mysql' and migrator.target_config['local_infile']
+
+        server = FakeServer(local_infile='ON')
+        migrator.db_manager.adapters['target'] = type('Wrapper', (), {
+            'adapter': make_adapter(server, local_infile=True)})()
+        migrator.source_conn = sqlite3.connect(source)
+        migrator.migrate_data('flags', self.SCHEMA)
+
+        assert len(server.loaded_files) == 3 and server.commits == 3
+        lines = b''.join(contents for _, contents in server.loaded_files).splitlines()
+        assert len(lines) == 25000 and lines[:2] == [b'0\t0', b'1\t1']
+
+
+    @pytest.mark.parametrize("url, option, enabled", [
+        ("mysql://u:p@db/target", False, False),
+        ("mariadb://u:p@db/target?local_infile=1", False, True),
+        ("mysql://u:p@db/target?local_infile=off", False, False),
+        ("mysql://u:p@db/target", True, True),
+    ])
+    def test_local_infile_is_opt_in(self, tmp_path, monkeypatch, url, option, enabled):
+        monkeypatch.setattr(db_migrator, "DatabaseManager", FakeDatabaseManager)
+        migrator = db_migrator.DBMigrator("sqlite:///source.db", target_url=url,
+                                          checkpoint_file=str(tmp_path / "state.json"),
+                                          mysql_local_infile=option)
+        assert migrator.target_config['local_infile'] is enabled
+        assert migrator.target_config['database'] == 'target'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for PostgreSQL COPY Bulk Load and Unload
+===================================================
+
+Tests the COPY text codec and TypeRegistry-driven value adaptation,
+that copy_in/copy_out stream through bounded buffers, and that DBMigrator
+switches to COPY when the source or target is PostgreSQL. The server side
+of COPY is played by fake connections.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from extensions.plugins.postgresql_adapter import (
+    ConnectionConfig, PostgreSQLAdapter, copy_in_rows, copy_out_rows
+)
+from tools.db_migrator import DBMigrator
+
+
+class QueryCanceled(Exception):
+    pass
+
+
+class FakeCopyCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def copy_expert(self, sql, file, size=8192):
+        self.connection.statements.append(sql)
+        if self.connection.error is not None:
+            raise self.connection.error
+        if 'FROM STDIN' in sql:
+            while True:
+                data = file.read(size)
+                if not data:
+                    break
+                self.connection.read_sizes.append(len(data))
+                self.connection.received.append(data)
+                if self.connection.probe is not None:
+                    self.connection.probes.append(self.connection.probe())
+        else:
+            output = self.connection.output
+            for i in range(0, len(output), self.connection.chunk_size):
+                if self.connection.cancelled:
+                    raise QueryCanceled("canceling statement due to user request")
+                file.write(output[i:i + self.connection.chunk_size])
+                self.connection.chunks_written += 1
+
+
+class FakeCopyConnection:
+    """Connection that accepts COPY FROM and serves `output` for COPY TO"""
+
+    def __init__(self, output=b'', chunk_size=64):
+        self.output = output
+        self.chunk_size = chunk_size
+        self.statements = []
+        self.received = []
+        self.read_sizes = []
+        self.chunks_written = 0
+        self.cancelled = False
+        self.error = None
+        self.probe = None
+        self.probes = []
+        self.commits = self.rollbacks = 0
+        self.autocommit = True
+
+    def cursor(self, name=None, cursor_factory=None):
+        return FakeCopyCursor(self)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    @property
+    def text(self):
+        return b''.join(self.received).decode('utf-8')
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get_connection(self, timeout=30):
+        return self.connection
+
+    def return_connection(self, connection):
+        pass
+
+
+def make_adapter(connection):
+    """PostgreSQLAdapter wired to a fake pool (no server needed)"""
+    adapter = PostgreSQLAdapter.__new__(PostgreSQLAdapter)
+    adapter.config = ConnectionConfig()
+    adapter.pool = FakePool(connection)
+    adapter._pool_lock = threading.RLock()
+    adapter.stats = {'queries_executed': 0, 'failed_queries': 0}
+    return adapter
+
+
+def copy_text(rows):
+    """What COPY TO STDOUT would send for rows of already-formatted fields"""
+    return ''.join('\t'.join(row) + '\n' for row in rows).encode('utf-8')
+
+
+class TestCopyCodec:
+    """Test text-format encoding and decoding"""
+
+    def test_copy_in_encoding(self):
+        connection = FakeCopyConnection()
+        rows = [
+            (1, 'tab\there', None, True, b'\x00\xff', {'k': [1]}, date(2024, 1, 2)),
+            (2, 'line\nbreak \\ slash', '', 0, None, None, None),
+        ]
+        columns = ['id', 'name', 'note', 'active', 'blob', 'doc', 'day']
+        types = ['integer', 'text', 'text', 'boolean', 'bytea', 'jsonb', 'date']
+        assert copy_in_rows(connection, 'My "Table"', rows, columns, types) == 2
+
+        assert connection.statements == [
+            'COPY "My ""Table""" ("id", "name", "note", "active", "blob", "doc", "day") FROM STDIN']
+        assert connection.text.split('\n') == [
+            '1\ttab\\there\t\\N\tt\t\\\\x00ff\t{"k": [1]}\t2024-01-02',
+            '2\tline\\nbreak \\\\ slash\t\tf\t\\N\t\\N\t\\N',
+            '',
+        ]
+
+    def test_copy_out_decoding(self):
+        output = copy_text([
+            ('1', 'tab\\there', '\\N', 't', '\\\\x00ff', '{"k": [1]}', '2024-01-02',
+             '2024-01-02 03:04:05+00', '12.50', 'infinity'),
+            ('2', '', '\\N', 'f', '\\N', '\\N', '\\N', '\\N', '\\N', '\\N'),
+        ])
+        types = ['integer', 'text', 'text', 'boolean', 'bytea', 'jsonb', 'date',
+                 'timestamp with time zone', 'numeric(10,2)', 'date']
+        [batch] = copy_out_rows(FakeCopyConnection(output), 'SELECT 1', types)
+
+        first, second = batch
+        assert first[:7] == (1, 'tab\there', None, True, b'\x00\xff', {'k': [1]}, date(2024, 1, 2))
+        assert first[7] == datetime.fromisoformat('2024-01-02 03:04:05+00:00')
+        assert first[8] == Decimal('12.50') and first[9] == 'infinity'
+        assert second == (2, '', None, False, None, None, None, None, None, None)
+
+    def test_round_trip_without_types(self):
+        rows = [(str(i), f'v\t{i}\n', None) for i in range(5)]
+        sink = FakeCopyConnection()
+        copy_in_rows(sink, 't', rows, ['a', 'b', 'c'])
+        [batch] = copy_out_rows(FakeCopyConnection(b''.join(sink.received), chunk_size=7), 'SELECT 1')
+        assert batch == rows
+
+
+class TestBoundedStreaming:
+    """Test that neither direction materializes the whole table"""
+
+    def test_copy_in_pulls_rows_lazily(self):
+        produced = []
+
+        def rows():
+            for i in range(10000):
+                produced.append(i)
+                yield (i, 'x' * 20)
+
+        connection = FakeCopyConnection()
+        connection.probe = lambda: len(produced)
+        copy_in_rows(connection, 't', rows(), ['id', 'pad'], read_size=1024)
+
+        assert max(connection.read_sizes) <= 1024 and len(connection.read_sizes) > 100
+        assert len(connection.text.splitlines()) == 10000
+        # Each read encoded only about one read's worth of new rows
+        assert connection.probes[0] < 50
+        assert max(b - a for a, b in zip(connection.probes, connection.probes[1:])) < 50
+
+    def test_copy_out_batches_and_backpressure(self):
+        output = copy_text([(str(i), f'name {i}') for i in range(1000)])
+        connection = FakeCopyConnection(output, chunk_size=100)
+        stream = copy_out_rows(connection, 'SELECT * FROM t', ['integer', 'text'],
+                               batch_size=64, max_chunks=4)
+
+        first = next(stream)
+        assert len(first) == 64 and first[0] == (0, 'name 0')
+        # The producer stalls once the queue is full instead of reading ahead
+        written = connection.chunks_written
+        assert written < len(output) // 100
+
+        rest = [row for batch in stream for row in batch]
+        assert len(first) + len(rest) == 1000 and rest[-1] == (999, 'name 999')
+        assert not connection.cancelled
+
+    def test_early_close_cancels_copy(self):
+        output = copy_text([(str(i),) for i in range(5000)])
+        connection = FakeCopyConnection(output, chunk_size=50)
+        stream = copy_out_rows(connection, 'SELECT id FROM t', batch_size=10, max_chunks=2)
+        assert len(next(stream)) == 10
+        stream.close()
+        assert connection.cancelled and connection.chunks_written < len(output) // 50
+
+    def test_copy_out_propagates_errors(self):
+        connection = FakeCopyConnection()
+        connection.error = psycopg2.Error('relation "t" does not exist')
+        with pytest.raises(psycopg2.Error):
+            list(copy_out_rows(connection, 'SELECT * FROM t'))
+
+
+class TestAdapterCopy:
+    """Test the PostgreSQLAdapter entry points"""
+
+    def test_copy_in_commits(self):
+        connection = FakeCopyConnection()
+        adapter = make_adapter(connection)
+        result = adapter.copy_in('t', ({'id': i, 'v': None} for i in range(3)), ['id', 'v'])
+        assert result['success'] and result['rows_affected'] == 3
+        assert connection.commits == 1 and connection.text == '0\t\\N\n1\t\\N\n2\t\\N\n'
+
+    def test_copy_in_failure_rolls_back(self):
+        connection = FakeCopyConnection()
+        adapter = make_adapter(connection)
+
+        def bad_rows():
+            yield (1,)
+            raise ValueError("bad row")
+
+        result = adapter.copy_in('t', bad_rows(), ['id'])
+        assert not result['success'] and 'bad row' in result['error']
+        assert connection.rollbacks == 1 and connection.commits == 0
+
+    def test_copy_out(self):
+        adapter = make_adapter(FakeCopyConnection(copy_text([('1', 'a'), ('2', 'b')])))
+        batches = list(adapter.copy_out('SELECT * FROM t', ['integer', 'text'], batch_size=1))
+        assert batches == [[(1, 'a')], [(2, 'b')]]
+        assert adapter.pool.connection.statements == ['COPY (SELECT * FROM t) TO STDOUT']
+
+
+class TestMigratorCopy:
+    """Test that DBMigrator picks COPY for PostgreSQL sources and targets"""
+
+    SCHEMA = {
+        'columns': [{'name': 'id', 'type': 'INTEGER', 'source_type': 'integer', 'nullable': False},
+                    {'name': 'active', 'type': 'BOOLEAN', 'source_type': 'boolean', 'nullable': True}],
+        'pk': ['id'], 'fks': []
+    }
+
+    def sqlite_target(self, tmp_path):
+        target = tmp_path / "target.db"
+        with sqlite3.connect(target) as conn:
+            conn.execute("CREATE TABLE flags (id INTEGER PRIMARY KEY, active BOOLEAN)")
+        return target
+
+    def test_postgres_source_uses_copy_out(self, tmp_path):
+        target = self.sqlite_target(tmp_path)
+        migrator = DBMigrator("postgresql://u:p@localhost/src", target_url=f"sqlite:///{target}",
+                              checkpoint_file=str(tmp_path / "state.json"))
+        migrator.source_conn = FakeCopyConnection(
+            copy_text([(str(i), 't' if i % 2 else 'f') for i in range(2500)]))
+        migrator._get_row_count = lambda table_name: 2500
+        migrator.state["current_table"] = 'flags'
+        migrator.state["current_offset"] = 500
+        migrator.migrate_data('flags', self.SCHEMA)
+
+        assert migrator.source_conn.statements == [
+            'COPY (SELECT * FROM "flags" ORDER BY "id" OFFSET 500) TO STDOUT']
+        with sqlite3.connect(target) as conn:
+            # The fake server ignores OFFSET, so every row it sent was loaded
+            assert conn.execute("SELECT COUNT(*), SUM(active) FROM flags").fetchone() == (2500, 1250)
+        assert migrator.state["completed_tables"] == ["flags"]
+
+    def test_postgres_target_uses_copy_in(self, tmp_path):
+        source = tmp_path / "source.db"
+        with sqlite3.connect(source) as conn:
+            conn.execute("CREATE TABLE flags (id INTEGER PRIMARY KEY, active BOOLEAN)")
+            conn.executemany("INSERT INTO flags VALUES (?, ?)", [(i, i % 2) for i in range(25000)])
+
+        migrator = DBMigrator(f"sqlite:///{source}", target_url=f"sqlite:///{tmp_path / 'unused.db'}",
+                              checkpoint_file=str(tmp_path / "state.json"))
+        migrator.source_conn = sqlite3.connect(source)
+        migrator.target_config['type'] = 'postgresql'
+        pg = FakeCopyConnection()
+        migrator.db_manager.adapters['target'] = type('Wrapper', (), {'adapter': make_adapter(pg)})()
+        migrator.migrate_data('flags', self.SCHEMA)
+
+        assert pg.statements == ['COPY "flags" ("id", "active") FROM STDIN'] * 3
+        assert pg.commits == 3
+        lines = pg.text.splitlines()
+        assert len(lines) == 25000 and lines[:2] == ['0\tf', '1\tt']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Streaming Statistics
+=========================================
+
+Tests the bounded-memory sketches (HyperLogLog, heavy hitters, reservoir
+sample, equi-depth histograms) and the StatisticsCollector paths built on
+them: generators, DB-API fetchmany, parallel merge and persistence.
+"""
+
+import pytest
+import random
+import sqlite3
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.stats_sketches import (
+    HyperLogLog, HeavyHitters, ReservoirSample, ColumnStatisticsState, TableStatisticsState, hash64
+)
+from core.statistics_collector import StatisticsCollector
+
+
+class TestHyperLogLog:
+    """Test distinct-value estimation"""
+
+    def test_exact_for_small_inputs(self):
+        hll = HyperLogLog()
+        hll.update([i % 1500 for i in range(10000)])
+        assert hll.estimate() == 1500
+
+    def test_large_cardinality_within_error(self):
+        hll = HyperLogLog()
+        hll.update(range(200000))
+        assert abs(hll.estimate() - 200000) / 200000 < 0.05
+
+    def test_merge_counts_union(self):
+        left, right = HyperLogLog(), HyperLogLog()
+        left.update(range(0, 60000))
+        right.update(range(30000, 90000))
+        left.merge(right)
+        assert abs(left.estimate() - 90000) / 90000 < 0.05
+
+    def test_merge_requires_same_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=12).merge(HyperLogLog(precision=14))
+
+    def test_hash_is_type_aware(self):
+        assert hash64(1) != hash64("1")
+        assert hash64("abc") == hash64("abc")
+
+
+class TestHeavyHitters:
+    """Test most-common-value tracking"""
+
+    def test_top_values_on_skewed_data(self):
+        rng = random.Random(7)
+        values = [min(int(rng.paretovariate(1.2)), 5000) for _ in range(50000)]
+        heavy = HeavyHitters(capacity=50)
+        for start in range(0, len(values), 5000):
+            heavy.update(values[start:start + 5000])
+
+        expected = sorted(set(values), key=values.count, reverse=True)[:3]
+        assert [value for value, _ in heavy.top(3)] == expected
+
+    def test_merge_adds_counts(self):
+        left, right = HeavyHitters(), HeavyHitters()
+        left.update(["a"] * 5 + ["b"] * 2)
+        right.update(["a"] * 1 + ["b"] * 6)
+        left.merge(right)
+        assert left.top(2) == [("b", 8), ("a", 6)]
+
+
+class TestReservoirSample:
+    """Test uniform sampling"""
+
+    def test_sample_is_bounded_and_uniform(self):
+        sample = ReservoirSample(size=2000, seed=1)
+        for start in range(0, 200000, 10000):
+            sample.update(list(range(start, start + 10000)))
+
+        assert len(sample.items) == 2000
+        assert sample.seen == 200000
+        mean = sum(sample.items) / len(sample.items)
+        assert abs(mean - 100000) < 5000
+
+    def test_merge_weights_by_rows_seen(self):
+        small, large = ReservoirSample(size=1000, seed=2), ReservoirSample(size=1000, seed=3)
+        small.update(list(range(10000)))
+        large.update(list(range(10000, 100000)))
+        small.merge(large)
+
+        from_small = sum(1 for item in small.items if item < 10000) / len(small.items)
+        assert len(small.items) == 1000
+        assert 0.05 < from_small < 0.15
+
+
+class TestEquiDepthHistogram:
+    """Test histogram construction from the reservoir"""
+
+    def test_buckets_hold_equal_row_counts(self):
+        state = ColumnStatisticsState("v", seed=4)
+        state.update([i * i for i in range(1000)])
+        bounds, counts = state.equi_depth_histogram(buckets=4)
+
+        assert len(bounds) == 5
+        assert bounds[0] == 0 and bounds[-1] == 999 * 999
+        assert bounds == sorted(bounds)
+        assert set(counts.values()) == {250}
+
+    def test_unorderable_values_have_no_histogram(self):
+        state = ColumnStatisticsState("v")
+        state.update([1, "a", 2.5])
+        assert state.equi_depth_histogram() == ([], {})
+
+
+class TestStatisticsCollector:
+    """Test streaming collection through StatisticsCollector"""
+
+    @staticmethod
+    def _rows(n, start=0):
+        for i in range(start, start + n):
+            yield {"id": i, "status": "active" if i % 4 else "inactive",
+                   "score": None if i % 10 == 0 else i % 97}
+
+    def test_generator_input(self, tmp_path):
+        collector = StatisticsCollector(storage_path=str(tmp_path), batch_size=1000)
+        stats = collector.collect_statistics("t", self._rows(5000))
+
+        assert stats.row_count == 5000
+        assert abs(stats.columns["id"].distinct_count - 5000) < 100
+        assert stats.columns["status"].distinct_count == 2
+        assert stats.columns["status"].most_common_values == ["active", "inactive"]
+        assert stats.columns["score"].null_count == 500
+        assert stats.columns["score"].min_value == 0
+        assert len(stats.columns["id"].histogram_bounds) == 11
+        assert sum(stats.columns["id"].histogram.values()) == 5000
+
+    def test_empty_input(self, tmp_path):
+        collector = StatisticsCollector(storage_path=str(tmp_path))
+        stats = collector.collect_statistics("empty", iter([]))
+        assert stats.row_count == 0
+        assert collector.get_statistics("empty") is None
+
+    def test_missing_keys_count_as_nulls(self, tmp_path):
+        collector = StatisticsCollector(storage_path=str(tmp_path), batch_size=2)
+        stats = collector.collect_statistics("t", [{"a": 1}, {"a": 2}, {"a": 3, "b": "x"}, {"a": 4}])
+        assert stats.columns["b"].null_count == 3
+        assert stats.columns["b"].distinct_count == 1
+
+    def test_cursor_fetchmany(self, tmp_path):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (id INTEGER, name TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [(i, f"n{i % 30}") for i in range(3000)])
+        collector = StatisticsCollector(storage_path=str(tmp_path))
+
+        cursor = conn.execute("SELECT id, name FROM t")
+        stats = collector.collect_statistics_from_cursor("t", cursor, batch_size=256)
+        conn.close()
+
+        assert stats.row_count == 3000
+        assert abs(stats.columns["id"].distinct_count - 3000) < 60
+        assert stats.columns["name"].distinct_count == 30
+        assert stats.columns["name"].avg_length > 0
+        assert stats.avg_row_size_bytes > 0
+
+    def test_parallel_matches_serial(self, tmp_path):
+        collector = StatisticsCollector(storage_path=str(tmp_path))
+        partitions = [list(self._rows(2000, start)) for start in range(0, 8000, 2000)]
+
+        parallel = collector.collect_statistics_parallel("p", partitions, max_workers=2)
+        serial = collector.collect_statistics("s", (row for part in partitions for row in part))
+
+        assert parallel.row_count == serial.row_count == 8000
+        for column in ("id", "status", "score"):
+            assert parallel.columns[column].distinct_count == serial.columns[column].distinct_count
+            assert parallel.columns[column].null_count == serial.columns[column].null_count
+            assert parallel.columns[column].min_value == serial.columns[column].min_value
+            assert parallel.columns[column].max_value == serial.columns[column].max_value
+        assert parallel.columns["status"].most_common_values == serial.columns["status"].most_common_values
+
+    def test_state_merge_then_finalize(self, tmp_path):
+        collector = StatisticsCollector(storage_path=str(tmp_path))
+        left, right = collector.create_state("t"), collector.create_state("t")
+        left.update(list(self._rows(100)))
+        right.update(list(self._rows(100, 100)))
+
+        stats = collector.finalize_statistics(left.merge(right))
+        assert stats.row_count == 200
+        assert stats.columns["id"].max_value == 199
+        assert isinstance(left, TableStatisticsState)
+
+    def test_persistence_round_trip(self, tmp_path):
+        collector = StatisticsCollector(storage_path=str(tmp_path))
+        collector.collect_statistics("t", self._rows(1000))
+
+        reloaded = StatisticsCollector(storage_path=str(tmp_path)).get_statistics("t")
+        original = collector.get_statistics("t")
+        assert reloaded.columns["status"].most_common_values == original.columns["status"].most_common_values
+        assert reloaded.columns["id"].histogram_bounds == original.columns["id"].histogram_bounds
+        assert reloaded.columns["id"].histogram == original.columns["id"].histogram
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Streaming Table Extraction
+=========================================
+
+Tests PostgreSQLAdapter.iter_data over a named server-side cursor, the
+order-independent streaming fingerprint, and that compare_adapters and
+DBMigrator consume tables in bounded batches. PostgreSQL is stood in for
+by fake DB-API objects that record how they are driven.
+"""
+
+import os
+import sys
+import threading
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from core.validation.fingerprint import FingerprintCalculator, FingerprintConfig
+from core.validation.report_v2 import compare_adapters
+from extensions.plugins.postgresql_adapter import ConnectionConfig, PostgreSQLAdapter
+from tools.db_migrator import DBMigrator
+
+
+class FakeCursor:
+    """Cursor over canned rows that records its queries and fetch sizes"""
+
+    def __init__(self, connection, name=None, rows=()):
+        self.connection = connection
+        self.name = name
+        self.rows = list(rows)
+        self.position = 0
+        self.itersize = 2000
+        self.queries = []
+        self.fetch_sizes = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch = self.rows[self.position:self.position + size]
+        self.position += len(batch)
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Connection whose named cursors serve `rows`"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.autocommit = True
+        self.cursors = []
+        self.rollbacks = 0
+
+    def cursor(self, name=None, cursor_factory=None):
+        cursor = FakeCursor(self, name, self.rows if name else ())
+        self.cursors.append(cursor)
+        return cursor
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    @property
+    def named_cursors(self):
+        return [cursor for cursor in self.cursors if cursor.name]
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+        self.checked_out = 0
+
+    def get_connection(self, timeout=30):
+        self.checked_out += 1
+        return self.connection
+
+    def return_connection(self, connection):
+        self.checked_out -= 1
+
+
+def make_adapter(rows):
+    """PostgreSQLAdapter wired to a fake pool (no server needed)"""
+    adapter = PostgreSQLAdapter.__new__(PostgreSQLAdapter)
+    adapter.config = ConnectionConfig()
+    adapter.pool = FakePool(FakeConnection(rows))
+    adapter._pool_lock = threading.RLock()
+    adapter.stats = {'queries_executed': 0}
+    return adapter
+
+
+def people(n):
+    return [{'id': i, 'name': f'person {i}', 'note': None if i % 3 else 'x'} for i in range(n)]
+
+
+class TestPostgreSQLIterData:
+    """Test that iter_data streams through a named cursor"""
+
+    def test_batches_from_server_side_cursor(self):
+        adapter = make_adapter(people(25))
+        batches = list(adapter.iter_data('People', order_by=['id'], batch_size=10))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert [row['id'] for batch in batches for row in batch] == list(range(25))
+
+        connection = adapter.pool.connection
+        [cursor] = connection.named_cursors
+        assert cursor.name.startswith('saiql_extract_') and cursor.itersize == 10
+        assert cursor.queries == ['SELECT * FROM "people" ORDER BY "id"']
+        assert max(cursor.fetch_sizes) == 10 and cursor.closed
+        assert connection.autocommit is False and connection.rollbacks == 1
+        assert adapter.pool.checked_out == 0
+
+    def test_early_close_releases_connection(self):
+        adapter = make_adapter(people(100))
+        stream = adapter.iter_data('people', order_by=['id'], batch_size=10)
+        assert len(next(stream)) == 10
+        stream.close()
+
+        [cursor] = adapter.pool.connection.named_cursors
+        assert cursor.closed and cursor.position == 10
+        assert adapter.pool.checked_out == 0
+
+    def test_default_ordering_uses_first_column(self):
+        adapter = make_adapter(people(3))
+        adapter.get_schema = lambda table: {'columns': [{'name': 'id'}, {'name': 'name'}]}
+        list(adapter.iter_data('people'))
+        assert adapter.pool.connection.named_cursors[0].queries == ['SELECT * FROM "people" ORDER BY "id"']
+
+
+class TestStreamingFingerprint:
+    """Test the order-independent fingerprint over row batches"""
+
+    def test_independent_of_order_and_batching(self):
+        calc = FingerprintCalculator()
+        rows = people(50)
+        cols = ['id', 'name', 'note']
+        forward = calc.compute_streaming_fingerprint('t', [rows[:20], rows[20:]], cols)
+        backward = calc.compute_streaming_fingerprint(
+            't', [rows[::-1][i:i + 7] for i in range(0, 50, 7)], cols)
+
+        assert forward.fingerprint == backward.fingerprint
+        assert forward.row_count == 50 and forward.null_counts['note'] == 33
+
+        changed = [dict(row) for row in rows]
+        changed[5]['name'] = 'someone else'
+        assert calc.compute_streaming_fingerprint('t', [changed], cols).fingerprint != forward.fingerprint
+        assert calc.compute_streaming_fingerprint('t', [rows[:-1]], cols).fingerprint != forward.fingerprint
+
+    def test_empty_and_excluded_columns(self):
+        calc = FingerprintCalculator(FingerprintConfig(excluded_columns=['note']))
+        empty = calc.compute_streaming_fingerprint('t', [], ['id', 'note'])
+        assert empty.row_count == 0 and empty.column_count == 1
+
+        a = [{'id': 1, 'note': 'a'}]
+        b = [{'id': 1, 'note': 'b'}]
+        assert (calc.compute_streaming_fingerprint('t', [a]).fingerprint ==
+                calc.compute_streaming_fingerprint('t', [b]).fingerprint)
+
+
+class MaterializingAdapter:
+    """Adapter with only extract_data(); rows come back in reverse order"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_tables(self):
+        return ['people']
+
+    def get_schema(self, table_name):
+        return {'columns': [{'name': c, 'type': 'text'} for c in ('id', 'name', 'note')]}
+
+    def extract_data(self, table_name, order_by=None):
+        return {'data': list(reversed(self.rows))}
+
+
+class TestCompareAdapters:
+    """Test that data parity streams adapters that support it"""
+
+    def test_streaming_source_against_materialized_target(self):
+        rows = people(45)
+        source = make_adapter(rows)
+        source.get_tables = lambda: ['people']
+        source.get_schema = MaterializingAdapter(rows).get_schema
+
+        report = compare_adapters(source, MaterializingAdapter(rows), 'run', check_constraints=False)
+        parity = report.data_parity['people']
+        assert parity['status'] == 'match' and parity['source_rows'] == parity['target_rows'] == 45
+
+        [cursor] = source.pool.connection.named_cursors
+        assert cursor.itersize == max(cursor.fetch_sizes)
+
+        report = compare_adapters(source, MaterializingAdapter(rows[:-1]), 'run', check_constraints=False)
+        assert report.data_parity['people']['status'] == 'mismatch'
+
+    def test_sampling_falls_back_to_materialized_fingerprint(self):
+        rows = people(10)
+        config = FingerprintConfig(sample_size=5)
+        report = compare_adapters(MaterializingAdapter(rows), MaterializingAdapter(rows), 'run',
+                                  check_constraints=False, fingerprint_config=config)
+        expected = FingerprintCalculator(config).compute_table_fingerprint(
+            'people', rows, ['id', 'name', 'note'])
+        assert report.data_parity['people']['source_fingerprint'] == expected.fingerprint
+
+
+class TestMigratorStreaming:
+    """Test that the migrator reads PostgreSQL sources through a named cursor"""
+
+    SCHEMA = {
+        'columns': [{'name': 'id', 'type': 'INTEGER', 'nullable': False},
+                    {'name': 'name', 'type': 'TEXT', 'nullable': True}],
+        'pk': ['id'], 'fks': []
+    }
+
+    def test_csv_export_streams_in_batches(self, tmp_path):
+        rows = [(i, f"p{i}") for i in range(2500)]
+        migrator = DBMigrator("postgresql://u:p@localhost/src", output_mode='files',
+                              output_dir=str(tmp_path), checkpoint_file=str(tmp_path / "state.json"))
+        migrator.source_conn = FakeConnection(rows)
+        migrator._get_row_count = lambda table_name: len(rows)
+        migrator._write_csv_file('people', self.SCHEMA)
+
+        [cursor] = migrator.source_conn.named_cursors
+        assert cursor.itersize == 1000 and set(cursor.fetch_sizes) == {1000}
+        assert cursor.queries == ['SELECT * FROM "people" ORDER BY "id"'] and cursor.closed
+        lines = (tmp_path / "data" / "people.csv").read_text().splitlines()
+        assert len(lines) == 2501 and lines[-1] == "2499,p2499"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
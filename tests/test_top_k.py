@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Top-K
+==========================
+
+Tests the bounded-heap ORDER BY ... LIMIT operator against a full stable
+sort, its use by SAIQLOperators and the planner, and streamed file views
+(including that they filter exactly like materialized ones).
+"""
+
+import random
+import shutil
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pandas as pd
+
+from core.top_k import TopK, top_k, parse_order_by, make_sort_key
+from core.operators import SAIQLOperators
+from core.execution_planner import QueryOptimizer, QueryStatistics, OperationType
+from extensions.plugins.file_adapter import FileAdapter, ViewDefinition
+
+BACKHISTORY_CSV = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                               '../speed_test/data/backhistory_sample.csv'))
+
+
+def reference(rows, order_by, k):
+    """Stable full sort (last key first), NULLs first ASC / last DESC"""
+    result = list(rows)
+    for column, descending in reversed(parse_order_by(order_by)):
+        present = [row for row in result if row.get(column) is not None]
+        missing = [row for row in result if row.get(column) is None]
+        present.sort(key=lambda row: row[column], reverse=descending)
+        result = present + missing if descending else missing + present
+    return result[:k]
+
+
+def random_rows(n, seed=7):
+    rng = random.Random(seed)
+    return [{"id": i,
+             "score": rng.choice([None, *range(20)]),
+             "name": rng.choice([None, "a", "b", "c", "d"]),
+             "price": rng.random() * 100} for i in range(n)]
+
+
+class TestTopK:
+    """Test TopK against a full sort"""
+
+    @pytest.mark.parametrize("order_by", [
+        "score DESC",
+        "score ASC, id DESC",
+        "name DESC, score, price DESC",
+        [("name", "ASC"), ("score", "DESC")],
+    ])
+    @pytest.mark.parametrize("k", [0, 1, 10, 500, 2000])
+    def test_matches_stable_sort(self, order_by, k):
+        rows = random_rows(1000)
+        assert top_k(rows, order_by, k) == reference(rows, order_by, k)
+
+    def test_ties_keep_input_order(self):
+        rows = [{"id": i, "group": i % 3} for i in range(30)]
+        result = top_k(rows, "group DESC", 12)
+        assert [row["id"] for row in result] == [2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 1, 4]
+
+    def test_memory_bounded_by_k(self):
+        top = TopK(5, "price DESC")
+        for row in random_rows(1000):
+            top.push(row)
+            assert len(top) <= 5
+        assert top.rows_seen == 1000 and top.full
+
+    def test_order_by_parsing(self):
+        assert parse_order_by('"timestamp" DESC, symbol') == [("timestamp", True), ("symbol", False)]
+        with pytest.raises(ValueError):
+            parse_order_by([])
+
+    def test_stops_reading_when_answer_known(self):
+        consumed = []
+
+        def source():
+            for i in range(1000):
+                consumed.append(i)
+                yield {"id": i}
+
+        assert [row["id"] for row in top_k(source(), None, 3)] == [0, 1, 2]
+        assert len(consumed) == 3
+        consumed.clear()
+        assert len(top_k(source(), "id", 5, presorted=True)) == 5
+        assert len(consumed) == 5
+
+    def test_custom_getter(self):
+        rows = [(i, (i * 7) % 10) for i in range(10)]
+        key = make_sort_key("1 DESC", lambda row, column: row[int(column)])
+        assert sorted(rows, key=key)[0] == (7, 9)
+        assert top_k(rows, "1 DESC", 2, getter=lambda row, column: row[int(column)]) == [(7, 9), (4, 8)]
+
+
+class TestTopKOperator:
+    """Test the TOPK operator of SAIQLOperators"""
+
+    def test_operator_registered(self):
+        operators = SAIQLOperators()
+        rows = random_rows(200)
+        result = operators.execute_operator("TOPK", rows, "price DESC", 3)
+        assert result == reference(rows, "price DESC", 3)
+
+    def test_limit_without_order(self):
+        operators = SAIQLOperators()
+        assert operators.execute_top_k(iter(random_rows(50)), None, 4) == random_rows(50)[:4]
+
+
+class TestPlannerTopK:
+    """Test SORT / TOP_K planning and in-process execution"""
+
+    def optimizer(self):
+        optimizer = QueryOptimizer()
+        optimizer.load_statistics({
+            "users": QueryStatistics("users", 10000, 50.0, {"id": {"distinct_count": 10000}}),
+            "orders": QueryStatistics("orders", 100000, 50.0, {"user_id": {"distinct_count": 10000}}),
+        })
+        return optimizer
+
+    def test_limit_over_order_by_becomes_top_k(self):
+        optimizer = self.optimizer()
+        plan, _ = optimizer.optimize_query({"operation": "SELECT", "table": "orders",
+                                            "order_by": "total DESC", "limit": 100})
+        top = plan.children[-1]
+
+        assert top.operation == OperationType.TOP_K
+        assert top.columns == ["total DESC"] and top.limit == 100
+        assert top.estimated_rows == 100
+
+        sorted_plan, _ = optimizer.optimize_query({"operation": "SELECT", "table": "orders",
+                                                   "order_by": "total DESC"})
+        sort = sorted_plan.children[-1]
+        assert sort.operation == OperationType.SORT and sort.estimated_rows == 100000
+        assert top.estimated_cost < sort.estimated_cost
+
+    def test_join_plan_ordered_and_limited(self):
+        optimizer = self.optimizer()
+        plan, _ = optimizer.optimize_query({
+            "operation": "SELECT", "table": "orders",
+            "joins": [{"type": "INNER", "table": "users",
+                       "conditions": [{"column": "id", "operator": "=", "value": "orders.user_id"}]},
+                      {"type": "INNER", "table": "regions",
+                       "conditions": [{"column": "user_id", "operator": "=", "value": "users.id"}]}],
+            "order_by": ["orders.total DESC", "orders.id"], "limit": 5
+        })
+        tables = {
+            "users": [{"id": i} for i in range(10)],
+            "regions": [{"user_id": i} for i in range(10)],
+            "orders": [{"id": i, "user_id": i % 20, "total": i % 7} for i in range(100)],
+        }
+
+        rows = optimizer.execute_join_plan(plan, tables)
+        top = next(child for child in plan.children if child.operation == OperationType.TOP_K)
+
+        assert [(row["orders.total"], row["orders.id"]) for row in rows] == [
+            (6, 6), (6, 20), (6, 27), (6, 41), (6, 48)
+        ]
+        assert plan.actual_rows == 50 and top.actual_rows == 5
+
+
+class TestFileViewTopK:
+    """Test streamed ORDER BY ... LIMIT views over the speed_test backhistory sample"""
+
+    @pytest.fixture
+    def adapter(self, tmp_path):
+        if not os.path.exists(BACKHISTORY_CSV):
+            pytest.skip("backhistory sample not available")
+        shutil.copy(BACKHISTORY_CSV, tmp_path / "backhistory.csv")
+        return FileAdapter(str(tmp_path))
+
+    def add_view(self, adapter, name, definition):
+        adapter.create_view(name, ViewDefinition(name=name, description="", source_tables=["backhistory"],
+                                                 definition=definition, columns=[]))
+
+    def expected(self, symbol, k):
+        df = pd.read_csv(BACKHISTORY_CSV)
+        df = df[df["symbol"] == symbol]
+        return df.sort_values("timestamp", ascending=False, kind="stable").head(k).reset_index(drop=True)
+
+    def test_backhistory_query_matches_full_sort(self, adapter, monkeypatch):
+        monkeypatch.setattr("extensions.plugins.file_adapter.VIEW_STREAM_BATCH_SIZE", 500)
+        self.add_view(adapter, "latest_btc", "SELECT * FROM backhistory WHERE symbol='BTC-USD' "
+                                             "ORDER BY \"timestamp\" DESC LIMIT 100;")
+
+        result = adapter.query_view("latest_btc")
+
+        pd.testing.assert_frame_equal(result, self.expected("BTC-USD", 100))
+
+    def test_limit_without_order_stops_early(self, adapter, monkeypatch):
+        monkeypatch.setattr("extensions.plugins.file_adapter.VIEW_STREAM_BATCH_SIZE", 100)
+        chunks = []
+        iter_frames = adapter._iter_frames
+
+        def counting(table_name, batch_size):
+            for chunk in iter_frames(table_name, batch_size):
+                chunks.append(len(chunk))
+                yield chunk
+
+        monkeypatch.setattr(adapter, "_iter_frames", counting)
+        self.add_view(adapter, "first_rows", "SELECT symbol, close FROM backhistory LIMIT 150")
+
+        result = adapter.query_view("first_rows")
+
+        assert list(result.columns) == ["symbol", "close"] and len(result) == 150
+        assert len(chunks) == 2
+
+    def test_simple_query_order_by_limit(self, adapter):
+        context = {"backhistory": pd.read_csv(BACKHISTORY_CSV)}
+        result = adapter._execute_simple_query(
+            "SELECT * FROM backhistory WHERE symbol = 'BTC-USD' ORDER BY timestamp DESC LIMIT 10", context
+        )
+        assert list(result["timestamp"]) == list(self.expected("BTC-USD", 10)["timestamp"])
+
+
+class TestViewPathsAgree:
+    """Test that streamed, aggregated and materialized views filter identically"""
+
+    @pytest.fixture
+    def adapter(self, tmp_path):
+        pd.DataFrame({"name": ["ALICE", "alice", "bob", "Alice"],
+                      "age": [40, 30, 50, 20]}).to_csv(tmp_path / "people.csv", index=False)
+        return FileAdapter(str(tmp_path))
+
+    def query(self, adapter, definition):
+        adapter.create_view("v", ViewDefinition(name="v", description="", source_tables=["people"],
+                                                definition=definition, columns=[]))
+        return adapter.query_view("v").reset_index(drop=True)
+
+    def test_string_predicates_match_exactly(self, adapter):
+        materialized = self.query(adapter, "SELECT name, age FROM people WHERE name = 'alice'")
+        streamed = self.query(adapter, "SELECT name, age FROM people WHERE name = 'alice' LIMIT 10")
+        ordered = self.query(adapter, "SELECT name, age FROM people WHERE name = 'alice' "
+                                      "ORDER BY age LIMIT 10")
+
+        assert materialized.to_dict("records") == [{"name": "alice", "age": 30}]
+        pd.testing.assert_frame_equal(streamed, materialized)
+        pd.testing.assert_frame_equal(ordered, materialized)
+
+    def test_aggregate_view_filters_the_same_rows(self, adapter):
+        grouped = self.query(adapter, "SELECT name, COUNT(*) AS n FROM people "
+                                      "WHERE name != 'alice' GROUP BY name ORDER BY name")
+        materialized = self.query(adapter, "SELECT name FROM people WHERE name != 'alice'")
+
+        assert list(grouped["name"]) == sorted(materialized["name"])
+        assert list(grouped["n"]) == [1, 1, 1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
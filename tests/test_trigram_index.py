@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SAIQL Trigram Index
+==================================
+
+Tests that trigram index lookups for SIMILAR and LIKE return exactly the
+rows the scalar operators accept, that maintenance keeps it consistent,
+that IndexManager selects it for pattern predicates, and that selective
+lookups beat a full scan.
+"""
+
+import random
+import string
+import time
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.trigram_index import TrigramIndex
+from core.operators import SAIQLOperators, trigram_similarity, trigrams
+from core.index_manager import IndexManager, IndexType
+
+NAMES = ["John Smith", "Jon Smyth", "Johnny Smithers", "Jane Doe", "janet doerr", "SMITH, JOHN",
+         "Mary-Jane O'Neil", "İstanbul Kebab", "Straße", "Kelvin", "ſmith", "ab", "", "a%b_c", 42, 4200]
+
+
+def random_names(n, seed=5):
+    rng = random.Random(seed)
+
+    def word():
+        return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8))).title()
+    return [f"{word()} {word()}" for _ in range(n)]
+
+
+def build(values):
+    index = TrigramIndex()
+    index.insert_many((value, row_id) for row_id, value in enumerate(values))
+    return index
+
+
+class TestTrigramSimilarity:
+    """Test the trigram similarity measure"""
+
+    def test_containment(self):
+        assert trigram_similarity("machine learning algorithms", "machine learning") == 1.0
+        assert trigram_similarity("John Smith", "jon smith") > 0.7
+        assert trigram_similarity("completely different", "machine learning") < 0.3
+        assert trigram_similarity("anything", "") == 0.0
+
+    def test_trigrams_padded_and_folded(self):
+        assert trigrams("Ab") == {"  a", " ab", "ab "}
+        assert trigrams("ſ") == trigrams("S")
+
+
+class TestTrigramLookups:
+    """Test index lookups against the scalar operators"""
+
+    @pytest.mark.parametrize("pattern", ["%smith%", "%SMITH%", "jo%", "%doe%r", "%n_smi%", "%ist%", "%s%",
+                                         "%ss%", "%strasse%", "%kelvin%", "%42%", "a%b_c", "%", "%mith,%"])
+    def test_like_matches_scalar(self, pattern):
+        operators = SAIQLOperators()
+        expected = [i for i, value in enumerate(NAMES) if operators.execute_like(value, pattern)]
+        assert build(NAMES).like_search(pattern) == expected
+
+    @pytest.mark.parametrize("pattern", ["John Smith", "smith", "Jane", "istanbul", "a", "4200", "smyth jon"])
+    @pytest.mark.parametrize("threshold", [0.0, 0.3, 0.5, 0.7, 1.0])
+    def test_similarity_matches_scalar(self, pattern, threshold):
+        operators = SAIQLOperators()
+        expected = [i for i, value in enumerate(NAMES) if operators.execute_similarity(value, pattern, threshold)]
+        assert build(NAMES).similarity_search(pattern, threshold) == expected
+
+    def test_random_names(self):
+        operators = SAIQLOperators()
+        names = random_names(2000)
+        index = build(names)
+        for name in names[:50]:
+            fuzzy = name[:-1] + "x"
+            assert index.similarity_search(fuzzy, 0.6) == \
+                [i for i, value in enumerate(names) if operators.execute_similarity(value, fuzzy, 0.6)]
+            infix = f"%{name[2:6]}%"
+            assert index.like_search(infix) == \
+                [i for i, value in enumerate(names) if operators.execute_like(value, infix)]
+
+
+class TestTrigramMaintenance:
+    """Test inserts, deletes and exact search"""
+
+    def test_delete_and_reinsert(self):
+        index = build(["alpha beta", "alpha gamma", "delta"])
+        assert index.delete("alpha beta", 0)
+        assert not index.delete("alpha beta", 0)
+        assert index.like_search("%alpha%") == [1]
+        index.insert("alpha omega", 0)
+        assert index.like_search("%alpha%") == [1, 0]
+        assert len(index) == 3
+
+    def test_delete_whole_key_and_search(self):
+        index = TrigramIndex()
+        index.insert("same", 1)
+        index.insert("same", 2)
+        index.insert("same", 2)
+        index.insert(None, 3)
+        assert index.search("same") == [1, 2] and index.search("sam") is None
+        assert index.delete("same")
+        assert "same" not in index and len(index) == 0
+        assert index.get_statistics()["deleted_documents"] == 2
+
+
+class TestIndexManagerTrigram:
+    """Test trigram indexes through IndexManager"""
+
+    def test_selected_for_pattern_predicates(self):
+        manager = IndexManager()
+        manager.create_index("name_btree", "users", "name", IndexType.BTREE)
+        trigram = manager.create_index("name_trgm", "users", "name", IndexType.TRIGRAM)
+        trigram.bulk_insert([(name, i) for i, name in enumerate(NAMES)])
+
+        assert manager.select_best_index("users", "name", "LIKE") is trigram
+        assert manager.select_best_index("users", "name", "SIMILAR") is trigram
+        assert manager.select_best_index("users", "name", "=").definition.index_type == IndexType.BTREE
+        assert trigram.like_search("%smith%") == [0, 2, 5, 10]
+        assert trigram.similarity_search("jon smith", 0.7) == [0, 1]
+        assert manager.get_stats()["indexes_by_type"] == {"btree": 1, "trigram": 1}
+
+    def test_unique(self):
+        manager = IndexManager()
+        index = manager.create_index("email_trgm", "users", "email", IndexType.TRIGRAM, is_unique=True)
+        index.insert("a@example.com", 1)
+        with pytest.raises(ValueError):
+            index.insert("a@example.com", 2)
+
+
+class TestTrigramPerformance:
+    """Test that selective lookups avoid full scans"""
+
+    def test_selective_lookups_beat_scan(self):
+        operators = SAIQLOperators()
+        names = random_names(100_000)
+        index = build(names)
+        target = names[len(names) // 2]
+
+        start = time.perf_counter()
+        fuzzy = index.similarity_search(target[:-1] + "x", 0.7)
+        infix = index.like_search(f"%{target[1:7]}%")
+        indexed_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scan_fuzzy = [i for i, name in enumerate(names) if operators.execute_similarity(name, target[:-1] + "x", 0.7)]
+        scan_infix = [i for i, name in enumerate(names) if operators.execute_like(name, f"%{target[1:7]}%")]
+        scan_time = time.perf_counter() - start
+
+        assert fuzzy == scan_fuzzy and infix == scan_infix
+        assert len(names) // 2 in fuzzy
+        assert indexed_time * 20 < scan_time
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
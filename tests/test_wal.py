@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the SAIQL Write-Ahead Log
+========================================
+
+Tests CRC framing and torn-tail handling, recovery of TransactionManager
+state from the log and checkpoints, and that group commit batches
+concurrent commits into shared fsyncs.
+"""
+
+import os
+import threading
+import time
+import pytest
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.transaction_manager import TransactionManager
+from core.wal import WriteAheadLog, encode_record, read_records
+
+
+def commit(tm, writes, operation="WRITE"):
+    tx = tm.begin_transaction()
+    for resource, value in writes.items():
+        assert tm.execute_operation(tx, operation, resource, value)
+    return tm.commit_transaction(tx)
+
+
+def committed(tm, *resources):
+    tx = tm.begin_transaction()
+    values = [tm.read(tx, resource) for resource in resources]
+    tm.commit_transaction(tx)
+    return values
+
+
+class TestFraming:
+    """Test record encoding and corruption detection"""
+
+    def test_round_trip_and_corruption(self, tmp_path):
+        path = str(tmp_path / "log")
+        records = [{"ts": i, "writes": [["k", {"n": i}, False]]} for i in range(1, 4)]
+        with open(path, "wb") as f:
+            for record in records:
+                f.write(encode_record(record))
+        assert read_records(path) == (records, os.path.getsize(path))
+
+        # Flip one payload byte of the second record
+        second = len(encode_record(records[0]))
+        with open(path, "r+b") as f:
+            f.seek(second + 12)
+            byte = f.read(1)
+            f.seek(second + 12)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        assert read_records(path) == (records[:1], second)
+
+    def test_recover_truncates_torn_tail(self, tmp_path):
+        path = str(tmp_path / "log")
+        frame = encode_record({"ts": 1, "tx": "a", "writes": []})
+        with open(path, "wb") as f:
+            f.write(frame + encode_record({"ts": 2, "tx": "b", "writes": []})[:-3])
+
+        wal = WriteAheadLog(path)
+        state = wal.recover()
+        wal.close()
+
+        assert [record["tx"] for record in state.records] == ["a"]
+        assert state.truncated_bytes > 0 and os.path.getsize(path) == len(frame)
+
+
+class TestRecovery:
+    """Test TransactionManager state survives restarts"""
+
+    def test_committed_state_recovered(self, tmp_path):
+        path = str(tmp_path / "saiql.wal")
+        tm = TransactionManager(wal_path=path)
+        assert commit(tm, {"acct:1": 100, "acct:2": 50})
+        assert commit(tm, {"acct:1": 70, "acct:2": 80})
+        assert commit(tm, {"acct:2": None}, operation="DELETE")
+        pending = tm.begin_transaction()
+        assert tm.execute_operation(pending, "WRITE", "acct:3", 1)
+        tm.close()
+
+        # Restart without committing `pending` (a crash)
+        recovered = TransactionManager(wal_path=path)
+        assert recovered.oracle.current() == 3
+        assert committed(recovered, "acct:1", "acct:2", "acct:3") == [70, None, None]
+        assert commit(recovered, {"acct:1": 1})
+        recovered.close()
+
+        again = TransactionManager(wal_path=path)
+        assert committed(again, "acct:1") == [1]
+        again.close()
+
+    def test_checkpoint_trims_log(self, tmp_path):
+        path = str(tmp_path / "saiql.wal")
+        tm = TransactionManager(wal_path=path)
+        for i in range(50):
+            assert commit(tm, {f"row:{i % 5}": i})
+        size = os.path.getsize(path)
+
+        assert tm.checkpoint()
+        assert os.path.getsize(path) == 0
+        assert commit(tm, {"row:0": "after"})
+        assert 0 < os.path.getsize(path) < size
+        tm.close()
+
+        recovered = TransactionManager(wal_path=path)
+        assert committed(recovered, "row:0", "row:4") == ["after", 49]
+        recovered.close()
+
+    def test_automatic_checkpoint(self, tmp_path):
+        path = str(tmp_path / "saiql.wal")
+        tm = TransactionManager(wal_path=path)
+        tm.wal.checkpoint_bytes = 2048
+        for i in range(200):
+            assert commit(tm, {"counter": i})
+        assert tm.wal.stats["checkpoints"] > 0
+        assert os.path.getsize(path) < 2048
+        tm.close()
+        recovered = TransactionManager(wal_path=path)
+        assert committed(recovered, "counter") == [199]
+        recovered.close()
+
+
+class TestGroupCommit:
+    """Test that concurrent commits share fsyncs"""
+
+    def run_commits(self, tm, threads, per_thread):
+        def worker(worker_id):
+            for i in range(per_thread):
+                assert commit(tm, {f"w{worker_id}:{i}": i})
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join(timeout=60)
+        return threads * per_thread / (time.perf_counter() - start)
+
+    def test_concurrent_commits_are_batched(self, tmp_path):
+        serial = TransactionManager(wal_path=str(tmp_path / "serial.wal"))
+        serial_rate = self.run_commits(serial, threads=1, per_thread=100)
+        assert serial.wal.stats["fsyncs"] == 100
+        serial.close()
+
+        tm = TransactionManager(wal_path=str(tmp_path / "group.wal"), group_commit_window=0.001)
+        group_rate = self.run_commits(tm, threads=16, per_thread=25)
+
+        stats = tm.wal.stats
+        print(f"\nserial: {serial_rate:,.0f} commits/s, 16 threads: {group_rate:,.0f} commits/s, "
+              f"{stats['records']} records in {stats['fsyncs']} fsyncs (max batch {stats['max_batch']})")
+        assert stats["records"] == 400
+        assert stats["fsyncs"] < stats["records"] / 2
+        assert len(list(tm.wal)) == 400
+        tm.close()
+
+        recovered = TransactionManager(wal_path=str(tmp_path / "group.wal"))
+        assert committed(recovered, "w15:24", "w0:0") == [24, 0]
+        recovered.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -39,7 +39,7 @@ import csv
 import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
 # Add parent directory to path to import SAIQL core
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
@@ -62,7 +62,8 @@ class DBMigrator:
     
     def __init__(self, source_url: str, target_url: Optional[str] = None, target_dir: Optional[str] = None, 
                  dry_run: bool = False, checkpoint_file: str = "migration_state.json", clean_on_failure: bool = False,
-                 output_mode: str = 'db', output_dir: str = './migration_artifacts'):
+                 output_mode: str = 'db', output_dir: str = './migration_artifacts',
+                 mysql_local_infile: bool = False):
         
         self.output_mode = output_mode
         self.output_dir = Path(output_dir)
@@ -113,14 +114,18 @@ class DBMigrator:
                     'password': parsed_target.password,
                     'database': parsed_target.path.lstrip('/')
                 }
-            elif 'mysql' in target_scheme:
+            elif 'mysql' in target_scheme or 'mariadb' in target_scheme:
                 self.target_config = {
                     'type': 'mysql',
                     'host': parsed_target.hostname,
                     'port': parsed_target.port or 3306,
                     'user': parsed_target.username,
                     'password': parsed_target.password,
-                    'database': parsed_target.path.lstrip('/')
+                    'database': parsed_target.path.lstrip('/'),
+                    # LOAD DATA LOCAL INFILE lets the server read any client file, so
+                    # it is opt-in (--mysql-local-infile or ?local_infile=1); packed
+                    # INSERTs are used otherwise
+                    'local_infile': mysql_local_infile or self._url_flag(parsed_target, 'local_infile')
                 }
             elif 'mssql' in target_scheme:
                  self.target_config = {
@@ -169,6 +174,12 @@ class DBMigrator:
         self.db_manager = DatabaseManager(config=db_config)
         logger.info(f"Initialized backend: target ({self.target_config['type']})")
 
+    @staticmethod
+    def _url_flag(parsed_url, name: str) -> bool:
+        """Whether a boolean query parameter (?name=1/true/on) is set on a database URL"""
+        values = parse_qs(parsed_url.query).get(name, [])
+        return bool(values) and values[-1].strip().lower() in ('1', 'true', 'yes', 'on')
+
     def _sanitize_error(self, e: Exception) -> str:
         """Mask credentials in error messages"""
         import re
@@ -366,6 +377,98 @@ class DBMigrator:
         # Kept for backward compat but should be replaced
         return f'"{identifier}"'
 
+    def _source_select_sql(self, table_name: str, schema: Dict[str, Any]) -> str:
+        """SELECT * of a source table, ordered by primary key for deterministic batches and offsets"""
+        query = f"SELECT * FROM {self.quote_source_ident(table_name)}"
+        if schema.get('pk'):
+            pk_cols = ", ".join([self.quote_source_ident(pk) for pk in schema['pk']])
+            query += f" ORDER BY {pk_cols}"
+        return query
+
+    def _select_source_rows(self, table_name: str, schema: Dict[str, Any], batch_size: int):
+        """
+        Open a cursor over a source table
+
+        PostgreSQL sources get a named (server-side) cursor with itersize
+        set to the batch size, so the result set stays on the server and
+        memory is bounded by one batch. Other sources use a client cursor.
+        """
+        if 'postgres' in self.source_type:
+            cursor = self.source_conn.cursor(name=f"saiql_migrate_{uuid.uuid4().hex[:12]}")
+            cursor.itersize = batch_size
+        else:
+            cursor = self.source_conn.cursor()
+        cursor.execute(self._source_select_sql(table_name, schema))
+        return cursor
+
+    def _iter_source_batches(self, table_name: str, schema: Dict[str, Any],
+                             batch_size: int, start_offset: int = 0):
+        """
+        Row tuples of a source table in batches, starting at start_offset
+
+        PostgreSQL sources stream through COPY (query) TO STDOUT inside the
+        snapshot transaction, with values decoded from the source column
+        types; the offset is applied server-side.
+        """
+        if 'postgres' in self.source_type:
+            from extensions.plugins.postgresql_adapter import copy_out_rows
+            query = self._source_select_sql(table_name, schema)
+            if start_offset > 0:
+                query += f" OFFSET {int(start_offset)}"
+            column_types = [c.get('source_type') for c in schema['columns']]
+            yield from copy_out_rows(self.source_conn, query, column_types, batch_size)
+            return
+
+        cursor = self.source_conn.cursor()
+        cursor.execute(self._source_select_sql(table_name, schema))
+        
+        # Skip to offset if needed
+        # Note: This is inefficient for large offsets but generic.
+        # Optimizations (LIMIT/OFFSET) are dialect-specific.
+        if start_offset > 0:
+            logger.info(f"Skipping {start_offset} rows...")
+        skipped = 0
+        while skipped < start_offset:
+            # Skip in chunks
+            to_skip = min(10000, start_offset - skipped)
+            cursor.fetchmany(to_skip)
+            skipped += to_skip
+        
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+        cursor.close()
+
+    def _target_bulk_loader(self):
+        """
+        Bulk load method of the target adapter, or None for per-row INSERTs
+
+        PostgreSQL loads with COPY; MySQL/MariaDB with LOAD DATA LOCAL
+        INFILE or max_allowed_packet-sized multi-row INSERTs.
+        """
+        adapter = getattr(self.db_manager.adapters.get('target'), 'adapter', None)
+        target_type = self.target_config.get('type')
+        if target_type == 'postgresql':
+            return getattr(adapter, 'copy_in', None)
+        if target_type == 'mysql':
+            return getattr(adapter, 'bulk_load', None)
+        return None
+
+    def _write_batch(self, table_name: str, schema: Dict[str, Any], insert_sql: str,
+                     rows: List[Any], bulk_loader=None) -> Optional[str]:
+        """Write one batch of positional rows to the target; returns an error message on failure"""
+        if bulk_loader is not None:
+            columns = [c['name'] for c in schema['columns']]
+            column_types = [c['type'] for c in schema['columns']]
+            result = bulk_loader(table_name, rows, columns, column_types)
+            return None if result['success'] else result['error']
+
+        operations = [{'sql': insert_sql, 'params': row} for row in rows]
+        result = self.db_manager.execute_transaction(operations, backend="target")
+        return None if result.success else result.error_message
+
     def _get_row_count(self, table_name: str) -> int:
         """Get total row count for a table"""
         if self.source_adapter:
@@ -464,6 +567,7 @@ class DBMigrator:
                 schema['columns'].append({
                     'name': row[0],
                     'type': self._map_type_to_saiql('postgres', row[1]),
+                    'source_type': row[1],
                     'nullable': row[2] == 'YES'
                 })
             
@@ -810,7 +914,11 @@ class DBMigrator:
             return
 
         insert_sql = self._generate_insert_sql(table_name, schema)
-        batch_size = 1000
+        # Bulk loads amortize far more rows per round trip than batched INSERTs
+        bulk_loader = self._target_bulk_loader()
+        batch_size = 10000 if bulk_loader else 1000
+        if bulk_loader:
+            logger.info(f"Bulk loading {table_name} into {self.target_config['type']}")
         
         # File Adapter Path
         if self.source_adapter:
@@ -819,12 +927,12 @@ class DBMigrator:
             
             for batch in self.source_adapter.fetch_rows(table_name, batch_size):
                  # Convert dict rows to tuples matching schema order for positional binding
-                 operations = [{'sql': insert_sql, 'params': [row.get(c) for c in cols]} for row in batch]
+                 rows = [[row.get(c) for c in cols] for row in batch]
                  
-                 result = self.db_manager.execute_transaction(operations, backend="target")
+                 error = self._write_batch(table_name, schema, insert_sql, rows, bulk_loader)
                  
-                 if not result.success:
-                     logger.error(f"Failed to insert batch for {table_name} at offset {migrated_count}: {result.error_message}")
+                 if error:
+                     logger.error(f"Failed to insert batch for {table_name} at offset {migrated_count}: {error}")
                      if self.clean_on_failure: self.cleanup()
                      sys.exit(1)
                  
@@ -847,40 +955,12 @@ class DBMigrator:
 
         migrated_count = start_offset
         
-        cursor = self.source_conn.cursor()
-        cursor.execute(f"SELECT * FROM {self.quote_source_ident(table_name)}")
-        
-        # Skip to offset if needed
-        # Note: This is inefficient for large offsets but generic.
-        # Optimizations (LIMIT/OFFSET) are dialect-specific.
-        if start_offset > 0:
-            logger.info(f"Skipping {start_offset} rows...")
-            skipped = 0
-            while skipped < start_offset:
-                # Skip in chunks
-                to_skip = min(10000, start_offset - skipped)
-                cursor.fetchmany(to_skip)
-                skipped += to_skip
-        
-        while True:
-            batch = cursor.fetchmany(batch_size)
-            if not batch:
-                break
-                
-            operations = []
-            
-            # Prepare batch operations with params
-            for row in batch:
-                operations.append({
-                    'sql': insert_sql,
-                    'params': row
-                })
-            
+        for batch in self._iter_source_batches(table_name, schema, batch_size, start_offset):
             # Execute batch in transaction
-            result = self.db_manager.execute_transaction(operations, backend="target")
+            error = self._write_batch(table_name, schema, insert_sql, batch, bulk_loader)
             
-            if not result.success:
-                logger.error(f"Failed to insert batch at offset {migrated_count}: {result.error_message}")
+            if error:
+                logger.error(f"Failed to insert batch at offset {migrated_count}: {error}")
                 if self.clean_on_failure: self.cleanup()
                 sys.exit(1)
             else:
@@ -1073,24 +1153,15 @@ class DBMigrator:
                      rows = [[row.get(c, None) for c in cols] for row in batch]
                      writer.writerows(rows)
             else:
-                # DBAPI Source
-                cursor = self.source_conn.cursor()
-                quoted_table = self.quote_source_ident(table_name)
-                
-                query = f"SELECT * FROM {quoted_table}"
-                
-                # Enforce determinism
-                if schema['pk']:
-                     pk_cols = ", ".join([self.quote_source_ident(pk) for pk in schema['pk']])
-                     query += f" ORDER BY {pk_cols}"
-                     
-                cursor.execute(query)
+                # DBAPI Source (ordered by PK for determinism)
+                cursor = self._select_source_rows(table_name, schema, 1000)
                 
                 while True:
                     rows = cursor.fetchmany(1000)
                     if not rows:
                         break
                     writer.writerows(rows)
+                cursor.close()
                 
         self.report["tables"].append({
             "name": table_name,
@@ -1336,6 +1407,9 @@ def main():
     parser.add_argument("--output-mode", choices=['db', 'files', 'both'], default='db', help="Output mode: db (live), files (csv/sql), or both")
     parser.add_argument("--output-dir", default="./migration_artifacts", help="Directory for output files")
     parser.add_argument("--clean-on-failure", action="store_true", help="Drop created tables if migration fails")
+    parser.add_argument("--mysql-local-infile", action="store_true",
+                        help="Bulk load MySQL/MariaDB targets with LOAD DATA LOCAL INFILE "
+                             "(lets the server read client files; only for trusted servers)")
     
     parser.add_argument("--resume-run", help="Resume a specific run ID or path")
     
@@ -1350,7 +1424,8 @@ def main():
     try:
         migrator = DBMigrator(args.source, target_url=args.target, target_dir=args.target_dir, 
                              dry_run=args.dry_run, checkpoint_file=args.checkpoint_file, clean_on_failure=args.clean_on_failure,
-                             output_mode=args.output_mode, output_dir=args.output_dir)
+                             output_mode=args.output_mode, output_dir=args.output_dir,
+                             mysql_local_infile=args.mysql_local_infile)
                              
         if args.resume_run:
             migrator.resume_run(args.resume_run)